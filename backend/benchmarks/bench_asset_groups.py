@@ -0,0 +1,122 @@
+"""
+에셋 그룹 벤치마크 — saved_images 전체 GROUP BY vs asset_groups 요약 테이블.
+
+파일명 G개(기본 2만)에 나뉜 저장 이미지를 크기별로(기본 3만 / 30만) 넣은 DB에서
+/asset-groups 첫 페이지를 정렬(latest / name / count)마다 예전 집계 쿼리와
+list_asset_groups(요약 테이블)로 읽어 걸린 시간을 비교한다. 요약 쪽은 이미지 수가 늘어도
+시간이 거의 같아야 한다. 이미지 추가 시 트리거 비용도 함께 잰다.
+
+    python -m backend.benchmarks.bench_asset_groups --images 30000 300000 --groups 20000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+from backend.src.job_store import JobStore
+
+IMAGE_STATUSES = ["pending", "approved", "approved", "rejected", "trashed"]
+SORTS = {"latest": "latestCreatedAt DESC", "name": "filename ASC", "count": "total DESC, filename ASC"}
+ASSET_GROUP_TRIGGERS = ("asset_groups_ai", "asset_groups_ad", "asset_groups_au")
+
+# 요약 테이블 전의 list_asset_groups 쿼리
+OLD_SQL = """
+    SELECT
+      original_filename AS filename,
+      COUNT(*) AS total,
+      SUM(CASE WHEN status = 'pending'  THEN 1 ELSE 0 END) AS pendingCount,
+      SUM(CASE WHEN status = 'approved' THEN 1 ELSE 0 END) AS approvedCount,
+      SUM(CASE WHEN status = 'rejected' THEN 1 ELSE 0 END) AS rejectedCount,
+      SUM(CASE WHEN status = 'trashed'  THEN 1 ELSE 0 END) AS trashedCount,
+      MAX(created_at) AS latestCreatedAt,
+      (SELECT hash FROM saved_images si2 WHERE si2.original_filename = si.original_filename
+       ORDER BY si2.created_at DESC LIMIT 1) AS sampleHash
+    FROM saved_images si
+    GROUP BY original_filename
+    ORDER BY {order}
+    LIMIT 100 OFFSET 0
+"""
+
+
+def _rows(first: int, last: int, groups: int, now: float) -> List[tuple[str, str, str, float, str]]:
+    return [
+        (f"{i:064x}", f"job-{i:07d}", f"char_{i * 7919 % groups:05d}.png", now + i,
+         IMAGE_STATUSES[i % len(IMAGE_STATUSES)])
+        for i in range(first, last)
+    ]
+
+
+async def _insert(store: JobStore, rows: List[tuple[str, str, str, float, str]]) -> float:
+    assert store._conn is not None
+    started = time.perf_counter()
+    await store._conn.executemany(
+        "INSERT INTO saved_images (hash, job_id, original_filename, created_at, status) VALUES (?, ?, ?, ?, ?)",
+        rows,
+    )
+    await store._conn.commit()
+    return (time.perf_counter() - started) * 1000
+
+
+async def _best_old(store: JobStore, order: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await store._read(OLD_SQL.format(order=order))
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+async def _best_new(store: JobStore, sort: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await store.list_asset_groups(sort=sort)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+async def _run(path: Path, sizes: List[int], groups: int, repeat: int, batch: int) -> None:
+    store = JobStore(db_path=path, flush_interval=0)
+    await store.open()
+    now = time.time()
+    loaded = 0
+    print(f"{groups} filename groups, first page of 100, best of {repeat}")
+    print(f"{'images':>8}{'sort':>8}{'GROUP BY ms':>13}{'summary ms':>12}{'speedup':>9}")
+    for size in sorted(sizes):
+        for first in range(loaded, size, 50_000):
+            await _insert(store, _rows(first, min(first + 50_000, size), groups, now))
+        loaded = size
+        for sort, order in SORTS.items():
+            old = await _best_old(store, order, repeat)
+            new = await _best_new(store, sort, repeat)
+            print(f"{size:>8}{sort:>8}{old:>13.1f}{new:>12.2f}{old / new:>8.0f}x")
+
+    # 트리거 비용: 이미지 batch개 추가 (트리거 있음 / 없음)
+    with_triggers = await _insert(store, _rows(loaded, loaded + batch, groups, now))
+    assert store._conn is not None
+    for trigger in ASSET_GROUP_TRIGGERS:
+        await store._conn.execute(f"DROP TRIGGER {trigger}")
+    await store._conn.commit()
+    without = await _insert(store, _rows(loaded + batch, loaded + 2 * batch, groups, now))
+    print(f"insert {batch} images: {without:.1f} ms without asset_groups triggers, {with_triggers:.1f} ms with them")
+    await store.close()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--images", type=int, nargs="+", default=[30_000, 300_000], help="측정할 저장 이미지 수들")
+    ap.add_argument("--groups", type=int, default=20_000, help="파일명 그룹 수")
+    ap.add_argument("--repeat", type=int, default=3, help="반복 측정 횟수 (최솟값 사용)")
+    ap.add_argument("--batch", type=int, default=10_000, help="트리거 비용 측정에 넣는 이미지 수")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(_run(Path(tmp) / "bench.db", args.images, args.groups, args.repeat, args.batch))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+상태 카운터 벤치마크 — 행을 세는 COUNT(*) vs job_counts / saved_image_counts 카운터.
+
+잡 N개(기본 100만, 30일에 걸쳐)와 저장 이미지 N개를 넣은 DB에서 UI가 자주 부르는 개수를
+카운터 경로(JobStore 메서드)와 예전 SQL(행을 세는 COUNT(*) / 잡 전체를 읽는 세션 통계)로 잰다.
+카운터를 고치는 트리거가 쓰기 경로에 더하는 비용도 상태 갱신 flush로 잰다.
+
+    python -m backend.benchmarks.bench_counters -n 1000000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, List, Tuple
+
+from backend.src.job_store import COUNTER_DAY_SECONDS, JobStore
+
+STATUSES = ["done"] * 18 + ["error", "cancelled", "pending"]
+IMAGE_STATUSES = ["pending", "approved", "approved", "rejected", "trashed"]
+DAYS = 30
+COUNTER_TRIGGERS = ("job_counts_ai", "job_counts_ad", "job_counts_au")
+
+
+async def _seed(path: Path, n: int, batch: int = 50_000) -> float:
+    store = JobStore(db_path=path, flush_interval=0, read_pool_size=0)
+    await store.open()
+    assert store._conn is not None
+    rng = random.Random(0)
+    start = time.time() - DAYS * COUNTER_DAY_SECONDS
+    step = DAYS * COUNTER_DAY_SECONDS / n
+    for first in range(0, n, batch):
+        ids = range(first, min(first + batch, n))
+        await store._conn.executemany(
+            "INSERT INTO jobs (id, filename, prompt, workflow_json, status, created_at) "
+            "VALUES (?, ?, 'p', '{}', ?, ?)",
+            [(f"job-{i:07d}", f"char_{i % 5000:04d}", rng.choice(STATUSES), start + i * step) for i in ids],
+        )
+        await store._conn.executemany(
+            "INSERT INTO saved_images (hash, job_id, original_filename, created_at, status) VALUES (?, ?, ?, ?, ?)",
+            [(f"{i:064x}", f"job-{i:07d}", f"char_{i % 5000:04d}.png", start + i * step,
+              IMAGE_STATUSES[i % len(IMAGE_STATUSES)]) for i in ids],
+        )
+        await store._conn.commit()
+    await store.close()
+    return start
+
+
+async def _best(call: Callable[[], Awaitable[object]], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await call()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+async def _scan_sessions(store: JobStore, bounds: List[float]) -> dict[int, int]:
+    """예전 /jobs/session-stats: 잡을 전부 읽어 세션마다 센다."""
+    counts: dict[int, int] = {}
+    for job in await store.get_all_jobs_minimal():
+        created_at = float(job["createdAt"])  # type: ignore[arg-type]
+        session = next((i for i, b in enumerate(bounds) if created_at >= b), len(bounds) - 1)
+        counts[session] = counts.get(session, 0) + 1
+    return counts
+
+
+async def _counter_sessions(store: JobStore, bounds: List[float]) -> dict[int, int]:
+    counts: dict[int, int] = {}
+    upper = None
+    for i, lower in enumerate(bounds):
+        by_status = await store.count_jobs_by_status(
+            created_at_from=lower if i < len(bounds) - 1 else None, created_before=upper
+        )
+        counts[i] = sum(by_status.values())
+        upper = lower
+    return counts
+
+
+async def _sql_count(store: JobStore, sql: str) -> int:
+    row = await store._read_one(sql)
+    return int(row[0]) if row is not None else 0
+
+
+async def _update_flush(store: JobStore, n: int, rounds: int, flip: List[int]) -> None:
+    """잡 rounds개의 상태를 바꿔 한 번에 flush (부를 때마다 done ↔ error를 뒤집는다)."""
+    flip[0] += 1
+    for i in range(rounds):
+        await store.update_fields(f"job-{i * 37 % n:07d}", status=("done", "error")[(i + flip[0]) % 2])
+    await store.flush()
+
+
+async def _run(path: Path, n: int, start: float, repeat: int, updates: int) -> None:
+    store = JobStore(db_path=path, flush_interval=0)
+    await store.open()
+    # 세션 마커 6개 (5일 간격 + 하루 중간) — 최신순
+    bounds = [start + d * COUNTER_DAY_SECONDS + 3_600 * d for d in range(25, -1, -5)]
+    assert await _counter_sessions(store, bounds) == await _scan_sessions(store, bounds)
+    cases: List[Tuple[str, Callable[[], Awaitable[object]], Callable[[], Awaitable[object]]]] = [
+        ("count all jobs", lambda: _sql_count(store, "SELECT COUNT(*) FROM jobs"), lambda: store.count_jobs()),
+        ("count error jobs", lambda: _sql_count(store, "SELECT COUNT(*) FROM jobs WHERE status = 'error'"),
+         lambda: store.count_jobs(statuses=["error"])),
+        ("count last 10 days", lambda: _sql_count(
+            store, f"SELECT COUNT(*) FROM jobs WHERE created_at >= {start + 20.5 * COUNTER_DAY_SECONDS}"),
+         lambda: store.count_jobs(created_at_from=start + 20.5 * COUNTER_DAY_SECONDS)),
+        ("count images", lambda: _sql_count(store, "SELECT COUNT(*) FROM saved_images"),
+         lambda: store.count_saved_images()),
+        ("approved images", lambda: _sql_count(store, "SELECT COUNT(*) FROM saved_images WHERE status = 'approved'"),
+         lambda: store.count_saved_images(status="approved")),
+        ("session stats", lambda: _scan_sessions(store, bounds), lambda: _counter_sessions(store, bounds)),
+    ]
+    print(f"{'count':>20}{'scan ms':>10}{'counter ms':>12}{'speedup':>9}")
+    for label, scan, counter in cases:
+        before = await _best(scan, repeat)
+        after = await _best(counter, repeat)
+        print(f"{label:>20}{before:>10.1f}{after:>12.2f}{before / after:>8.0f}x")
+
+    flip = [0]
+    with_triggers = await _best(lambda: _update_flush(store, n, updates, flip), repeat)
+    assert store._conn is not None
+    for trigger in COUNTER_TRIGGERS:
+        await store._conn.execute(f"DROP TRIGGER {trigger}")
+    await store._conn.commit()
+    without = await _best(lambda: _update_flush(store, n, updates, flip), repeat)
+    print(f"flush of {updates} status updates: {without:.1f} ms without counter triggers, "
+          f"{with_triggers:.1f} ms with them")
+    await store.close()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("-n", type=int, default=1_000_000, help="잡 수 (저장 이미지도 같은 수)")
+    ap.add_argument("--repeat", type=int, default=3, help="반복 측정 횟수 (최솟값 사용)")
+    ap.add_argument("--updates", type=int, default=5_000, help="쓰기 비용 측정에 쓰는 상태 갱신 수")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.db"
+        started = time.perf_counter()
+        start = asyncio.run(_seed(path, args.n))
+        print(f"seeded {args.n} jobs + {args.n} saved images in {time.perf_counter() - started:.1f}s")
+        asyncio.run(_run(path, args.n, start, args.repeat, args.updates))
+
+
+if __name__ == "__main__":
+    main()
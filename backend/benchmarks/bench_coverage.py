@@ -0,0 +1,49 @@
+"""
+커버링 배열 벤치마크 — 축 수/값 수에 따른 covering_array() 시간과 행 수.
+
+축 n개 x 값 v개의 곱(여러 축 AND exclude 몇 개 포함)에서 t-way 배열을 만들고,
+행 수를 전체 조합 수와 비교한다.
+
+    python -m backend.benchmarks.bench_coverage --axes 7 --values 10 30 50
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+from backend.src.prompt_dsl import Program, count_combinations, covering_array, parse
+
+
+def _program(n_axes: int, n_values: int) -> Program:
+    parts = []
+    for a in range(n_axes):
+        parts.append(f"{{{{axis a{a}}}}}\n")
+        parts.extend(f'  v{v} : "a{a} value {v}"\n' for v in range(n_values))
+        parts.append("{{/axis}}\n")
+    parts.append("{{combine " + " * ".join(f"a{a}" for a in range(n_axes)) + "}}\n")
+    for a in range(n_axes - 1):
+        parts.append(f"{{{{exclude a{a} = v{a % n_values} AND a{a + 1} = v{(a + 2) % n_values}}}}}\n")
+    parts.append("{{template}}" + ", ".join(f"{{{{a{a}}}}}" for a in range(n_axes)) + "{{/template}}\n")
+    return parse("".join(parts))
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--axes", type=int, default=7, help="축 수")
+    ap.add_argument("--values", type=int, nargs="+", default=[10, 30, 50], help="축당 값 수 (여러 개 가능)")
+    ap.add_argument("-t", "--strength", type=int, default=2, help="t-way 강도")
+    args = ap.parse_args()
+
+    print(f"{'values':>7}{'combos':>16}{'tuples':>10}{'rows':>8}{'time':>9}")
+    for n_values in args.values:
+        prog = _program(args.axes, n_values)
+        total = count_combinations(prog)
+        start = time.perf_counter()
+        _, report = covering_array(prog, args.strength)
+        elapsed = time.perf_counter() - start
+        assert report["ratio"] == 1.0
+        print(f"{n_values:>7}{total:>16,}{report['tuples']:>10}{report['rows']:>8}{elapsed:>8.2f}s")
+
+
+if __name__ == "__main__":
+    main()
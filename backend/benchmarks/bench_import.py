@@ -0,0 +1,58 @@
+"""
+콜드 스타트 벤치마크 — 새 인터프리터에서 모듈 import에 걸리는 시간.
+
+문법 캐시(prompt_dsl.lark.cache)를 끈 경우와 켠 경우를 각각 잰다.
+측정마다 새 프로세스를 띄우므로 이미 import된 모듈의 영향을 받지 않는다.
+
+    python -m backend.benchmarks.bench_import --runs 10
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+MODULES = ["backend.src.prompt_dsl", "backend.src.server"]
+
+_PROBE = (
+    "import time; t = time.perf_counter(); import {module}; "
+    "print(time.perf_counter() - t)"
+)
+
+
+def _import_time(module: str, env: Dict[str, str]) -> float:
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(module=module)],
+        cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--runs", type=int, default=10, help="모듈/설정별 측정 횟수 (중앙값 사용)")
+    args = ap.parse_args()
+
+    base = dict(os.environ)
+    base["PYTHONPATH"] = os.pathsep.join(filter(None, [str(PROJECT_ROOT), base.get("PYTHONPATH")]))
+    configs = {
+        "no grammar cache": {**base, "CEG_GRAMMAR_CACHE": ""},
+        "grammar cache": base,
+    }
+    _import_time(MODULES[0], base)  # 캐시 파일을 미리 만들어 둔다
+
+    print(f"{'module':<26}{'config':<20}{'median':>10}{'min':>10}")
+    for module in MODULES:
+        for name, env in configs.items():
+            samples: List[float] = [_import_time(module, env) for _ in range(args.runs)]
+            print(f"{module:<26}{name:<20}{statistics.median(samples) * 1000:>8.1f}ms"
+                  f"{min(samples) * 1000:>8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+jobs.db 인덱스 벤치마크 — 설계한 복합/부분 인덱스 vs 예전 단일 컬럼 인덱스.
+
+JobStore.open()으로 스키마를 만든 DB에 잡 N개(기본 100만)와 저장 이미지 N개를 넣고,
+JobStore가 보내는 모양 그대로의 목록 / 개수 쿼리를 두 인덱스 구성에서 잰다.
+
+    designed: open()이 만드는 인덱스 (상태+최신순, 정렬별 (컬럼, id), 활성 잡 부분 인덱스,
+              파일명+최신순 등)
+    single:   예전 구성 — jobs는 기본 키뿐, saved_images는 created_at / status /
+              original_filename 단일 컬럼 인덱스
+
+    python -m backend.benchmarks.bench_indexes -n 1000000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+from backend.src.job_store import JobStore
+
+# (상태, 비율) — 대부분 끝난 잡, 일부 대기열
+STATUSES = [("done", 0.90), ("error", 0.03), ("cancelled", 0.02), ("pending", 0.04), ("queued", 0.005), ("running", 0.005)]
+IMAGE_STATUSES = ["pending", "approved", "approved", "rejected", "trashed"]
+
+DESIGNED_INDEXES = [
+    "idx_jobs_created_at_id", "idx_jobs_status_created_at", "idx_jobs_filename_id",
+    "idx_jobs_duration_id", "idx_jobs_active", "idx_saved_images_created_at_hash",
+    "idx_saved_images_status_created_at", "idx_saved_images_filename_created_at",
+]
+SINGLE_INDEXES = [
+    "CREATE INDEX idx_saved_images_created_at ON saved_images(created_at)",
+    "CREATE INDEX idx_saved_images_status ON saved_images(status)",
+    "CREATE INDEX idx_saved_images_original_filename ON saved_images(original_filename)",
+]
+
+PAGE = "LIMIT 50 OFFSET 0"
+QUERIES: List[Tuple[str, str]] = [
+    ("newest jobs", f"SELECT * FROM jobs ORDER BY created_at DESC, id DESC {PAGE}"),
+    ("error jobs", f"SELECT * FROM jobs WHERE status IN ('error') ORDER BY created_at DESC, id DESC {PAGE}"),
+    ("active jobs", "SELECT * FROM jobs{active_hint} WHERE status IN ('pending', 'queued', 'running') "
+                    f"ORDER BY created_at DESC, id DESC {PAGE}"),
+    ("jobs by filename", f"SELECT * FROM jobs ORDER BY filename ASC, id ASC {PAGE}"),
+    ("jobs by duration", f"SELECT * FROM jobs ORDER BY execution_duration_ms DESC, id DESC {PAGE}"),
+    ("jobs by status", f"SELECT * FROM jobs ORDER BY status ASC, created_at ASC, id ASC {PAGE}"),
+    ("count error jobs", "SELECT COUNT(*) FROM jobs WHERE status IN ('error')"),
+    ("approved images", "SELECT si.* FROM saved_images si WHERE si.status = 'approved' "
+                        f"ORDER BY si.created_at DESC, si.hash DESC {PAGE}"),
+    ("images of a file", "SELECT si.* FROM saved_images si WHERE si.original_filename = 'char_0042.png' "
+                         f"ORDER BY si.created_at DESC, si.hash DESC {PAGE}"),
+    ("asset groups", """
+        SELECT original_filename AS filename, COUNT(*) AS total, MAX(created_at) AS latestCreatedAt,
+          (SELECT hash FROM saved_images si2 WHERE si2.original_filename = si.original_filename
+           ORDER BY si2.created_at DESC LIMIT 1) AS sampleHash
+        FROM saved_images si GROUP BY original_filename ORDER BY latestCreatedAt DESC LIMIT 100 OFFSET 0
+    """),
+]
+
+
+async def _init_schema(path: Path) -> None:
+    store = JobStore(db_path=path, flush_interval=0, read_pool_size=0)
+    await store.open()
+    await store.close()
+
+
+def _seed(path: Path, n: int, batch: int = 50_000) -> None:
+    asyncio.run(_init_schema(path))
+    rng = random.Random(0)
+    names, weights = zip(*STATUSES)
+    conn = sqlite3.connect(path)
+    # 검색 인덱스는 이 벤치마크와 무관하므로 시드 속도를 위해 트리거를 뺀다
+    for trigger in ("jobs_fts_ai", "jobs_fts_ad", "jobs_fts_au"):
+        conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    now = time.time()
+    for start in range(0, n, batch):
+        jobs = []
+        images = []
+        for i in range(start, min(start + batch, n)):
+            status = rng.choices(names, weights)[0]
+            duration = rng.uniform(1_000, 60_000) if status in ("done", "error") else None
+            jobs.append((f"job-{i:07d}", f"char_{i % 5000:04d}", f"prompt {i}", status, now - n + i, duration))
+            images.append((f"{i:064x}", f"job-{i:07d}", f"char_{i % 5000:04d}.png", now - n + i,
+                           IMAGE_STATUSES[i % len(IMAGE_STATUSES)]))
+        conn.executemany(
+            "INSERT INTO jobs (id, filename, prompt, workflow_json, status, created_at, execution_duration_ms) "
+            "VALUES (?, ?, ?, '{}', ?, ?, ?)",
+            jobs,
+        )
+        conn.executemany(
+            "INSERT INTO saved_images (hash, job_id, original_filename, created_at, status) VALUES (?, ?, ?, ?, ?)",
+            images,
+        )
+        conn.commit()
+    conn.close()
+
+
+def _measure(conn: sqlite3.Connection, active_hint: str, repeat: int) -> List[float]:
+    results = []
+    for _, sql in QUERIES:
+        sql = sql.format(active_hint=active_hint)
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            conn.execute(sql).fetchall()
+            best = min(best, time.perf_counter() - started)
+        results.append(best * 1000)
+    return results
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("-n", type=int, default=1_000_000, help="잡 수 (저장 이미지도 같은 수)")
+    ap.add_argument("--repeat", type=int, default=3, help="쿼리별 반복 측정 횟수 (최솟값 사용)")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.db"
+        started = time.perf_counter()
+        _seed(path, args.n)
+        print(f"seeded {args.n} jobs + {args.n} saved images in {time.perf_counter() - started:.1f}s")
+        conn = sqlite3.connect(path)
+        designed = _measure(conn, " INDEXED BY idx_jobs_active", args.repeat)
+        for name in DESIGNED_INDEXES:
+            conn.execute(f"DROP INDEX {name}")
+        for sql in SINGLE_INDEXES:
+            conn.execute(sql)
+        single = _measure(conn, "", args.repeat)
+        conn.close()
+
+    print(f"{'query':>18}{'single ms':>11}{'designed ms':>13}{'speedup':>9}")
+    for (label, _), before, after in zip(QUERIES, single, designed):
+        print(f"{label:>18}{before:>11.1f}{after:>13.2f}{before / after:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
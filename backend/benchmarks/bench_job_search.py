@@ -0,0 +1,99 @@
+"""
+잡 검색 벤치마크 — LIKE '%term%' 스캔 vs jobs_fts (FTS5 trigram).
+
+합성 잡 N개(기본 50만)를 넣은 DB에서 잡 목록 검색창이 하는 것처럼
+count_jobs + query_jobs(첫 페이지)를 검색어별로 돌려 걸린 시간을 비교한다.
+LIKE 쪽은 같은 저장소에서 FTS를 끄고(_fts=False) 잰다.
+
+    python -m backend.benchmarks.bench_job_search -n 500000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+from backend.src.job_store import JobStore
+
+EMOTIONS = ["happy", "sad", "angry", "surprised", "sleepy", "smug", "crying", "laughing"]
+POSES = ["standing", "sitting", "running", "jumping", "lying", "kneeling"]
+OUTFITS = ["school uniform", "maid dress", "hoodie", "kimono", "swimsuit", "armor"]
+ERRORS = ["CUDA out of memory", "worker timeout", "node 12 failed: missing model"]
+
+SEARCHES = ["@char_0421", "#kimono", "#laughing, kneeling", "$timeout", "armor", "@ab"]
+
+
+async def _seed(path: Path, n: int, batch: int = 20_000) -> None:
+    store = JobStore(db_path=path, flush_interval=0, read_pool_size=0)
+    await store.open()
+    assert store._conn is not None
+    rng = random.Random(0)
+    now = time.time()
+    for start in range(0, n, batch):
+        rows = []
+        for i in range(start, min(start + batch, n)):
+            emotion, pose, outfit = rng.choice(EMOTIONS), rng.choice(POSES), rng.choice(OUTFITS)
+            rows.append((
+                f"job-{i}",
+                f"char_{i % 5000:04d}_{emotion}_{pose}",
+                f"masterpiece, best quality, 1girl, solo, {emotion}, {pose}, {outfit}, detailed background",
+                "{}",
+                "failed" if i % 50 == 0 else "completed",
+                ERRORS[i % len(ERRORS)] if i % 50 == 0 else None,
+                now - n + i,
+                json.dumps({"emotion": emotion, "pose": pose, "outfit": outfit}),
+            ))
+        await store._conn.executemany(
+            "INSERT INTO jobs (id, filename, prompt, workflow_json, status, error, created_at, meta_json) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        await store._conn.commit()
+    await store.close()
+
+
+async def _search(store: JobStore, term: str) -> tuple[float, int]:
+    started = time.perf_counter()
+    total = await store.count_jobs(search_tags=[term])
+    await store.query_jobs(search_tags=[term], limit=50)
+    return time.perf_counter() - started, total
+
+
+async def _run(path: Path, repeat: int) -> None:
+    store = JobStore(db_path=path, flush_interval=0)
+    await store.open()
+    print(f"{'search':>22}{'matches':>9}{'LIKE ms':>10}{'FTS ms':>9}{'speedup':>9}")
+    for term in SEARCHES:
+        timings: List[List[float]] = [[], []]
+        total = 0
+        for _ in range(repeat):
+            for slot, fts in enumerate((False, True)):
+                store._fts = fts
+                elapsed, total = await _search(store, term)
+                timings[slot].append(elapsed)
+        like_ms, fts_ms = (min(t) * 1000 for t in timings)
+        print(f"{term:>22}{total:>9}{like_ms:>10.1f}{fts_ms:>9.1f}{like_ms / fts_ms:>8.1f}x")
+    await store.close()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("-n", type=int, default=500_000, help="합성 잡 수")
+    ap.add_argument("--repeat", type=int, default=3, help="검색어별 반복 측정 횟수 (최솟값 사용)")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.db"
+        started = time.perf_counter()
+        asyncio.run(_seed(path, args.n))
+        print(f"seeded {args.n} jobs (with jobs_fts triggers) in {time.perf_counter() - started:.1f}s")
+        asyncio.run(_run(path, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+페이지네이션 벤치마크 — LIMIT/OFFSET vs 커서(keyset) 페이지.
+
+잡 / 저장 이미지 / 잡 이벤트를 N개씩 넣은 DB에서 첫 페이지와 깊은 페이지를
+OFFSET으로 읽을 때와 커서로 읽을 때 걸린 시간을 비교한다 (COUNT 없이 페이지만).
+깊은 페이지의 커서는 측정 전에 OFFSET으로 한 번 읽어 만들어 둔다.
+
+    python -m backend.benchmarks.bench_pagination -n 200000 --limit 50
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, List
+
+from backend.src.job_store import JobStore, event_cursor, job_cursor, saved_image_cursor
+from backend.src.models import JSONValue
+
+Page = Callable[..., Awaitable[List[dict[str, JSONValue]]]]
+
+
+async def _seed(path: Path, n: int, batch: int = 20_000) -> None:
+    store = JobStore(db_path=path, flush_interval=0, read_pool_size=0)
+    await store.open()
+    assert store._conn is not None
+    now = time.time()
+    for start in range(0, n, batch):
+        ids = range(start, min(start + batch, n))
+        await store._conn.executemany(
+            "INSERT INTO jobs (id, filename, prompt, workflow_json, status, created_at) "
+            "VALUES (?, ?, ?, '{}', 'done', ?)",
+            [(f"job-{i:07d}", f"char_{i % 5000:04d}", f"prompt {i}", now - n + i // 4) for i in ids],
+        )
+        await store._conn.executemany(
+            "INSERT INTO saved_images (hash, job_id, original_filename, created_at, status) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [(f"{i:064x}", f"job-{i:07d}", f"char_{i % 5000:04d}.png", now - n + i // 4,
+              ("pending", "approved", "rejected")[i % 3]) for i in ids],
+        )
+        await store._conn.executemany(
+            "INSERT INTO job_events (job_id, event_type, timestamp, worker_id) VALUES (?, 'done', ?, ?)",
+            [(f"job-{i:07d}", now - n + i // 4, f"w{i % 4}") for i in ids],
+        )
+        await store._conn.commit()
+    await store.close()
+
+
+async def _time(page: Page, repeat: int, **kwargs: JSONValue) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await page(**kwargs)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+async def _run(path: Path, limit: int, depth: int, repeat: int) -> None:
+    store = JobStore(db_path=path, flush_interval=0)
+    await store.open()
+    cases: list[tuple[str, Page, Callable[[dict[str, JSONValue]], str], dict[str, JSONValue]]] = [
+        ("jobs", store.query_jobs, job_cursor, {}),
+        ("saved images", store.list_saved_images, saved_image_cursor, {}),
+        ("approved images", store.list_saved_images, saved_image_cursor, {"status": "approved"}),
+        ("events", store.get_all_events, event_cursor, {}),
+    ]
+    print(f"page {depth} x {limit} rows, best of {repeat}")
+    print(f"{'list':>16}{'first ms':>10}{'OFFSET ms':>11}{'cursor ms':>11}")
+    for name, page, make_cursor, filters in cases:
+        first = await _time(page, repeat, limit=limit, **filters)
+        offset = await _time(page, repeat, limit=limit, offset=depth * limit, **filters)
+        before = await page(limit=1, offset=depth * limit - 1, **filters)
+        cursor = await _time(page, repeat, limit=limit, cursor=make_cursor(before[0]), **filters)
+        print(f"{name:>16}{first:>10.2f}{offset:>11.2f}{cursor:>11.2f}")
+    await store.close()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("-n", type=int, default=200_000, help="잡 / 저장 이미지 / 이벤트 수")
+    ap.add_argument("--limit", type=int, default=50, help="페이지 크기")
+    ap.add_argument("--page", type=int, default=None, help="측정할 깊은 페이지 번호 (기본: 승인 이미지 목록의 끝 근처)")
+    ap.add_argument("--repeat", type=int, default=3, help="반복 측정 횟수 (최솟값 사용)")
+    args = ap.parse_args()
+    depth = args.page if args.page is not None else max(1, args.n // 3 // args.limit - 2)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.db"
+        asyncio.run(_seed(path, args.n))
+        asyncio.run(_run(path, args.limit, depth, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
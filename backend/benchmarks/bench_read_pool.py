@@ -0,0 +1,104 @@
+"""
+읽기 연결 풀 벤치마크 — 갤러리 조회가 진행률 쓰기 지연에 주는 영향.
+
+저장 이미지 N개가 있는 DB에서, 워커 4개가 진행률을 보내는 상황(update_fields + flush)을
+흉내 내며 갤러리 조회(list_asset_groups / list_saved_images / count_saved_images)를 동시에 돌린다.
+read_pool_size=0(모든 쿼리가 쓰기 연결 하나를 공유)과 풀을 쓴 경우의 쓰기 지연을 비교한다.
+
+    python -m backend.benchmarks.bench_read_pool -n 50000 --seconds 5
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from backend.src.job_store import JobStore
+
+WORKERS = 4
+
+
+async def _seed(path: Path, n: int) -> None:
+    store = JobStore(db_path=path, flush_interval=0, read_pool_size=0)
+    await store.open()
+    now = time.time()
+    assert store._conn is not None
+    await store._conn.executemany(
+        "INSERT INTO saved_images (hash, job_id, original_filename, created_at, status) "
+        "VALUES (?, ?, ?, ?, ?)",
+        [
+            (f"{i:064x}", f"job-{i}", f"char_{i % 2000:04d}.png", now - i,
+             ("pending", "approved", "rejected")[i % 3])
+            for i in range(n)
+        ],
+    )
+    await store._conn.commit()
+    for w in range(WORKERS):
+        await store.save({"id": f"job-w{w}", "filename": "f", "prompt": "p", "status": "running"})
+    await store.close()
+
+
+async def _progress(store: JobStore, worker: int, stop: asyncio.Event, latencies: List[float]) -> None:
+    step = 0
+    while not stop.is_set():
+        step += 1
+        started = time.perf_counter()
+        await store.update_fields(f"job-w{worker}", progress_percent=step % 100, current_node_name=f"node {step}")
+        await store.flush()
+        latencies.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(0.02)
+
+
+async def _gallery(store: JobStore, stop: asyncio.Event, counter: List[int]) -> None:
+    while not stop.is_set():
+        await store.list_asset_groups(limit=100, sort="count")
+        await store.list_saved_images(limit=100, offset=5000, status="approved")
+        await store.count_saved_images(status="pending")
+        counter[0] += 1
+
+
+async def _run(path: Path, pool_size: int, seconds: float, readers: int) -> Dict[str, float]:
+    store = JobStore(db_path=path, flush_interval=0, read_pool_size=pool_size)
+    await store.open()
+    stop = asyncio.Event()
+    latencies: List[float] = []
+    queries = [0]
+    tasks = [asyncio.create_task(_progress(store, w, stop, latencies)) for w in range(WORKERS)]
+    tasks += [asyncio.create_task(_gallery(store, stop, queries)) for _ in range(readers)]
+    await asyncio.sleep(seconds)
+    stop.set()
+    await asyncio.gather(*tasks)
+    await store.close()
+    latencies.sort()
+    return {
+        "writes": len(latencies),
+        "p50": statistics.median(latencies),
+        "p99": latencies[int(len(latencies) * 0.99) - 1],
+        "max": latencies[-1],
+        "gallery": queries[0],
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("-n", type=int, default=50_000, help="저장 이미지 수")
+    ap.add_argument("--seconds", type=float, default=5.0, help="설정별 측정 시간")
+    ap.add_argument("--readers", type=int, default=2, help="동시에 갤러리를 조회하는 클라이언트 수")
+    ap.add_argument("--pool", type=int, default=2, help="비교할 읽기 연결 수")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.db"
+        asyncio.run(_seed(path, args.n))
+        print(f"{'read pool':>10}{'writes':>8}{'p50 ms':>9}{'p99 ms':>9}{'max ms':>9}{'gallery':>9}")
+        for pool_size in (0, args.pool):
+            r = asyncio.run(_run(path, pool_size, args.seconds, args.readers))
+            print(f"{pool_size:>10}{r['writes']:>8}{r['p50']:>9.2f}{r['p99']:>9.2f}{r['max']:>9.2f}{r['gallery']:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+render() 항목 생성 벤치마크 — 치환 계획 vs 기존 _substitute() 구현.
+
+examples/ceg 의 예제들을 조합째 돌려 가며 N개 항목을 렌더링하고, 두 구현의 출력이
+같은지 확인한 뒤 소요 시간을 비교한다.
+
+    python -m backend.benchmarks.bench_render -n 100000
+"""
+from __future__ import annotations
+
+import argparse
+import itertools
+import re
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from backend.src.models import JSONValue
+from backend.src.prompt_dsl import (
+    AxisValue,
+    Program,
+    _compile_render_plan,
+    _iter_combos,
+    _render_item,
+    parse,
+)
+
+EXAMPLES_DIR = Path(__file__).resolve().parents[2] / "examples" / "ceg"
+
+
+# ── 기준 구현 (치환 계획 도입 전 _render_item 그대로) ──
+
+def _reference_substitute(template: str, ctx: Dict[str, str], keys: Dict[str, str]) -> str:
+    out = template
+    for _ in range(5):
+        prev = out
+        out = re.sub(r'\{\{(\w+)\.key\}\}', lambda m: keys.get(m.group(1), m.group(0)), out)
+        out = re.sub(r'\{\{(\w+)\.(\w+)\}\}',
+                     lambda m: str(ctx.get(f"{m.group(1)}.{m.group(2)}", m.group(0))), out)
+        out = re.sub(r'\{\{(\w+)\}\}', lambda m: str(ctx.get(m.group(1), m.group(0))), out)
+        if prev == out:
+            break
+    return out
+
+
+def _reference_clean_prompt(s: str) -> str:
+    s = re.sub(r'\s+', ' ', s)
+    s = re.sub(r'\s*,\s*', ', ', s)
+    s = re.sub(r'(,\s*)+', ', ', s)
+    return s.strip(" ,\n")
+
+
+def _reference_render_item(prog: Program, combo: Dict[str, AxisValue]) -> Dict[str, JSONValue]:
+    ctx = dict(prog.vars)
+    keys = {}
+    for name in prog.axes:
+        if name not in combo:
+            ctx[name] = ""
+            keys[name] = ""
+    for k, v in combo.items():
+        ctx[k] = v.value
+        keys[k] = "" if v.hide_key else v.key
+        for prop_name, prop_val in v.props.items():
+            ctx[f"{k}.{prop_name}"] = prop_val
+    if prog.combine_alias:
+        alias = prog.combine_alias
+        ctx[alias] = ", ".join(v.value for v in combo.values() if v.value.strip())
+        keys[alias] = "_".join(v.key for v in combo.values() if v.key.strip() and not v.hide_key)
+
+    filename = _reference_substitute(prog.filename, ctx, keys).strip()
+    if prog.vars.get("clean_filename", "true").lower() == "true":
+        filename = re.sub(r'__+', '_', filename)
+        filename = re.sub(r'--+', '-', filename)
+        filename = re.sub(r'\.\.+', '.', filename)
+        filename = filename.strip('_-. ')
+    return {
+        "filename": filename,
+        "prompt": _reference_clean_prompt(_reference_substitute(prog.template, ctx, keys)),
+        "meta": {k: v for k, v in keys.items() if k != prog.combine_alias and keys[k]},
+    }
+
+
+# ── 측정 ──
+
+def _load_corpus() -> List[Tuple[str, Program, List[Dict[str, AxisValue]]]]:
+    corpus = []
+    for path in sorted(EXAMPLES_DIR.glob("*.ceg")):
+        prog = parse(path.read_text(encoding="utf-8"))
+        if prog.combine_expr:
+            corpus.append((path.name, prog, list(_iter_combos(prog))))
+    return corpus
+
+
+def _time(fn: Callable[[], None], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("-n", type=int, default=100_000, help="예제마다 렌더링할 항목 수")
+    ap.add_argument("--repeat", type=int, default=3, help="반복 측정 횟수 (최솟값 사용)")
+    args = ap.parse_args()
+
+    print(f"{'example':<28}{'combos':>8}{'reference':>12}{'plan':>10}{'speedup':>9}")
+    total_ref = total_plan = 0.0
+    for name, prog, combos in _load_corpus():
+        work = list(itertools.islice(itertools.cycle(combos), args.n))
+        plan = _compile_render_plan(prog)
+        for combo in combos:
+            assert _render_item(prog, combo, plan) == _reference_render_item(prog, combo), name
+
+        def run_reference() -> None:
+            for c in work:
+                _reference_render_item(prog, c)
+
+        def run_plan() -> None:
+            p = _compile_render_plan(prog)  # 계획 컴파일 비용도 포함
+            for c in work:
+                _render_item(prog, c, p)
+
+        t_ref = _time(run_reference, args.repeat)
+        t_plan = _time(run_plan, args.repeat)
+        total_ref += t_ref
+        total_plan += t_plan
+        planned = "" if plan is not None else " (fallback)"
+        print(f"{name:<28}{len(combos):>8}{t_ref:>11.3f}s{t_plan:>9.3f}s{t_ref / t_plan:>8.1f}x{planned}")
+    print(f"{'total':<36}{total_ref:>11.3f}s{total_plan:>9.3f}s{total_ref / total_plan:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
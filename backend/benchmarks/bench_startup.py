@@ -0,0 +1,119 @@
+"""
+시작 시 잡 복원 벤치마크 — load_all 후 거르기 vs load_active 청크 스트리밍.
+
+잡 N개(기본 5만, 그중 --active 비율만 pending/queued/running)를 워크플로우와 함께 넣은 DB에서
+JobManager가 시작할 때 하는 잡 복원을 두 방식으로 잰다. 방식마다 새 프로세스에서 돌려
+걸린 시간과 최대 RSS(복원 전 RSS와의 차이)를 본다.
+
+    before: load_all()로 모든 잡을 복원해 Job으로 만든 뒤 활성 잡만 남긴다 (예전 start / reload_jobs)
+    after:  JobManager._restore_active_jobs() — load_active()로 활성 잡만 청크 단위로 읽는다
+
+    python -m backend.benchmarks.bench_startup -n 50000 --active 0.01
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from backend.src.job_store import JobStore
+from backend.src.jobs import Job, JobManager
+from backend.src.models import JobStatus
+from backend.src.worker_pool import WorkerPool
+
+FINISHED = ["done"] * 18 + ["error", "cancelled"]
+ACTIVE = ["pending", "pending", "queued", "running"]
+
+
+def _workflow(i: int) -> dict[str, object]:
+    """노드 30개 남짓의 ComfyUI 워크플로우 (잡마다 시드 / 프롬프트만 다르다)."""
+    nodes: dict[str, object] = {
+        str(n): {"class_type": "LoraLoader", "inputs": {"lora_name": f"style_{n}.safetensors",
+                                                         "strength_model": 0.8, "model": [str(n - 1), 0]}}
+        for n in range(10, 38)
+    }
+    nodes["3"] = {"class_type": "KSampler", "inputs": {"seed": i, "steps": 28, "cfg": 6.5, "model": ["37", 0]}}
+    nodes["6"] = {"class_type": "CLIPTextEncode", "inputs": {"text": f"1girl, solo, expression {i % 97}"}}
+    nodes["9"] = {"class_type": "SaveImage", "inputs": {"filename_prefix": f"char_{i % 5000:04d}"}}
+    return nodes
+
+
+async def _seed(path: Path, n: int, active: float, batch: int = 5_000) -> None:
+    store = JobStore(db_path=path, flush_interval=0, read_pool_size=0)
+    await store.open()
+    rng = random.Random(0)
+    now = time.time() - n
+    for first in range(0, n, batch):
+        jobs: list[dict[str, object]] = []
+        for i in range(first, min(first + batch, n)):
+            status = rng.choice(ACTIVE) if rng.random() < active else rng.choice(FINISHED)
+            jobs.append({
+                "id": f"job-{i:07d}", "filename": f"char_{i % 5000:04d}", "prompt": f"1girl, solo, expression {i % 97}",
+                "_workflow": _workflow(i), "status": status, "createdAt": now + i,
+                "meta": {"emotion": f"e{i % 8}"}, "imageUrls": [f"/images/{i}.png"] if status == "done" else [],
+            })
+        await store.save_created(jobs)  # type: ignore[arg-type]
+    await store.close()
+
+
+def _rss_kb() -> int:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+async def _measure(path: Path, mode: str) -> dict[str, float]:
+    store = JobStore(db_path=path, flush_interval=0)
+    await store.open()
+    baseline = _rss_kb()
+    started = time.perf_counter()
+    if mode == "before":
+        jobs = [Job.from_dict(d) for d in await store.load_all()]
+        restored = sum(j.status in (JobStatus.PENDING, JobStatus.QUEUED, JobStatus.RUNNING) for j in jobs)
+    else:
+        manager = JobManager(pool=WorkerPool(urls=["http://127.0.0.1:9"]), store=store)
+        restored = await manager._restore_active_jobs()
+    elapsed = time.perf_counter() - started
+    peak = _rss_kb()
+    await store.close()
+    return {"seconds": elapsed, "restored": restored, "rssDeltaMb": (peak - baseline) / 1024}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("-n", type=int, default=50_000, help="잡 수")
+    ap.add_argument("--active", type=float, default=0.01, help="활성 잡 비율")
+    ap.add_argument("--measure", choices=["before", "after"], help=argparse.SUPPRESS)
+    ap.add_argument("--db", type=Path, help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.measure:
+        # 자식 프로세스: 한 방식만 재고 JSON으로 보고
+        print(json.dumps(asyncio.run(_measure(args.db, args.measure))))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.db"
+        started = time.perf_counter()
+        asyncio.run(_seed(path, args.n, args.active))
+        print(f"seeded {args.n} jobs ({args.active:.1%} active) in {time.perf_counter() - started:.1f}s, "
+              f"db {path.stat().st_size / 2**20:.0f} MB")
+        print(f"{'restore':>8}{'seconds':>10}{'restored':>10}{'RSS +MB':>10}")
+        for mode in ("before", "after"):
+            # 두 번째 방식이 첫 번째의 페이지 캐시 덕을 보지 않도록 둘 다 한 번 데운 뒤 잰다
+            for _ in range(2):
+                out = subprocess.run(
+                    [sys.executable, "-m", "backend.benchmarks.bench_startup", "--measure", mode, "--db", str(path)],
+                    check=True, capture_output=True, text=True,
+                ).stdout
+            result = json.loads(out.strip().splitlines()[-1])
+            print(f"{mode:>8}{result['seconds']:>10.2f}{result['restored']:>10}{result['rssDeltaMb']:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
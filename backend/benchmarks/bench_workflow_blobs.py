@@ -0,0 +1,136 @@
+"""
+워크플로우 블롭 저장 공간 벤치마크 — 행마다 workflow_json vs workflow_blobs + 입력 패치.
+
+기존 방식(행마다 전체 JSON)으로 채운 DB를 복사해 JobStore.open()의 마이그레이션을 돌리고,
+둘 다 VACUUM한 뒤 파일 크기와 워크플로우 관련 바이트를 비교한다.
+
+--db를 주면 그 DB(실제 데이터)를 복사해서 잰다. 원본은 건드리지 않는다.
+주지 않으면 tools/workflow.json에 프롬프트·파일명·시드만 바꿔 잡 N개와 저장 이미지 N개를 만든다.
+
+    python -m backend.benchmarks.bench_workflow_blobs -n 20000
+    python -m backend.benchmarks.bench_workflow_blobs --db data/jobs.db
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import copy
+import json
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from backend.src.job_store import JobStore
+from backend.src.models import JSONValue
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+SAMPLE_WORKFLOW = PROJECT_ROOT / "tools" / "workflow.json"
+
+
+def _legacy_db(path: Path, n: int) -> None:
+    """블롭 도입 전처럼 행마다 전체 workflow_json을 가진 DB를 만든다."""
+    asyncio.run(_init_schema(path))
+    base: Dict[str, Dict[str, JSONValue]] = json.loads(SAMPLE_WORKFLOW.read_text(encoding="utf-8"))
+    conn = sqlite3.connect(path)
+    jobs: List[Tuple[JSONValue, ...]] = []
+    images: List[Tuple[JSONValue, ...]] = []
+    for i in range(n):
+        wf = copy.deepcopy(base)
+        for node in wf.values():
+            inputs = node["inputs"]
+            if "seed" in inputs:
+                inputs["seed"] = i * 7919 % 1_000_000_000
+            if "filename_prefix" in inputs:
+                inputs["filename_prefix"] = f"char_{i:05d}"
+            if node["class_type"] == "CLIPTextEncode" and "lowres" not in str(inputs.get("text", "")):
+                inputs["text"] = f"1girl, solo, emotion {i % 12}, pose {i % 7}, outfit {i % 5}"
+        wf_json = json.dumps(wf)
+        jobs.append((f"job-{i}", f"char_{i:05d}", f"prompt {i}", wf_json, "done", float(i)))
+        images.append((f"{i:064x}", f"job-{i}", float(i), wf_json))
+    conn.executemany(
+        "INSERT INTO jobs (id, filename, prompt, workflow_json, status, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+        jobs,
+    )
+    conn.executemany(
+        "INSERT INTO saved_images (hash, job_id, created_at, workflow_json) VALUES (?, ?, ?, ?)",
+        images,
+    )
+    conn.commit()
+    conn.close()
+
+
+async def _init_schema(path: Path) -> None:
+    store = JobStore(db_path=path, flush_interval=0)
+    await store.open()
+    await store.close()
+
+
+async def _migrate(path: Path) -> float:
+    store = JobStore(db_path=path, flush_interval=0)
+    started = time.perf_counter()
+    await store.open()
+    elapsed = time.perf_counter() - started
+    await store.close()
+    return elapsed
+
+
+def _copy(src: Path, dst: Path) -> None:
+    """WAL 내용까지 포함해 복사 (sqlite 백업 API)."""
+    with sqlite3.connect(src) as s, sqlite3.connect(dst) as d:
+        s.backup(d)
+
+
+def _measure(path: Path) -> Dict[str, int]:
+    conn = sqlite3.connect(path)
+    conn.execute("VACUUM")
+    tables = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    workflow_bytes = 0
+    for table in ("jobs", "saved_images"):
+        cols = {r[1] for r in conn.execute(f"PRAGMA table_info({table})")}
+        exprs = [f"LENGTH({c})" for c in ("workflow_json", "workflow_patch") if c in cols]
+        workflow_bytes += conn.execute(
+            f"SELECT COALESCE(SUM({' + '.join(f'COALESCE({e}, 0)' for e in exprs)}), 0) FROM {table}"
+        ).fetchone()[0]
+    blobs = 0
+    if "workflow_blobs" in tables:
+        row = conn.execute("SELECT COUNT(*), COALESCE(SUM(LENGTH(workflow_json)), 0) FROM workflow_blobs").fetchone()
+        blobs = row[0]
+        workflow_bytes += row[1]
+    rows = sum(conn.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0] for t in ("jobs", "saved_images"))
+    conn.close()
+    return {"file": path.stat().st_size, "workflow": workflow_bytes, "blobs": blobs, "rows": rows}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--db", type=Path, help="측정할 기존 jobs.db (복사본으로 측정)")
+    ap.add_argument("-n", type=int, default=20_000, help="--db가 없을 때 만들 잡 수 (저장 이미지도 같은 수)")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        before = Path(tmp) / "before.db"
+        after = Path(tmp) / "after.db"
+        if args.db:
+            _copy(args.db, before)
+        else:
+            _legacy_db(before, args.n)
+        _copy(before, after)
+        # before는 블롭 컬럼이 있을 수 있으므로 마이그레이션 없이 잰다
+        m_before = _measure(before)
+        elapsed = asyncio.run(_migrate(after))
+        m_after = _measure(after)
+
+    mb = 1024 * 1024
+    print(f"rows (jobs + saved_images): {m_before['rows']}, blobs after: {m_after['blobs']}, "
+          f"migration: {elapsed:.2f}s")
+    print(f"{'':>14}{'before':>12}{'after':>12}{'saving':>9}")
+    for key, label in (("workflow", "workflow MB"), ("file", "db file MB")):
+        b, a = m_before[key], m_after[key]
+        saving = 1 - a / b if b else 0.0
+        print(f"{label:>14}{b / mb:>12.2f}{a / mb:>12.2f}{saving:>8.0%}")
+
+
+if __name__ == "__main__":
+    main()
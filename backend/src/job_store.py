@@ -3,22 +3,93 @@ SQLite 기반 잡 영속 저장소.
 
 백엔드 재시작 시에도 잡 목록을 유지하기 위해 사용.
 잡 상태 전환 audit log와 ComfyUI 실행 이벤트 로그도 함께 저장.
+
+쓰기 지연(write-behind):
+    save() / save_event() / save_execution_event()는 바로 커밋하지 않고 큐에 쌓는다.
+    잡 행은 잡 ID별로 마지막 값만 남기고(last-write-wins), 이벤트는 순서대로 덧붙인다.
+    큐는 flush_interval마다, 또는 max_pending개가 쌓이면 한 트랜잭션으로 기록된다.
+    jobs / job_events / execution_events를 직접 읽거나 고치는 메서드는 먼저 flush()하므로
+    읽는 쪽에서는 지연이 보이지 않는다. 종료(close) 때도 flush한다.
+
+읽기 연결 풀:
+    쓰기는 연결 하나(_conn)로 직렬화하고, get_* / list_* / count_* / query_* 조회는
+    읽기 전용 연결 read_pool_size개에서 돌린다. aiosqlite 연결마다 스레드가 하나라
+    느린 갤러리 조회가 진행률 쓰기를 막지 않는다 (WAL이라 읽기와 쓰기가 동시에 가능).
+    read_pool_size=0이면 예전처럼 쓰기 연결에서 읽는다.
+    쓰기 연결의 트랜잭션은 모두 쓰기 락(_write_lock) 안에서 커밋 / 롤백까지 마친다 (flush와
+    _transaction()). 락 없이 커밋하거나 롤백하면 진행 중인 flush의 행을 반만 커밋하거나 지운다.
+
+워크플로우 블롭:
+    jobs / saved_images의 워크플로우는 workflow_blobs 테이블의 블롭 해시 + 입력 패치로 기록한다
+    (backend.src.workflow_blobs). 행을 읽을 때 블롭을 캐시에서 찾아 워크플로우를 복원한다.
+    workflow_json을 통째로 가진 기존 행은 open() 때 옮긴다.
+
+템플릿 인터닝:
+    CEG 템플릿 원문은 templates 테이블에 내용 해시(sha256)로 한 번만 두고,
+    jobs / saved_images에는 template_hash만 기록한다 (ceg_template 컬럼은 비워 둔다).
+    읽을 때 캐시에서 원문을 찾아 cegTemplate으로 돌려준다. 기존 행은 open() 때 옮긴다.
+
+잡 검색 인덱스:
+    jobs_fts는 jobs(filename, prompt, error, meta_json)를 내용 테이블로 쓰는 FTS5 trigram 인덱스로,
+    트리거가 jobs와 동기화한다. 검색어(@filename / #prompt / $error / 일반)가 3글자 이상이면
+    MATCH로(%, _도 글자 그대로), 그보다 짧은 검색어는 예전처럼 LIKE로 찾는다.
+    SQLite에 FTS5 trigram이 없으면 모든 검색어를 LIKE로 찾는다.
+    검색어만 있는 count_jobs는 jobs_fts에서 바로 센다. query_jobs(최신순)는 일치하는 잡이
+    FTS_DENSE_MATCHES 이상이면 idx_jobs_created_at_id를 따라 내려가며 첫 페이지를 채우고,
+    그보다 적으면 일치하는 행만 정렬한다.
+
+커서 페이지네이션:
+    query_jobs / list_saved_images / get_all_events는 OFFSET 대신 cursor를 받을 수 있다.
+    커서는 (정렬 키, 정렬 값, 동점 키)를 담은 불투명 문자열로, 페이지 마지막 항목에서
+    job_cursor / saved_image_cursor / event_cursor로 만든다. 저장소는 이를
+    (created_at, id) < (?, ?) 같은 조건으로 바꿔 (정렬 컬럼, 동점 키) 인덱스에서 바로 찾아가므로
+    깊은 페이지도 첫 페이지와 비용이 같다. 잘못되었거나 정렬이 다른 커서는 ValueError.
+
+상태 카운터:
+    job_counts는 (상태, 생성일)별 잡 수, saved_image_counts는 (원본 파일명, 상태)별 이미지 수로,
+    jobs / saved_images 트리거가 행을 쓰는 같은 트랜잭션에서 고친다.
+    count_jobs(검색어 없음) / count_jobs_by_status는 하루 전체가 범위에 드는 날은 카운터에서,
+    범위 양 끝의 걸친 날만 (상태, 생성 시각) 인덱스로 센다. count_saved_images는 상태 / 파일명
+    필터만 있으면 카운터에서 센다. 그 밖의 필터는 예전처럼 SQL로 센다.
+    check_counters()는 원본 테이블에서 다시 세어 어긋난 (키, 컬럼)을 돌려주고, repair=True면 다시 만든다.
+
+에셋 그룹:
+    asset_groups는 파일명별 (이미지 수, 최신 이미지 시각, 대표 이미지 해시) 요약 테이블로,
+    saved_images 트리거가 이미지 추가 / 삭제 때 고친다 (대표 이미지를 지우면 다음 최신 이미지를
+    파일명 인덱스에서 찾는다). list_asset_groups는 요약 테이블을 latest / name / count 정렬
+    인덱스로 한 페이지만 읽고, 상태별 개수는 saved_image_counts에서 가져온다.
+    카운터와 에셋 그룹은 rebuild_counters() 또는
+    `python -m backend.src.job_store rebuild-counters [db_path]`로 처음부터 다시 만들 수 있다.
 """
 
 from __future__ import annotations
 
+import asyncio
+import base64
+import binascii
+import hashlib
 import json
 import logging
+import math
 import os
 import time
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Optional
+from typing import cast, AsyncIterator, Mapping, Optional, Sequence, TypedDict, Unpack
 from backend.src.models import JSONValue
+from backend.src.workflow_blobs import WorkflowEncoder, decode_workflow
 
 import aiosqlite
 
 logger = logging.getLogger(__name__)
 
+WRITE_BEHIND_INTERVAL = 0.25  # 쓰기 큐 flush 주기 (초)
+WRITE_BEHIND_MAX_PENDING = 500  # 이만큼 쌓이면 주기를 기다리지 않고 flush
+READ_POOL_SIZE = int(os.environ.get("CEG_DB_READ_POOL", "2"))  # 읽기 전용 연결 수 (0이면 풀 없음)
+INTERN_CACHE_SIZE = 1024  # 읽기용 워크플로우 블롭 / 템플릿 캐시 항목 수
+BLOB_MIGRATION_BATCH = 500  # 블롭 마이그레이션 트랜잭션당 행 수
+LOAD_ACTIVE_CHUNK = 500  # load_active가 한 번에 읽는 잡 수
+
 # Resolve database path: CEG_DATABASE_PATH/CEG_DB_PATH > CEG_DATA_DIR/jobs.db > data/jobs.db
 def get_default_db_path() -> Path:
     _env_db_path = os.environ.get("CEG_DATABASE_PATH") or os.environ.get("CEG_DB_PATH")
@@ -30,18 +101,53 @@ def get_default_db_path() -> Path:
     return Path("data/jobs.db")
 
 
+def _row_workflow(
+    row: aiosqlite.Row, blobs: Optional[Mapping[str, str]]
+) -> dict[str, JSONValue]:
+    """행의 워크플로우 복원: 블롭 해시가 있으면 블롭 + 패치, 없으면 workflow_json."""
+    keys = row.keys() if hasattr(row, "keys") else set()
+    try:
+        blob_id = row["workflow_hash"] if "workflow_hash" in keys else None
+        if blob_id:
+            if blobs is None or blob_id not in blobs:
+                logger.warning("workflow blob %s not found", blob_id)
+                return {}
+            return decode_workflow(blobs[blob_id], row["workflow_patch"])
+        return json.loads(row["workflow_json"]) if "workflow_json" in keys and row["workflow_json"] else {}
+    except (json.JSONDecodeError, TypeError):
+        return {}
+
+
+def _template_hash(source: str) -> str:
+    """템플릿 원문의 내용 해시 (templates 키)."""
+    return hashlib.sha256(source.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+def _row_template(row: aiosqlite.Row, templates: Optional[Mapping[str, str]]) -> str:
+    """행의 템플릿 원문: template_hash가 있으면 templates에서, 없으면 ceg_template."""
+    keys = row.keys() if hasattr(row, "keys") else set()
+    template_hash = row["template_hash"] if "template_hash" in keys else None
+    if template_hash:
+        if templates is None or template_hash not in templates:
+            logger.warning("template %s not found", template_hash)
+            return ""
+        return templates[template_hash]
+    return (row["ceg_template"] if "ceg_template" in keys else "") or ""
+
+
 def _saved_image_row_to_dict(
-    row: aiosqlite.Row, *, tags: Optional[list[str]] = None
+    row: aiosqlite.Row,
+    *,
+    tags: Optional[list[str]] = None,
+    blobs: Optional[Mapping[str, str]] = None,
+    templates: Optional[Mapping[str, str]] = None,
 ) -> dict[str, JSONValue]:
     keys = row.keys() if hasattr(row, "keys") else set()
     try:
         meta = json.loads(row["meta_json"]) if "meta_json" in keys and row["meta_json"] else {}
     except (json.JSONDecodeError, TypeError):
         meta = {}
-    try:
-        workflow = json.loads(row["workflow_json"]) if "workflow_json" in keys and row["workflow_json"] else {}
-    except (json.JSONDecodeError, TypeError):
-        workflow = {}
+    workflow = _row_workflow(row, blobs)
     return {
         "hash": row["hash"],
         "jobId": row["job_id"],
@@ -59,17 +165,428 @@ def _saved_image_row_to_dict(
         "trashedAt": row["trashed_at"] if "trashed_at" in keys else None,
         "tags": tags or [],
         "meta": meta,
-        "cegTemplate": row["ceg_template"] if "ceg_template" in keys else "",
+        "cegTemplate": _row_template(row, templates),
+        "templateHash": row["template_hash"] if "template_hash" in keys else None,
         "workflow": workflow,
     }
 
 
+_JOB_UPSERT_SQL = """
+    INSERT OR REPLACE INTO jobs (
+        id, filename, prompt, workflow_json, status, worker_id,
+        error, image_urls_json, progress_percent, current_node_name,
+        created_at, started_at, finished_at, retry_count,
+        execution_duration_ms, meta_json, ceg_template,
+        saved_image_hashes_json, total_node_count,
+        completed_node_count, worker_type, target_worker_id,
+        workflow_hash, workflow_patch, template_hash
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+class JobFieldChanges(TypedDict, total=False):
+    """update_fields가 받는 변경 가능한 잡 필드 (키 = Job 필드 이름).
+
+    workflow / prompt / filename / cegTemplate / meta 등은 생성 시 한 번만 기록한다.
+    """
+    status: str
+    worker_id: Optional[str]
+    error: Optional[str]
+    image_urls: list[str]
+    saved_image_hashes: list[str]
+    progress_percent: float
+    current_node_name: str
+    total_node_count: int
+    completed_node_count: int
+    started_at: Optional[float]
+    finished_at: Optional[float]
+    retry_count: int
+    execution_duration_ms: Optional[float]
+    target_worker_id: Optional[str]
+
+
+# 잡 필드 → jobs 컬럼
+_MUTABLE_JOB_COLUMNS: dict[str, str] = {
+    "status": "status",
+    "worker_id": "worker_id",
+    "error": "error",
+    "image_urls": "image_urls_json",
+    "saved_image_hashes": "saved_image_hashes_json",
+    "progress_percent": "progress_percent",
+    "current_node_name": "current_node_name",
+    "total_node_count": "total_node_count",
+    "completed_node_count": "completed_node_count",
+    "started_at": "started_at",
+    "finished_at": "finished_at",
+    "retry_count": "retry_count",
+    "execution_duration_ms": "execution_duration_ms",
+    "target_worker_id": "target_worker_id",
+}
+_JSON_JOB_FIELDS = frozenset({"image_urls", "saved_image_hashes"})
+
+
+_JOB_EVENT_INSERT_SQL = """
+    INSERT INTO job_events (job_id, event_type, timestamp, worker_id, details)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+# trigram 토크나이저가 부분 문자열로 찾을 수 있는 최소 길이
+FTS_MIN_TERM_LENGTH = 3
+# 일치하는 잡이 이만큼 이상이면 정렬 대신 created_at 인덱스를 따라 페이지를 채운다
+FTS_DENSE_MATCHES = 2000
+
+# 검색 접두사 → (LIKE 대상 컬럼, FTS 컬럼 필터)
+_SEARCH_PREFIXES: dict[str, tuple[tuple[str, ...], str]] = {
+    "@": (("filename",), "filename"),
+    "#": (("prompt",), "prompt"),
+    "$": (("error",), "error"),
+}
+_SEARCH_ALL_COLUMNS = ("filename", "prompt", "error", "meta_json")
+
+_JOBS_FTS_SQL = (
+    """
+    CREATE VIRTUAL TABLE jobs_fts USING fts5(
+        filename, prompt, error, meta_json,
+        content='jobs', content_rowid='rowid', tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_ai AFTER INSERT ON jobs BEGIN
+        INSERT INTO jobs_fts (rowid, filename, prompt, error, meta_json)
+        VALUES (new.rowid, new.filename, new.prompt, new.error, new.meta_json);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_ad AFTER DELETE ON jobs BEGIN
+        INSERT INTO jobs_fts (jobs_fts, rowid, filename, prompt, error, meta_json)
+        VALUES ('delete', old.rowid, old.filename, old.prompt, old.error, old.meta_json);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_au AFTER UPDATE OF filename, prompt, error, meta_json ON jobs BEGIN
+        INSERT INTO jobs_fts (jobs_fts, rowid, filename, prompt, error, meta_json)
+        VALUES ('delete', old.rowid, old.filename, old.prompt, old.error, old.meta_json);
+        INSERT INTO jobs_fts (rowid, filename, prompt, error, meta_json)
+        VALUES (new.rowid, new.filename, new.prompt, new.error, new.meta_json);
+    END
+    """,
+)
+
+# 잡 카운터의 하루 버킷 (created_at 기준, UTC 일 단위)
+COUNTER_DAY_SECONDS = 86400
+_JOB_DAY_SQL = "CAST(created_at / 86400 AS INTEGER)"
+
+# saved_images 행 하나를 에셋 그룹에 더한다 / 뺀다 (트리거 본문)
+_ASSET_GROUP_ADD_SQL = """
+        INSERT INTO asset_groups (filename, count, latest_created_at, sample_hash)
+        VALUES (new.original_filename, 1, new.created_at, new.hash)
+        ON CONFLICT (filename) DO UPDATE SET
+            count = count + 1,
+            latest_created_at = MAX(latest_created_at, excluded.latest_created_at),
+            sample_hash = CASE
+                WHEN (excluded.latest_created_at, excluded.sample_hash) > (latest_created_at, sample_hash)
+                THEN excluded.sample_hash ELSE sample_hash END"""
+_ASSET_GROUP_REMOVE_SQL = """
+        UPDATE asset_groups SET count = count - 1 WHERE filename = old.original_filename;
+        DELETE FROM asset_groups WHERE filename = old.original_filename AND count <= 0;
+        UPDATE asset_groups SET (latest_created_at, sample_hash) = (
+            SELECT created_at, hash FROM saved_images WHERE original_filename = old.original_filename
+            ORDER BY created_at DESC, hash DESC LIMIT 1
+        )
+        WHERE filename = old.original_filename AND sample_hash = old.hash"""
+
+_COUNTERS_SQL = (
+    """
+    CREATE TABLE IF NOT EXISTS job_counts (
+        status TEXT NOT NULL,
+        day INTEGER NOT NULL,
+        count INTEGER NOT NULL,
+        PRIMARY KEY (status, day)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS saved_image_counts (
+        original_filename TEXT NOT NULL,
+        status TEXT NOT NULL,
+        count INTEGER NOT NULL,
+        PRIMARY KEY (original_filename, status)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_saved_image_counts_status ON saved_image_counts(status)",
+    """
+    CREATE TRIGGER IF NOT EXISTS job_counts_ai AFTER INSERT ON jobs BEGIN
+        INSERT INTO job_counts (status, day, count)
+        VALUES (new.status, CAST(new.created_at / 86400 AS INTEGER), 1)
+        ON CONFLICT (status, day) DO UPDATE SET count = count + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS job_counts_ad AFTER DELETE ON jobs BEGIN
+        UPDATE job_counts SET count = count - 1
+        WHERE status = old.status AND day = CAST(old.created_at / 86400 AS INTEGER);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS job_counts_au AFTER UPDATE OF status, created_at ON jobs
+    WHEN old.status IS NOT new.status
+        OR CAST(old.created_at / 86400 AS INTEGER) != CAST(new.created_at / 86400 AS INTEGER)
+    BEGIN
+        UPDATE job_counts SET count = count - 1
+        WHERE status = old.status AND day = CAST(old.created_at / 86400 AS INTEGER);
+        INSERT INTO job_counts (status, day, count)
+        VALUES (new.status, CAST(new.created_at / 86400 AS INTEGER), 1)
+        ON CONFLICT (status, day) DO UPDATE SET count = count + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS saved_image_counts_ai AFTER INSERT ON saved_images BEGIN
+        INSERT INTO saved_image_counts (original_filename, status, count)
+        VALUES (new.original_filename, new.status, 1)
+        ON CONFLICT (original_filename, status) DO UPDATE SET count = count + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS saved_image_counts_ad AFTER DELETE ON saved_images BEGIN
+        UPDATE saved_image_counts SET count = count - 1
+        WHERE original_filename = old.original_filename AND status = old.status;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS saved_image_counts_au AFTER UPDATE OF status, original_filename ON saved_images
+    WHEN old.status IS NOT new.status OR old.original_filename IS NOT new.original_filename
+    BEGIN
+        UPDATE saved_image_counts SET count = count - 1
+        WHERE original_filename = old.original_filename AND status = old.status;
+        INSERT INTO saved_image_counts (original_filename, status, count)
+        VALUES (new.original_filename, new.status, 1)
+        ON CONFLICT (original_filename, status) DO UPDATE SET count = count + 1;
+    END
+    """,
+    # 에셋 그룹: 파일명별 이미지 수 + 최신 이미지 (created_at, hash가 가장 큰 것).
+    # 상태별 개수는 saved_image_counts에서 읽는다.
+    """
+    CREATE TABLE IF NOT EXISTS asset_groups (
+        filename TEXT PRIMARY KEY,
+        count INTEGER NOT NULL,
+        latest_created_at REAL NOT NULL,
+        sample_hash TEXT NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_asset_groups_latest ON asset_groups(latest_created_at, filename)",
+    "CREATE INDEX IF NOT EXISTS idx_asset_groups_count ON asset_groups(count DESC, filename)",
+    f"""
+    CREATE TRIGGER IF NOT EXISTS asset_groups_ai AFTER INSERT ON saved_images BEGIN
+        {_ASSET_GROUP_ADD_SQL};
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS asset_groups_ad AFTER DELETE ON saved_images BEGIN
+        {_ASSET_GROUP_REMOVE_SQL};
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS asset_groups_au AFTER UPDATE OF original_filename, created_at ON saved_images
+    WHEN old.original_filename IS NOT new.original_filename OR old.created_at IS NOT new.created_at
+    BEGIN
+        {_ASSET_GROUP_REMOVE_SQL};
+        {_ASSET_GROUP_ADD_SQL};
+    END
+    """,
+)
+
+# 카운터 테이블 → (키 컬럼, 값 컬럼, 원본 테이블에서 다시 센 행 — 컬럼 순서는 카운터 테이블과 같다)
+_COUNTER_SOURCES: dict[str, tuple[tuple[str, ...], tuple[str, ...], str]] = {
+    "job_counts": (
+        ("status", "day"),
+        ("count",),
+        f"SELECT status, {_JOB_DAY_SQL} AS day, COUNT(*) AS count FROM jobs GROUP BY 1, 2",
+    ),
+    "saved_image_counts": (
+        ("original_filename", "status"),
+        ("count",),
+        "SELECT original_filename, status, COUNT(*) AS count FROM saved_images GROUP BY 1, 2",
+    ),
+    "asset_groups": (
+        ("filename",),
+        ("count", "latest_created_at", "sample_hash"),
+        """
+        SELECT original_filename AS filename, COUNT(*) AS count, MAX(created_at) AS latest_created_at,
+          (SELECT hash FROM saved_images si2 WHERE si2.original_filename = si.original_filename
+           ORDER BY si2.created_at DESC, si2.hash DESC LIMIT 1) AS sample_hash
+        FROM saved_images si GROUP BY original_filename
+        """,
+    ),
+}
+
+
+async def _succeeds(future: asyncio.Future[None]) -> bool:
+    """future가 끝나기를 기다려 예외 없이 끝났는지 돌려준다."""
+    try:
+        await future
+    except Exception:
+        return False
+    return True
+
+
+def _fts_phrase(term: str) -> str:
+    """검색어 → FTS5 문자열 (큰따옴표 이스케이프)."""
+    return '"' + term.replace('"', '""') + '"'
+
+
+# query_jobs sort_by → 정렬 컬럼들 (동점은 id로 가른다). 상태 정렬은 상태 안에서 최신순.
+_JOB_SORT_COLUMNS: dict[str, tuple[str, ...]] = {
+    "createdat": ("created_at",),
+    "created_at": ("created_at",),
+    "filename": ("filename",),
+    "status": ("status", "created_at"),
+    "duration": ("execution_duration_ms",),
+}
+# 정렬 컬럼 → 잡 dict 키 (job_cursor용)
+_JOB_SORT_KEYS = {
+    "created_at": "createdAt",
+    "filename": "filename",
+    "status": "status",
+    "execution_duration_ms": "executionDurationMs",
+}
+_NULLABLE_SORT_COLUMNS = frozenset({"execution_duration_ms"})
+
+# 활성 잡 상태. jobs_filter가 이 집합을 글자 그대로 쓰면 부분 인덱스 idx_jobs_active를 탄다.
+ACTIVE_JOB_STATUSES = ("pending", "queued", "running")
+_ACTIVE_STATUS_SQL = "status IN ('pending', 'queued', 'running')"
+
+
+def _job_sort(sort_by: str, sort_order: str) -> tuple[tuple[str, ...], str]:
+    """sort_by / sort_order → (정렬 컬럼들, ASC|DESC)."""
+    columns = _JOB_SORT_COLUMNS.get(sort_by.lower(), ("created_at",))
+    return columns, "ASC" if sort_order.lower() == "asc" else "DESC"
+
+
+def _encode_cursor(sort_key: str, values: Sequence[JSONValue], tiebreak: JSONValue) -> str:
+    raw = json.dumps([sort_key, list(values), tiebreak], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str, sort_key: str, width: int = 1) -> tuple[list[JSONValue], JSONValue]:
+    """커서 → (정렬 값들, 동점 키). 형식이 틀리거나 정렬 키가 다르면 ValueError."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        decoded = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as exc:
+        raise ValueError("invalid cursor") from exc
+    if not isinstance(decoded, list) or len(decoded) != 3 or decoded[0] != sort_key:
+        raise ValueError("invalid cursor")
+    _, values, tiebreak = decoded
+    if (
+        not isinstance(values, list)
+        or len(values) != width
+        or any(isinstance(v, (dict, list)) for v in values)
+        or tiebreak is None
+        or isinstance(tiebreak, (dict, list))
+    ):
+        raise ValueError("invalid cursor")
+    return values, tiebreak
+
+
+def _seek_clause(
+    columns: tuple[str, ...],
+    tiebreak: str,
+    order_dir: str,
+    values: Sequence[JSONValue],
+    key: JSONValue,
+    *,
+    nullable: bool = False,
+) -> tuple[str, list[JSONValue]]:
+    """(columns..., tiebreak) 정렬에서 커서 다음 행부터 고르는 조건.
+
+    NULL은 SQLite 정렬에서 가장 작은 값이므로 nullable 컬럼(단일 정렬 컬럼만)은 따로 처리한다.
+    """
+    op = "<" if order_dir == "DESC" else ">"
+    if nullable and values[0] is None:
+        column = columns[0]
+        after_nulls = f"({column} IS NULL AND {tiebreak} {op} ?)"
+        if order_dir == "DESC":
+            return after_nulls, [key]
+        return f"({after_nulls} OR {column} IS NOT NULL)", [key]
+    placeholders = ", ".join("?" * (len(columns) + 1))
+    clause = f"({', '.join(columns)}, {tiebreak}) {op} ({placeholders})"
+    if nullable and order_dir == "DESC":
+        clause = f"({clause} OR {columns[0]} IS NULL)"
+    return clause, [*values, key]
+
+
+def job_cursor(job: Mapping[str, JSONValue], sort_by: str = "created_at", sort_order: str = "desc") -> str:
+    """query_jobs 결과 항목 → 그 다음 페이지를 가리키는 커서."""
+    columns, order_dir = _job_sort(sort_by, sort_order)
+    return _encode_cursor(
+        f"jobs:{'+'.join(columns)}:{order_dir}",
+        [job.get(_JOB_SORT_KEYS[c]) for c in columns],
+        job["id"],
+    )
+
+
+def saved_image_cursor(image: Mapping[str, JSONValue]) -> str:
+    """list_saved_images 결과 항목 → 그 다음 페이지를 가리키는 커서."""
+    return _encode_cursor("saved_images", [image["createdAt"]], image["hash"])
+
+
+def event_cursor(event: Mapping[str, JSONValue]) -> str:
+    """get_all_events 결과 항목 → 그 다음 페이지를 가리키는 커서."""
+    return _encode_cursor("job_events", [event["timestamp"]], event["id"])
+
+
+_BLOB_INSERT_SQL = "INSERT OR IGNORE INTO workflow_blobs (hash, workflow_json) VALUES (?, ?)"
+_TEMPLATE_INSERT_SQL = "INSERT OR IGNORE INTO templates (hash, source) VALUES (?, ?)"
+
+# 아직 기록하지 않은 (워크플로우 블롭, 템플릿) — 해시 → 내용
+_Interned = tuple[dict[str, str], dict[str, str]]
+
+_EXECUTION_EVENT_INSERT_SQL = """
+    INSERT INTO execution_events (job_id, worker_id, event_type, timestamp, payload_json)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+
 class JobStore:
     """aiosqlite 기반 잡 저장소."""
 
-    def __init__(self, db_path: Optional[Path] = None) -> None:
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        *,
+        flush_interval: float = WRITE_BEHIND_INTERVAL,
+        max_pending: int = WRITE_BEHIND_MAX_PENDING,
+        read_pool_size: int = READ_POOL_SIZE,
+    ) -> None:
         self._db_path = db_path or get_default_db_path()
         self._conn: Optional[aiosqlite.Connection] = None
+        # 읽기 전용 연결 풀
+        self._read_pool_size = read_pool_size
+        self._fts = False  # jobs_fts 사용 가능 여부 (open에서 결정)
+        self._readers: list[aiosqlite.Connection] = []
+        self._idle_readers: asyncio.Queue[aiosqlite.Connection] = asyncio.Queue()
+        # 쓰기 지연 큐
+        self._flush_interval = flush_interval
+        self._max_pending = max_pending
+        self._pending_jobs: dict[str, tuple[JSONValue, ...]] = {}
+        self._pending_updates: dict[str, dict[str, JSONValue]] = {}  # job_id → {컬럼: 값}
+        self._pending_events: list[tuple[JSONValue, ...]] = []
+        self._pending_execution_events: list[tuple[JSONValue, ...]] = []
+        self._write_lock = asyncio.Lock()  # 쓰기 연결의 트랜잭션 하나(커밋 / 롤백까지)를 감싼다
+        # 워크플로우 블롭
+        self._encoder = WorkflowEncoder()
+        self._pending_blobs: dict[str, str] = {}  # 아직 기록하지 않은 블롭 해시 → JSON
+        self._blob_cache: dict[str, str] = {}
+        # 템플릿 인터닝
+        self._known_templates: set[str] = set()
+        self._pending_templates: dict[str, str] = {}  # 아직 기록하지 않은 템플릿 해시 → 원문
+        self._template_cache: dict[str, str] = {}
+        self._template_axes: dict[str, frozenset[str]] = {}  # 템플릿 해시 → 축 이름 (자동 태그용)
+        self._flush_task: Optional[asyncio.Task[None]] = None
+        # 지표
+        self._flush_count = 0
+        self._flushed_rows = 0
+        self._last_flush_ms: Optional[float] = None
+        self._max_flush_ms = 0.0
 
     async def open(self) -> None:
         if self._conn is not None:
@@ -80,158 +597,252 @@ class JobStore:
             logger.exception("failed to open database: %s", self._db_path)
             raise
         self._conn.row_factory = aiosqlite.Row
+        # 다른 DB 파일일 수 있으므로 (가져오기 후 재오픈 등) 블롭 상태를 비운다
+        self._encoder.reset()
+        self._pending_blobs.clear()
+        self._blob_cache.clear()
+        self._known_templates.clear()
+        self._pending_templates.clear()
+        self._template_cache.clear()
         try:
-            await self._conn.execute("PRAGMA journal_mode=WAL")
-            await self._conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS jobs (
-                    id TEXT PRIMARY KEY,
-                    filename TEXT NOT NULL,
-                    prompt TEXT NOT NULL,
-                    workflow_json TEXT NOT NULL,
-                    status TEXT NOT NULL DEFAULT 'pending',
-                    worker_id TEXT,
-                    error TEXT,
-                    image_urls_json TEXT NOT NULL DEFAULT '[]',
-                    progress_percent REAL NOT NULL DEFAULT 0.0,
-                    current_node_name TEXT NOT NULL DEFAULT '',
-                    created_at REAL NOT NULL,
-                    started_at REAL,
-                    finished_at REAL,
-                    retry_count INTEGER NOT NULL DEFAULT 0,
-                    execution_duration_ms REAL
-                )
-                """
+            async with self._write_lock:
+                await self._create_schema()
+            await self._migrate_workflow_blobs()
+            await self._migrate_templates()
+        except Exception:
+            logger.exception("failed to initialize database schema: %s", self._db_path)
+            raise
+        await self._open_readers()
+        if self._flush_interval > 0 and self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop(), name="job-store-flush")
+
+    async def _create_schema(self) -> None:
+        """테이블 / 인덱스 / 트리거를 만들고 컬럼을 옮긴 뒤 커밋합니다 (쓰기 락 안에서 부른다)."""
+        assert self._conn is not None
+        await self._conn.execute("PRAGMA journal_mode=WAL")
+        # INSERT OR REPLACE가 지우는 기존 행에도 jobs_fts 삭제 트리거가 돌도록
+        await self._conn.execute("PRAGMA recursive_triggers = ON")
+        await self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                filename TEXT NOT NULL,
+                prompt TEXT NOT NULL,
+                workflow_json TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                worker_id TEXT,
+                error TEXT,
+                image_urls_json TEXT NOT NULL DEFAULT '[]',
+                progress_percent REAL NOT NULL DEFAULT 0.0,
+                current_node_name TEXT NOT NULL DEFAULT '',
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL,
+                retry_count INTEGER NOT NULL DEFAULT 0,
+                execution_duration_ms REAL
             )
-            # 기존 DB 마이그레이션
-            await self._migrate_add_column("jobs", "execution_duration_ms", "REAL")
-            await self._migrate_add_column("jobs", "meta_json", "TEXT NOT NULL DEFAULT '{}'")
-            await self._migrate_add_column("jobs", "ceg_template", "TEXT NOT NULL DEFAULT ''")
-            await self._migrate_add_column("jobs", "saved_image_hashes_json", "TEXT NOT NULL DEFAULT '[]'")
-            await self._migrate_add_column("jobs", "total_node_count", "INTEGER NOT NULL DEFAULT 0")
-            await self._migrate_add_column("jobs", "completed_node_count", "INTEGER NOT NULL DEFAULT 0")
-            await self._migrate_add_column("jobs", "worker_type", "TEXT")
-            await self._migrate_add_column("jobs", "target_worker_id", "TEXT")
+            """
+        )
+        # 기존 DB 마이그레이션
+        await self._migrate_add_column("jobs", "execution_duration_ms", "REAL")
+        await self._migrate_add_column("jobs", "meta_json", "TEXT NOT NULL DEFAULT '{}'")
+        await self._migrate_add_column("jobs", "ceg_template", "TEXT NOT NULL DEFAULT ''")
+        await self._migrate_add_column("jobs", "saved_image_hashes_json", "TEXT NOT NULL DEFAULT '[]'")
+        await self._migrate_add_column("jobs", "total_node_count", "INTEGER NOT NULL DEFAULT 0")
+        await self._migrate_add_column("jobs", "completed_node_count", "INTEGER NOT NULL DEFAULT 0")
+        await self._migrate_add_column("jobs", "worker_type", "TEXT")
+        await self._migrate_add_column("jobs", "target_worker_id", "TEXT")
+        await self._migrate_add_column("jobs", "workflow_hash", "TEXT")
+        await self._migrate_add_column("jobs", "workflow_patch", "TEXT")
+        await self._migrate_add_column("jobs", "template_hash", "TEXT")
+        await self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_jobs_template_hash ON jobs(template_hash)"
+        )
+        # 목록 정렬(query_jobs sort_by)마다 (정렬 컬럼들, id) 인덱스 하나 — 커서 탐색도 같은 인덱스
+        await self._conn.execute("DROP INDEX IF EXISTS idx_jobs_created_at")
+        await self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_jobs_created_at_id ON jobs(created_at, id)"
+        )
+        # 상태 필터 + 최신순, 상태 정렬, 상태별 개수
+        await self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_jobs_status_created_at ON jobs(status, created_at, id)"
+        )
+        await self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_jobs_filename_id ON jobs(filename, id)"
+        )
+        await self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_jobs_duration_id ON jobs(execution_duration_ms, id)"
+        )
+        # 활성 잡(보통 전체의 일부)만 담는 부분 인덱스
+        await self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_jobs_active ON jobs(created_at, id) "
+            f"WHERE {_ACTIVE_STATUS_SQL}"
+        )
+        await self._ensure_job_search_index()
 
-            await self._conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS job_events (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    job_id TEXT NOT NULL,
-                    event_type TEXT NOT NULL,
-                    timestamp REAL NOT NULL,
-                    worker_id TEXT,
-                    details TEXT NOT NULL DEFAULT '{}'
-                )
-                """
-            )
-            await self._conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_job_events_job_id ON job_events(job_id)"
-            )
-            await self._conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_job_events_timestamp ON job_events(timestamp)"
+        await self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS job_events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_id TEXT NOT NULL,
+                event_type TEXT NOT NULL,
+                timestamp REAL NOT NULL,
+                worker_id TEXT,
+                details TEXT NOT NULL DEFAULT '{}'
             )
+            """
+        )
+        await self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_job_events_job_id ON job_events(job_id)"
+        )
+        # id가 rowid라 (timestamp, id) 커서 탐색도 이 인덱스로 된다
+        await self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_job_events_timestamp ON job_events(timestamp)"
+        )
 
-            await self._conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS execution_events (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    job_id TEXT NOT NULL,
-                    worker_id TEXT NOT NULL,
-                    event_type TEXT NOT NULL,
-                    timestamp REAL NOT NULL,
-                    payload_json TEXT NOT NULL DEFAULT '{}'
-                )
-                """
-            )
-            await self._conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_execution_events_job_id ON execution_events(job_id)"
-            )
-            await self._conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_execution_events_timestamp ON execution_events(timestamp)"
+        await self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS execution_events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_id TEXT NOT NULL,
+                worker_id TEXT NOT NULL,
+                event_type TEXT NOT NULL,
+                timestamp REAL NOT NULL,
+                payload_json TEXT NOT NULL DEFAULT '{}'
             )
+            """
+        )
+        await self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_execution_events_job_id ON execution_events(job_id)"
+        )
+        await self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_execution_events_timestamp ON execution_events(timestamp)"
+        )
 
-            await self._conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS saved_images (
-                    hash TEXT PRIMARY KEY,
-                    job_id TEXT NOT NULL,
-                    original_filename TEXT NOT NULL DEFAULT '',
-                    comfy_filename TEXT NOT NULL DEFAULT '',
-                    subfolder TEXT NOT NULL DEFAULT '',
-                    type TEXT NOT NULL DEFAULT '',
-                    worker_id TEXT,
-                    extension TEXT NOT NULL DEFAULT '',
-                    size_bytes INTEGER NOT NULL DEFAULT 0,
-                    prompt TEXT NOT NULL DEFAULT '',
-                    created_at REAL NOT NULL
-                )
-                """
-            )
-            await self._conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_saved_images_job_id ON saved_images(job_id)"
-            )
-            await self._conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_saved_images_created_at ON saved_images(created_at)"
-            )
-            # 큐레이션 컬럼 마이그레이션 (NOT NULL DEFAULT는 ALTER로 추가 가능)
-            await self._migrate_add_column(
-                "saved_images", "status", "TEXT NOT NULL DEFAULT 'pending'"
-            )
-            await self._migrate_add_column(
-                "saved_images", "note", "TEXT NOT NULL DEFAULT ''"
-            )
-            await self._migrate_add_column("saved_images", "trashed_at", "REAL")
-            await self._migrate_add_column("saved_images", "meta_json", "TEXT NOT NULL DEFAULT '{}'")
-            await self._migrate_add_column("saved_images", "ceg_template", "TEXT NOT NULL DEFAULT ''")
-            await self._migrate_add_column("saved_images", "workflow_json", "TEXT NOT NULL DEFAULT '{}'")
-            await self._conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_saved_images_status ON saved_images(status)"
-            )
-            await self._conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_saved_images_original_filename "
-                "ON saved_images(original_filename)"
+        await self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS saved_images (
+                hash TEXT PRIMARY KEY,
+                job_id TEXT NOT NULL,
+                original_filename TEXT NOT NULL DEFAULT '',
+                comfy_filename TEXT NOT NULL DEFAULT '',
+                subfolder TEXT NOT NULL DEFAULT '',
+                type TEXT NOT NULL DEFAULT '',
+                worker_id TEXT,
+                extension TEXT NOT NULL DEFAULT '',
+                size_bytes INTEGER NOT NULL DEFAULT 0,
+                prompt TEXT NOT NULL DEFAULT '',
+                created_at REAL NOT NULL
             )
+            """
+        )
+        await self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_saved_images_job_id ON saved_images(job_id)"
+        )
+        # 최신순 갤러리 + 커서 (created_at, hash) 탐색용
+        await self._conn.execute("DROP INDEX IF EXISTS idx_saved_images_created_at")
+        await self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_saved_images_created_at_hash "
+            "ON saved_images(created_at, hash)"
+        )
+        # 큐레이션 컬럼 마이그레이션 (NOT NULL DEFAULT는 ALTER로 추가 가능)
+        await self._migrate_add_column(
+            "saved_images", "status", "TEXT NOT NULL DEFAULT 'pending'"
+        )
+        await self._migrate_add_column(
+            "saved_images", "note", "TEXT NOT NULL DEFAULT ''"
+        )
+        await self._migrate_add_column("saved_images", "trashed_at", "REAL")
+        await self._migrate_add_column("saved_images", "meta_json", "TEXT NOT NULL DEFAULT '{}'")
+        await self._migrate_add_column("saved_images", "ceg_template", "TEXT NOT NULL DEFAULT ''")
+        await self._migrate_add_column("saved_images", "workflow_json", "TEXT NOT NULL DEFAULT '{}'")
+        await self._migrate_add_column("saved_images", "workflow_hash", "TEXT")
+        await self._migrate_add_column("saved_images", "workflow_patch", "TEXT")
+        await self._migrate_add_column("saved_images", "template_hash", "TEXT")
+        # 상태별 개수 + 상태 필터 갤러리의 최신순 커서 탐색용
+        await self._conn.execute("DROP INDEX IF EXISTS idx_saved_images_status")
+        await self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_saved_images_status_created_at "
+            "ON saved_images(status, created_at, hash)"
+        )
+        await self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_saved_images_template_hash ON saved_images(template_hash)"
+        )
+        # 파일명 필터 + 최신순, 에셋 그룹의 sampleHash(파일명별 최신 이미지) 조회
+        await self._conn.execute("DROP INDEX IF EXISTS idx_saved_images_original_filename")
+        await self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_saved_images_filename_created_at "
+            "ON saved_images(original_filename, created_at, hash)"
+        )
 
-            await self._conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS image_tags (
-                    image_hash TEXT NOT NULL,
-                    tag TEXT NOT NULL,
-                    created_at REAL NOT NULL,
-                    PRIMARY KEY (image_hash, tag)
-                )
-                """
+        await self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS image_tags (
+                image_hash TEXT NOT NULL,
+                tag TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (image_hash, tag)
             )
-            await self._conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_image_tags_tag ON image_tags(tag)"
+            """
+        )
+        await self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_image_tags_tag ON image_tags(tag)"
+        )
+
+        await self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS workers (
+                url TEXT PRIMARY KEY,
+                worker_type TEXT NOT NULL DEFAULT 'comfyui',
+                added_at REAL NOT NULL
             )
+            """
+        )
+        # 기존 DB 마이그레이션: worker_type 컬럼 추가
+        await self._migrate_add_column("workers", "worker_type", "TEXT NOT NULL DEFAULT 'comfyui'")
 
-            await self._conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS workers (
-                    url TEXT PRIMARY KEY,
-                    worker_type TEXT NOT NULL DEFAULT 'comfyui',
-                    added_at REAL NOT NULL
-                )
-                """
+        await self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS settings (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL DEFAULT ''
             )
-            # 기존 DB 마이그레이션: worker_type 컬럼 추가
-            await self._migrate_add_column("workers", "worker_type", "TEXT NOT NULL DEFAULT 'comfyui'")
+            """
+        )
 
-            await self._conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS settings (
-                    key TEXT PRIMARY KEY,
-                    value TEXT NOT NULL DEFAULT ''
-                )
-                """
+        await self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS workflow_blobs (
+                hash TEXT PRIMARY KEY,
+                workflow_json TEXT NOT NULL
             )
+            """
+        )
+        await self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS templates (
+                hash TEXT PRIMARY KEY,
+                source TEXT NOT NULL
+            )
+            """
+        )
+        await self._ensure_counters()
 
-            await self._conn.commit()
-        except Exception:
-            logger.exception("failed to initialize database schema: %s", self._db_path)
-            raise
+        await self._conn.commit()
+
+    async def _open_readers(self) -> None:
+        """읽기 전용 연결 풀을 연다 (스키마/마이그레이션이 끝난 뒤)."""
+        self._idle_readers = asyncio.Queue()
+        for _ in range(self._read_pool_size):
+            try:
+                reader = await aiosqlite.connect(str(self._db_path))
+            except Exception:
+                logger.exception("failed to open read connection: %s", self._db_path)
+                raise
+            reader.row_factory = aiosqlite.Row
+            await reader.execute("PRAGMA query_only = ON")
+            self._readers.append(reader)
+            self._idle_readers.put_nowait(reader)
 
     async def _migrate_add_column(
         self, table: str, column: str, col_type: str
@@ -249,57 +860,567 @@ class JobStore:
             )
             logger.info("migrated: added %s.%s (%s)", table, column, col_type)
 
+    async def _ensure_job_search_index(self) -> None:
+        """jobs_fts와 동기화 트리거를 만든다. 새로 만들었으면 기존 잡으로 채운다."""
+        if self._conn is None:
+            return
+        cursor = await self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'jobs_fts'"
+        )
+        exists = await cursor.fetchone() is not None
+        try:
+            if not exists:
+                await self._conn.execute(_JOBS_FTS_SQL[0])
+            for trigger_sql in _JOBS_FTS_SQL[1:]:
+                await self._conn.execute(trigger_sql)
+            if not exists:
+                await self._conn.execute("INSERT INTO jobs_fts (jobs_fts) VALUES ('rebuild')")
+                logger.info("migrated: built jobs_fts search index")
+        except aiosqlite.OperationalError:
+            # FTS5/trigram이 없는 SQLite 빌드 — LIKE 검색으로 동작
+            logger.warning("FTS5 trigram tokenizer unavailable; job search falls back to LIKE")
+            self._fts = False
+            return
+        self._fts = True
+
+    async def _ensure_counters(self) -> None:
+        """상태 카운터 테이블과 트리거를 만든다. 새로 만든 테이블은 기존 행으로 채운다."""
+        if self._conn is None:
+            return
+        cursor = await self._conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name IN "
+            f"({', '.join('?' for _ in _COUNTER_SOURCES)})",
+            tuple(_COUNTER_SOURCES),
+        )
+        existing = {row["name"] for row in await cursor.fetchall()}
+        for sql in _COUNTERS_SQL:
+            await self._conn.execute(sql)
+        for table in _COUNTER_SOURCES:
+            if table not in existing:
+                await self._rebuild_counter(table)
+                logger.info("migrated: built %s counters", table)
+
+    async def _rebuild_counter(self, table: str) -> None:
+        """카운터 테이블을 원본 테이블에서 다시 센다 (커밋은 호출한 쪽에서)."""
+        assert self._conn is not None
+        await self._conn.execute(f"DELETE FROM {table}")
+        await self._conn.execute(f"INSERT INTO {table} {_COUNTER_SOURCES[table][2]}")
+
+    def _split_search(
+        self, search_tags: list[str]
+    ) -> tuple[Optional[str], list[tuple[tuple[str, ...], str]]]:
+        """검색어 → (jobs_fts MATCH 식, LIKE로 찾을 (컬럼, 검색어) 목록). 검색어끼리는 OR.
+
+        FTS에서는 %와 _도 글자 그대로 찾는다. trigram이 다룰 수 없는 짧은 검색어는 LIKE.
+        """
+        phrases: list[str] = []
+        like_terms: list[tuple[tuple[str, ...], str]] = []
+        for tag in search_tags:
+            like_columns, fts_column = _SEARCH_PREFIXES.get(tag[:1], (_SEARCH_ALL_COLUMNS, ""))
+            term = tag[1:] if fts_column else tag
+            if self._fts and len(term) >= FTS_MIN_TERM_LENGTH:
+                phrases.append(f"{fts_column}:{_fts_phrase(term)}" if fts_column else _fts_phrase(term))
+            else:
+                like_terms.append((like_columns, term))
+        return (" OR ".join(phrases) or None), like_terms
+
+    def _jobs_filter_clause(
+        self,
+        *,
+        statuses: Optional[list[str]] = None,
+        search_tags: Optional[list[str]] = None,
+        created_at_from: Optional[float] = None,
+        created_at_to: Optional[float] = None,
+    ) -> tuple[str, list[JSONValue]]:
+        """count_jobs / query_jobs가 공유하는 WHERE/params 빌더."""
+        conditions: list[str] = []
+        params: list[JSONValue] = []
+
+        if statuses and set(statuses) == set(ACTIVE_JOB_STATUSES):
+            # 부분 인덱스는 WHERE가 인덱스 조건과 글자 그대로 같을 때만 쓰인다
+            conditions.append(_ACTIVE_STATUS_SQL)
+        elif statuses:
+            placeholders = ",".join("?" for _ in statuses)
+            conditions.append(f"status IN ({placeholders})")
+            params.extend(statuses)
+
+        if search_tags:
+            match, like_terms = self._split_search(search_tags)
+            tag_conds = []
+            if match is not None:
+                tag_conds.append("rowid IN (SELECT rowid FROM jobs_fts WHERE jobs_fts MATCH ?)")
+                params.append(match)
+            for like_columns, term in like_terms:
+                tag_conds.append("(" + " OR ".join(f"{c} LIKE ?" for c in like_columns) + ")")
+                params.extend([f"%{term}%"] * len(like_columns))
+            if tag_conds:
+                conditions.append(f"({' OR '.join(tag_conds)})")
+
+        if created_at_from is not None:
+            conditions.append("created_at >= ?")
+            params.append(created_at_from)
+        if created_at_to is not None:
+            conditions.append("created_at <= ?")
+            params.append(created_at_to)
+
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        return where, params
+
+    async def _migrate_workflow_blobs(self) -> None:
+        """workflow_json을 통째로 가진 기존 행을 블롭 참조 + 패치로 옮긴다.
+
+        BLOB_MIGRATION_BATCH행씩 커밋하므로 중간에 멈춰도 다음 open()에서 이어간다.
+        줄어든 페이지는 재사용되고, 파일 크기는 VACUUM 후에 줄어든다.
+        """
+        if self._conn is None:
+            return
+        for table, key in (("jobs", "id"), ("saved_images", "hash")):
+            migrated = 0
+            while True:
+                cursor = await self._conn.execute(
+                    f"SELECT {key}, workflow_json FROM {table} "
+                    "WHERE workflow_hash IS NULL AND workflow_json NOT IN ('', '{}') "
+                    "ORDER BY rowid LIMIT ?",
+                    (BLOB_MIGRATION_BATCH,),
+                )
+                rows = list(await cursor.fetchall())
+                if not rows:
+                    break
+                updates: list[tuple[JSONValue, ...]] = []
+                for row in rows:
+                    try:
+                        workflow = json.loads(row["workflow_json"])
+                    except (json.JSONDecodeError, TypeError):
+                        workflow = None
+                    if not isinstance(workflow, dict):
+                        # 읽을 때도 {}로 복원되던 값
+                        updates.append(("{}", None, None, row[key]))
+                        continue
+                    updates.append((*self._encoder.encode(workflow, self._pending_blobs), row[key]))
+                async with self._transaction() as conn:
+                    await conn.executemany(
+                        f"UPDATE {table} SET workflow_json = ?, workflow_hash = ?, workflow_patch = ? "
+                        f"WHERE {key} = ?",
+                        updates,
+                    )
+                migrated += len(rows)
+            if migrated:
+                logger.info("migrated: %d %s rows to workflow blobs", migrated, table)
+
+    async def _migrate_templates(self) -> None:
+        """ceg_template 원문을 가진 기존 행을 templates 참조로 옮긴다 (서로 다른 템플릿마다 한 번)."""
+        if self._conn is None:
+            return
+        for table in ("jobs", "saved_images"):
+            cursor = await self._conn.execute(
+                f"SELECT DISTINCT ceg_template FROM {table} "
+                "WHERE template_hash IS NULL AND ceg_template != ''"
+            )
+            sources = [row["ceg_template"] for row in await cursor.fetchall()]
+            async with self._transaction() as conn:
+                for source in sources:
+                    template_hash = _template_hash(source)
+                    await conn.execute(_TEMPLATE_INSERT_SQL, (template_hash, source))
+                    await conn.execute(
+                        f"UPDATE {table} SET template_hash = ?, ceg_template = '' "
+                        "WHERE template_hash IS NULL AND ceg_template = ?",
+                        (template_hash, source),
+                    )
+            if sources:
+                logger.info("migrated: %d distinct %s templates to templates table", len(sources), table)
+
     async def close(self) -> None:
+        if self._flush_task is not None:
+            # 진행 중인 flush가 끝난 뒤(쓰기 락을 쥔 채) 루프를 멈춘다 — 트랜잭션 도중에 취소하지 않는다
+            async with self._write_lock:
+                self._flush_task.cancel()
+                try:
+                    await self._flush_task
+                except asyncio.CancelledError:
+                    pass
+            self._flush_task = None
+        readers, self._readers = self._readers, []
+        for reader in readers:
+            await reader.close()
         if self._conn is not None:
-            await self._conn.close()
-            self._conn = None
+            await self.flush()
+            async with self._write_lock:
+                if self._conn is not None:
+                    await self._conn.close()
+                    self._conn = None
+
+    # ---------- 읽기 ----------
+
+    async def _read(
+        self, sql: str, params: Sequence[JSONValue] = ()
+    ) -> list[aiosqlite.Row]:
+        """조회 하나를 읽기 연결에서 실행해 모든 행을 반환합니다 (풀이 없으면 쓰기 연결)."""
+        if not self._readers:
+            assert self._conn is not None
+            return list(await self._conn.execute_fetchall(sql, params))
+        reader = await self._idle_readers.get()
+        try:
+            return list(await reader.execute_fetchall(sql, params))
+        finally:
+            self._idle_readers.put_nowait(reader)
+
+    async def _read_one(
+        self, sql: str, params: Sequence[JSONValue] = ()
+    ) -> Optional[aiosqlite.Row]:
+        rows = await self._read(sql, params)
+        return rows[0] if rows else None
+
+    # ---------- write-behind ----------
+
+    @property
+    def pending_writes(self) -> int:
+        """flush를 기다리는 행 수 (잡 행 + 부분 갱신 + 이벤트)."""
+        return (
+            len(self._pending_jobs)
+            + len(self._pending_updates)
+            + len(self._pending_events)
+            + len(self._pending_execution_events)
+        )
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._flush_interval)
+            if not self.pending_writes:
+                continue
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("write-behind flush failed; will retry")
+
+    async def _flush_if_full(self) -> None:
+        if self.pending_writes >= self._max_pending:
+            await self.flush()
+
+    @asynccontextmanager
+    async def _transaction(self) -> AsyncIterator[aiosqlite.Connection]:
+        """쓰기 락을 쥔 채 블록을 한 트랜잭션으로 실행하고 커밋합니다.
+
+        대기 중인 블롭/템플릿을 먼저 같은 트랜잭션에 기록한다. 블록이 실패하면 롤백하고
+        꺼낸 블롭/템플릿을 되돌린다.
+        """
+        async with self._write_lock:
+            if self._conn is None:
+                raise RuntimeError("JobStore is not open")
+            interned = self._take_interned()
+            try:
+                await self._insert_interned(interned)
+                yield self._conn
+                await self._conn.commit()
+            except BaseException:
+                await self._conn.rollback()
+                self._requeue_interned(interned)
+                raise
+
+    async def flush(self) -> None:
+        """쌓인 잡 행과 이벤트를 한 트랜잭션으로 기록합니다.
+
+        실패하거나 취소되면 롤백하고 꺼낸 쓰기를 큐에 되돌린다 (그 사이 들어온 더 새 잡 행이 이긴다).
+        커밋을 보낸 뒤에 취소되면 커밋이 끝나기를 기다리고, 커밋됐으면 되돌리지 않는다.
+        """
+        async with self._write_lock:
+            if self._conn is None or not self.pending_writes:
+                return
+            jobs, self._pending_jobs = self._pending_jobs, {}
+            updates, self._pending_updates = self._pending_updates, {}
+            events, self._pending_events = self._pending_events, []
+            execution_events, self._pending_execution_events = self._pending_execution_events, []
+            interned = self._take_interned()
+            started = time.perf_counter()
+            commit: Optional[asyncio.Future[None]] = None
+            try:
+                await self._insert_interned(interned)
+                if jobs:
+                    await self._conn.executemany(_JOB_UPSERT_SQL, list(jobs.values()))
+                # 바뀐 컬럼 조합별로 UPDATE 하나씩
+                grouped: dict[tuple[str, ...], list[list[JSONValue]]] = {}
+                for job_id, columns in updates.items():
+                    grouped.setdefault(tuple(columns), []).append([*columns.values(), job_id])
+                for columns_key, update_params in grouped.items():
+                    assignments = ", ".join(f"{c} = ?" for c in columns_key)
+                    await self._conn.executemany(
+                        f"UPDATE jobs SET {assignments} WHERE id = ?", update_params
+                    )
+                if events:
+                    await self._conn.executemany(_JOB_EVENT_INSERT_SQL, events)
+                if execution_events:
+                    await self._conn.executemany(_EXECUTION_EVENT_INSERT_SQL, execution_events)
+                # 보낸 커밋은 취소돼도 연결 스레드에서 실행되므로 shield로 감싸 결과를 확인할 수 있게 둔다
+                commit = asyncio.ensure_future(self._conn.commit())
+                await asyncio.shield(commit)
+            except BaseException:
+                if commit is not None and await _succeeds(commit):
+                    raise
+                await self._conn.rollback()
+                self._requeue_interned(interned)
+                for job_id, params in jobs.items():
+                    self._pending_jobs.setdefault(job_id, params)
+                for job_id, columns in updates.items():
+                    if job_id not in self._pending_jobs:
+                        self._pending_updates[job_id] = {
+                            **columns, **self._pending_updates.get(job_id, {})
+                        }
+                self._pending_events[:0] = events
+                self._pending_execution_events[:0] = execution_events
+                raise
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self._flush_count += 1
+            self._flushed_rows += len(jobs) + len(updates) + len(events) + len(execution_events)
+            self._last_flush_ms = elapsed_ms
+            self._max_flush_ms = max(self._max_flush_ms, elapsed_ms)
+
+    async def checkpoint(self) -> None:
+        """큐를 flush하고 WAL 내용을 본 DB 파일에 반영합니다 (파일 복사/내보내기 전용)."""
+        await self.flush()
+        async with self._write_lock:
+            if self._conn is not None:
+                await self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    async def rebuild_counters(self) -> dict[str, int]:
+        """상태 카운터와 에셋 그룹 테이블을 원본 테이블에서 모두 다시 만듭니다 (테이블 → 행 수)."""
+        if self._conn is None:
+            raise RuntimeError("JobStore is not open")
+        await self.flush()
+        async with self._transaction():
+            for table in _COUNTER_SOURCES:
+                await self._rebuild_counter(table)
+        sizes: dict[str, int] = {}
+        for table in _COUNTER_SOURCES:
+            row = await self._read_one(f"SELECT COUNT(*) FROM {table}")
+            sizes[table] = int(row[0]) if row is not None else 0
+        return sizes
+
+    async def check_counters(self, *, repair: bool = False) -> list[dict[str, JSONValue]]:
+        """상태 카운터 / 에셋 그룹을 원본 테이블에서 다시 세어 어긋난 (키, 컬럼) 목록을 돌려줍니다 (없으면 빈 목록).
+
+        에셋 그룹은 수뿐 아니라 최신 시각(latest_created_at)과 대표 해시(sample_hash)도 비교한다.
+        repair=True면 어긋난 카운터 테이블을 원본에서 다시 만든다.
+        """
+        if self._conn is None:
+            return []
+        await self.flush()
+        drift: list[dict[str, JSONValue]] = []
+        for table, (columns, values, source_sql) in _COUNTER_SOURCES.items():
+            keys = ", ".join(columns)
+            # count는 합으로, 나머지 값(최신 시각 / 대표 해시)은 한쪽에만 있으니 MAX로 모아 비교한다
+            agg = {value: "SUM" if value == "count" else "MAX" for value in values}
+            stored = ", ".join(
+                f"{value} AS stored_{value}, {'0' if value == 'count' else 'NULL'} AS actual_{value}" for value in values
+            )
+            actual = ", ".join(f"{'0' if value == 'count' else 'NULL'}, {value}" for value in values)
+            picked = ", ".join(
+                f"{agg[value]}(stored_{value}) AS stored_{value}, {agg[value]}(actual_{value}) AS actual_{value}"
+                for value in values
+            )
+            differs = " OR ".join(f"{agg[value]}(stored_{value}) IS NOT {agg[value]}(actual_{value})" for value in values)
+            # 저장된 값과 다시 센 값을 한 문장에서 읽어 같은 스냅샷끼리 비교한다
+            rows = await self._read(
+                f"SELECT {keys}, {picked} FROM ("
+                f"SELECT {keys}, {stored} FROM {table} "
+                f"UNION ALL SELECT {keys}, {actual} FROM ({source_sql})"
+                f") GROUP BY {keys} HAVING {differs}"
+            )
+            drift.extend(
+                {
+                    "table": table,
+                    "key": {column: row[column] for column in columns},
+                    "column": value,
+                    "stored": row[f"stored_{value}"],
+                    "actual": row[f"actual_{value}"],
+                }
+                for row in rows
+                for value in values
+                if row[f"stored_{value}"] != row[f"actual_{value}"]
+            )
+            if repair and rows:
+                async with self._transaction():
+                    await self._rebuild_counter(table)
+                logger.warning("rebuilt %s counters (%d keys drifted)", table, len(rows))
+        return drift
+
+    def write_behind_stats(self) -> dict[str, JSONValue]:
+        """쓰기 큐 깊이와 flush 지연 지표."""
+        return {
+            "pendingJobs": len(self._pending_jobs) + len(self._pending_updates),
+            "pendingEvents": len(self._pending_events) + len(self._pending_execution_events),
+            "queueDepth": self.pending_writes,
+            "flushes": self._flush_count,
+            "flushedRows": self._flushed_rows,
+            "lastFlushMs": self._last_flush_ms,
+            "maxFlushMs": self._max_flush_ms,
+        }
+
+    def _intern_template(self, source: str) -> Optional[str]:
+        """템플릿 원문 → 해시. 처음 보는 템플릿은 _pending_templates에 쌓인다."""
+        if not source:
+            return None
+        template_hash = _template_hash(source)
+        if template_hash not in self._known_templates:
+            self._known_templates.add(template_hash)
+            self._pending_templates[template_hash] = source
+            self._template_cache[template_hash] = source
+        return template_hash
+
+    def _take_interned(self) -> _Interned:
+        """대기 중인 블롭/템플릿을 꺼낸다. 이 행들을 커밋하는 트랜잭션에서 함께 기록해야 한다."""
+        interned = (self._pending_blobs, self._pending_templates)
+        self._pending_blobs, self._pending_templates = {}, {}
+        return interned
+
+    async def _insert_interned(self, interned: _Interned) -> None:
+        """꺼낸 블롭/템플릿을 현재 트랜잭션에 기록합니다 (커밋은 호출자 몫)."""
+        blobs, templates = interned
+        if self._conn is None:
+            return
+        if blobs:
+            await self._conn.executemany(_BLOB_INSERT_SQL, list(blobs.items()))
+        if templates:
+            await self._conn.executemany(_TEMPLATE_INSERT_SQL, list(templates.items()))
+
+    def _requeue_interned(self, interned: _Interned) -> None:
+        """트랜잭션이 실패했을 때 꺼낸 블롭/템플릿을 다시 대기시킨다."""
+        self._pending_blobs.update(interned[0])
+        self._pending_templates.update(interned[1])
+
+    async def _fill_cache(
+        self, cache: dict[str, str], table: str, column: str, wanted: set[str]
+    ) -> dict[str, str]:
+        """wanted 중 캐시에 없는 해시를 table에서 읽어 채운 캐시를 반환합니다."""
+        missing = wanted - cache.keys()
+        if not missing or self._conn is None:
+            return cache
+        if len(cache) + len(missing) > INTERN_CACHE_SIZE:
+            # 이번 행들이 쓰는 항목만 남긴다
+            cache = {h: cache[h] for h in wanted - missing}
+        ids = list(missing)
+        for i in range(0, len(ids), BLOB_MIGRATION_BATCH):
+            chunk = ids[i:i + BLOB_MIGRATION_BATCH]
+            for row in await self._read(
+                f"SELECT hash, {column} FROM {table} WHERE hash IN ({','.join('?' * len(chunk))})",
+                chunk,
+            ):
+                cache[row["hash"]] = row[column]
+        return cache
+
+    async def _load_interned(
+        self, rows: list[aiosqlite.Row]
+    ) -> tuple[Mapping[str, str], Mapping[str, str]]:
+        """rows가 가리키는 워크플로우 블롭과 템플릿을 캐시에 올리고 (블롭, 템플릿) 캐시를 반환합니다."""
+        self._blob_cache = await self._fill_cache(
+            self._blob_cache, "workflow_blobs", "workflow_json",
+            {r["workflow_hash"] for r in rows if r["workflow_hash"]},
+        )
+        return self._blob_cache, await self._load_templates(rows)
+
+    async def _load_templates(self, rows: list[aiosqlite.Row]) -> Mapping[str, str]:
+        """rows가 가리키는 템플릿 원문을 캐시에 올리고 캐시를 반환합니다."""
+        self._template_cache = await self._fill_cache(
+            self._template_cache, "templates", "source",
+            {r["template_hash"] for r in rows if r["template_hash"]},
+        )
+        return self._template_cache
+
+    def _job_params(self, job_dict: dict[str, JSONValue]) -> tuple[JSONValue, ...]:
+        """잡 딕셔너리 → _JOB_UPSERT_SQL 파라미터. 새 블롭/템플릿은 대기열에 쌓인다."""
+        workflow = job_dict.get("_workflow")
+        workflow_json, workflow_hash, workflow_patch = self._encoder.encode(
+            workflow if isinstance(workflow, dict) else None, self._pending_blobs
+        )
+        return (
+            job_dict["id"],
+            job_dict["filename"],
+            job_dict["prompt"],
+            workflow_json,
+            job_dict["status"],
+            job_dict.get("workerId"),
+            job_dict.get("error"),
+            json.dumps(job_dict.get("imageUrls", [])),
+            job_dict.get("progressPercent", 0.0),
+            job_dict.get("currentNodeName", ""),
+            job_dict.get("createdAt", 0.0),
+            job_dict.get("startedAt"),
+            job_dict.get("finishedAt"),
+            job_dict.get("retryCount", 0),
+            job_dict.get("executionDurationMs"),
+            json.dumps(job_dict.get("meta", {})),
+            "",
+            json.dumps(job_dict.get("savedImageHashes", [])),
+            job_dict.get("totalNodeCount", 0),
+            job_dict.get("completedNodeCount", 0),
+            job_dict.get("workerType"),
+            job_dict.get("targetWorkerId"),
+            workflow_hash,
+            workflow_patch,
+            self._intern_template(str(job_dict.get("cegTemplate") or "")),
+        )
 
     async def save(self, job_dict: dict[str, JSONValue]) -> None:
+        """잡 행 전체를 쓰기 큐에 넣습니다. 같은 잡의 이전 대기 값은 덮어씁니다.
+
+        기존 잡의 일부 필드만 바뀔 때는 update_fields()를 쓴다.
+        """
+        if self._conn is None:
+            raise RuntimeError("JobStore is not open")
+        job_id = str(job_dict["id"])
+        self._pending_updates.pop(job_id, None)
+        self._pending_jobs[job_id] = self._job_params(job_dict)
+        await self._flush_if_full()
+
+    async def update_fields(self, job_id: str, **changes: Unpack[JobFieldChanges]) -> None:
+        """기존 잡의 바뀐 컬럼만 UPDATE합니다 (쓰기 큐에서 잡별로 합쳐짐).
+
+        Raises:
+            ValueError: 변경할 수 없거나 모르는 필드가 있을 때.
+        """
+        if self._conn is None:
+            raise RuntimeError("JobStore is not open")
+        unknown = changes.keys() - _MUTABLE_JOB_COLUMNS.keys()
+        if unknown:
+            raise ValueError(f"not updatable job fields: {sorted(unknown)}")
+        if not changes:
+            return
+        pending = self._pending_updates.setdefault(job_id, {})
+        for field, value in changes.items():
+            pending[_MUTABLE_JOB_COLUMNS[field]] = (
+                json.dumps(value) if field in _JSON_JOB_FIELDS else cast(JSONValue, value)
+            )
+        await self._flush_if_full()
+
+    async def save_created(self, job_dicts: list[dict[str, JSONValue]]) -> None:
+        """새 잡 여러 개와 각 잡의 created 이벤트를 일괄 기록합니다 (단일 트랜잭션)."""
         if self._conn is None:
             raise RuntimeError("JobStore is not open")
-        await self._conn.execute(
-            """
-            INSERT OR REPLACE INTO jobs (
-                id, filename, prompt, workflow_json, status, worker_id,
-                error, image_urls_json, progress_percent, current_node_name,
-                created_at, started_at, finished_at, retry_count,
-                execution_duration_ms, meta_json, ceg_template,
-                saved_image_hashes_json, total_node_count,
-                completed_node_count, worker_type, target_worker_id
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                job_dict["id"],
-                job_dict["filename"],
-                job_dict["prompt"],
-                json.dumps(job_dict.get("_workflow", {})),
-                job_dict["status"],
-                job_dict.get("workerId"),
-                job_dict.get("error"),
-                json.dumps(job_dict.get("imageUrls", [])),
-                job_dict.get("progressPercent", 0.0),
-                job_dict.get("currentNodeName", ""),
-                job_dict.get("createdAt", 0.0),
-                job_dict.get("startedAt"),
-                job_dict.get("finishedAt"),
-                job_dict.get("retryCount", 0),
-                job_dict.get("executionDurationMs"),
-                json.dumps(job_dict.get("meta", {})),
-                job_dict.get("cegTemplate", ""),
-                json.dumps(job_dict.get("savedImageHashes", [])),
-                job_dict.get("totalNodeCount", 0),
-                job_dict.get("completedNodeCount", 0),
-                job_dict.get("workerType"),
-                job_dict.get("targetWorkerId"),
-            ),
-        )
-        await self._conn.commit()
+        if not job_dicts:
+            return
+        now = time.time()
+        params = [self._job_params(d) for d in job_dicts]
+        # 이 잡들이 가리키는 블롭/템플릿은 _transaction이 같은 트랜잭션에 기록한다
+        async with self._transaction() as conn:
+            await conn.executemany(_JOB_UPSERT_SQL, params)
+            await conn.executemany(
+                _JOB_EVENT_INSERT_SQL,
+                [
+                    (
+                        d["id"],
+                        "created",
+                        now,
+                        None,
+                        json.dumps({"filename": d["filename"], "prompt": d["prompt"]}),
+                    )
+                    for d in job_dicts
+                ],
+            )
 
     async def delete(self, job_id: str) -> None:
         if self._conn is None:
             raise RuntimeError("JobStore is not open")
-        await self._conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
-        await self._conn.commit()
+        await self.flush()
+        async with self._transaction() as conn:
+            await conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
 
     async def delete_batch(self, job_ids: list[str]) -> None:
         """여러 잡을 일괄 삭제합니다 (단일 트랜잭션)."""
@@ -307,12 +1428,13 @@ class JobStore:
             raise RuntimeError("JobStore is not open")
         if not job_ids:
             return
+        await self.flush()
         placeholders = ",".join("?" for _ in job_ids)
-        await self._conn.execute(
-            f"DELETE FROM jobs WHERE id IN ({placeholders})",
-            job_ids
-        )
-        await self._conn.commit()
+        async with self._transaction() as conn:
+            await conn.execute(
+                f"DELETE FROM jobs WHERE id IN ({placeholders})",
+                job_ids
+            )
 
     async def cancel_batch(self, job_updates: list[dict[str, JSONValue]]) -> None:
         """여러 잡을 일괄 취소 상태로 변경하고 이벤트를 기록합니다 (단일 트랜잭션)."""
@@ -320,14 +1442,8 @@ class JobStore:
             raise RuntimeError("JobStore is not open")
         if not job_updates:
             return
+        await self.flush()
 
-        # 1. jobs 테이블 업데이트
-        await self._conn.executemany(
-            "UPDATE jobs SET status = 'cancelled', finished_at = ? WHERE id = ?",
-            [(u["finished_at"], u["id"]) for u in job_updates],
-        )
-
-        # 2. job_events 기록
         event_tuples = [
             (
                 u["id"],
@@ -338,25 +1454,34 @@ class JobStore:
             )
             for u in job_updates
         ]
-        await self._conn.executemany(
-            """
-            INSERT INTO job_events (job_id, event_type, timestamp, worker_id, details)
-            VALUES (?, ?, ?, ?, ?)
-            """,
-            event_tuples,
-        )
-        await self._conn.commit()
+        async with self._transaction() as conn:
+            # 1. jobs 테이블 업데이트
+            await conn.executemany(
+                "UPDATE jobs SET status = 'cancelled', finished_at = ? WHERE id = ?",
+                [(u["finished_at"], u["id"]) for u in job_updates],
+            )
+
+            # 2. job_events 기록
+            await conn.executemany(
+                """
+                INSERT INTO job_events (job_id, event_type, timestamp, worker_id, details)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                event_tuples,
+            )
 
 
-    def _job_row_to_dict(self, row: aiosqlite.Row) -> dict[str, JSONValue]:
+    def _job_row_to_dict(
+        self,
+        row: aiosqlite.Row,
+        blobs: Optional[Mapping[str, str]] = None,
+        templates: Optional[Mapping[str, str]] = None,
+    ) -> dict[str, JSONValue]:
         try:
             meta = json.loads(row["meta_json"]) if row["meta_json"] else {}
         except (json.JSONDecodeError, TypeError):
             meta = {}
-        try:
-            workflow = json.loads(row["workflow_json"])
-        except (json.JSONDecodeError, TypeError):
-            workflow = {}
+        workflow = _row_workflow(row, blobs)
         try:
             image_urls = json.loads(row["image_urls_json"])
         except (json.JSONDecodeError, TypeError):
@@ -385,7 +1510,7 @@ class JobStore:
             "retryCount": row["retry_count"],
             "executionDurationMs": row["execution_duration_ms"],
             "meta": meta,
-            "cegTemplate": row["ceg_template"] or "",
+            "cegTemplate": _row_template(row, templates),
             "workerType": row["worker_type"] if "worker_type" in row.keys() else None,
             "targetWorkerId": row["target_worker_id"] if "target_worker_id" in row.keys() else None,
         }
@@ -393,24 +1518,52 @@ class JobStore:
     async def load_all(self) -> list[dict[str, JSONValue]]:
         if self._conn is None:
             return []
-        cursor = await self._conn.execute("SELECT * FROM jobs ORDER BY created_at ASC")
-        rows = await cursor.fetchall()
-        return [self._job_row_to_dict(row) for row in rows]
+        await self.flush()
+        rows = await self._read("SELECT * FROM jobs ORDER BY created_at ASC")
+        blobs, templates = await self._load_interned(rows)
+        return [self._job_row_to_dict(row, blobs, templates) for row in rows]
+
+    async def load_active(
+        self, chunk_size: int = LOAD_ACTIVE_CHUNK
+    ) -> AsyncIterator[list[dict[str, JSONValue]]]:
+        """활성 잡(pending / queued / running)만 생성 순으로 chunk_size개씩 돌려줍니다.
+
+        idx_jobs_active 부분 인덱스를 (created_at, id) 커서로 따라가므로 끝난 잡은 읽지 않고,
+        한 번에 chunk_size개의 행만 복원한다.
+        """
+        if self._conn is None:
+            return
+        await self.flush()
+        after: list[JSONValue] = []
+        while True:
+            seek = " AND (created_at, id) > (?, ?)" if after else ""
+            rows = await self._read(
+                f"SELECT * FROM jobs INDEXED BY idx_jobs_active WHERE {_ACTIVE_STATUS_SQL}{seek} "
+                "ORDER BY created_at ASC, id ASC LIMIT ?",
+                [*after, chunk_size],
+            )
+            if not rows:
+                return
+            blobs, templates = await self._load_interned(rows)
+            yield [self._job_row_to_dict(row, blobs, templates) for row in rows]
+            if len(rows) < chunk_size:
+                return
+            after = [rows[-1]["created_at"], rows[-1]["id"]]
 
     async def get_job(self, job_id: str) -> Optional[dict[str, JSONValue]]:
         if self._conn is None:
             return None
-        cursor = await self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,))
-        row = await cursor.fetchone()
+        await self.flush()
+        row = await self._read_one("SELECT * FROM jobs WHERE id = ?", (job_id,))
         if row is None:
             return None
-        return self._job_row_to_dict(row)
+        return self._job_row_to_dict(row, *await self._load_interned([row]))
 
     async def get_all_jobs_minimal(self) -> list[dict[str, JSONValue]]:
         if self._conn is None:
             return []
-        cursor = await self._conn.execute("SELECT id, status, created_at FROM jobs")
-        rows = await cursor.fetchall()
+        await self.flush()
+        rows = await self._read("SELECT id, status, created_at FROM jobs")
         return [{"id": r["id"], "status": r["status"], "createdAt": r["created_at"]} for r in rows]
 
     async def count_jobs(
@@ -423,47 +1576,100 @@ class JobStore:
     ) -> int:
         if self._conn is None:
             return 0
-        conditions: list[str] = []
-        params: list[JSONValue] = []
-
-        if statuses:
-            placeholders = ",".join("?" for _ in statuses)
-            conditions.append(f"status IN ({placeholders})")
-            params.extend(statuses)
-
-        if search_tags:
-            tag_conds = []
-            for tag in search_tags:
-                lower_tag = tag.lower()
-                if lower_tag.startswith("@"):
-                    tag_conds.append("filename LIKE ?")
-                    params.append(f"%{tag[1:]}%")
-                elif lower_tag.startswith("#"):
-                    tag_conds.append("prompt LIKE ?")
-                    params.append(f"%{tag[1:]}%")
-                elif lower_tag.startswith("$"):
-                    tag_conds.append("error LIKE ?")
-                    params.append(f"%{tag[1:]}%")
-                else:
-                    tag_conds.append("(filename LIKE ? OR prompt LIKE ? OR error LIKE ? OR meta_json LIKE ?)")
-                    params.extend([f"%{tag}%", f"%{tag}%", f"%{tag}%", f"%{tag}%"])
-            if tag_conds:
-                conditions.append(f"({' OR '.join(tag_conds)})")
-
-        if created_at_from is not None:
-            conditions.append("created_at >= ?")
-            params.append(created_at_from)
-        if created_at_to is not None:
-            conditions.append("created_at <= ?")
-            params.append(created_at_to)
-
-        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
-        cursor = await self._conn.execute(
+        await self.flush()
+        if search_tags and not statuses and created_at_from is None and created_at_to is None:
+            match, like_terms = self._split_search(search_tags)
+            if match is not None and not like_terms:
+                # 검색어만 있으면 jobs 행을 읽지 않고 인덱스에서 센다
+                row = await self._read_one(
+                    "SELECT COUNT(*) AS c FROM jobs_fts WHERE jobs_fts MATCH ?", (match,)
+                )
+                return int(row["c"]) if row is not None else 0
+        if not search_tags:
+            # 상태 / 기간 필터만 있으면 카운터에서 센다
+            by_status = await self._count_jobs_by_status(created_at_from, created_at_to, inclusive=True)
+            if statuses:
+                return sum(by_status.get(status, 0) for status in set(statuses))
+            return sum(by_status.values())
+        where, params = self._jobs_filter_clause(
+            statuses=statuses,
+            search_tags=search_tags,
+            created_at_from=created_at_from,
+            created_at_to=created_at_to,
+        )
+        row = await self._read_one(
             f"SELECT COUNT(*) AS c FROM jobs{where}", params
         )
-        row = await cursor.fetchone()
         return int(row["c"]) if row is not None else 0
 
+    async def count_jobs_by_status(
+        self,
+        *,
+        created_at_from: Optional[float] = None,
+        created_before: Optional[float] = None,
+    ) -> dict[str, int]:
+        """created_at_from <= 생성 시각 < created_before인 잡의 상태별 개수 (0개인 상태는 빠진다)."""
+        if self._conn is None:
+            return {}
+        await self.flush()
+        return await self._count_jobs_by_status(created_at_from, created_before, inclusive=False)
+
+    async def _count_jobs_by_status(
+        self, lo: Optional[float], hi: Optional[float], *, inclusive: bool
+    ) -> dict[str, int]:
+        """[lo, hi] (inclusive=False면 [lo, hi))의 상태별 잡 수.
+
+        하루 전체가 범위에 드는 날은 job_counts에서 더하고, 양 끝에 걸친 날은 상태마다
+        idx_jobs_status_created_at 범위로 센다. 카운터와 jobs를 한 문장에서 읽어 스냅샷이 같다.
+        """
+        upper = "created_at <= ?" if inclusive else "created_at < ?"
+        # 온전히 범위 안에 드는 첫날 / 마지막 날 (day 0은 음수 시각도 담으므로 항상 걸친 날로 센다)
+        first_day = None if lo is None else max(math.ceil(lo / COUNTER_DAY_SECONDS), 1)
+        last_day = None if hi is None else math.floor(hi / COUNTER_DAY_SECONDS) - 1
+        parts: list[tuple[list[str], list[JSONValue]]] = []  # 걸친 날: (조건, 인자)
+        counter_sql = ""
+        counter_params: list[JSONValue] = []
+        if first_day is not None and last_day is not None and first_day > last_day:
+            parts.append((["created_at >= ?", upper], [lo, hi]))
+        else:
+            day_conds: list[str] = []
+            if first_day is not None:
+                day_conds.append("day >= ?")
+                counter_params.append(first_day)
+                parts.append((
+                    ["created_at >= ?", "created_at < ?", f"{_JOB_DAY_SQL} < ?"],
+                    [lo, first_day * COUNTER_DAY_SECONDS + 1, first_day],
+                ))
+            if last_day is not None:
+                day_conds.append("day <= ?")
+                counter_params.append(last_day)
+                # 다음 날이 시작되기 전 시각 (인덱스 범위용; 정확한 경계는 day 조건이 정한다).
+                # day는 0 쪽으로 자르므로 0 이하의 날은 (day - 1) * 하루 초과 ~ day * 하루다.
+                next_day = last_day + 1
+                before_next = (
+                    next_day * COUNTER_DAY_SECONDS - 1 if next_day >= 1
+                    else (next_day - 1) * COUNTER_DAY_SECONDS
+                )
+                parts.append((
+                    ["created_at > ?", f"{_JOB_DAY_SQL} > ?", upper],
+                    [before_next, last_day, hi],
+                ))
+            where = f" WHERE {' AND '.join(day_conds)}" if day_conds else ""
+            counter_sql = f"SELECT status, SUM(count) AS c FROM job_counts{where} GROUP BY status"
+        selects = [counter_sql] if counter_sql else []
+        params = list(counter_params)
+        for conds, part_params in parts:
+            selects.append(
+                "SELECT s.status, (SELECT COUNT(*) FROM jobs WHERE status = s.status AND "
+                f"{' AND '.join(conds)}) AS c FROM (SELECT DISTINCT status FROM job_counts) AS s"
+            )
+            params.extend(part_params)
+        rows = await self._read(
+            f"SELECT status, SUM(c) AS c FROM ({' UNION ALL '.join(selects)}) GROUP BY status",
+            params,
+        )
+        return {str(r["status"]): int(r["c"]) for r in rows if r["c"]}
+
     async def query_jobs(
         self,
         *,
@@ -475,62 +1681,57 @@ class JobStore:
         created_at_to: Optional[float] = None,
         sort_by: str = "created_at",
         sort_order: str = "desc",
+        cursor: Optional[str] = None,
     ) -> list[dict[str, JSONValue]]:
+        """잡 목록. cursor(job_cursor)가 있으면 그 항목 다음부터 (offset은 그 뒤에서 센다)."""
         if self._conn is None:
             return []
-        conditions: list[str] = []
-        params: list[JSONValue] = []
-
-        if statuses:
-            placeholders = ",".join("?" for _ in statuses)
-            conditions.append(f"status IN ({placeholders})")
-            params.extend(statuses)
-
-        if search_tags:
-            tag_conds = []
-            for tag in search_tags:
-                lower_tag = tag.lower()
-                if lower_tag.startswith("@"):
-                    tag_conds.append("filename LIKE ?")
-                    params.append(f"%{tag[1:]}%")
-                elif lower_tag.startswith("#"):
-                    tag_conds.append("prompt LIKE ?")
-                    params.append(f"%{tag[1:]}%")
-                elif lower_tag.startswith("$"):
-                    tag_conds.append("error LIKE ?")
-                    params.append(f"%{tag[1:]}%")
-                else:
-                    tag_conds.append("(filename LIKE ? OR prompt LIKE ? OR error LIKE ? OR meta_json LIKE ?)")
-                    params.extend([f"%{tag}%", f"%{tag}%", f"%{tag}%", f"%{tag}%"])
-            if tag_conds:
-                conditions.append(f"({' OR '.join(tag_conds)})")
-
-        if created_at_from is not None:
-            conditions.append("created_at >= ?")
-            params.append(created_at_from)
-        if created_at_to is not None:
-            conditions.append("created_at <= ?")
-            params.append(created_at_to)
-
-        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
-
-        sort_column_map = {
-            "createdat": "created_at",
-            "created_at": "created_at",
-            "filename": "filename",
-            "status": "status",
-            "duration": "execution_duration_ms",
-        }
-        sort_column = sort_column_map.get(sort_by.lower(), "created_at")
-        order_dir = "ASC" if sort_order.lower() == "asc" else "DESC"
+        sort_columns, order_dir = _job_sort(sort_by, sort_order)
+        seek: Optional[tuple[str, list[JSONValue]]] = None
+        if cursor is not None:
+            values, key = _decode_cursor(
+                cursor, f"jobs:{'+'.join(sort_columns)}:{order_dir}", len(sort_columns)
+            )
+            seek = _seek_clause(
+                sort_columns, "id", order_dir, values, key,
+                nullable=sort_columns[0] in _NULLABLE_SORT_COLUMNS,
+            )
+        await self.flush()
+        where, params = self._jobs_filter_clause(
+            statuses=statuses,
+            search_tags=search_tags,
+            created_at_from=created_at_from,
+            created_at_to=created_at_to,
+        )
+        if seek is not None:
+            where = f"{where} AND {seek[0]}" if where else f" WHERE {seek[0]}"
+            params.extend(seek[1])
+
+        hint = ""
+        if sort_columns == ("created_at",) and statuses and set(statuses) == set(ACTIVE_JOB_STATUSES):
+            # 통계가 없으면 플래너는 상태별 3번 찾고 정렬하는 쪽을 고른다 — 대기 잡이 많으면 느림
+            hint = " INDEXED BY idx_jobs_active"
+        elif sort_columns == ("created_at",) and search_tags:
+            match, _ = self._split_search(search_tags)
+            if match is not None:
+                # 흔한 검색어는 수만 행을 정렬하느니 최신순 인덱스를 따라가는 편이 빠르다
+                row = await self._read_one(
+                    "SELECT COUNT(*) AS c FROM "
+                    "(SELECT rowid FROM jobs_fts WHERE jobs_fts MATCH ? LIMIT ?)",
+                    (match, FTS_DENSE_MATCHES),
+                )
+                if row is not None and row["c"] >= FTS_DENSE_MATCHES:
+                    hint = " INDEXED BY idx_jobs_created_at_id"
 
         params.extend([limit, offset])
-        cursor = await self._conn.execute(
-            f"SELECT * FROM jobs{where} ORDER BY {sort_column} {order_dir} LIMIT ? OFFSET ?",
+        rows = await self._read(
+            f"SELECT * FROM jobs{hint}{where} "
+            f"ORDER BY {', '.join(f'{c} {order_dir}' for c in (*sort_columns, 'id'))} "
+            "LIMIT ? OFFSET ?",
             params,
         )
-        rows = await cursor.fetchall()
-        return [self._job_row_to_dict(row) for row in rows]
+        blobs, templates = await self._load_interned(rows)
+        return [self._job_row_to_dict(row, blobs, templates) for row in rows]
 
     # ---------- job_events (audit log) ----------
 
@@ -542,33 +1743,29 @@ class JobStore:
         worker_id: Optional[str] = None,
         details: Optional[dict[str, JSONValue]] = None,
     ) -> None:
-        """잡 상태 전환 이벤트를 기록 (INSERT-only)."""
+        """잡 상태 전환 이벤트를 쓰기 큐에 추가 (INSERT-only)."""
         if self._conn is None:
             raise RuntimeError("JobStore is not open")
-        await self._conn.execute(
-            """
-            INSERT INTO job_events (job_id, event_type, timestamp, worker_id, details)
-            VALUES (?, ?, ?, ?, ?)
-            """,
+        self._pending_events.append(
             (
                 job_id,
                 event_type,
                 time.time(),
                 worker_id,
                 json.dumps(details or {}),
-            ),
+            )
         )
-        await self._conn.commit()
+        await self._flush_if_full()
 
     async def get_job_events(self, job_id: str) -> list[dict[str, JSONValue]]:
         """특정 잡의 모든 상태 전환 이력을 시간순으로 반환."""
         if self._conn is None:
             return []
-        cursor = await self._conn.execute(
+        await self.flush()
+        rows = await self._read(
             "SELECT * FROM job_events WHERE job_id = ? ORDER BY timestamp ASC",
             (job_id,),
         )
-        rows = await cursor.fetchall()
         results: list[dict[str, JSONValue]] = []
         for row in rows:
             try:
@@ -594,33 +1791,29 @@ class JobStore:
         event_type: str,
         payload: dict[str, JSONValue],
     ) -> None:
-        """ComfyUI 실행 이벤트를 기록 (INSERT-only)."""
+        """ComfyUI 실행 이벤트를 쓰기 큐에 추가 (INSERT-only)."""
         if self._conn is None:
             raise RuntimeError("JobStore is not open")
-        await self._conn.execute(
-            """
-            INSERT INTO execution_events (job_id, worker_id, event_type, timestamp, payload_json)
-            VALUES (?, ?, ?, ?, ?)
-            """,
+        self._pending_execution_events.append(
             (
                 job_id,
                 worker_id,
                 event_type,
                 time.time(),
                 json.dumps(payload),
-            ),
+            )
         )
-        await self._conn.commit()
+        await self._flush_if_full()
 
     async def get_execution_events(self, job_id: str) -> list[dict[str, JSONValue]]:
         """특정 잡의 모든 ComfyUI 실행 이벤트를 시간순으로 반환."""
         if self._conn is None:
             return []
-        cursor = await self._conn.execute(
+        await self.flush()
+        rows = await self._read(
             "SELECT * FROM execution_events WHERE job_id = ? ORDER BY timestamp ASC",
             (job_id,),
         )
-        rows = await cursor.fetchall()
         results: list[dict[str, JSONValue]] = []
         for row in rows:
             try:
@@ -643,38 +1836,36 @@ class JobStore:
         """키-값 설정 저장 (INSERT OR REPLACE)."""
         if self._conn is None:
             raise RuntimeError("JobStore is not open")
-        await self._conn.execute(
-            "INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
-            (key, value),
-        )
-        await self._conn.commit()
+        async with self._transaction() as conn:
+            await conn.execute(
+                "INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
+                (key, value),
+            )
 
     async def get_setting(self, key: str) -> Optional[str]:
         """키에 해당하는 설정 값 반환 (없으면 None)."""
         if self._conn is None:
             return None
-        cursor = await self._conn.execute(
+        row = await self._read_one(
             "SELECT value FROM settings WHERE key = ?", (key,)
         )
-        row = await cursor.fetchone()
         return row["value"] if row is not None else None
 
     async def delete_setting(self, key: str) -> bool:
         """설정 삭제. 삭제했으면 True, 없으면 False."""
         if self._conn is None:
             return False
-        cursor = await self._conn.execute(
-            "DELETE FROM settings WHERE key = ?", (key,)
-        )
-        await self._conn.commit()
+        async with self._transaction() as conn:
+            cursor = await conn.execute(
+                "DELETE FROM settings WHERE key = ?", (key,)
+            )
         return cursor.rowcount > 0
 
     async def list_settings(self) -> dict[str, str]:
         """모든 설정을 {key: value} 딕셔너리로 반환."""
         if self._conn is None:
             return {}
-        cursor = await self._conn.execute("SELECT key, value FROM settings")
-        rows = await cursor.fetchall()
+        rows = await self._read("SELECT key, value FROM settings")
         return {row["key"]: row["value"] for row in rows}
 
     # ---------- workers (persistent worker URL list) ----------
@@ -683,30 +1874,29 @@ class JobStore:
         """워커 URL 목록을 [{url, worker_type}, ...] 형태로 반환."""
         if self._conn is None:
             return []
-        cursor = await self._conn.execute(
+        rows = await self._read(
             "SELECT url, worker_type FROM workers ORDER BY added_at ASC"
         )
-        rows = await cursor.fetchall()
         return [{"url": row["url"], "worker_type": row["worker_type"]} for row in rows]
 
     async def add_worker_url(self, url: str, *, worker_type: str = "comfyui") -> bool:
         """URL 추가. 이미 존재하면 False, 새로 추가했으면 True."""
         if self._conn is None:
             return False
-        cursor = await self._conn.execute(
-            "INSERT OR IGNORE INTO workers (url, worker_type, added_at) VALUES (?, ?, ?)",
-            (url, worker_type, time.time()),
-        )
-        await self._conn.commit()
+        async with self._transaction() as conn:
+            cursor = await conn.execute(
+                "INSERT OR IGNORE INTO workers (url, worker_type, added_at) VALUES (?, ?, ?)",
+                (url, worker_type, time.time()),
+            )
         return cursor.rowcount > 0
 
     async def remove_worker_url(self, url: str) -> bool:
         if self._conn is None:
             return False
-        cursor = await self._conn.execute(
-            "DELETE FROM workers WHERE url = ?", (url,)
-        )
-        await self._conn.commit()
+        async with self._transaction() as conn:
+            cursor = await conn.execute(
+                "DELETE FROM workers WHERE url = ?", (url,)
+            )
         return cursor.rowcount > 0
 
     # ---------- saved_images ----------
@@ -730,97 +1920,117 @@ class JobStore:
     ) -> None:
         if self._conn is None:
             raise RuntimeError("JobStore is not open")
-        await self._conn.execute(
-            """
-            INSERT OR IGNORE INTO saved_images (
-                hash, job_id, original_filename, comfy_filename,
-                subfolder, type, worker_id, extension, size_bytes,
-                prompt, created_at, meta_json, ceg_template, workflow_json
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                hash,
-                job_id,
-                original_filename,
-                comfy_filename,
-                subfolder,
-                type_,
-                worker_id,
-                extension,
-                size_bytes,
-                prompt,
-                time.time(),
-                json.dumps(meta or {}),
-                ceg_template,
-                json.dumps(workflow or {}),
-            ),
+        workflow_json, workflow_hash, workflow_patch = self._encoder.encode(
+            workflow, self._pending_blobs
         )
-        
+        template_hash = self._intern_template(ceg_template)
         # 템플릿의 축(Axis)에 할당된 실제 생성 값을 추출하여 태그로 저장
-        auto_tags = self._extract_auto_tags(ceg_template, json.dumps(meta or {}))
-
-        now = time.time()
-        for tag in auto_tags:
-            await self._conn.execute(
+        auto_tags = self._extract_auto_tags(ceg_template, json.dumps(meta or {}), template_hash)
+        async with self._transaction() as conn:
+            await conn.execute(
                 """
-                INSERT OR IGNORE INTO image_tags (image_hash, tag, created_at)
-                VALUES (?, ?, ?)
+                INSERT OR IGNORE INTO saved_images (
+                    hash, job_id, original_filename, comfy_filename,
+                    subfolder, type, worker_id, extension, size_bytes,
+                    prompt, created_at, meta_json, ceg_template, workflow_json,
+                    workflow_hash, workflow_patch, template_hash
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
-                (hash, tag, now),
+                (
+                    hash,
+                    job_id,
+                    original_filename,
+                    comfy_filename,
+                    subfolder,
+                    type_,
+                    worker_id,
+                    extension,
+                    size_bytes,
+                    prompt,
+                    time.time(),
+                    json.dumps(meta or {}),
+                    "",
+                    workflow_json,
+                    workflow_hash,
+                    workflow_patch,
+                    template_hash,
+                ),
             )
 
-        await self._conn.commit()
+            now = time.time()
+            for tag in auto_tags:
+                await conn.execute(
+                    """
+                    INSERT OR IGNORE INTO image_tags (image_hash, tag, created_at)
+                    VALUES (?, ?, ?)
+                    """,
+                    (hash, tag, now),
+                )
+
+    def _template_axis_names(self, ceg_template: str, template_hash: str) -> frozenset[str]:
+        """템플릿의 축 이름 (템플릿 해시별로 한 번만 파싱)."""
+        axes = self._template_axes.get(template_hash)
+        if axes is None:
+            try:
+                try:
+                    from backend.src.prompt_dsl import parse
+                except ImportError:
+                    from prompt_dsl import parse  # type: ignore[import-not-found, no-redef]
+                axes = frozenset(parse(ceg_template).axes.keys())
+            except Exception:
+                logger.exception("Failed to auto-generate tags from ceg_template and meta")
+                axes = frozenset()
+            self._template_axes[template_hash] = axes
+        return axes
 
-    def _extract_auto_tags(self, ceg_template: str, meta_json: str) -> set[str]:
+    def _extract_auto_tags(
+        self, ceg_template: str, meta_json: str, template_hash: Optional[str] = None
+    ) -> set[str]:
         ceg_template = ceg_template or ""
         meta_json = meta_json or ""
         try:
             meta = json.loads(meta_json) if meta_json else {}
         except Exception:
             meta = {}
-            
+
         auto_tags = set()
         if ceg_template and ceg_template.strip() and meta:
-            try:
-                try:
-                    from backend.src.prompt_dsl import parse
-                except ImportError:
-                    from prompt_dsl import parse  # type: ignore[import-not-found, no-redef]
-                
-                prog = parse(ceg_template)
-                axis_names = set(prog.axes.keys())
-                
-                for axis_name in axis_names:
-                    if axis_name in meta:
-                        val = meta[axis_name]
-                        if val and str(val).strip():
-                            auto_tags.add(str(val).strip())
-            except Exception:
-                logger.exception("Failed to auto-generate tags from ceg_template and meta")
+            axis_names = self._template_axis_names(
+                ceg_template, template_hash or _template_hash(ceg_template)
+            )
+            for axis_name in axis_names:
+                if axis_name in meta:
+                    val = meta[axis_name]
+                    if val and str(val).strip():
+                        auto_tags.add(str(val).strip())
         return auto_tags
 
+    def _row_auto_tags(self, row: aiosqlite.Row, templates: Mapping[str, str]) -> set[str]:
+        return self._extract_auto_tags(
+            _row_template(row, templates), row["meta_json"], row["template_hash"]
+        )
+
     async def auto_generate_tags(self, hash: str) -> Optional[list[str]]:
         if self._conn is None:
             return None
-        cursor = await self._conn.execute(
-            "SELECT ceg_template, meta_json FROM saved_images WHERE hash = ?", (hash,)
+        row = await self._read_one(
+            "SELECT ceg_template, template_hash, meta_json FROM saved_images WHERE hash = ?", (hash,)
         )
-        row = await cursor.fetchone()
         if row is None:
             return None
-        
-        auto_tags = self._extract_auto_tags(row["ceg_template"], row["meta_json"])
+
+        auto_tags = self._row_auto_tags(row, await self._load_templates([row]))
         
         now = time.time()
-        for tag in auto_tags:
-            await self._conn.execute(
-                """
-                INSERT OR IGNORE INTO image_tags (image_hash, tag, created_at)
-                VALUES (?, ?, ?)
-                """,
-                (hash, tag, now),
-            )
-        await self._conn.commit()
+        async with self._transaction() as conn:
+            for tag in auto_tags:
+                await conn.execute(
+                    """
+                    INSERT OR IGNORE INTO image_tags (image_hash, tag, created_at)
+                    VALUES (?, ?, ?)
+                    """,
+                    (hash, tag, now),
+                )
         
         return await self.get_tags(hash)
 
@@ -829,28 +2039,28 @@ class JobStore:
             return {}
         
         placeholders = ",".join("?" for _ in hashes)
-        cursor = await self._conn.execute(
-            f"SELECT hash, ceg_template, meta_json FROM saved_images WHERE hash IN ({placeholders})",
+        rows = await self._read(
+            f"SELECT hash, ceg_template, template_hash, meta_json FROM saved_images "
+            f"WHERE hash IN ({placeholders})",
             hashes,
         )
-        rows = await cursor.fetchall()
-        
+        templates = await self._load_templates(rows)
+
         now = time.time()
         updated_hashes = []
-        for row in rows:
-            h = row["hash"]
-            auto_tags = self._extract_auto_tags(row["ceg_template"], row["meta_json"])
-            for tag in auto_tags:
-                await self._conn.execute(
-                    """
-                    INSERT OR IGNORE INTO image_tags (image_hash, tag, created_at)
-                    VALUES (?, ?, ?)
-                    """,
-                    (h, tag, now),
-                )
-            updated_hashes.append(h)
-            
-        await self._conn.commit()
+        async with self._transaction() as conn:
+            for row in rows:
+                h = row["hash"]
+                auto_tags = self._row_auto_tags(row, templates)
+                for tag in auto_tags:
+                    await conn.execute(
+                        """
+                        INSERT OR IGNORE INTO image_tags (image_hash, tag, created_at)
+                        VALUES (?, ?, ?)
+                        """,
+                        (h, tag, now),
+                    )
+                updated_hashes.append(h)
         
         result = {}
         for h in updated_hashes:
@@ -861,32 +2071,31 @@ class JobStore:
         if self._conn is None:
             return {}
         
-        cursor = await self._conn.execute(
+        rows = await self._read(
             """
-            SELECT hash, ceg_template, meta_json FROM saved_images
+            SELECT hash, ceg_template, template_hash, meta_json FROM saved_images
             WHERE hash NOT IN (SELECT DISTINCT image_hash FROM image_tags)
             AND status != 'trashed'
             """
         )
-        rows = await cursor.fetchall()
-        
+        templates = await self._load_templates(rows)
+
         now = time.time()
         updated_hashes = []
-        for row in rows:
-            h = row["hash"]
-            auto_tags = self._extract_auto_tags(row["ceg_template"], row["meta_json"])
-            if auto_tags:
-                for tag in auto_tags:
-                    await self._conn.execute(
-                        """
-                        INSERT OR IGNORE INTO image_tags (image_hash, tag, created_at)
-                        VALUES (?, ?, ?)
-                        """,
-                        (h, tag, now),
-                    )
-                updated_hashes.append(h)
-                
-        await self._conn.commit()
+        async with self._transaction() as conn:
+            for row in rows:
+                h = row["hash"]
+                auto_tags = self._row_auto_tags(row, templates)
+                if auto_tags:
+                    for tag in auto_tags:
+                        await conn.execute(
+                            """
+                            INSERT OR IGNORE INTO image_tags (image_hash, tag, created_at)
+                            VALUES (?, ?, ?)
+                            """,
+                            (h, tag, now),
+                        )
+                    updated_hashes.append(h)
         
         result = {}
         for h in updated_hashes:
@@ -896,14 +2105,14 @@ class JobStore:
     async def get_saved_image(self, hash: str) -> Optional[dict[str, JSONValue]]:
         if self._conn is None:
             return None
-        cursor = await self._conn.execute(
+        row = await self._read_one(
             "SELECT * FROM saved_images WHERE hash = ?", (hash,)
         )
-        row = await cursor.fetchone()
         if row is None:
             return None
         tags = await self.get_tags(hash)
-        return _saved_image_row_to_dict(row, tags=tags)
+        blobs, templates = await self._load_interned([row])
+        return _saved_image_row_to_dict(row, tags=tags, blobs=blobs, templates=templates)
 
     def _saved_images_filter_clause(
         self,
@@ -912,6 +2121,7 @@ class JobStore:
         status: Optional[str] = None,
         filename: Optional[str] = None,
         tag: Optional[str] = None,
+        template_hash: Optional[str] = None,
     ) -> tuple[str, str, list[JSONValue]]:
         """list/count가 공유하는 JOIN/WHERE/params 빌더."""
         conditions: list[str] = []
@@ -930,6 +2140,9 @@ class JobStore:
         if filename is not None:
             conditions.append("si.original_filename = ?")
             params.append(filename)
+        if template_hash is not None:
+            conditions.append("si.template_hash = ?")
+            params.append(template_hash)
         where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
         return joins, where, params
 
@@ -940,15 +2153,31 @@ class JobStore:
         status: Optional[str] = None,
         filename: Optional[str] = None,
         tag: Optional[str] = None,
+        template_hash: Optional[str] = None,
     ) -> int:
         if self._conn is None:
             return 0
+        if job_id is None and tag is None and template_hash is None:
+            # 상태 / 파일명 필터만 있으면 카운터에서 센다
+            conditions: list[str] = []
+            counter_params: list[JSONValue] = []
+            if status is not None:
+                conditions.append("status = ?")
+                counter_params.append(status)
+            if filename is not None:
+                conditions.append("original_filename = ?")
+                counter_params.append(filename)
+            where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+            row = await self._read_one(
+                f"SELECT COALESCE(SUM(count), 0) AS c FROM saved_image_counts{where}", counter_params
+            )
+            return int(row["c"]) if row is not None else 0
         joins, where, params = self._saved_images_filter_clause(
-            job_id=job_id, status=status, filename=filename, tag=tag
+            job_id=job_id, status=status, filename=filename, tag=tag,
+            template_hash=template_hash,
         )
         query = f"SELECT COUNT(*) AS c FROM saved_images si{joins}{where}"
-        cursor = await self._conn.execute(query, params)
-        row = await cursor.fetchone()
+        row = await self._read_one(query, params)
         return int(row["c"]) if row is not None else 0
 
     async def list_saved_images(
@@ -960,33 +2189,47 @@ class JobStore:
         status: Optional[str] = None,
         filename: Optional[str] = None,
         tag: Optional[str] = None,
+        template_hash: Optional[str] = None,
+        cursor: Optional[str] = None,
     ) -> list[dict[str, JSONValue]]:
+        """최신순 저장 이미지. cursor(saved_image_cursor)가 있으면 그 항목 다음부터."""
         if self._conn is None:
             return []
         joins, where, params = self._saved_images_filter_clause(
-            job_id=job_id, status=status, filename=filename, tag=tag
+            job_id=job_id, status=status, filename=filename, tag=tag,
+            template_hash=template_hash,
         )
+        if cursor is not None:
+            values, key = _decode_cursor(cursor, "saved_images")
+            clause, seek_params = _seek_clause(("si.created_at",), "si.hash", "DESC", values, key)
+            where = f"{where} AND {clause}" if where else f" WHERE {clause}"
+            params.extend(seek_params)
         query = (
             f"SELECT si.* FROM saved_images si{joins}{where} "
-            "ORDER BY si.created_at DESC LIMIT ? OFFSET ?"
+            "ORDER BY si.created_at DESC, si.hash DESC LIMIT ? OFFSET ?"
         )
         params.extend([limit, offset])
-        cursor = await self._conn.execute(query, params)
-        rows = await cursor.fetchall()
+        rows = await self._read(query, params)
         if not rows:
             return []
         # 태그 일괄 조회 (N+1 방지)
         hashes = [r["hash"] for r in rows]
         placeholders = ",".join("?" * len(hashes))
-        tag_cursor = await self._conn.execute(
+        tag_rows = await self._read(
             f"SELECT image_hash, tag FROM image_tags "
             f"WHERE image_hash IN ({placeholders}) ORDER BY tag ASC",
             hashes,
         )
         tag_map: dict[str, list[str]] = {h: [] for h in hashes}
-        for tag_row in await tag_cursor.fetchall():
+        for tag_row in tag_rows:
             tag_map[tag_row["image_hash"]].append(tag_row["tag"])
-        return [_saved_image_row_to_dict(r, tags=tag_map.get(r["hash"], [])) for r in rows]
+        blobs, templates = await self._load_interned(rows)
+        return [
+            _saved_image_row_to_dict(
+                r, tags=tag_map.get(r["hash"], []), blobs=blobs, templates=templates
+            )
+            for r in rows
+        ]
 
     # ---------- 큐레이션 ----------
 
@@ -1019,33 +2262,32 @@ class JobStore:
         if not sets:
             return existing
         params.append(hash)
-        await self._conn.execute(
-            f"UPDATE saved_images SET {', '.join(sets)} WHERE hash = ?", params
-        )
-        await self._conn.commit()
+        async with self._transaction() as conn:
+            await conn.execute(
+                f"UPDATE saved_images SET {', '.join(sets)} WHERE hash = ?", params
+            )
         return await self.get_saved_image(hash)
 
     async def delete_saved_image(self, hash: str) -> bool:
         """saved_images 행 + 태그 영구 삭제. 디스크 파일은 호출자가 삭제."""
         if self._conn is None:
             return False
-        cursor = await self._conn.execute(
-            "DELETE FROM saved_images WHERE hash = ?", (hash,)
-        )
-        await self._conn.execute(
-            "DELETE FROM image_tags WHERE image_hash = ?", (hash,)
-        )
-        await self._conn.commit()
+        async with self._transaction() as conn:
+            cursor = await conn.execute(
+                "DELETE FROM saved_images WHERE hash = ?", (hash,)
+            )
+            await conn.execute(
+                "DELETE FROM image_tags WHERE image_hash = ?", (hash,)
+            )
         return cursor.rowcount > 0
 
     async def list_trashed_for_purge(self) -> list[dict[str, JSONValue]]:
         """status='trashed' 항목 전체 (휴지통 비우기에서 디스크 정리에 필요)."""
         if self._conn is None:
             return []
-        cursor = await self._conn.execute(
+        rows = await self._read(
             "SELECT hash, extension FROM saved_images WHERE status = 'trashed'"
         )
-        rows = await cursor.fetchall()
         return [{"hash": r["hash"], "extension": r["extension"]} for r in rows]
 
     # ---------- 태그 ----------
@@ -1054,47 +2296,45 @@ class JobStore:
         if self._conn is None:
             return []
         now = time.time()
-        for tag in tags:
-            t = tag.strip()
-            if not t:
-                continue
-            await self._conn.execute(
-                "INSERT OR IGNORE INTO image_tags (image_hash, tag, created_at) "
-                "VALUES (?, ?, ?)",
-                (hash, t, now),
-            )
-        await self._conn.commit()
+        async with self._transaction() as conn:
+            for tag in tags:
+                t = tag.strip()
+                if not t:
+                    continue
+                await conn.execute(
+                    "INSERT OR IGNORE INTO image_tags (image_hash, tag, created_at) "
+                    "VALUES (?, ?, ?)",
+                    (hash, t, now),
+                )
         return await self.get_tags(hash)
 
     async def remove_tag(self, hash: str, tag: str) -> list[str]:
         if self._conn is None:
             return []
-        await self._conn.execute(
-            "DELETE FROM image_tags WHERE image_hash = ? AND tag = ?",
-            (hash, tag),
-        )
-        await self._conn.commit()
+        async with self._transaction() as conn:
+            await conn.execute(
+                "DELETE FROM image_tags WHERE image_hash = ? AND tag = ?",
+                (hash, tag),
+            )
         return await self.get_tags(hash)
 
     async def get_tags(self, hash: str) -> list[str]:
         if self._conn is None:
             return []
-        cursor = await self._conn.execute(
+        rows = await self._read(
             "SELECT tag FROM image_tags WHERE image_hash = ? ORDER BY tag ASC",
             (hash,),
         )
-        rows = await cursor.fetchall()
         return [r["tag"] for r in rows]
 
     async def list_tag_counts(self) -> list[dict[str, JSONValue]]:
         """{tag, count} 리스트 (count 내림차순)."""
         if self._conn is None:
             return []
-        cursor = await self._conn.execute(
+        rows = await self._read(
             "SELECT tag, COUNT(*) AS cnt FROM image_tags "
             "GROUP BY tag ORDER BY cnt DESC, tag ASC"
         )
-        rows = await cursor.fetchall()
         return [{"tag": r["tag"], "count": r["cnt"]} for r in rows]
 
     # ---------- asset groups (filename 단위 집계) ----------
@@ -1105,34 +2345,31 @@ class JobStore:
         if self._conn is None:
             return []
         if sort == "name":
-            order = "filename ASC"
+            order = "g.filename ASC"
         elif sort == "count":
-            order = "total DESC, filename ASC"
+            order = "g.count DESC, g.filename ASC"
         else:
-            order = "latestCreatedAt DESC"
-        cursor = await self._conn.execute(
+            order = "g.latest_created_at DESC, g.filename DESC"
+        status_counts = ",\n".join(
+            f"(SELECT count FROM saved_image_counts c WHERE c.original_filename = g.filename "
+            f"AND c.status = '{status}') AS {status}Count"
+            for status in ("pending", "approved", "rejected", "trashed")
+        )
+        # 요약 테이블의 한 페이지만 읽으므로 전체 이미지 수와 무관하다
+        rows = await self._read(
             f"""
             SELECT
-              original_filename AS filename,
-              COUNT(*) AS total,
-              SUM(CASE WHEN status = 'pending'  THEN 1 ELSE 0 END) AS pendingCount,
-              SUM(CASE WHEN status = 'approved' THEN 1 ELSE 0 END) AS approvedCount,
-              SUM(CASE WHEN status = 'rejected' THEN 1 ELSE 0 END) AS rejectedCount,
-              SUM(CASE WHEN status = 'trashed'  THEN 1 ELSE 0 END) AS trashedCount,
-              MAX(created_at) AS latestCreatedAt,
-              (
-                SELECT hash FROM saved_images si2
-                WHERE si2.original_filename = si.original_filename
-                ORDER BY si2.created_at DESC LIMIT 1
-              ) AS sampleHash
-            FROM saved_images si
-            GROUP BY original_filename
+              g.filename AS filename,
+              g.count AS total,
+              {status_counts},
+              g.latest_created_at AS latestCreatedAt,
+              g.sample_hash AS sampleHash
+            FROM asset_groups g
             ORDER BY {order}
             LIMIT ? OFFSET ?
             """,
             (limit, offset),
         )
-        rows = await cursor.fetchall()
         return [
             {
                 "filename": r["filename"],
@@ -1156,12 +2393,19 @@ class JobStore:
         offset: int = 0,
         status: Optional[str] = None,
         worker_id: Optional[str] = None,
+        cursor: Optional[str] = None,
     ) -> list[dict[str, JSONValue]]:
-        """필터링된 전체 job_events 목록을 반환."""
+        """필터링된 전체 job_events 목록을 반환. cursor(event_cursor)가 있으면 그 항목 다음부터."""
         if self._conn is None:
             return []
         conditions: list[str] = []
         params: list[JSONValue] = []
+        if cursor is not None:
+            values, key = _decode_cursor(cursor, "job_events")
+            clause, seek_params = _seek_clause(("je.timestamp",), "je.id", "DESC", values, key)
+            conditions.append(clause)
+            params.extend(seek_params)
+        await self.flush()
 
         if status is not None:
             # status는 jobs 테이블에 있으므로 JOIN 필요
@@ -1180,7 +2424,7 @@ class JobStore:
                 JOIN jobs j ON je.job_id = j.id
                 {where_clause}
                 {'AND' if conditions else 'WHERE'} j.status = ?
-                ORDER BY je.timestamp DESC
+                ORDER BY je.timestamp DESC, je.id DESC
                 LIMIT ? OFFSET ?
             """
             params.extend([status, limit, offset])
@@ -1188,13 +2432,12 @@ class JobStore:
             query = f"""
                 SELECT * FROM job_events je
                 {where_clause}
-                ORDER BY je.timestamp DESC
+                ORDER BY je.timestamp DESC, je.id DESC
                 LIMIT ? OFFSET ?
             """
             params.extend([limit, offset])
 
-        cursor = await self._conn.execute(query, params)
-        rows = await cursor.fetchall()
+        rows = await self._read(query, params)
         results: list[dict[str, JSONValue]] = []
         for row in rows:
             try:
@@ -1210,3 +2453,26 @@ class JobStore:
                 "details": details,
             })
         return results
+
+
+# ====== CLI ======
+
+async def _rebuild_counters_cli(db_path: Path) -> None:
+    store = JobStore(db_path=db_path, flush_interval=0, read_pool_size=0)
+    await store.open()
+    try:
+        started = time.perf_counter()
+        sizes = await store.rebuild_counters()
+        for table, rows in sizes.items():
+            print(f"{table}: {rows} rows")
+        print(f"rebuilt in {time.perf_counter() - started:.2f}s")
+    finally:
+        await store.close()
+
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) < 2 or sys.argv[1] != "rebuild-counters":
+        print("Usage: python -m backend.src.job_store rebuild-counters [db_path]")
+        sys.exit(1)
+    asyncio.run(_rebuild_counters_cli(Path(sys.argv[2]) if len(sys.argv) > 2 else get_default_db_path()))
@@ -17,6 +17,7 @@
 from __future__ import annotations
 
 import asyncio
+from collections import deque
 from copy import deepcopy
 import hashlib
 import logging
@@ -28,23 +29,26 @@ import urllib.parse
 import uuid
 from dataclasses import dataclass
 from pathlib import Path
-from typing import cast, Awaitable, Callable, Optional, overload, Any
+from typing import cast, Awaitable, Callable, Iterator, Literal, Optional, overload, Any
 
 from pydantic import TypeAdapter, BaseModel, Field, ConfigDict
 from backend.src.models import (
     JobItem,
     JobStatus,
     JobResponse,
+    JobsCreatedEvent,
+    JobSummary,
     WorkerViewResponse,
     DiagnosticsSnapshotResponse,
     JobQueryResponse,
     NormalizedEvent,
     SavedImageResponse,
+    TemplateBatchResponse,
     JSONValue,
 )
 from backend.src.workflow_models import ComfyWorkflow
 from backend.src.worker import BaseWorker, WorkerInfo
-from backend.src.job_store import JobStore
+from backend.src.job_store import JobFieldChanges, JobStore, job_cursor
 from backend.src.worker_pool import WorkerPool
 
 
@@ -104,10 +108,36 @@ class WorkerView:
         )
 
 
+@dataclass
+class TemplateBatch:
+    """템플릿 → 잡 배치의 진행 상태 (submit_stream이 만들고 백그라운드 태스크가 갱신).
+    Progress record of a template-to-jobs batch, updated by its background task.
+    """
+    id: str
+    total: Optional[int] = None
+    created: int = 0
+    status: Literal["running", "done", "error", "cancelled"] = "running"
+    error: Optional[str] = None
+
+    def to_response(self) -> TemplateBatchResponse:
+        """배치 상태를 API 응답 모델(TemplateBatchResponse)로 변환한다.
+        Converts the batch record to an API response model (TemplateBatchResponse).
+        """
+        return TemplateBatchResponse(
+            batchId=self.id,
+            total=self.total,
+            created=self.created,
+            status=self.status,
+            error=self.error,
+        )
+
+
 logger = logging.getLogger(__name__)
 
 
 RETRY_DELAY = 1.0  # 재시도 간격 (초)
+BULK_CREATED_EVENT_MIN = 20  # 이 개수 이상 한 번에 등록하면 jobs.created 하나로 알림
+FINISHED_BATCH_LIMIT = 100  # 끝난 템플릿 배치 기록은 최근 이만큼만 보관 (오래된 것부터 버림)
 
 # Resolve images directory: CEG_IMAGES_DIR > CEG_DATA_DIR/images > data/images
 _env_images_dir = os.environ.get("CEG_IMAGES_DIR")
@@ -223,6 +253,21 @@ class Job(BaseModel):
             targetWorkerId=self.target_worker_id,
         )
 
+    def to_summary(self) -> JobSummary:
+        """잡을 워크플로우 없는 축약 모델(JobSummary)로 변환한다 (jobs.created 이벤트용).
+        Converts the job to a compact JobSummary without the workflow (for jobs.created events).
+        """
+        return JobSummary(
+            id=self.id,
+            filename=self.filename,
+            prompt=self.prompt,
+            status=self.status,
+            createdAt=self.created_at,
+            meta=self.meta,
+            workerType=self.worker_type,
+            targetWorkerId=self.target_worker_id,
+        )
+
     @classmethod
     def from_dict(cls, d: dict[str, Any]) -> Job:
         """딕셔너리로부터 Job 인스턴스를 생성한다 (DB 복원 시 사용).
@@ -326,6 +371,9 @@ class JobManager:
         self._images_dir.mkdir(parents=True, exist_ok=True)
         self._persist_tasks: set[asyncio.Task[None]] = set()
         self._worker_previews: dict[str, bytes] = {}  # worker_id → latest preview image bytes
+        self._batches: dict[str, TemplateBatch] = {}
+        self._finished_batch_ids: deque[str] = deque()  # 끝난 순서
+        self._batch_tasks: set[asyncio.Task[None]] = set()
 
         pool.set_handlers(
             on_message=self._on_worker_message,
@@ -349,24 +397,10 @@ class JobManager:
         self._paused = paused_value == "true"
         if self._paused:
             logger.info("dispatch paused state restored from database")
-        # DB에서 기존 잡 복원
-        stored = await self._store.load_all()
-        async with self._lock:
-            for d in stored:
-                job = Job.from_dict(d)
-                # queued/running 상태였던 잡은 pending으로 되돌림 (백엔드 재시작)
-                if job.status in (JobStatus.QUEUED, JobStatus.RUNNING):
-                    job.status = JobStatus.PENDING
-                    job.worker_id = None
-                    job.progress_percent = 0.0
-                    job.current_node_name = ""
-                    job.total_node_count = 0
-                    job.completed_node_count = 0
-                    job.started_at = None
-                if job.status in (JobStatus.PENDING, JobStatus.QUEUED, JobStatus.RUNNING):
-                    self._jobs[job.id] = job
-        if stored:
-            logger.info("restored %d jobs from %s", len(stored), self._store._db_path)
+        # DB에서 활성 잡 복원 (끝난 잡은 읽지 않는다)
+        restored = await self._restore_active_jobs()
+        if restored:
+            logger.info("restored %d active jobs from %s", restored, self._store._db_path)
         await self._pool.start()
         if self._dispatcher_task is None:
             self._dispatcher_task = asyncio.create_task(
@@ -382,6 +416,10 @@ class JobManager:
         """
         self._stopping = True
         self._wakeup.set()
+        for task in list(self._batch_tasks):
+            task.cancel()
+        if self._batch_tasks:
+            await asyncio.gather(*self._batch_tasks, return_exceptions=True)
         if self._dispatcher_task is not None:
             self._dispatcher_task.cancel()
             try:
@@ -402,12 +440,23 @@ class JobManager:
         queued/running 상태의 잡은 pending으로 되돌린다.
         Resets queued/running jobs back to pending.
         """
-        stored = await self._store.load_all()
-        async with self._lock:
-            self._jobs.clear()
-            for d in stored:
+        await self._restore_active_jobs()
+        self._wakeup.set()
+
+    async def _restore_active_jobs(self) -> int:
+        """DB의 활성 잡만 청크 단위로 읽어 인메모리 목록을 바꾼다. 복원한 잡 수를 반환한다.
+        Replace the in-memory job list with the active jobs in the DB, read in chunks.
+
+        queued/running 상태였던 잡은 pending으로 되돌린다 (재시작 / DB 교체 후 다시 디스패치).
+        Jobs left queued/running are reset to pending so they are dispatched again.
+        """
+        restored: dict[str, Job] = {}
+        requeued: list[str] = []
+        async for chunk in self._store.load_active():
+            for d in chunk:
                 job = Job.from_dict(d)
                 if job.status in (JobStatus.QUEUED, JobStatus.RUNNING):
+                    requeued.append(job.id)
                     job.status = JobStatus.PENDING
                     job.worker_id = None
                     job.progress_percent = 0.0
@@ -415,21 +464,52 @@ class JobManager:
                     job.total_node_count = 0
                     job.completed_node_count = 0
                     job.started_at = None
-                if job.status in (JobStatus.PENDING, JobStatus.QUEUED, JobStatus.RUNNING):
-                    self._jobs[job.id] = job
-        self._wakeup.set()
-    async def _register_job(self, job: Job) -> None:
-        """새 잡을 인메모리 저장소와 DB에 등록하고 생성 이벤트를 발행한다.
-        Register a new job in both in-memory storage and DB, then emit a creation event.
+                restored[job.id] = job
+        async with self._lock:
+            self._jobs.clear()
+            self._jobs.update(restored)
+        await self._persist_requeued(requeued)
+        return len(restored)
+
+    async def _persist_requeued(self, job_ids: list[str]) -> None:
+        """pending으로 되돌린 잡을 DB에도 기록한다 (DB 상태 카운터가 메모리와 같도록).
+        Persist jobs reset to pending so the DB status counters match memory.
+        """
+        for job_id in job_ids:
+            await self._store.update_fields(
+                job_id,
+                status=JobStatus.PENDING,
+                worker_id=None,
+                progress_percent=0.0,
+                current_node_name="",
+                total_node_count=0,
+                completed_node_count=0,
+                started_at=None,
+            )
+    async def _register_jobs(self, jobs: list[Job]) -> None:
+        """새 잡들을 DB(잡 + created 이벤트, 단일 트랜잭션)와 인메모리 저장소에 등록하고 생성 이벤트를 발행한다.
+        Register new jobs in the DB (jobs and their created events in one transaction)
+        and in memory, then emit creation events.
+
+        BULK_CREATED_EVENT_MIN개 미만이면 잡마다 job.created를, 그 이상이면
+        워크플로우를 뺀 축약 정보로 jobs.created 하나를 발행한다.
+        Small submissions emit one job.created per job; larger ones emit a
+        single compact jobs.created event without workflows.
         """
+        if not jobs:
+            return
+        await self._store.save_created([job.to_dict() for job in jobs])
         async with self._lock:
-            self._jobs[job.id] = job
-        await self._store.save(job.to_dict())
-        await self._store.save_event(
-        job.id, "created",
-        details={"filename": job.filename, "prompt": job.prompt},
-        )
-        await self._emit({"type": "job.created", "job": job.to_dict()})
+            for job in jobs:
+                self._jobs[job.id] = job
+        if len(jobs) < BULK_CREATED_EVENT_MIN:
+            for job in jobs:
+                await self._emit({"type": "job.created", "job": job.to_dict()})
+            return
+        await self._emit(JobsCreatedEvent(
+            type="jobs.created",
+            jobs=[job.to_summary() for job in jobs],
+        ))
     # ---------- public API ----------
     async def retry(self, items: list[Job]) -> list[Job]:
         """기존 잡들을 복제(clone)하여 새 잡으로 재시도한다.
@@ -442,9 +522,7 @@ class JobManager:
             새로 생성된 잡 리스트 / List of newly created cloned jobs.
         """
         new_jobs = [job.clone() for job in items]
-        
-        for job in new_jobs:
-            await self._register_job(job)
+        await self._register_jobs(new_jobs)
         self._wakeup.set()
         return new_jobs
 
@@ -477,12 +555,74 @@ class JobManager:
         Create Jobs from multiple JobItems, register them, and wake the dispatcher.
         """
         created: list[Job] = self._create_jobs(items)
-            
-
-        for job in created:
-            await self._register_job(job)
+        await self._register_jobs(created)
         self._wakeup.set()
         return created
+
+    def submit_stream(
+        self, chunks: Iterator[list[JobItem]], total: Optional[int] = None
+    ) -> TemplateBatch:
+        """JobItem 청크 이터레이터를 백그라운드에서 차례로 등록하는 배치를 시작한다.
+        Start a batch that registers chunks of JobItems in the background.
+
+        청크는 워커 스레드에서 하나씩 만들어(렌더링/주입이 이벤트 루프를 막지 않도록)
+        만들어지는 대로 등록하고 디스패처를 깨운다. 따라서 마지막 청크가 렌더링되기 전에
+        첫 청크의 잡이 실행될 수 있다.
+        Each chunk is produced in a worker thread and registered as soon as it
+        is ready, so dispatch starts before the last chunk is rendered.
+
+        Args:
+            chunks: JobItem 리스트를 내는 이터레이터 / Iterator yielding lists of JobItems.
+            total: 예상 잡 수 (모르면 None) / Expected number of jobs, if known.
+
+        Returns:
+            즉시 반환되는 배치 진행 레코드 / Batch progress record, returned immediately.
+        """
+        batch = TemplateBatch(id=str(uuid.uuid4()), total=total)
+        self._batches[batch.id] = batch
+        task = asyncio.create_task(self._run_batch(batch, chunks), name=f"batch-{batch.id}")
+        self._batch_tasks.add(task)
+        task.add_done_callback(self._batch_tasks.discard)
+        return batch
+
+    def get_batch(self, batch_id: str) -> Optional[TemplateBatch]:
+        """배치 진행 레코드를 조회한다. 끝난 배치는 최근 FINISHED_BATCH_LIMIT개만 남아 있다.
+        Look up a template batch progress record. Only the most recent
+        FINISHED_BATCH_LIMIT finished batches are kept.
+        """
+        return self._batches.get(batch_id)
+
+    async def _run_batch(self, batch: TemplateBatch, chunks: Iterator[list[JobItem]]) -> None:
+        """청크를 하나씩 받아 등록한다. 실패하면 이미 등록된 잡은 그대로 두고 배치를 error로 표시한다.
+        Register chunks one by one; on failure, keep registered jobs and mark the batch as errored.
+        """
+        try:
+            while not self._stopping:
+                chunk = await asyncio.to_thread(next, chunks, None)
+                if chunk is None:
+                    batch.status = "done"
+                    return
+                await self._submit_many(chunk)
+                batch.created += len(chunk)
+            batch.status = "cancelled"
+        except asyncio.CancelledError:
+            batch.status = "cancelled"
+            raise
+        except Exception as exc:
+            logger.exception("template batch %s failed after %d jobs", batch.id, batch.created)
+            batch.status = "error"
+            batch.error = str(exc)
+        finally:
+            self._retire_batch(batch)
+
+    def _retire_batch(self, batch: TemplateBatch) -> None:
+        """끝난 배치를 기록하고, 끝난 배치가 FINISHED_BATCH_LIMIT개를 넘으면 가장 오래된 것부터 버린다.
+        Record a finished batch and evict the oldest finished ones beyond FINISHED_BATCH_LIMIT.
+        """
+        self._finished_batch_ids.append(batch.id)
+        while len(self._finished_batch_ids) > FINISHED_BATCH_LIMIT:
+            self._batches.pop(self._finished_batch_ids.popleft(), None)
+
     def _create_jobs(self, items: list[JobItem]) -> list[Job]:
         """JobItem 리스트를 Job 인스턴스 리스트로 변환한다 (UUID 자동 생성).
         Convert a list of JobItems into Job instances with auto-generated UUIDs.
@@ -765,6 +905,7 @@ class JobManager:
             worker_id = job.worker_id
             job.status = JobStatus.CANCELLED
             job.finished_at = time.time()
+            finished_at = job.finished_at
             job_dict = job.to_dict()
         if worker_id is not None:
             worker = self._pool.get(worker_id)
@@ -778,11 +919,15 @@ class JobManager:
                     }
                 )
                 await worker.delete_from_queue(job_id)
-        await self._store.save(job_dict)
+        await self._store.update_fields(
+            job_id, status=JobStatus.CANCELLED, finished_at=finished_at
+        )
         await self._store.save_event(
             job_id, "cancelled",
             worker_id=worker_id,
         )
+        # 종료 상태는 쓰기 큐를 기다리지 않고 바로 기록
+        await self._store.flush()
         await self._emit({"type": "job.updated", "job": job_dict})
         async with self._lock:
             self._jobs.pop(job_id, None)
@@ -831,6 +976,8 @@ class JobManager:
         created_at_to: Optional[float] = None,
         sort_by: str = "created_at",
         sort_order: str = "desc",
+        cursor: Optional[str] = None,
+        with_total: bool = True,
     ) -> JobQueryResponse:
         """필터·정렬·페이지네이션을 적용하여 잡을 조회한다.
         Query jobs with filtering, sorting, and pagination.
@@ -849,18 +996,18 @@ class JobManager:
             created_at_to: 생성 시각 상한 (Unix timestamp) / Created-at upper bound.
             sort_by: 정렬 기준 필드 / Sort field.
             sort_order: 정렬 방향 ('asc' 또는 'desc') / Sort direction.
+            cursor: 이전 응답의 nextCursor. 그 항목 다음부터 조회 / nextCursor of the previous page.
+            with_total: False면 전체 개수(COUNT)를 건너뛴다 / Skip the total count when False.
 
         Returns:
             페이지네이션된 잡 응답 / Paginated job query response.
+
+        Raises:
+            ValueError: 커서가 잘못되었거나 정렬이 다를 때 / Invalid cursor or sort mismatch.
         """
-        total = await self._store.count_jobs(
-            statuses=statuses,
-            search_tags=search_tags,
-            created_at_from=created_at_from,
-            created_at_to=created_at_to,
-        )
+        # 한 행 더 읽어 다음 페이지가 있는지 안다
         items = await self._store.query_jobs(
-            limit=limit,
+            limit=limit + 1,
             offset=offset,
             statuses=statuses,
             search_tags=search_tags,
@@ -868,7 +1015,20 @@ class JobManager:
             created_at_to=created_at_to,
             sort_by=sort_by,
             sort_order=sort_order,
+            cursor=cursor,
         )
+        next_cursor: Optional[str] = None
+        if len(items) > limit:
+            items = items[:limit]
+            next_cursor = job_cursor(items[-1], sort_by, sort_order) if items else None
+        total: Optional[int] = None
+        if with_total:
+            total = await self._store.count_jobs(
+                statuses=statuses,
+                search_tags=search_tags,
+                created_at_from=created_at_from,
+                created_at_to=created_at_to,
+            )
         response_items: list[JobResponse] = []
         async with self._lock:
             for item in items:
@@ -877,7 +1037,9 @@ class JobManager:
                     response_items.append(self._jobs[jid].to_response())
                 else:
                     response_items.append(Job.from_dict(item).to_response())
-        return JobQueryResponse(total=total, items=response_items, limit=limit, offset=offset)
+        return JobQueryResponse(
+            total=total, items=response_items, limit=limit, offset=offset, nextCursor=next_cursor
+        )
 
     async def get_job(self, job_id: str) -> Optional[Job]:
         """ID로 잡을 조회한다 (인메모리 → DB 순서로 탐색).
@@ -989,7 +1151,9 @@ class JobManager:
                 workflow = pending.workflow
                 image_uploads = pending.image_uploads
                 job_id = pending.id
-            await self._store.save(job_dict)
+            await self._store.update_fields(
+                job_id, status=JobStatus.QUEUED, worker_id=worker.id
+            )
             await self._store.save_event(
                 job_id, "dispatched",
                 worker_id=worker.id,
@@ -1144,7 +1308,10 @@ class JobManager:
                         )
                         job_dict = job.to_dict()
                 if job_dict is not None:
-                    await self._store.save(job_dict)
+                    await self._store.update_fields(
+                        prompt_id,
+                        completed_node_count=cast(int, job_dict["completedNodeCount"]),
+                    )
                     await self._emit({"type": "job.updated", "job": job_dict})
         elif msg_type == "execution_cached":
             cached_val = data.get("nodes")
@@ -1162,7 +1329,10 @@ class JobManager:
                         )
                         job_dict = job.to_dict()
                 if job_dict is not None:
-                    await self._store.save(job_dict)
+                    await self._store.update_fields(
+                        prompt_id,
+                        completed_node_count=cast(int, job_dict["completedNodeCount"]),
+                    )
                     await self._emit({"type": "job.updated", "job": job_dict})
         elif msg_type == "progress_state":
             nodes = data.get("nodes")
@@ -1190,7 +1360,10 @@ class JobManager:
                                 prompt_id, finished, job.completed_node_count,
                             )
                 if job_dict is not None:
-                    await self._store.save(job_dict)
+                    await self._store.update_fields(
+                        prompt_id,
+                        completed_node_count=cast(int, job_dict["completedNodeCount"]),
+                    )
                     await self._emit({"type": "job.updated", "job": job_dict})
         elif msg_type == "executed":
             output = cast(dict[str, JSONValue], data.get("output") or {})
@@ -1374,26 +1547,28 @@ class JobManager:
         None이 아닌 인자만 업데이트된다. image_urls_append는 기존 URL 리스트에 추가된다.
         Only non-None arguments are applied. image_urls_append extends the existing URL list.
         """
+        changes: JobFieldChanges = {}
         async with self._lock:
             job = self._jobs.get(job_id)
             if job is None:
                 return
             if status is not None:
-                job.status = status
+                job.status = changes["status"] = status
             if started_at is not None:
-                job.started_at = started_at
+                job.started_at = changes["started_at"] = started_at
             if total_node_count is not None:
-                job.total_node_count = total_node_count
+                job.total_node_count = changes["total_node_count"] = total_node_count
             if completed_node_count is not None:
-                job.completed_node_count = completed_node_count
+                job.completed_node_count = changes["completed_node_count"] = completed_node_count
             if progress_percent is not None:
-                job.progress_percent = progress_percent
+                job.progress_percent = changes["progress_percent"] = progress_percent
             if current_node_name is not None:
-                job.current_node_name = current_node_name
+                job.current_node_name = changes["current_node_name"] = current_node_name
             if image_urls_append is not None:
                 job.image_urls.extend(image_urls_append)
+                changes["image_urls"] = list(job.image_urls)
             payload = job.to_dict()
-        await self._store.save(payload)
+        await self._store.update_fields(job_id, **changes)
         await self._emit({"type": "job.updated", "job": payload})
 
     async def _finish(self, job_id: str) -> None:
@@ -1416,6 +1591,11 @@ class JobManager:
                     (job.finished_at - job.started_at) * 1000
                 )
             worker_id_to_clear = job.worker_id
+            changes: JobFieldChanges = {
+                "status": job.status,
+                "finished_at": job.finished_at,
+                "execution_duration_ms": job.execution_duration_ms,
+            }
             payload = job.to_dict()
         if worker_id_to_clear:
             worker = self._pool.get(worker_id_to_clear)
@@ -1427,7 +1607,7 @@ class JobManager:
                         "worker": WorkerView.from_info(worker.info()).to_dict(),
                     }
                 )
-        await self._store.save(payload)
+        await self._store.update_fields(job_id, **changes)
         await self._store.save_event(
             job_id, "completed",
             worker_id=worker_id_to_clear,
@@ -1436,6 +1616,7 @@ class JobManager:
                 "imageCount": len(cast(list[JSONValue], payload.get("imageUrls") or [])),
             },
         )
+        await self._store.flush()
         await self._emit({"type": "job.updated", "job": payload})
         async with self._lock:
             self._jobs.pop(job_id, None)
@@ -1478,6 +1659,18 @@ class JobManager:
                 job.total_node_count = 0
                 job.completed_node_count = 0
                 job.started_at = None
+            changes: JobFieldChanges = {
+                "status": job.status,
+                "worker_id": job.worker_id,
+                "error": job.error,
+                "retry_count": job.retry_count,
+                "finished_at": job.finished_at,
+                "progress_percent": job.progress_percent,
+                "current_node_name": job.current_node_name,
+                "total_node_count": job.total_node_count,
+                "completed_node_count": job.completed_node_count,
+                "started_at": job.started_at,
+            }
             payload = job.to_dict()
         if worker_id_to_clear:
             worker = self._pool.get(worker_id_to_clear)
@@ -1489,7 +1682,7 @@ class JobManager:
                         "worker": WorkerView.from_info(worker.info()).to_dict(),
                     }
                 )
-        await self._store.save(payload)
+        await self._store.update_fields(job_id, **changes)
         if is_permanent_failure:
             await self._store.save_event(
                 job_id, "failed",
@@ -1499,6 +1692,7 @@ class JobManager:
                     "error": error,
                 },
             )
+            await self._store.flush()
             await self._emit({"type": "job.updated", "job": payload})
             async with self._lock:
                 self._jobs.pop(job_id, None)
@@ -1547,9 +1741,8 @@ class JobManager:
             if target.worker_type != (job.worker_type or "comfyui"):
                 raise ValueError("worker type mismatch")
             job.target_worker_id = target_worker_id
-            payload = job.to_dict()
             response = job.to_response()
-        await self._store.save(payload)
+        await self._store.update_fields(job_id, target_worker_id=target_worker_id)
         await self._store.save_event(
             job_id, "moved",
             worker_id=target_worker_id,
@@ -1701,12 +1894,13 @@ class JobManager:
                 job = self._jobs.get(job_id)
                 if job:
                     job.saved_image_hashes.append(sha)
+                    hashes_now = list(job.saved_image_hashes)
                     payload = job.to_dict()
                 else:
                     payload = None
 
             if payload:
-                await self._store.save(payload)
+                await self._store.update_fields(job_id, saved_image_hashes=hashes_now)
                 await self._emit({"type": "job.updated", "job": payload})
             else:
                 # DB Fallback: update stored job with the new hash
@@ -1717,7 +1911,7 @@ class JobManager:
                     if sha not in hashes:
                         hashes.append(sha)
                         job_db["savedImageHashes"] = cast(JSONValue, hashes)
-                        await self._store.save(job_db)
+                        await self._store.update_fields(job_id, saved_image_hashes=hashes)
                         await self._emit({"type": "job.updated", "job": job_db})
         except Exception:
             logger.exception(
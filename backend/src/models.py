@@ -81,6 +81,18 @@ class JobResponse(BaseModel):
     targetWorkerId: Optional[str] = None
 
 
+class TemplateBatchResponse(BaseModel):
+    """
+    API response model reporting the progress of a server-side template-to-jobs batch.
+    서버에서 템플릿을 전개해 잡을 청크 단위로 등록하는 배치의 진행 상황(생성된 잡 수, 상태)을 전달하는 응답 모델 클래스입니다.
+    """
+    batchId: str
+    total: Optional[int] = None
+    created: int = 0
+    status: Literal["running", "done", "error", "cancelled"] = "running"
+    error: Optional[str] = None
+
+
 class WorkerViewResponse(BaseModel):
     """
     API response model displaying the connectivity and processing state of a worker.
@@ -112,11 +124,15 @@ class JobQueryResponse(BaseModel):
     """
     API response model returning pagination details alongside a list of matching jobs.
     조건에 맞게 필터링된 작업 목록과 페이지네이션 메타데이터를 함께 담아 전달하는 API 응답 모델 클래스입니다.
+
+    total is None when the count was skipped (with_total=false); nextCursor is None on the last page.
+    total은 개수를 건너뛰면(with_total=false) None, nextCursor는 마지막 페이지에서 None입니다.
     """
-    total: int
+    total: Optional[int] = None
     items: list[JobResponse]
     limit: int
     offset: int
+    nextCursor: Optional[str] = None
 
 
 class BaseEvent(BaseModel):
@@ -136,6 +152,30 @@ class JobCreatedEvent(BaseEvent):
     job: JobResponse
 
 
+class JobSummary(BaseModel):
+    """
+    Compact job record without the workflow, used in bulk creation events.
+    대량 등록 이벤트에 쓰는 축약 잡 정보로, 워크플로우 등 큰 필드를 빼고 목록 표시에 필요한 값만 담는 모델 클래스입니다.
+    """
+    id: str
+    filename: str
+    prompt: str
+    status: JobStatus
+    createdAt: float
+    meta: dict[str, str] = Field(default_factory=dict)
+    workerType: Optional[str] = None
+    targetWorkerId: Optional[str] = None
+
+
+class JobsCreatedEvent(BaseEvent):
+    """
+    Real-time WebSocket event broadcasted once for a bulk submission instead of one job.created per job.
+    여러 잡이 한꺼번에 등록되었을 때 잡마다 job.created를 보내는 대신 축약 정보 목록을 한 번에 전송하는 웹소켓 이벤트 클래스입니다.
+    """
+    type: Literal["jobs.created"]
+    jobs: list[JobSummary]
+
+
 class JobUpdatedEvent(BaseEvent):
     """
     Real-time WebSocket event broadcasted when a job's progress, status, or logs change.
@@ -235,17 +275,22 @@ class SavedImageResponse(BaseModel):
     trashedAt: Optional[float] = None
     tags: list[str] = Field(default_factory=list)
     meta: dict[str, str] = Field(default_factory=dict)
+    templateHash: Optional[str] = None
 
 
 class SavedImagesListResponse(BaseModel):
     """
     API response model containing a paginated slice of curated, saved images.
     사용자가 생성하여 보관 중인 이미지 목록을 페이지네이션 정보와 함께 안전하게 전송하는 API 응답 모델 클래스입니다.
+
+    total is None when the count was skipped (with_total=false); nextCursor is None on the last page.
+    total은 개수를 건너뛰면(with_total=false) None, nextCursor는 마지막 페이지에서 None입니다.
     """
     items: list[SavedImageResponse]
     limit: int
     offset: int
-    total: int
+    total: Optional[int] = None
+    nextCursor: Optional[str] = None
 
 
 class JobSavedImagesResponse(BaseModel):
@@ -313,6 +358,7 @@ class SettingsUpdatedEvent(BaseModel):
 
 NormalizedEvent = Union[
     JobCreatedEvent,
+    JobsCreatedEvent,
     JobUpdatedEvent,
     JobDeletedEvent,
     ControlUpdatedEvent,
@@ -11,8 +11,14 @@ from __future__ import annotations
 from pathlib import Path
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import cast, Dict, List, Optional, Union, TypedDict
+from typing import cast, Callable, Dict, Iterator, List, Optional, Union, TypedDict
+from collections import OrderedDict
+import hashlib
+import itertools
+import os
+import random
 import re
+import threading
 
 from lark import Lark, Transformer, UnexpectedInput, Token, Tree
 from backend.src.models import JSONValue
@@ -97,7 +103,21 @@ class Program:
     excludes: List[ExcludeRule] = field(default_factory=list)
     template: str = ""
     filename: str = ""
-    template_structure: List[TemplateLine] = field(default_factory=list)
+    _structure: Optional[List[TemplateLine]] = field(default=None, repr=False, compare=False)
+    _lazy_structure: Optional["_LazyStructure"] = field(default=None, repr=False, compare=False)
+
+    @property
+    def template_structure(self) -> List[TemplateLine]:
+        """줄 번호별 하이라이트 정보. parse() 결과에서는 처음 접근할 때 계산된다."""
+        if self._structure is None:
+            lazy = self._lazy_structure
+            self._structure = lazy.lines() if lazy is not None else []
+        return self._structure
+
+    @template_structure.setter
+    def template_structure(self, lines: List[TemplateLine]) -> None:
+        self._structure = lines
+        self._lazy_structure = None
 
 
 # ====== 파서 (Lark 기반) ======
@@ -244,17 +264,29 @@ class _Builder(Transformer[Token, object]):
         return None
 
 
+GRAMMAR_CACHE_PATH = GRAMMAR_PATH.with_name(GRAMMAR_PATH.name + ".cache")
+
+
+def _load_parser() -> Lark:
+    """문법 파서를 만든다.
+
+    직렬화된 파서(GRAMMAR_CACHE_PATH, CEG_GRAMMAR_CACHE로 변경 가능)가 있고 문법 해시가
+    같으면 컴파일 없이 읽어 들이고, 없거나 해시가 다르면 컴파일한 뒤 다시 저장한다.
+    캐시 파일을 읽거나 쓸 수 없으면 그냥 컴파일한다. CEG_GRAMMAR_CACHE=""이면 캐시를 쓰지 않는다.
+    """
+    grammar = GRAMMAR_PATH.read_text(encoding="utf-8")
+    cache_path = os.environ.get("CEG_GRAMMAR_CACHE", str(GRAMMAR_CACHE_PATH))
+    if cache_path:
+        try:
+            return Lark(grammar, parser="lalr", propagate_positions=True, cache=cache_path)
+        except Exception:
+            pass  # 캐시 문제로 실패하면 아래에서 새로 컴파일
+    return Lark(grammar, parser="lalr", propagate_positions=True)
+
+
 try:
-    _raw_parser = Lark(
-        GRAMMAR_PATH.read_text(encoding="utf-8"),
-        parser="lalr",
-        propagate_positions=True,
-    )
-    _parser = Lark(
-        GRAMMAR_PATH.read_text(encoding="utf-8"),
-        parser="lalr",
-        transformer=_Builder(),
-    )
+    # 위치 정보가 붙은 트리 하나를 _Builder와 _StructureExtractor가 함께 쓴다
+    _parser = _load_parser()
 except FileNotFoundError:
     raise ImportError(f"DSL grammar file not found: {GRAMMAR_PATH}")
 except Exception as exc:
@@ -424,12 +456,33 @@ def _build_template_structure(tree: Tree[Token] | Token, source: str) -> List[Te
     return _StructureExtractor(source).extract(tree)
 
 
-def parse(src: str) -> Program:
+class _LazyStructure:
+    """파스 트리에서 template_structure를 처음 필요할 때 한 번만 추출한다.
+
+    같은 파싱 결과의 사본들이 공유하므로, 줄 목록은 매번 새로 복사해서 내준다.
+    """
+
+    def __init__(self, tree: Tree[Token], source: str) -> None:
+        self._tree: Optional[Tree[Token]] = tree
+        self._source = source
+        self._lines: Optional[List[TemplateLine]] = None
+        self._lock = threading.Lock()
+
+    def lines(self) -> List[TemplateLine]:
+        with self._lock:
+            if self._lines is None:
+                assert self._tree is not None
+                self._lines = _build_template_structure(self._tree, self._source)
+                self._tree = None  # 추출이 끝나면 트리는 필요 없다
+        return [TemplateLine(line_num=ln.line_num, text=ln.text, keys=list(ln.keys), type=ln.type)
+                for ln in self._lines]
+
+
+def _parse_uncached(src: str) -> Program:
     try:
-        raw_tree: Tree[Token] = _raw_parser.parse(src)
-        structure = _build_template_structure(raw_tree, src)
-        prog = cast(Program, _parser.parse(src))
-        prog.template_structure = structure
+        tree: Tree[Token] = _parser.parse(src)
+        prog = cast(Program, _Builder().transform(tree))
+        prog._lazy_structure = _LazyStructure(tree, src)
         return prog
     except UnexpectedInput as e:
         context = e.get_context(src, span=40)
@@ -441,87 +494,932 @@ def parse(src: str) -> Program:
         raise DSLSyntaxError("\n".join(msg)) from None
 
 
+def _copy_expr(expr: object) -> object:
+    if isinstance(expr, tuple):
+        return tuple(_copy_expr(x) for x in expr)
+    if isinstance(expr, list):
+        return [_copy_expr(x) for x in expr]
+    return expr
+
+
+def _copy_program(prog: Program) -> Program:
+    """Program의 가변 부분을 모두 새로 만든 사본 (copy.deepcopy보다 훨씬 싸다)."""
+    return Program(
+        vars=dict(prog.vars),
+        axes={
+            name: Axis(
+                name=a.name,
+                values=[AxisValue(key=v.key, value=v.value, hide_key=v.hide_key, props=dict(v.props))
+                        for v in a.values],
+                include=a.include,
+                is_optional=a.is_optional,
+            )
+            for name, a in prog.axes.items()
+        },
+        combine_alias=prog.combine_alias,
+        combine_expr=_copy_expr(prog.combine_expr),
+        excludes=[
+            ExcludeRule(conditions=[Condition(axis=c.axis, op=c.op, values=list(c.values)) for c in r.conditions],
+                        connective=r.connective)
+            for r in prog.excludes
+        ],
+        template=prog.template,
+        filename=prog.filename,
+        _structure=None if prog._structure is None else [
+            TemplateLine(line_num=ln.line_num, text=ln.text, keys=list(ln.keys), type=ln.type)
+            for ln in prog._structure
+        ],
+        _lazy_structure=prog._lazy_structure,
+    )
+
+
+PARSE_CACHE_SIZE = 128
+
+
+class _ParseCache:
+    """소스 텍스트 해시를 키로 하는 파싱 결과 LRU 캐시.
+
+    캐시된 Program은 밖으로 내보내지 않는다. parse()는 항상 사본을 돌려주므로
+    호출자가 결과를 고쳐도 캐시는 오염되지 않는다. 문법 에러도 메시지째 캐시한다.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[bytes, Union[Program, DSLSyntaxError]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, src: str) -> Program:
+        key = hashlib.sha256(src.encode("utf-8", "surrogatepass")).digest()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+        if entry is None:
+            try:
+                entry = _parse_uncached(src)
+            except DSLSyntaxError as exc:
+                entry = exc
+            with self._lock:
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        if isinstance(entry, DSLSyntaxError):
+            raise DSLSyntaxError(str(entry))
+        return _copy_program(entry)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, JSONValue]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxSize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+_parse_cache = _ParseCache(PARSE_CACHE_SIZE)
+
+
+def parse(src: str) -> Program:
+    """DSL 소스를 Program으로 파싱한다. 같은 소스는 캐시에서 사본으로 돌려준다."""
+    return _parse_cache.get(src)
+
+
+def parse_cache_stats() -> Dict[str, JSONValue]:
+    """파싱 캐시 크기와 적중/미스 횟수."""
+    return _parse_cache.stats()
+
+
+# ====== 제외 규칙 ======
+
+_CONDITION_OPS = ("eq", "in", "not_in")
+
+
+def _condition_test(cond: Condition) -> Callable[[str], bool]:
+    """조건 하나를 키 판정 함수로.
+
+    알 수 없는 op는 축이 있을 때 판정에서 빠지고 없을 때만 거짓이 되므로,
+    AND 규칙 안에서는 "축이 존재함"과 같다.
+    """
+    values = list(cond.values)
+    if cond.op == "eq":
+        return lambda key: bool(values) and key == values[0]
+    if cond.op == "in":
+        allowed = set(values)
+        return lambda key: key in allowed
+    if cond.op == "not_in":
+        banned = set(values)
+        return lambda key: key not in banned
+    return lambda key: True
+
+
+def _key_in(allowed: frozenset[str]) -> Callable[[str], bool]:
+    return lambda key: key in allowed
+
+
+def _all_of(tests: List[Callable[[str], bool]]) -> Callable[[str], bool]:
+    return lambda key: all(t(key) for t in tests)
+
+
+class _RuleMatcher:
+    """exclude 규칙 목록을 축별 비트마스크로 컴파일한 판정기 (규칙 i = 비트 i).
+
+    sat(axis, key)는 "그 축에 걸린 조건이 참인 규칙" 비트다. AND 규칙은 그 축의 조건이
+    모두 참일 때, OR 규칙은 하나라도 참일 때 켜진다. (축, 키)마다 한 번만 계산하므로
+    조합 하나를 판정하는 비용은 규칙 수가 아니라 규칙이 참조하는 축 수에 비례한다.
+    """
+
+    def __init__(self, rules: List[ExcludeRule]) -> None:
+        self.rules = rules
+        self.full = (1 << len(rules)) - 1
+        self.and_bits = 0
+        self.or_bits = 0
+        self.refs: Dict[str, int] = {}
+        self._tests: Dict[str, List[tuple[int, bool, Callable[[str], bool]]]] = {}
+        self._sat: Dict[tuple[str, str], int] = {}
+        for i, rule in enumerate(rules):
+            bit = 1 << i
+            is_and = rule.connective == "AND"
+            if is_and:
+                self.and_bits |= bit
+            else:
+                self.or_bits |= bit
+            for c in rule.conditions:
+                if not is_and and c.op not in _CONDITION_OPS:
+                    continue  # OR 규칙에서 알 수 없는 op는 결과에 영향이 없다
+                self.refs[c.axis] = self.refs.get(c.axis, 0) | bit
+                self._tests.setdefault(c.axis, []).append((bit, is_and, _condition_test(c)))
+
+    def sat(self, axis: str, key: str) -> int:
+        cached = self._sat.get((axis, key))
+        if cached is not None:
+            return cached
+        and_ok = self.refs[axis] & self.and_bits
+        or_hit = 0
+        for bit, is_and, test in self._tests[axis]:
+            if is_and:
+                if not test(key):
+                    and_ok &= ~bit
+            elif test(key):
+                or_hit |= bit
+        self._sat[(axis, key)] = and_ok | or_hit
+        return and_ok | or_hit
+
+    def decided(self, partial: Dict[str, AxisValue], later: frozenset[str]) -> bool:
+        """부분 조합이 이미 제외로 확정됐는지. later는 뒤에서 정해질(덮어쓸 수도 있는) 이름들.
+
+        later에 없고 partial에 있는 축만 "확정"으로 본다. AND 규칙은 참조 축이 모두 확정
+        + 조건 만족일 때, OR 규칙은 확정 축 하나에서 조건이 참일 때 제외가 확정된다.
+        """
+        alive = self.and_bits
+        hit = 0
+        for axis, ref in self.refs.items():
+            v = partial.get(axis)
+            if v is None or axis in later:
+                alive &= ~ref
+            else:
+                s = self.sat(axis, v.key)
+                alive &= s | ~ref
+                hit |= s
+        return bool(alive or hit & self.or_bits)
+
+    def excluded(self, combo: Dict[str, AxisValue]) -> bool:
+        return self.decided(combo, frozenset())
+
+
 # ====== 평가기 ======
 
-def eval_expr(expr: object, axes: Dict[str, Axis], vars: Dict[str, str]) -> List[Dict[str, AxisValue]]:
+def _check_expr_names(expr: object, axes: Dict[str, Axis], vars: Dict[str, str]) -> None:
+    """조합식에 쓰인 이름이 모두 정의됐는지 미리 검사한다 (지연 평가에서도 즉시 에러)."""
     if not isinstance(expr, tuple) or len(expr) < 2:
-        return []
+        return
     kind, payload = expr[0], expr[1]
     if kind == 'var':
         name = str(payload)
-        if name in axes:
-            axis = axes[name]
-            vals = axis.values
-            if axis.include:
-                vals = [
-                    AxisValue(key=v.key, value=f"{v.value}, {axis.include}", hide_key=v.hide_key, props=v.props)
-                    for v in vals
-                ]
-            res = [{name: val} for val in vals]
-            if getattr(axis, "is_optional", False):
-                res.append({})
-            return res
-        elif name in vars:
-            return [{name: AxisValue(key=name, value=vars[name])}]
-        else:
+        if name not in axes and name not in vars:
             raise DSLSyntaxError(f"정의되지 않은 축 또는 변수: {name}")
-    
-    elif kind == 'str':
-        dummy_name = f"__literal_{id(expr)}__"
-        return [{dummy_name: AxisValue(key="", value=str(payload))}]
-
     elif kind == 'hide_key':
-        res = eval_expr(payload, axes, vars)
-        new_res = []
-        for combo in res:
-            new_combo = {}
-            for k, v in combo.items():
-                new_combo[k] = AxisValue(key=v.key, value=v.value, hide_key=True, props=v.props)
-            new_res.append(new_combo)
-        return new_res
-
-    elif kind == 'add':
-        res = []
-        if isinstance(payload, list):
-            for child in payload:
-                res.extend(eval_expr(child, axes, vars))
+        _check_expr_names(payload, axes, vars)
+    elif kind in ('add', 'mul') and isinstance(payload, list):
+        for child in payload:
+            _check_expr_names(child, axes, vars)
+
+
+def _var_options(name: str, axes: Dict[str, Axis], vars: Dict[str, str]) -> List[Dict[str, AxisValue]]:
+    if name in axes:
+        axis = axes[name]
+        vals = axis.values
+        if axis.include:
+            vals = [
+                AxisValue(key=v.key, value=f"{v.value}, {axis.include}", hide_key=v.hide_key, props=v.props)
+                for v in vals
+            ]
+        res: List[Dict[str, AxisValue]] = [{name: val} for val in vals]
+        if getattr(axis, "is_optional", False):
+            res.append({})
         return res
-        
-    elif kind == 'mul':
-        if isinstance(payload, list) and len(payload) > 0:
-            res = eval_expr(payload[0], axes, vars)
-            for child in payload[1:]:
-                right = eval_expr(child, axes, vars)
-                new_res = []
-                for left in res:
-                    for r in right:
-                        merged = dict(left)
-                        merged.update(r)
-                        new_res.append(merged)
-                res = new_res
-            return res
-        
-    return []
+    elif name in vars:
+        return [{name: AxisValue(key=name, value=vars[name])}]
+    else:
+        raise DSLSyntaxError(f"정의되지 않은 축 또는 변수: {name}")
+
+
+class _Expander:
+    """조합식 전개기. 축 값 목록과 식별 이름 집합을 식 노드별로 한 번만 만든다.
+
+    matcher가 있으면 곱셈 전개 중 부분 조합이 제외로 확정되는 즉시 그 가지를 버린다.
+    뒤쪽 인자가 같은 이름을 덮어쓸 수 있으므로(a * a), 뒤에서 다시 정해질 이름은
+    판정에서 미확정으로 취급한다.
+    """
+
+    def __init__(self, axes: Dict[str, Axis], vars: Dict[str, str],
+                 matcher: Optional[_RuleMatcher] = None) -> None:
+        self.axes = axes
+        self.vars = vars
+        self.matcher = matcher
+        self._leaves: Dict[int, List[Dict[str, AxisValue]]] = {}
+        self._names: Dict[int, frozenset[str]] = {}
+
+    def names(self, expr: object) -> frozenset[str]:
+        """expr이 만드는 조합에 나올 수 있는 이름들."""
+        cached = self._names.get(id(expr))
+        if cached is not None:
+            return cached
+        out: frozenset[str] = frozenset()
+        if isinstance(expr, tuple) and len(expr) >= 2:
+            kind, payload = expr[0], expr[1]
+            if kind == 'var':
+                out = frozenset({str(payload)})
+            elif kind == 'str':
+                out = frozenset({f"__literal_{id(expr)}__"})
+            elif kind == 'hide_key':
+                out = self.names(payload)
+            elif kind in ('add', 'mul') and isinstance(payload, list):
+                out = frozenset().union(*(self.names(c) for c in payload))
+        self._names[id(expr)] = out
+        return out
+
+    def iter(self, expr: object, later: frozenset[str] = frozenset()) -> Iterator[Dict[str, AxisValue]]:
+        if not isinstance(expr, tuple) or len(expr) < 2:
+            return
+        kind, payload = expr[0], expr[1]
+        if kind == 'var':
+            # 축 값 목록은 곱셈 전개 중 여러 번 재방문되므로 한 번만 만든다
+            opts = self._leaves.get(id(expr))
+            if opts is None:
+                opts = self._leaves[id(expr)] = _var_options(str(payload), self.axes, self.vars)
+            yield from opts
+
+        elif kind == 'str':
+            dummy_name = f"__literal_{id(expr)}__"
+            yield {dummy_name: AxisValue(key="", value=str(payload))}
+
+        elif kind == 'hide_key':
+            for combo in self.iter(payload, later):
+                yield {
+                    k: AxisValue(key=v.key, value=v.value, hide_key=True, props=v.props)
+                    for k, v in combo.items()
+                }
+
+        elif kind == 'add':
+            if isinstance(payload, list):
+                for child in payload:
+                    yield from self.iter(child, later)
+
+        elif kind == 'mul':
+            if isinstance(payload, list) and len(payload) > 0:
+                # i번째 인자를 펼친 뒤 아직 정해지지 않은 이름들
+                lates = [later] * len(payload)
+                for i in range(len(payload) - 2, -1, -1):
+                    lates[i] = lates[i + 1] | self.names(payload[i + 1])
+                yield from self._mul(payload, 0, {}, lates)
+
+    def _mul(self, children: List[object], i: int, left: Dict[str, AxisValue],
+             lates: List[frozenset[str]]) -> Iterator[Dict[str, AxisValue]]:
+        # 오른쪽 인자를 왼쪽 조합마다 다시 전개한다: 메모리는 곱 크기가 아니라 인자 깊이에 비례
+        matcher = self.matcher
+        for right in self.iter(children[i], lates[i]):
+            merged = dict(left)
+            merged.update(right)
+            if matcher is not None and matcher.decided(merged, lates[i]):
+                continue
+            if i + 1 == len(children):
+                yield merged
+            else:
+                yield from self._mul(children, i + 1, merged, lates)
+
+
+def iter_expr(expr: object, axes: Dict[str, Axis], vars: Dict[str, str],
+              excludes: Optional[List[ExcludeRule]] = None) -> Iterator[Dict[str, AxisValue]]:
+    """eval_expr()의 지연(lazy) 버전. 조합을 eval_expr()와 같은 순서로 하나씩 생성한다.
+
+    excludes를 주면 그 규칙에 걸리는 조합을 빼고 생성한다. 곱셈 전개 중 제외가 확정된
+    가지는 끝까지 펼치지 않는다.
+    """
+    _check_expr_names(expr, axes, vars)
+    if not excludes:
+        return _Expander(axes, vars).iter(expr)
+    matcher = _RuleMatcher(list(excludes))
+    combos = _Expander(axes, vars, matcher).iter(expr)
+    if isinstance(expr, tuple) and expr and expr[0] == 'mul':
+        return combos  # 마지막 인자에서 later가 비므로 이미 최종 판정됐다
+    return (c for c in combos if not matcher.excluded(c))
+
+
+def eval_expr(expr: object, axes: Dict[str, Axis], vars: Dict[str, str],
+              excludes: Optional[List[ExcludeRule]] = None) -> List[Dict[str, AxisValue]]:
+    return list(iter_expr(expr, axes, vars, excludes))
+
+
+# ====== 조합 공간 (카운팅) ======
+#
+# 조합식을 Leaf(값 목록) / Sum(+) / Product(*) 트리로 정규화하고, only/fix/exclude를
+# 트리에 미리 컴파일해 두면 조합을 전개하지 않고도 살아남는 조합 수를 셀 수 있다.
+#
+# - only/fix, OR 규칙, 한 축만 보는 AND 규칙은 Leaf 옵션 필터로 바뀐다.
+# - 여러 축에 걸친 AND 규칙은 규칙당 비트 하나를 쓰는 마스크로 추적한다. 옵션의 비트는
+#   "이 옵션이 정한 축에서는 규칙 조건을 모두 만족"이면 1이고, 곱은 AND로 합쳐진다.
+#   규칙이 참조하는 축이 모두 한 노드 안에서 정해지면 그 비트는 확정이므로,
+#   비트가 1인 상태는 그 자리에서 버린다.
+# - Product 자식들의 이름 집합이 겹치면(예: a * a) 덮어쓰기 의미 때문에 정규화를 포기하고
+#   전개 방식으로 되돌아간다.
+# - 마스크별 개수를 알고 있으므로 N번째 조합도 앞 조합을 전개하지 않고 찾을 수 있다
+#   (_walk: 각 선택지가 만드는 살아남는 조합 수만큼 한 번에 건너뛴다).
+
+
+@dataclass
+class _Leaf:
+    options: List[Dict[str, AxisValue]]
+    scope: frozenset[str]
+
+
+@dataclass
+class _Sum:
+    children: List["_Node"]
+    scope: frozenset[str]
+
+
+@dataclass
+class _Product:
+    children: List["_Node"]
+    scope: frozenset[str]
+
+
+_Node = Union[_Leaf, _Sum, _Product]
+
+
+class _NotDisjoint(Exception):
+    """Product 자식들이 같은 이름을 정의함 — 정규화 불가."""
+
+
+def _compile_node(expr: object, axes: Dict[str, Axis], vars: Dict[str, str], hide: bool = False) -> _Node:
+    if not isinstance(expr, tuple) or len(expr) < 2:
+        return _Leaf(options=[], scope=frozenset())
+    kind, payload = expr[0], expr[1]
+    if kind in ('var', 'str'):
+        options = list(_Expander(axes, vars).iter(expr))
+        if hide:
+            options = [
+                {k: AxisValue(key=v.key, value=v.value, hide_key=True, props=v.props) for k, v in o.items()}
+                for o in options
+            ]
+        return _Leaf(options=options, scope=frozenset(k for o in options for k in o))
+    if kind == 'hide_key':
+        return _compile_node(payload, axes, vars, hide=True)
+    if kind in ('add', 'mul') and isinstance(payload, list) and payload:
+        children = [_compile_node(c, axes, vars, hide) for c in payload]
+        scope = frozenset().union(*(c.scope for c in children))
+        if kind == 'add':
+            return _Sum(children=children, scope=scope)
+        if sum(len(c.scope) for c in children) != len(scope):
+            raise _NotDisjoint()
+        return _Product(children=children, scope=scope)
+    return _Leaf(options=[], scope=frozenset())
+
+
+@dataclass
+class _CompiledFilters:
+    """only/fix/exclude 옵션을 조합 공간에 적용 가능한 형태로 컴파일한 결과."""
+    required: Dict[str, List[Callable[[str], bool]]] = field(default_factory=dict)
+    drops: Dict[str, List[Callable[[str], bool]]] = field(default_factory=dict)
+    mask_rules: List[ExcludeRule] = field(default_factory=list)
+    exclude_all: bool = False
+
+    def keeps(self, option: Dict[str, AxisValue], scope: frozenset[str]) -> bool:
+        for axis, tests in self.required.items():
+            if axis in scope:
+                v = option.get(axis)
+                if v is None or not all(t(v.key) for t in tests):
+                    return False
+        for axis, tests in self.drops.items():
+            v = option.get(axis)
+            if v is not None and any(t(v.key) for t in tests):
+                return False
+        return True
+
+
+def _compile_filters(rules: List[ExcludeRule], scope: frozenset[str], *,
+                     only: Optional[Dict[str, List[str]]],
+                     fix: Optional[Dict[str, str]]) -> _CompiledFilters:
+    out = _CompiledFilters()
+    for ax, keys in (only or {}).items():
+        out.required.setdefault(ax, []).append(_key_in(frozenset(keys)))
+    for ax, val in (fix or {}).items():
+        out.required.setdefault(ax, []).append(_key_in(frozenset([val])))
+
+    for rule in rules:
+        if rule.connective != "AND":
+            # OR: 조건 하나라도 참이면 제외 → 축별로 독립적인 옵션 필터
+            for c in rule.conditions:
+                if c.op in _CONDITION_OPS:
+                    out.drops.setdefault(c.axis, []).append(_condition_test(c))
+            continue
+        if not rule.conditions:
+            # all([]) == True: 조건 없는 AND 규칙은 모든 조합을 제외한다
+            out.exclude_all = True
+            continue
+        rule_axes = {c.axis for c in rule.conditions}
+        if not rule_axes <= scope:
+            continue  # 없는 축의 조건은 항상 거짓
+        if len(rule_axes) == 1:
+            tests = [_condition_test(c) for c in rule.conditions]
+            out.drops.setdefault(next(iter(rule_axes)), []).append(_all_of(tests))
+        else:
+            out.mask_rules.append(rule)
+    return out
+
+
+def _memoized(f: Callable[[int], int]) -> Callable[[int], int]:
+    cache: Dict[int, int] = {}
+
+    def g(mask: int) -> int:
+        r = cache.get(mask)
+        if r is None:
+            r = cache[mask] = f(mask)
+        return r
+
+    return g
+
+
+def _masked(h: Callable[[int], int], clear: int) -> Callable[[int], int]:
+    """clear 밖의 비트를 끈 마스크로 h를 부르는 메모 함수."""
+    def g(mask: int) -> int:
+        return h(mask & clear)
+
+    return _memoized(g)
+
+
+def _one(mask: int) -> int:
+    return 1
+
+
+class _CombinationSpace:
+    """필터가 컴파일된 조합 공간. 생성 비용은 축 값 개수에 비례하고, 조합 수와 무관하다."""
+
+    def __init__(self, root: _Node, filters: _CompiledFilters) -> None:
+        self.filters = filters
+        self.matcher = _RuleMatcher(filters.mask_rules)
+        self.rule_axes = [frozenset(c.axis for c in rule.conditions) for rule in filters.mask_rules]
+        self.full = self.matcher.full
+        self._dists: Dict[int, Dict[int, int]] = {}
+        self._suffixes: Dict[tuple[int, int], Dict[int, int]] = {}
+        self._leaf_masks: Dict[int, List[int]] = {}
+        self.root: Optional[_Node] = None
+        if not filters.exclude_all and set(filters.required) <= root.scope:
+            self.root = self._filter(root, frozenset(filters.required))
+
+    def _filter(self, node: _Node, required: frozenset[str]) -> _Node:
+        """옵션 필터를 적용한 새 트리. 필수 축이 빠지는 Sum 가지는 통째로 버린다."""
+        if isinstance(node, _Leaf):
+            return _Leaf(
+                options=[o for o in node.options
+                         if all(ax in o for ax in required & node.scope) and self.filters.keeps(o, node.scope)],
+                scope=node.scope,
+            )
+        if isinstance(node, _Sum):
+            return _Sum(
+                children=[self._filter(c, required & c.scope) for c in node.children if required & node.scope <= c.scope],
+                scope=node.scope,
+            )
+        return _Product(children=[self._filter(c, required & c.scope) for c in node.children], scope=node.scope)
+
+    def _final_bits(self, scope: frozenset[str]) -> int:
+        bits = 0
+        for i, axes in enumerate(self.rule_axes):
+            if axes <= scope:
+                bits |= 1 << i
+        return bits
+
+    def _absent_bits(self, missing: frozenset[str]) -> int:
+        bits = 0
+        for i, axes in enumerate(self.rule_axes):
+            if axes & missing:
+                bits |= 1 << i
+        return bits
+
+    def option_mask(self, option: Dict[str, AxisValue], scope: frozenset[str]) -> int:
+        """옵션이 정하는 축에서 조건을 모두 만족하는 규칙 비트 (scope 밖 규칙은 중립 1)."""
+        mask = self.full
+        for axis, ref in self.matcher.refs.items():
+            if axis in scope:
+                v = option.get(axis)
+                mask &= ~ref if v is None else self.matcher.sat(axis, v.key) | ~ref
+        return mask
+
+    def _masks(self, leaf: _Leaf) -> List[int]:
+        cached = self._leaf_masks.get(id(leaf))
+        if cached is None:
+            cached = self._leaf_masks[id(leaf)] = [self.option_mask(o, leaf.scope) for o in leaf.options]
+        return cached
+
+    def dist(self, node: _Node) -> Dict[int, int]:
+        """노드가 만드는 (아직 살아있는) 조합 수를 마스크별로 센다."""
+        cached = self._dists.get(id(node))
+        if cached is not None:
+            return cached
+        acc: Dict[int, int] = {}
+        if isinstance(node, _Leaf):
+            for m in self._masks(node):
+                acc[m] = acc.get(m, 0) + 1
+        elif isinstance(node, _Sum):
+            for child in node.children:
+                clear = ~self._absent_bits(node.scope - child.scope)
+                for m, c in self.dist(child).items():
+                    acc[m & clear] = acc.get(m & clear, 0) + c
+        else:
+            acc = self._suffix(node, 0)
+        final = self._final_bits(node.scope)
+        acc = {m: c for m, c in acc.items() if not m & final}
+        self._dists[id(node)] = acc
+        return acc
+
+    def _suffix(self, node: _Product, i: int) -> Dict[int, int]:
+        """Product의 i번째 이후 자식들의 곱을 마스크별로 센다."""
+        cached = self._suffixes.get((id(node), i))
+        if cached is not None:
+            return cached
+        if i == len(node.children):
+            return {self.full: 1}
+        rest = self._suffix(node, i + 1)
+        final = self._final_bits(frozenset().union(*(c.scope for c in node.children[i:])))
+        acc: Dict[int, int] = {}
+        for m1, c1 in self.dist(node.children[i]).items():
+            for m2, c2 in rest.items():
+                m = m1 & m2
+                if not m & final:
+                    acc[m] = acc.get(m, 0) + c1 * c2
+        self._suffixes[(id(node), i)] = acc
+        return acc
+
+    def count(self) -> int:
+        if self.root is None:
+            return 0
+        return sum(self.dist(self.root).values())
+
+    def _weight(self, node: _Node, h: Callable[[int], int]) -> int:
+        return sum(c * h(m) for m, c in self.dist(node).items())
+
+    def _walk(self, node: _Node, h: Callable[[int], int],
+              start: int) -> Iterator[tuple[Dict[str, AxisValue], int, int]]:
+        """node의 조합을 순서대로 생성한다. 조합 x는 h(mask(x))칸을 차지한다고 보고
+        start칸을 건너뛴 위치부터 시작한다.
+
+        (조합, 마스크, 그 조합의 칸 안에서 남은 오프셋)을 내놓는다. 부모 Product는
+        h를 "이 선택 뒤에 살아남는 나머지 조합 수"로 넘기므로, 건너뛰기가 조합 단위가
+        아니라 블록 단위로 이뤄진다.
+        """
+        final = self._final_bits(node.scope)
+        if isinstance(node, _Leaf):
+            masks = self._masks(node)
+            i = 0
+            if not self.full:
+                # 마스크 규칙이 없으면 모든 옵션의 칸 수가 같다: 혼합 기수 자릿수로 바로 이동
+                w = h(0)
+                if not w:
+                    return
+                i, start = divmod(start, w)
+            for o, m in zip(node.options[i:], masks[i:]):
+                if m & final:
+                    continue
+                w = h(m)
+                if start >= w:
+                    start -= w
+                    continue
+                yield o, m, start
+                start = 0
+        elif isinstance(node, _Sum):
+            for child in node.children:
+                clear = ~self._absent_bits(node.scope - child.scope)
+                hc = _masked(h, clear)
+                w = self._weight(child, hc)
+                if start >= w:
+                    start -= w
+                    continue
+                for x, m, rem in self._walk(child, hc, start):
+                    yield x, m & clear, rem
+                start = 0
+        else:
+            def h_final(m: int) -> int:
+                return 0 if m & final else h(m)
+            yield from self._walk_product(node, 0, {}, self.full, h_final, start)
+
+    def _walk_product(self, node: _Product, i: int, prefix: Dict[str, AxisValue], p: int,
+                      h: Callable[[int], int],
+                      start: int) -> Iterator[tuple[Dict[str, AxisValue], int, int]]:
+        last = i + 1 == len(node.children)
+        if last:
+            hi = _memoized(lambda m: h(p & m))
+        else:
+            rest = self._suffix(node, i + 1)
+            hi = _memoized(lambda m: sum(c * h(p & m & m2) for m2, c in rest.items()))
+        for x, m, rem in self._walk(node.children[i], hi, start):
+            merged = dict(prefix)
+            merged.update(x)
+            if last:
+                yield merged, p & m, rem
+            else:
+                yield from self._walk_product(node, i + 1, merged, p & m, h, rem)
+
+    def walk(self, start: int = 0) -> Iterator[Dict[str, AxisValue]]:
+        """살아남는 조합을 순서대로 생성한다. start번째까지는 전개하지 않고 건너뛴다."""
+        if self.root is None:
+            return
+        for combo, _, _ in self._walk(self.root, _one, start):
+            yield combo
+
+    def select(self, index: int) -> Optional[Dict[str, AxisValue]]:
+        """index번째 살아남는 조합. 비용은 축 값 개수에 비례한다."""
+        if index < 0:
+            return None
+        return next(self.walk(index), None)
+
+
+def _combination_space(prog: Program, *,
+                       only: Optional[Dict[str, List[str]]] = None,
+                       fix: Optional[Dict[str, str]] = None,
+                       skip_excludes: bool = False,
+                       extra_excludes: Optional[List[Dict[str, JSONValue]]] = None) -> Optional[_CombinationSpace]:
+    """조합 공간을 컴파일한다. 정규화할 수 없는 조합식이면 None."""
+    _check_expr_names(prog.combine_expr, prog.axes, prog.vars)
+    try:
+        root = _compile_node(prog.combine_expr, prog.axes, prog.vars)
+    except _NotDisjoint:
+        return None
+    rules = _exclude_rules(prog, skip_excludes=skip_excludes, extra_excludes=extra_excludes)
+    return _CombinationSpace(root, _compile_filters(rules, root.scope, only=only, fix=fix))
+
+
+def count_combinations(prog: Program, *,
+                       only: Optional[Dict[str, List[str]]] = None,
+                       fix: Optional[Dict[str, str]] = None,
+                       skip_excludes: bool = False,
+                       extra_excludes: Optional[List[Dict[str, JSONValue]]] = None) -> int:
+    """render()의 total과 같은 값을 조합 전개 없이 계산한다."""
+    if not prog.combine_expr:
+        return 1
+    space = _combination_space(prog, only=only, fix=fix,
+                               skip_excludes=skip_excludes, extra_excludes=extra_excludes)
+    if space is None:
+        return sum(1 for _ in _iter_combos(prog, only=only, fix=fix,
+                                           skip_excludes=skip_excludes, extra_excludes=extra_excludes))
+    return space.count()
+
+
+# ====== 커버링 배열 ======
+#
+# coverage=t는 서로 다른 축 t개의 키 조합("t-튜플")이 결과에 한 번 이상 나오도록 적은 수의
+# 조합을 고른다. AETG 방식의 탐욕 알고리즘이다.
+#
+# - 같이 나올 수 없는 축(Sum의 서로 다른 가지)의 튜플은 처음부터 세지 않는다.
+# - 행은 아직 안 덮인 튜플 하나로 시작하고, 나머지 축은 새로 덮는 튜플이 가장 많은 키를 고른다.
+#   이때 exclude는 _RuleMatcher로만 거르고, 완성은 fix로 컴파일한 조합 공간의 select(0)에
+#   맡기므로 결과는 항상 render()가 만드는 조합 중 하나다.
+# - 완성이 실패하면(규칙끼리 엮여서 매처가 못 잡은 경우) 단계마다 공간으로 확인하며 다시 만든다.
+#   시작 튜플 자체가 어떤 조합에도 나올 수 없으면 "불가능"으로 세고 뺀다.
+
+
+def _cooccurring(node: _Node, out: set[frozenset[str]]) -> None:
+    """한 조합 안에 같이 나올 수 있는 이름 쌍 (어떤 Product의 서로 다른 자식에 속함)."""
+    if isinstance(node, _Leaf):
+        return
+    if isinstance(node, _Product):
+        for i, left in enumerate(node.children):
+            for right in node.children[i + 1:]:
+                out.update(frozenset((a, b)) for a in left.scope for b in right.scope)
+    for child in node.children:
+        _cooccurring(child, out)
+
+
+class _CoveringBuilder:
+    """정규화된 조합 공간 위에서 t-way 커버링 배열을 만든다."""
+
+    def __init__(self, prog: Program, root: _Node, rules: List[ExcludeRule], strength: int, *,
+                 only: Optional[Dict[str, List[str]]], fix: Optional[Dict[str, str]]) -> None:
+        # 행 완성은 이미 필터가 적용된 base.root에 여러 축 AND 규칙과 행의 fix만 다시 건다
+        base = self.base = _CombinationSpace(root, _compile_filters(rules, root.scope, only=only, fix=fix))
+        self.matcher = base.matcher
+        self.values: Dict[str, Dict[str, AxisValue]] = {}
+        if base.root is not None:
+            for name, axis in prog.axes.items():
+                if name in root.scope:
+                    vals = {v.key: v for v in axis.values if base.filters.keeps({name: v}, frozenset((name,)))}
+                    if vals:
+                        self.values[name] = vals
+        self.pairs: set[frozenset[str]] = set()
+        _cooccurring(root, self.pairs)
+        names = list(self.values)
+        self.strength = min(strength, len(names))
+        self.groups = [
+            g for g in itertools.combinations(names, self.strength)
+            if all(frozenset(p) in self.pairs for p in itertools.combinations(g, 2))
+        ] if self.strength else []
+        # 순서가 결과를 정하므로 set 대신 삽입 순서가 있는 dict를 쓴다
+        self.uncovered: Dict[tuple[str, ...], Dict[tuple[str, ...], None]] = {
+            g: dict.fromkeys(itertools.product(*(self.values[a] for a in g))) for g in self.groups
+        }
+        self.by_axis: Dict[str, List[tuple[str, ...]]] = {a: [g for g in self.groups if a in g] for a in names}
+        self.tuples = sum(len(u) for u in self.uncovered.values())
+        self.infeasible = 0
+
+    def _complete(self, partial: Dict[str, str]) -> Optional[Dict[str, AxisValue]]:
+        root = self.base.root
+        if root is None:
+            return None
+        filters = _compile_filters(self.base.filters.mask_rules, root.scope, only=None, fix=partial)
+        return _CombinationSpace(root, filters).select(0)
+
+    def _allowed(self, partial: Dict[str, str], checked: bool) -> bool:
+        if checked:
+            return self._complete(partial) is not None
+        return not self.matcher.decided({a: self.values[a][k] for a, k in partial.items()}, frozenset())
+
+    def _gains(self, partial: Dict[str, str], axis: str) -> Callable[[str], int]:
+        """axis에 키 k를 넣었을 때 새로 덮이는 튜플 수를 세는 함수."""
+        relevant: List[tuple[Dict[tuple[str, ...], None], tuple[str, ...], tuple[str, ...]]] = []
+        for g in self.by_axis[axis]:
+            if all(a == axis or a in partial for a in g):
+                i = g.index(axis)
+                relevant.append((self.uncovered[g],
+                                 tuple(partial[a] for a in g[:i]),
+                                 tuple(partial[a] for a in g[i + 1:])))
+        return lambda key: sum((before + (key,) + after) in unc for unc, before, after in relevant)
+
+    def _row(self, group: tuple[str, ...], keys: tuple[str, ...], checked: bool) -> Optional[Dict[str, str]]:
+        partial = dict(zip(group, keys))
+        if checked and not self._allowed(partial, True):
+            return None
+        # 덮을 튜플이 많이 남은 축부터 정한다
+        rest = sorted((a for a in self.values if a not in partial),
+                      key=lambda a: -sum(len(self.uncovered[g]) for g in self.by_axis[a]))
+        for axis in rest:
+            if not all(frozenset((axis, b)) in self.pairs for b in partial):
+                continue
+            gain = self._gains(partial, axis)
+            for key in sorted(self.values[axis], key=lambda k: -gain(k)):
+                partial[axis] = key
+                if self._allowed(partial, checked):
+                    break
+                del partial[axis]
+        return partial
+
+    def _cover(self, combo: Dict[str, AxisValue]) -> None:
+        for g in self.groups:
+            if all(a in combo for a in g):
+                self.uncovered[g].pop(tuple(combo[a].key for a in g), None)
+
+    def build(self, max_rows: int = 0) -> List[Dict[str, AxisValue]]:
+        rows: List[Dict[str, AxisValue]] = []
+        while not max_rows or len(rows) < max_rows:
+            group = max(self.groups, key=lambda g: len(self.uncovered[g]), default=None)
+            if group is None or not self.uncovered[group]:
+                break
+            keys = next(iter(self.uncovered[group]))
+            partial = self._row(group, keys, checked=False)
+            combo = self._complete(partial) if partial is not None else None
+            if combo is None:
+                partial = self._row(group, keys, checked=True)
+                combo = self._complete(partial) if partial is not None else None
+            if combo is None:
+                del self.uncovered[group][keys]
+                self.infeasible += 1
+                continue
+            self._cover(combo)
+            rows.append(combo)
+        if not rows:
+            # 덮을 튜플이 없어도(값이 있는 축이 없음) 조합이 있으면 하나는 낸다
+            combo = self._complete({})
+            if combo is not None:
+                rows.append(combo)
+        return rows
+
+
+def _row_tuples(combo: Dict[str, AxisValue], names: List[str],
+                strength: int) -> set[tuple[tuple[str, ...], tuple[str, ...]]]:
+    """조합 하나가 덮는 t-튜플들 ((축 이름들), (키들))."""
+    present = [a for a in names if a in combo]
+    return {(g, tuple(combo[a].key for a in g)) for g in itertools.combinations(present, strength)}
+
+
+def _cover_listed(combos: Iterator[Dict[str, AxisValue]], names: List[str], strength: int,
+                  max_rows: int = 0) -> tuple[List[Dict[str, AxisValue]], int]:
+    """정규화할 수 없는 조합식용: 전개한 조합 목록에서 탐욕적으로 덮개를 고른다.
+
+    (조합 목록, 전체 튜플 수)를 반환한다.
+    """
+    candidates = [(combo, _row_tuples(combo, names, strength)) for combo in combos]
+    uncovered = set().union(*(c[1] for c in candidates))
+    total = len(uncovered)
+    rows: List[Dict[str, AxisValue]] = []
+    while uncovered and (not max_rows or len(rows) < max_rows):
+        combo, covered = max(candidates, key=lambda c: len(c[1] & uncovered))
+        rows.append(combo)
+        uncovered -= covered
+    if not rows and candidates:
+        rows.append(candidates[0][0])
+    return rows, total
+
+
+def covering_array(prog: Program, strength: int, *,
+                   only: Optional[Dict[str, List[str]]] = None,
+                   fix: Optional[Dict[str, str]] = None,
+                   skip_excludes: bool = False,
+                   extra_excludes: Optional[List[Dict[str, JSONValue]]] = None,
+                   max_rows: int = 0) -> tuple[List[Dict[str, AxisValue]], Dict[str, JSONValue]]:
+    """필터를 통과한 조합 중, 서로 다른 축 strength개의 키 조합을 모두 덮는 작은 부분집합.
+
+    반환값은 (조합 목록, 보고서). 조합은 새로 덮는 튜플이 많은 것부터 나오므로
+    max_rows로 앞쪽만 잘라도 그 개수에서 덮는 비율이 높다.
+    보고서: tuples = 같이 나올 수 있는 축들의 t-튜플 수, infeasible = exclude 때문에
+    어떤 조합에도 나올 수 없는 튜플 수, covered = 반환한 조합들이 덮은 튜플 수,
+    ratio = covered / (tuples - infeasible). max_rows로 자르면 infeasible은 그때까지 발견한
+    것만 센다. strength가 축 수보다 크면 축 수로 줄인다.
+    """
+    if strength < 1:
+        raise ValueError("strength must be >= 1")
+    if not prog.combine_expr:
+        return [], {"strength": 0, "tuples": 0, "covered": 0, "infeasible": 0, "ratio": 1.0, "rows": 0}
+    _check_expr_names(prog.combine_expr, prog.axes, prog.vars)
+    names = list(prog.axes)
+    try:
+        root = _compile_node(prog.combine_expr, prog.axes, prog.vars)
+    except _NotDisjoint:
+        t = min(strength, len(names))
+        combos = _iter_combos(prog, only=only, fix=fix,
+                              skip_excludes=skip_excludes, extra_excludes=extra_excludes)
+        rows, total = _cover_listed(combos, names, t, max_rows)
+        infeasible = 0
+    else:
+        rules = _exclude_rules(prog, skip_excludes=skip_excludes, extra_excludes=extra_excludes)
+        builder = _CoveringBuilder(prog, root, rules, strength, only=only, fix=fix)
+        rows = builder.build(max_rows)
+        t, total, infeasible = builder.strength, builder.tuples, builder.infeasible
+    covered = len(set().union(*(_row_tuples(r, names, t) for r in rows))) if t else 0
+    feasible = total - infeasible
+    return rows, {
+        "strength": t,
+        "tuples": total,
+        "covered": covered,
+        "infeasible": infeasible,
+        "ratio": covered / feasible if feasible else 1.0,
+        "rows": len(rows),
+    }
 
 
 # ====== 렌더러 ======
 
+_SUBST_ROUNDS = 5  # 최대 5번 재귀적 치환
+_KEY_TOKEN_RE = re.compile(r'\{\{(\w+)\.key\}\}')
+_PROP_TOKEN_RE = re.compile(r'\{\{(\w+)\.(\w+)\}\}')
+_NAME_TOKEN_RE = re.compile(r'\{\{(\w+)\}\}')
+_TOKEN_RE = re.compile(r'\{\{(\w+)(?:\.(\w+))?\}\}')
+_FILENAME_RUN_RE = re.compile(r'([_.-])\1+')
+
+
 def _substitute(template: str, ctx: Dict[str, str], keys: Dict[str, str]) -> str:
     out = template
-    for _ in range(5):  # 최대 5번 재귀적 치환
+    for _ in range(_SUBST_ROUNDS):
         prev = out
-        out = re.sub(
-            r'\{\{(\w+)\.key\}\}',
+        out = _KEY_TOKEN_RE.sub(
             lambda m: keys.get(m.group(1), m.group(0)),
             out,
         )
-        out = re.sub(
-            r'\{\{(\w+)\.(\w+)\}\}',
+        out = _PROP_TOKEN_RE.sub(
             lambda m: str(ctx.get(f"{m.group(1)}.{m.group(2)}", m.group(0))),
             out,
         )
-        out = re.sub(
-            r'\{\{(\w+)\}\}',
+        out = _NAME_TOKEN_RE.sub(
             lambda m: str(ctx.get(m.group(1), m.group(0))),
             out,
         )
@@ -532,133 +1430,313 @@ def _substitute(template: str, ctx: Dict[str, str], keys: Dict[str, str]) -> str
 
 
 def _clean_prompt(s: str) -> str:
-    s = re.sub(r'\s+', ' ', s)
-    s = re.sub(r'\s*,\s*', ', ', s)
-    s = re.sub(r'(,\s*)+', ', ', s)
-    return s.strip(" ,\n")
+    # 공백 덩어리는 " " 하나로, 쉼표가 섞인 덩어리는 ", " 하나로, 앞뒤 쉼표/공백은 제거
+    # (str.split()과 정규식 \s는 같은 유니코드 공백 정의를 쓴다)
+    s = " ".join(s.split()).replace(" ,", ",").replace(", ", ",")
+    return ", ".join(filter(None, s.split(",")))
 
 
-def render(prog: Program, *,
-           only: Optional[Dict[str, List[str]]] = None,
-           fix: Optional[Dict[str, str]] = None,
-           skip_excludes: bool = False,
-           extra_excludes: Optional[List[Dict[str, JSONValue]]] = None,
-           limit: int = 0,
-           offset: int = 0) -> Dict[str, JSONValue]:
-    if not prog.combine_expr:
-        return {
-            "total": 1,
-            "items": [{
-                "filename": _substitute(prog.filename, prog.vars, {}).strip(),
-                "prompt": _clean_prompt(_substitute(prog.template, prog.vars, {})),
-                "meta": {},
-            }],
-            "axes": {},
-            "sets": dict(prog.vars),
-            "excludes": [],
-            "template_structure": [ln.to_dict() for ln in prog.template_structure],
-        }
+def _clean_filename(s: str) -> str:
+    s = _FILENAME_RUN_RE.sub(r'\1', s)  # __ → _, -- → -, .. → .
+    return s.strip('_-. ')
 
-    combos = eval_expr(prog.combine_expr, prog.axes, prog.vars)
 
-    # -- only: axis 값 선택적 포함 --
-    if only:
-        combos = [c for c in combos if all(
-            c.get(ax) is not None and c[ax].key in keys
-            for ax, keys in only.items()
-        )]
+# ── 치환 계획 ──
+#
+# _substitute()는 조합마다 정규식 3개를 최대 5라운드 돌린다. {{template}}/{{filename}}
+# 본문은 Program마다 고정이므로, 리터럴 조각 + 슬롯(축 값/키/속성/별칭) 목록으로 한 번
+# 컴파일해 두고 조합마다 join 한 번으로 실행한다.
+#
+# - set 변수는 조합과 무관하므로 컴파일 시점에 펼친다. 라운드/패스 순서도 그대로 따라서,
+#   5라운드 안에 풀리지 않는 순환 참조는 _substitute()와 똑같이 원문으로 남는다.
+# - 축 값처럼 조합마다 달라지는 텍스트에 토큰이 있으면 그 텍스트별로 하위 계획을 만들어 둔다.
+# - 토큰이 아닌 중괄호가 있으면 치환 결과끼리 이어 붙어 새 토큰이 생길 수 있으므로
+#   계획을 포기하고 _substitute()로 되돌아간다.
 
-    # -- fix: 특정 축을 단일 값으로 고정 --
-    if fix:
-        combos = [c for c in combos if all(
-            c.get(ax) is not None and c[ax].key == val
-            for ax, val in fix.items()
-        )]
-
-    # -- skip_excludes: 기존 exclude 규칙 무시 --
-    if not skip_excludes:
-        def program_excluded(combo_dict: Dict[str, AxisValue]) -> bool:
-            cks = {k: v.key for k, v in combo_dict.items()}
-            for rule in prog.excludes:
-                results = []
-                for cond in rule.conditions:
-                    val = cks.get(cond.axis)
-                    if val is None:
-                        results.append(False)
-                    elif cond.op == "eq":
-                        results.append(val == cond.values[0])
-                    elif cond.op == "in":
-                        results.append(val in cond.values)
-                    elif cond.op == "not_in":
-                        results.append(val not in cond.values)
-                if rule.connective == "AND":
-                    if all(results):
-                        return True
-                else:
-                    if any(results):
-                        return True
-            return False
-        combos = [c for c in combos if not program_excluded(c)]
+_PlanPart = Union[str, Callable[[Dict[str, AxisValue]], str]]
+
+
+class _Unplannable(Exception):
+    """토큰이 아닌 중괄호가 있음 — 치환 계획으로 옮길 수 없다."""
 
-    # -- extra_excludes: 추가 제외 규칙 --
+
+def _has_stray_braces(s: str) -> bool:
+    if '{' not in s and '}' not in s:
+        return False
+    rest = _TOKEN_RE.sub('', s)
+    return '{' in rest or '}' in rest
+
+
+@dataclass
+class _TextPlan:
+    parts: List[_PlanPart]
+
+    def render(self, combo: Dict[str, AxisValue]) -> str:
+        return "".join([p if isinstance(p, str) else p(combo) for p in self.parts])
+
+
+@dataclass
+class _RenderPlan:
+    """Program 하나의 템플릿/파일명 치환 계획."""
+    template: _TextPlan
+    filename: _TextPlan
+
+
+class _PlanCompiler:
+    """_substitute()의 치환 순서를 컴파일 시점에 재현한다.
+
+    한 라운드는 .key → .속성 → 이름 순으로 패스를 돈다. 패스 p에서 끼워 넣은 텍스트 속
+    토큰은 자기 패스가 p보다 뒤면 같은 라운드에, 아니면 다음 라운드에 풀린다.
+    """
+
+    def __init__(self, prog: Program) -> None:
+        self.prog = prog
+
+    def text(self, s: str, rnd: int, after: int) -> _TextPlan:
+        """라운드 rnd의 패스 after에서 끼워 넣어진 텍스트 s의 계획."""
+        parts: List[_PlanPart] = []
+        for p in self._parts(s, rnd, after):
+            if isinstance(p, str) and parts and isinstance(parts[-1], str):
+                parts[-1] += p
+            elif p != "":
+                parts.append(p)
+        return _TextPlan(parts=parts)
+
+    def _parts(self, s: str, rnd: int, after: int) -> List[_PlanPart]:
+        if '{' not in s:
+            return [s]
+        if _has_stray_braces(s):
+            raise _Unplannable()
+        out: List[_PlanPart] = []
+        pos = 0
+        for m in _TOKEN_RE.finditer(s):
+            out.append(s[pos:m.start()])
+            out.extend(self._token(m, rnd, after))
+            pos = m.end()
+        out.append(s[pos:])
+        return out
+
+    def _token(self, m: re.Match[str], rnd: int, after: int) -> List[_PlanPart]:
+        prog = self.prog
+        name, attr, raw = m.group(1), m.group(2), m.group(0)
+        stage = 3 if attr is None else 1 if attr == "key" else 2
+        r = rnd if stage > after else rnd + 1
+        if r > _SUBST_ROUNDS:
+            return [raw]
+        if attr is None:
+            if name == prog.combine_alias:
+                return [self._slot(_alias_value, "", r, stage)]
+            if name in prog.axes:
+                return [self._slot(lambda c: _value_of(c, name), "", r, stage)]
+            if name in prog.vars:
+                return self._parts(prog.vars[name], r, stage)
+            return [raw]
+        if attr == "key":
+            if name == prog.combine_alias:
+                return [self._slot(_alias_key, "", r, stage)]
+            if name in prog.axes:
+                return [self._slot(lambda c: _key_of(c, name), "", r, stage)]
+            if name in prog.vars:
+                # set 변수는 조합식에 쓰였을 때만 키가 생긴다
+                return [self._slot(lambda c: _key_of(c, name), raw, r, stage)]
+            return [raw]
+        return [self._slot(lambda c: _prop_of(c, name, attr), raw, r, stage)]
+
+    def _slot(self, get: Callable[[Dict[str, AxisValue]], Optional[str]], default: str,
+              rnd: int, stage: int) -> Callable[[Dict[str, AxisValue]], str]:
+        plans: Dict[str, _TextPlan] = {}
+
+        def slot(combo: Dict[str, AxisValue]) -> str:
+            s = get(combo)
+            if s is None:
+                return default
+            if '{' not in s:
+                return s
+            plan = plans.get(s)
+            if plan is None:
+                plan = plans[s] = self.text(s, rnd, stage)
+            return plan.render(combo)
+
+        return slot
+
+
+def _value_of(combo: Dict[str, AxisValue], name: str) -> Optional[str]:
+    v = combo.get(name)
+    return None if v is None else v.value
+
+
+def _key_of(combo: Dict[str, AxisValue], name: str) -> Optional[str]:
+    v = combo.get(name)
+    return None if v is None else "" if v.hide_key else v.key
+
+
+def _prop_of(combo: Dict[str, AxisValue], name: str, prop: str) -> Optional[str]:
+    v = combo.get(name)
+    return None if v is None else v.props.get(prop)
+
+
+def _alias_value(combo: Dict[str, AxisValue]) -> str:
+    # v.value가 비어있지 않은 것만 모아서 조립
+    return ", ".join(v.value for v in combo.values() if v.value.strip())
+
+
+def _alias_key(combo: Dict[str, AxisValue]) -> str:
+    return "_".join(v.key for v in combo.values() if v.key.strip() and not v.hide_key)
+
+
+def _expr_literals(expr: object) -> Iterator[str]:
+    if not isinstance(expr, tuple) or len(expr) < 2:
+        return
+    kind, payload = expr[0], expr[1]
+    if kind == 'str':
+        yield str(payload)
+    elif kind == 'hide_key':
+        yield from _expr_literals(payload)
+    elif kind in ('add', 'mul') and isinstance(payload, list):
+        for child in payload:
+            yield from _expr_literals(child)
+
+
+def _compile_render_plan(prog: Program) -> Optional[_RenderPlan]:
+    """치환 계획을 만든다. 조합마다 달라지는 텍스트까지 포함해 토큰이 아닌 중괄호가 있으면 None."""
+    dynamic: List[str] = list(prog.vars.values())
+    dynamic.extend(_expr_literals(prog.combine_expr))
+    for axis in prog.axes.values():
+        dynamic.append(axis.include or "")
+        for v in axis.values:
+            dynamic.extend((v.key, v.value, *v.props.values()))
+    if any(_has_stray_braces(s) for s in dynamic):
+        return None
+    compiler = _PlanCompiler(prog)
+    try:
+        return _RenderPlan(template=compiler.text(prog.template, 1, 0),
+                           filename=compiler.text(prog.filename, 1, 0))
+    except _Unplannable:
+        return None
+
+
+def _parse_extra_excludes(extra_excludes: List[Dict[str, JSONValue]]) -> List[ExcludeRule]:
+    """API로 들어온 추가 제외 규칙(dict)을 ExcludeRule로 변환."""
+    rules = []
+    for r in extra_excludes:
+        conds_raw = r.get("conditions")
+        conditions = []
+        if isinstance(conds_raw, list):
+            for c in conds_raw:
+                if isinstance(c, dict):
+                    axis = str(c.get("axis", ""))
+                    op = str(c.get("op", ""))
+                    vals_raw = c.get("values", [])
+                    values = [str(v) for v in vals_raw] if isinstance(vals_raw, list) else []
+                    conditions.append(Condition(axis=axis, op=op, values=values))
+        connective = str(r.get("connective", "AND"))
+        rules.append(ExcludeRule(conditions=conditions, connective=connective))
+    return rules
+
+
+def _exclude_rules(prog: Program, *, skip_excludes: bool,
+                   extra_excludes: Optional[List[Dict[str, JSONValue]]]) -> List[ExcludeRule]:
+    # skip_excludes: 기존 exclude 규칙 무시, extra_excludes: 추가 제외 규칙
+    rules = [] if skip_excludes else list(prog.excludes)
     if extra_excludes:
-        _extra_rules = []
-        for r in extra_excludes:
-            conds_raw = r.get("conditions")
-            conditions = []
-            if isinstance(conds_raw, list):
-                for c in conds_raw:
-                    if isinstance(c, dict):
-                        axis = str(c.get("axis", ""))
-                        op = str(c.get("op", ""))
-                        vals_raw = c.get("values", [])
-                        values = [str(v) for v in vals_raw] if isinstance(vals_raw, list) else []
-                        conditions.append(Condition(axis=axis, op=op, values=values))
-            connective = str(r.get("connective", "AND"))
-            _extra_rules.append(ExcludeRule(conditions=conditions, connective=connective))
-
-        def extra_excluded(combo_dict: Dict[str, AxisValue]) -> bool:
-            cks = {k: v.key for k, v in combo_dict.items()}
-            for rule in _extra_rules:
-                results = []
-                for cond in rule.conditions:
-                    val = cks.get(cond.axis)
-                    if val is None:
-                        results.append(False)
-                    elif cond.op == "eq":
-                        results.append(val == cond.values[0])
-                    elif cond.op == "in":
-                        results.append(val in cond.values)
-                    elif cond.op == "not_in":
-                        results.append(val not in cond.values)
-                if rule.connective == "AND":
-                    if all(results):
-                        return True
-                else:
-                    if any(results):
-                        return True
-            return False
-        combos = [c for c in combos if not extra_excluded(c)]
+        rules.extend(_parse_extra_excludes(extra_excludes))
+    return rules
 
-    total = len(combos)
 
-    # -- 페이지네이션 --
-    if offset:
-        combos = combos[offset:]
-    if limit:
-        combos = combos[:limit]
+def _combo_filter(*, only: Optional[Dict[str, List[str]]],
+                  fix: Optional[Dict[str, str]]) -> Callable[[Dict[str, AxisValue]], bool]:
+    """only/fix 옵션을 조합 하나에 대한 판정 함수로 묶는다 (True = 남김)."""
 
-    results = []
-    for combo in combos:
+    def keep(combo: Dict[str, AxisValue]) -> bool:
+        # -- only: axis 값 선택적 포함 --
+        if only and not all(
+            combo.get(ax) is not None and combo[ax].key in keys
+            for ax, keys in only.items()
+        ):
+            return False
+        # -- fix: 특정 축을 단일 값으로 고정 --
+        if fix and not all(
+            combo.get(ax) is not None and combo[ax].key == val
+            for ax, val in fix.items()
+        ):
+            return False
+        return True
+
+    return keep
+
+
+def _iter_combos(prog: Program, *,
+                 only: Optional[Dict[str, List[str]]] = None,
+                 fix: Optional[Dict[str, str]] = None,
+                 skip_excludes: bool = False,
+                 extra_excludes: Optional[List[Dict[str, JSONValue]]] = None,
+                 offset: int = 0) -> Iterator[Dict[str, AxisValue]]:
+    """필터를 통과한 조합을 offset번째부터 지연 생성한다.
+
+    조합 공간으로 정규화할 수 있으면 offset까지는 블록 단위로 건너뛰고,
+    아니면 전개하면서 버린다.
+    """
+    space = _combination_space(prog, only=only, fix=fix,
+                               skip_excludes=skip_excludes, extra_excludes=extra_excludes)
+    if space is not None:
+        return space.walk(offset)
+    # exclude는 전개 중에 가지치기하고, only/fix만 완성된 조합에 적용한다
+    rules = _exclude_rules(prog, skip_excludes=skip_excludes, extra_excludes=extra_excludes)
+    combos = iter_expr(prog.combine_expr, prog.axes, prog.vars, rules)
+    return itertools.islice(filter(_combo_filter(only=only, fix=fix), combos), offset, None)
+
+
+def _sample_combos(prog: Program, n: int, seed: Optional[int], *,
+                   only: Optional[Dict[str, List[str]]] = None,
+                   fix: Optional[Dict[str, str]] = None,
+                   skip_excludes: bool = False,
+                   extra_excludes: Optional[List[Dict[str, JSONValue]]] = None) -> Iterator[Dict[str, AxisValue]]:
+    """필터를 통과한 조합 중 n개를 균등하게 (비복원) 뽑아 원래 순서대로 생성한다.
+
+    조합 공간으로 정규화할 수 있으면 살아남는 조합의 인덱스를 뽑아 select()로 바로 찾아가므로
+    조합 수와 무관하게 n에 비례하는 비용이다. 아니면 전개하면서 저수지 샘플링으로 n개만 쥔다.
+    같은 seed면 같은 조합이 나온다.
+    """
+    rng = random.Random(seed)
+    space = _combination_space(prog, only=only, fix=fix,
+                               skip_excludes=skip_excludes, extra_excludes=extra_excludes)
+    if space is not None:
+        total = space.count()
+        for index in sorted(rng.sample(range(total), min(n, total))):
+            combo = space.select(index)
+            if combo is not None:
+                yield combo
+        return
+    reservoir: List[tuple[int, Dict[str, AxisValue]]] = []
+    combos = _iter_combos(prog, only=only, fix=fix,
+                          skip_excludes=skip_excludes, extra_excludes=extra_excludes)
+    for i, combo in enumerate(combos):
+        if i < n:
+            reservoir.append((i, combo))
+        else:
+            j = rng.randrange(i + 1)
+            if j < n:
+                reservoir[j] = (i, combo)
+    reservoir.sort(key=lambda entry: entry[0])
+    for _, combo in reservoir:
+        yield combo
+
+
+def _render_item(prog: Program, combo: Dict[str, AxisValue],
+                 plan: Optional[_RenderPlan] = None) -> Dict[str, JSONValue]:
+    if plan is not None:
+        filename = plan.filename.render(combo)
+        prompt = plan.template.render(combo)
+    else:
         ctx = dict(prog.vars)
         keys = {}
-        
+
         # 생략된 선택적 축들에 대해 빈 문자열 기본값 바인딩
         for name, axis_obj in prog.axes.items():
             if name not in combo:
                 ctx[name] = ""
                 keys[name] = ""
-                
+
         for k, v in combo.items():
             ctx[k] = v.value
             if not getattr(v, "hide_key", False):
@@ -667,31 +1745,103 @@ def render(prog: Program, *,
                 keys[k] = ""
             for prop_name, prop_val in v.props.items():
                 ctx[f"{k}.{prop_name}"] = prop_val
-            
+
         if prog.combine_alias:
-            alias = prog.combine_alias
-            # v.value가 비어있지 않은 것만 모아서 조립
-            c_val = ", ".join(v.value for v in combo.values() if v.value.strip())
-            c_key = "_".join(v.key for v in combo.values() if v.key.strip() and not getattr(v, "hide_key", False))
-            ctx[alias] = c_val
-            keys[alias] = c_key
-
-        filename = _substitute(prog.filename, ctx, keys).strip()
-        
-        # clean_filename 옵션이 true(기본값)인 경우에만 다듬기 수행
-        clean_opt = prog.vars.get("clean_filename", "true").lower() == "true"
-        if clean_opt:
-            filename = re.sub(r'__+', '_', filename)
-            filename = re.sub(r'--+', '-', filename)
-            filename = re.sub(r'\.\.+', '.', filename)
-            filename = filename.strip('_-. ')
-
-        results.append({
-            "filename": filename,
-            "prompt": _clean_prompt(_substitute(prog.template, ctx, keys)),
-            "meta": {k: v for k, v in keys.items() if k != prog.combine_alias and keys[k]},
-        })
+            ctx[prog.combine_alias] = _alias_value(combo)
+            keys[prog.combine_alias] = _alias_key(combo)
+
+        filename = _substitute(prog.filename, ctx, keys)
+        prompt = _substitute(prog.template, ctx, keys)
+
+    filename = filename.strip()
+    # clean_filename 옵션이 true(기본값)인 경우에만 다듬기 수행
+    clean_opt = prog.vars.get("clean_filename", "true").lower() == "true"
+    if clean_opt:
+        filename = _clean_filename(filename)
+
+    return {
+        "filename": filename,
+        "prompt": _clean_prompt(prompt),
+        "meta": {k: v.key for k, v in combo.items()
+                 if k != prog.combine_alias and v.key and not v.hide_key},
+    }
+
+
+def _render_single(prog: Program) -> Dict[str, JSONValue]:
+    """combine 없는 템플릿의 유일한 항목."""
+    return {
+        "filename": _substitute(prog.filename, prog.vars, {}).strip(),
+        "prompt": _clean_prompt(_substitute(prog.template, prog.vars, {})),
+        "meta": {},
+    }
+
+
+def render_iter(prog: Program, *,
+                only: Optional[Dict[str, List[str]]] = None,
+                fix: Optional[Dict[str, str]] = None,
+                skip_excludes: bool = False,
+                extra_excludes: Optional[List[Dict[str, JSONValue]]] = None,
+                limit: int = 0,
+                offset: int = 0,
+                sample: int = 0,
+                seed: Optional[int] = None,
+                coverage: int = 0) -> Iterator[Dict[str, JSONValue]]:
+    """렌더링 항목을 지연 생성한다.
+
+    조합식을 전개하면서 필터를 바로 적용하고, offset+limit개를 채우면 전개를 멈춘다.
+    offset 앞의 조합은 전개하지 않고 건너뛴다.
+    메모리 사용량은 조합 총수가 아니라 소비자가 쥐고 있는 항목 수에 비례한다.
+    sample>0이면 필터를 통과한 조합 중 sample개를 seed로 균등 추출하고,
+    coverage=t면 t-way 커버링 배열(covering_array)의 조합만 낸다.
+    두 경우 모두 offset/limit은 뽑힌 항목들 안에서 적용한다.
+    """
+    if not prog.combine_expr:
+        yield _render_single(prog)
+        return
+
+    combos: Iterator[Dict[str, AxisValue]]
+    if coverage:
+        rows, _ = covering_array(
+            prog, coverage, only=only, fix=fix,
+            skip_excludes=skip_excludes, extra_excludes=extra_excludes,
+            max_rows=offset + limit if limit else 0,
+        )
+        combos = iter(rows[offset:])
+    elif sample:
+        combos = itertools.islice(_sample_combos(
+            prog, sample, seed, only=only, fix=fix,
+            skip_excludes=skip_excludes, extra_excludes=extra_excludes,
+        ), offset, None)
+    else:
+        combos = _iter_combos(
+            prog, only=only, fix=fix,
+            skip_excludes=skip_excludes, extra_excludes=extra_excludes,
+            offset=offset,
+        )
+    # -- 페이지네이션 --
+    if limit:
+        combos = itertools.islice(combos, limit)
+    plan = _compile_render_plan(prog)
+    for combo in combos:
+        yield _render_item(prog, combo, plan)
 
+
+def render_at(prog: Program, index: int, *,
+              only: Optional[Dict[str, List[str]]] = None,
+              fix: Optional[Dict[str, str]] = None,
+              skip_excludes: bool = False,
+              extra_excludes: Optional[List[Dict[str, JSONValue]]] = None) -> Optional[Dict[str, JSONValue]]:
+    """index번째 렌더링 항목 (범위 밖이면 None). render(offset=index, limit=1)의 단건 버전."""
+    if index < 0:
+        return None
+    if not prog.combine_expr:
+        return _render_single(prog) if index == 0 else None
+    return next(render_iter(prog, only=only, fix=fix, skip_excludes=skip_excludes,
+                            extra_excludes=extra_excludes, offset=index, limit=1), None)
+
+
+def _render_meta(prog: Program) -> Dict[str, JSONValue]:
+    """render() 응답의 items/total을 제외한 부분 (축/세트/제외 규칙/구조)."""
     axes_info = {}
     for name, axis_obj in prog.axes.items():
         axes_info[name] = {
@@ -719,8 +1869,6 @@ def render(prog: Program, *,
     ]
 
     return cast(Dict[str, JSONValue], {
-        "total": total,
-        "items": results,
         "axes": axes_info,
         "sets": dict(prog.vars),
         "excludes": excludes_info,
@@ -728,6 +1876,93 @@ def render(prog: Program, *,
     })
 
 
+def render_header(prog: Program, *,
+                  only: Optional[Dict[str, List[str]]] = None,
+                  fix: Optional[Dict[str, str]] = None,
+                  skip_excludes: bool = False,
+                  extra_excludes: Optional[List[Dict[str, JSONValue]]] = None) -> Dict[str, JSONValue]:
+    """render() 응답에서 items를 뺀 부분 (total/축/세트/제외 규칙/구조).
+
+    조합을 전개하지 않으므로 조합 수와 무관하게 빠르다. 스트리밍 응답의 첫 레코드로 쓴다.
+    """
+    if not prog.combine_expr:
+        return {
+            "total": 1,
+            "axes": {},
+            "sets": dict(prog.vars),
+            "excludes": [],
+            "template_structure": [ln.to_dict() for ln in prog.template_structure],
+        }
+    total = count_combinations(prog, only=only, fix=fix,
+                               skip_excludes=skip_excludes, extra_excludes=extra_excludes)
+    return {"total": total, **_render_meta(prog)}
+
+
+def render_covering(prog: Program, coverage: int, *,
+                    only: Optional[Dict[str, List[str]]] = None,
+                    fix: Optional[Dict[str, str]] = None,
+                    skip_excludes: bool = False,
+                    extra_excludes: Optional[List[Dict[str, JSONValue]]] = None,
+                    limit: int = 0,
+                    offset: int = 0) -> tuple[Iterator[Dict[str, JSONValue]], Optional[Dict[str, JSONValue]]]:
+    """coverage=t 렌더링: (항목 이터레이터, covering_array 보고서).
+
+    보고서는 이 페이지까지(앞쪽 offset+limit개) 낸 조합이 덮은 비율이다.
+    조합식이 없으면 단일 항목과 None을 낸다. render()와 스트리밍 응답이 같이 쓴다.
+    """
+    if not prog.combine_expr:
+        return iter([_render_single(prog)]), None
+    rows, report = covering_array(
+        prog, coverage, only=only, fix=fix,
+        skip_excludes=skip_excludes, extra_excludes=extra_excludes,
+        max_rows=offset + limit if limit else 0,
+    )
+    plan = _compile_render_plan(prog)
+    return (_render_item(prog, combo, plan) for combo in rows[offset:]), report
+
+
+def render(prog: Program, *,
+           only: Optional[Dict[str, List[str]]] = None,
+           fix: Optional[Dict[str, str]] = None,
+           skip_excludes: bool = False,
+           extra_excludes: Optional[List[Dict[str, JSONValue]]] = None,
+           limit: int = 0,
+           offset: int = 0,
+           sample: int = 0,
+           seed: Optional[int] = None,
+           coverage: int = 0) -> Dict[str, JSONValue]:
+    """템플릿을 렌더링해 {"total", "items", 축/세트/제외 규칙/구조[, "coverage"]}를 돌려준다.
+
+    total은 항상 필터를 통과한 조합 총수(count_combinations와 같은 값)다. limit/offset,
+    sample, coverage는 items만 줄이고 total은 바꾸지 않는다. 돌려준 항목 수는 len(items)이고,
+    추출 크기는 min(sample, total), 커버링 배열 크기는 coverage["rows"]로 알 수 있다.
+    """
+    header = render_header(prog, only=only, fix=fix,
+                           skip_excludes=skip_excludes, extra_excludes=extra_excludes)
+    report: Optional[Dict[str, JSONValue]] = None
+    items: List[JSONValue]
+    if coverage:
+        covered, report = render_covering(
+            prog, coverage, only=only, fix=fix,
+            skip_excludes=skip_excludes, extra_excludes=extra_excludes,
+            limit=limit, offset=offset,
+        )
+        items = list(covered)
+    elif not prog.combine_expr:
+        items = [_render_single(prog)]
+    else:
+        items = list(render_iter(
+            prog, only=only, fix=fix,
+            skip_excludes=skip_excludes, extra_excludes=extra_excludes,
+            limit=limit, offset=offset, sample=sample, seed=seed,
+        ))
+    total = header.pop("total")
+    out: Dict[str, JSONValue] = {"total": total, "items": items, **header}
+    if report is not None:
+        out["coverage"] = report
+    return out
+
+
 # ====== ComfyUI 연동 ======
 
 WorkflowNode = Union[Dict[str, 'WorkflowNode'], List['WorkflowNode'], str, int, float, bool, None]
@@ -751,6 +1986,117 @@ def inject_into_workflow(workflow: WorkflowNode, prompt: Union[str, Dict[str, st
     return walk(workflow)
 
 
+class _StrSlot:
+    """플레이스홀더가 든 문자열 하나. 키가 하나면 미리 잘라 둔 조각을 값으로 잇기만 한다."""
+
+    __slots__ = ("source", "segments")
+
+    def __init__(self, source: str, keys: tuple[str, ...]) -> None:
+        self.source = source
+        # str.replace(k, v) == v.join(s.split(k)) — 빈 키는 split이 안 되므로 replace로 처리
+        self.segments = source.split(keys[0]) if len(keys) == 1 and keys[0] else None
+
+    def fill(self, keys: tuple[str, ...], values: tuple[str, ...]) -> str:
+        if self.segments is not None:
+            return values[0].join(self.segments)
+        # 키가 여럿이면 앞 값에 뒤 키가 들어 있을 수 있으므로 inject_into_workflow와 같은 순서로 치환
+        out = self.source
+        for k, v in zip(keys, values):
+            out = out.replace(k, v)
+        return out
+
+
+class _TreeSlot:
+    """플레이스홀더가 든 하위 노드를 가진 dict/list. children은 (키 또는 인덱스, 슬롯)."""
+
+    __slots__ = ("children",)
+
+    def __init__(self, children: List[tuple[Union[str, int], Union["_TreeSlot", _StrSlot]]]) -> None:
+        self.children = children
+
+
+class InjectionPlan:
+    """워크플로우 하나에 대한 주입 계획.
+
+    워크플로우를 한 번만 훑어 플레이스홀더가 든 문자열의 위치만 기록해 두고,
+    inject()는 그 경로에 있는 dict/list만 얕게 복사해 슬롯을 채운다. 나머지 하위 트리는
+    원본과 공유하므로 결과를 고쳐 쓰지 말 것 (고칠 거면 inject_into_workflow를 쓴다).
+    결과 값은 같은 키 순서의 inject_into_workflow와 같다.
+    """
+
+    def __init__(self, workflow: WorkflowNode, placeholders: tuple[str, ...]) -> None:
+        self.workflow = workflow
+        self.keys = placeholders
+        self.root = self._scan(workflow)
+
+    def _scan(self, obj: WorkflowNode) -> Union[_TreeSlot, _StrSlot, None]:
+        if isinstance(obj, str):
+            return _StrSlot(obj, self.keys) if any(k in obj for k in self.keys) else None
+        items: Iterator[tuple[Union[str, int], WorkflowNode]]
+        if isinstance(obj, dict):
+            items = iter(obj.items())
+        elif isinstance(obj, list):
+            items = enumerate(obj)
+        else:
+            return None
+        children: List[tuple[Union[str, int], Union[_TreeSlot, _StrSlot]]] = []
+        for k, v in items:
+            slot = self._scan(v)
+            if slot is not None:
+                children.append((k, slot))
+        return _TreeSlot(children) if children else None
+
+    def inject(self, values: Union[str, Dict[str, str]]) -> WorkflowNode:
+        """값 하나(키가 하나일 때) 또는 {placeholder: value}로 슬롯을 채운 워크플로우."""
+        if isinstance(values, dict):
+            if tuple(values) != self.keys:
+                raise ValueError(f"placeholders {tuple(values)} do not match plan {self.keys}")
+            vals = tuple(values.values())
+        else:
+            vals = (values,)
+        return self._fill(self.workflow, self.root, vals)
+
+    def _fill(self, obj: WorkflowNode, slot: Union[_TreeSlot, _StrSlot, None],
+              values: tuple[str, ...]) -> WorkflowNode:
+        if slot is None:
+            return obj
+        if isinstance(slot, _StrSlot):
+            return slot.fill(self.keys, values)
+        if isinstance(obj, dict):
+            out_d = dict(obj)
+            for k, child in slot.children:
+                out_d[cast(str, k)] = self._fill(obj[cast(str, k)], child, values)
+            return out_d
+        out_l = list(cast(List[WorkflowNode], obj))
+        for i, child in slot.children:
+            out_l[cast(int, i)] = self._fill(out_l[cast(int, i)], child, values)
+        return out_l
+
+
+def compile_injection(workflow: WorkflowNode, placeholders: Union[str, List[str], tuple[str, ...]]) -> InjectionPlan:
+    """워크플로우를 한 번 훑어 주입 계획을 만든다. placeholders 순서대로 치환한다."""
+    keys = (placeholders,) if isinstance(placeholders, str) else tuple(placeholders)
+    return InjectionPlan(workflow, keys)
+
+
+def inject_many(workflow: WorkflowNode, prompts: List[Union[str, Dict[str, str]]],
+                placeholder: str = "{{input}}") -> List[WorkflowNode]:
+    """프롬프트 여러 개를 주입한 워크플로우 목록. inject_into_workflow를 N번 부른 것과 같은 값이다.
+
+    플레이스홀더 구성(순서 포함)마다 계획을 한 번만 만들고, 결과들은 바뀌지 않은 하위 트리를
+    서로 공유한다 (InjectionPlan 참고).
+    """
+    plans: Dict[tuple[str, ...], InjectionPlan] = {}
+    out: List[WorkflowNode] = []
+    for prompt in prompts:
+        keys = tuple(prompt) if isinstance(prompt, dict) else (placeholder,)
+        plan = plans.get(keys)
+        if plan is None:
+            plan = plans[keys] = InjectionPlan(workflow, keys)
+        out.append(plan.inject(prompt))
+    return out
+
+
 # ====== CLI ======
 
 if __name__ == "__main__":
@@ -9,8 +9,14 @@
 엔드포인트:
     GET  /health                       - 백엔드 + 워커 풀 상태
     POST /render                       - DSL 템플릿 → 프롬프트 리스트
+    POST /render/stream                - /render의 NDJSON 스트리밍 버전 (헤더 → 항목 → 끝)
+    POST /render/count                 - 필터 적용 후 조합 수 (전개 없이 계산)
+    GET  /render/item/{index}          - index번째 렌더링 항목 (앞 조합 전개 없이)
     POST /workflow/inject              - 워크플로우에 프롬프트 주입
+    POST /workflow/inject/batch        - 워크플로우 하나에 프롬프트 N개 주입 (주입 계획 재사용)
     POST /jobs                         - 잡 N개 등록 (프론트가 시드/치환 박은 워크플로우 제출)
+    POST /jobs/from-template           - 템플릿 + 기본 워크플로우 + 노드 매핑 → 서버에서 전개해 청크 단위로 잡 등록
+    GET  /jobs/from-template/{batch_id} - 위 배치의 진행 상황
     GET  /jobs                         - 잡 목록 (선택적 필터: status,filename,limit,offset)
     DELETE /jobs/{id}                  - 잡 취소
     GET  /images/{worker_id}/view      - ComfyUI view 프록시 (실시간)
@@ -42,15 +48,17 @@ import asyncio
 import gc
 import hashlib
 import io
+import itertools
 import json
 import logging
 import mimetypes
 import zipfile
 import os
+import random
 import tracemalloc
 from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Dict, List, Literal, Optional, Union, AsyncGenerator
+from typing import Dict, Iterator, List, Literal, Optional, Union, AsyncGenerator
 
 from fastapi import FastAPI, HTTPException, UploadFile, WebSocket, WebSocketDisconnect, Request, Query
 from fastapi.middleware.cors import CORSMiddleware
@@ -58,10 +66,24 @@ from fastapi.responses import FileResponse, JSONResponse, Response, StreamingRes
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel, Field
 
-from backend.src.prompt_dsl import DSLSyntaxError, parse, render, inject_into_workflow
+from backend.src.prompt_dsl import (
+    DSLSyntaxError,
+    count_combinations,
+    inject_into_workflow,
+    inject_many,
+    parse,
+    parse_cache_stats,
+    render,
+    render_at,
+    render_covering,
+    render_header,
+    render_iter,
+)
 from backend.src.worker_pool import DEFAULT_COMFYUI_URL, WorkerPool, read_env_worker_urls
 from backend.src.jobs import ActiveJobError, JobManager, DEFAULT_IMAGES_DIR, UPLOAD_IMAGES_DIR
-from backend.src.job_store import JobStore
+from backend.src.job_store import JobStore, event_cursor, saved_image_cursor
+from backend.src.template_jobs import DEFAULT_CHUNK_SIZE, WorkflowMapper, iter_job_chunks
+from backend.src.workflow_models import ComfyWorkflow, NodeMapping
 from backend.src.webhook import WebhookService, WEBHOOK_EVENTS
 from backend.src._version import BACKEND_VERSION, BUNDLE_VERSION, COMMIT
 from backend.src.models import (
@@ -79,6 +101,8 @@ from backend.src.models import (
     JobQueryResponse,
     WorkerViewResponse,
     JobResponse,
+    TemplateBatchResponse,
+    WorkerType,
 )
 
 logger = logging.getLogger(__name__)
@@ -137,6 +161,23 @@ class RenderRequest(BaseModel):
     extra_excludes: Optional[List[Dict[str, JSONValue]]] = Field(None, description="추가 제외 규칙")
     limit: int = Field(0, ge=0, description="페이지 크기 (0=전체)")
     offset: int = Field(0, ge=0, description="오프셋")
+    sample: int = Field(0, ge=0, description="필터 통과 조합 중 균등 추출할 개수 (0=추출 안 함). limit/offset은 추출 결과 안에서 적용")
+    seed: Optional[int] = Field(None, description="추출 시드. 생략하면 서버가 정해 응답에 돌려준다 (같은 seed → 같은 추출)")
+    coverage: int = Field(0, ge=0, le=3, description="t-way 커버링 배열만 렌더링 (0=안 씀, 2=pairwise). sample과 함께 쓸 수 없음")
+
+
+class RenderCountRequest(BaseModel):
+    """조합 수 계산 요청 모델. RenderRequest와 같은 필터를 받지만 페이지네이션은 없다.
+
+    Request model for counting surviving combinations of a CEG template.
+    Accepts the same filters as RenderRequest, without pagination.
+    Used by POST /render/count.
+    """
+    template: str = Field(..., description="CEG 템플릿 소스")
+    only: Optional[Dict[str, List[str]]] = Field(None, description="특정 axis 값만 포함")
+    fix: Optional[Dict[str, str]] = Field(None, description="특정 axis를 단일 값으로 고정")
+    skip_excludes: bool = Field(False, description="DSL 내 exclude 규칙 무시")
+    extra_excludes: Optional[List[Dict[str, JSONValue]]] = Field(None, description="추가 제외 규칙")
 
 
 class ExcludeConditionIn(BaseModel):
@@ -213,6 +254,22 @@ class RenderItem(BaseModel):
     meta: Dict[str, str]
 
 
+class CoverageReport(BaseModel):
+    """커버링 배열 보고서. 서로 다른 축 strength개의 키 조합(t-튜플)을 얼마나 덮었는지 담는다.
+
+    Coverage report for covering-array renders. `tuples` counts t-way
+    interactions of axes that can appear together, `infeasible` those ruled
+    out by excludes, `covered` those hit by the returned rows (through this
+    page), and `ratio` = covered / (tuples - infeasible).
+    """
+    strength: int
+    tuples: int
+    covered: int
+    infeasible: int
+    ratio: float
+    rows: int
+
+
 class RenderResponse(BaseModel):
     """DSL 렌더링 응답 모델. 생성된 프롬프트 목록, 축 정보, 제외 규칙 등을 포함한다.
     POST /render 엔드포인트에서 사용된다.
@@ -221,12 +278,52 @@ class RenderResponse(BaseModel):
     axis definitions, exclude rules, and template structure.
     Used by the POST /render endpoint.
     """
-    count: int
+    count: int = Field(..., description="필터를 통과한 조합 총수. limit/offset, sample, coverage와 무관하게 POST /render/count와 같다")
     items: List[RenderItem]
     axes: Dict[str, AxisOut] = {}
     sets: Dict[str, str] = {}
     excludes: List[ExcludeRuleOut] = []
     template_structure: List[Dict[str, JSONValue]] = []
+    seed: Optional[int] = None
+    coverage: Optional[CoverageReport] = None
+
+
+class RenderStreamHeader(BaseModel):
+    """스트리밍 렌더링의 첫 레코드. RenderResponse에서 items만 뺀 모양이다.
+    POST /render/stream 응답의 첫 줄로 쓰인다.
+
+    First record of a streamed render. Same shape as RenderResponse without
+    `items`. Emitted as the first line of POST /render/stream.
+    """
+    type: Literal["header"] = "header"
+    count: int
+    axes: Dict[str, AxisOut] = {}
+    sets: Dict[str, str] = {}
+    excludes: List[ExcludeRuleOut] = []
+    template_structure: List[Dict[str, JSONValue]] = []
+    seed: Optional[int] = None
+    coverage: Optional[CoverageReport] = None
+
+
+class RenderCountResponse(BaseModel):
+    """조합 수 응답 모델. POST /render 응답의 count와 항상 같은 값이다.
+
+    Response model for POST /render/count. Always equal to the `count`
+    that POST /render would return for the same template and filters.
+    """
+    count: int
+
+
+class RenderItemResponse(BaseModel):
+    """단건 렌더링 응답 모델. index번째 항목과 필터 적용 후 전체 조합 수를 담는다.
+
+    Single rendered item response. Contains the item at `index` and the
+    total number of combinations after filtering.
+    Used by GET /render/item/{index}.
+    """
+    index: int
+    count: int
+    item: RenderItem
 
 
 class InjectRequest(BaseModel):
@@ -244,6 +341,19 @@ class InjectRequest(BaseModel):
     placeholder: str = "{{input}}"
 
 
+class InjectBatchRequest(BaseModel):
+    """워크플로우 일괄 주입 요청 모델. 워크플로우 하나에 프롬프트 여러 개를 각각 주입한다.
+
+    Request model for batch workflow injection. Injects each prompt into
+    its own copy of the workflow. Used by POST /workflow/inject/batch.
+    """
+    workflow: Dict[str, JSONValue]
+    prompts: List[Union[str, Dict[str, str]]] = Field(
+        ..., description="문자열 또는 {placeholder: value} 매핑의 목록"
+    )
+    placeholder: str = "{{input}}"
+
+
 
 class SessionMarker(BaseModel):
     """세션 마커 모델. 프론트엔드에서 세션 구간을 식별하기 위한 타임스탬프 마커.
@@ -287,6 +397,22 @@ class JobsCreateRequest(BaseModel):
     items: List[JobItem]
 
 
+class JobsFromTemplateRequest(RenderRequest):
+    """템플릿 기반 잡 생성 요청 모델. 렌더 옵션은 RenderRequest와 같고,
+    기본 워크플로우와 노드 매핑을 함께 보내면 서버가 항목마다 워크플로우를 만들어 잡으로 등록한다.
+
+    Request model for creating jobs from a CEG template. Takes the same render
+    options as RenderRequest plus the base workflow and node mappings; the
+    server expands, injects and enqueues jobs itself.
+    Used by POST /jobs/from-template.
+    """
+    workflow: ComfyWorkflow = Field(..., description="매핑을 적용할 기본 ComfyUI 워크플로우")
+    node_mappings: List[NodeMapping] = Field(default_factory=list, description="노드 매핑 (PROMPT/FILENAME/SEED/IMAGE/FIXED)")
+    workerType: WorkerType = Field(WorkerType.COMFYUI, description="잡을 실행할 워커 종류")
+    workerId: Optional[str] = Field(None, description="타겟 워커 ID (None이면 자동 배분)")
+    chunk_size: int = Field(DEFAULT_CHUNK_SIZE, ge=1, le=5000, description="한 번에 등록할 잡 수")
+
+
 class CurationPatch(BaseModel):
     """큐레이션 패치 모델. 저장된 이미지의 상태(승인/거절/휴지통)나 메모를 수정한다.
 
@@ -403,6 +529,7 @@ class LogsResponse(BaseModel):
     events: list[dict[str, JSONValue]]
     limit: int
     offset: int
+    nextCursor: str | None = None
 
 
 class TrashListResponse(BaseModel):
@@ -515,6 +642,15 @@ class InjectResponse(BaseModel):
     workflow: dict[str, JSONValue]
 
 
+class InjectBatchResponse(BaseModel):
+    """워크플로우 일괄 주입 응답 모델. prompts와 같은 순서의 워크플로우 목록이다.
+
+    Batch workflow inject response. One injected workflow per prompt,
+    in request order. Used by POST /workflow/inject/batch.
+    """
+    workflows: List[dict[str, JSONValue]]
+
+
 class SessionStatsResponse(BaseModel):
     """세션 통계 응답 모델. 세션별 잡 수와 선택된 세션의 상태별 카운트를 반환한다.
 
@@ -737,11 +873,12 @@ def health() -> HealthResponse:
 async def debug_memory() -> dict[str, JSONValue]:
     """메모리 디버깅용 런타임 카운터를 반환한다.
     CEG_MEMORY_DEBUG=1 환경변수로 tracemalloc을 활성화해야 상세 할당 정보를 볼 수 있다.
-    GC 카운트, RSS, asyncio 태스크 수, 잡 상태 등을 포함.
+    GC 카운트, RSS, asyncio 태스크 수, 잡 상태, DSL 파싱 캐시 적중률, 잡 저장소 쓰기 큐 깊이/flush 지연 등을 포함.
 
     Runtime memory counters for leak triage.
     Enable tracemalloc with CEG_MEMORY_DEBUG=1 for detailed allocation tracking.
-    Includes GC counts, RSS, asyncio task count, and job state diagnostics.
+    Includes GC counts, RSS, asyncio task count, job state diagnostics, DSL parse cache hits/misses
+    and the job store write-behind queue depth / flush latency.
     """
     gc_counts = gc.get_count()
     tasks = asyncio.all_tasks()
@@ -797,9 +934,23 @@ async def debug_memory() -> dict[str, JSONValue]:
             "workers": len(worker_pool.all()),
         },
         "jobs": jobs_dict,
+        "parseCache": parse_cache_stats(),
+        "writeBehind": job_manager._store.write_behind_stats(),
     }
 
 
+@app.get("/debug/counters")
+async def debug_counters(repair: bool = False) -> dict[str, JSONValue]:
+    """DB 상태 카운터(job_counts / saved_image_counts)를 원본 테이블에서 다시 세어 어긋남을 보고한다.
+    repair=true면 어긋난 카운터 테이블을 다시 만든다.
+
+    Recompute the DB status counters from scratch and report drifted keys.
+    With repair=true the drifted counter tables are rebuilt.
+    """
+    drift: list[JSONValue] = [*await job_manager._store.check_counters(repair=repair)]
+    return {"drift": drift, "repaired": repair and bool(drift)}
+
+
 @app.get("/workers", response_model=WorkersListResponse)
 def workers_list() -> WorkersListResponse:
     """현재 등록된 ComfyUI 워커들의 상태 스냅샷을 반환한다.
@@ -873,15 +1024,30 @@ async def worker_preview(worker_id: str) -> Response:
     return Response(content=preview_bytes, media_type="image/png")
 
 
+def _sample_seed(req: RenderRequest) -> Optional[int]:
+    """추출 요청이면 사용할 seed (없으면 새로 정함), 아니면 None."""
+    if req.sample and req.coverage:
+        raise HTTPException(status_code=400, detail="sample과 coverage는 함께 쓸 수 없습니다")
+    if not req.sample:
+        return None
+    return req.seed if req.seed is not None else random.randrange(2**32)
+
+
 @app.post("/render", response_model=RenderResponse)
 def render_endpoint(req: RenderRequest) -> dict[str, JSONValue]:
     """CEG DSL 템플릿을 파싱하고 렌더링하여 프롬프트 목록을 반환한다.
-    축 조합, 필터링, 페이지네이션 등을 적용.
+    축 조합, 필터링, 페이지네이션 등을 적용. sample>0이면 조합을 seed로 균등 추출하고
+    사용한 seed를 응답에 담는다. coverage=t면 t-way 커버링 배열만 렌더링하고 덮은 비율을 보고한다.
 
     Parse and render a CEG DSL template into a list of prompts.
     Applies axis combinations, filtering (only/fix/excludes), and pagination.
+    With `sample`, draws that many combinations uniformly at random and
+    returns the seed used so the same sample can be rendered again. With
+    `coverage=t`, renders only a t-way covering array and reports the
+    achieved coverage.
     """
     prog = parse(req.template)
+    seed = _sample_seed(req)
     rendered = render(
         prog,
         only=req.only,
@@ -890,6 +1056,9 @@ def render_endpoint(req: RenderRequest) -> dict[str, JSONValue]:
         extra_excludes=req.extra_excludes,
         limit=req.limit,
         offset=req.offset,
+        sample=req.sample,
+        seed=seed,
+        coverage=req.coverage,
     )
     return {
         "count": rendered["total"],
@@ -898,9 +1067,172 @@ def render_endpoint(req: RenderRequest) -> dict[str, JSONValue]:
         "sets": rendered["sets"],
         "excludes": rendered["excludes"],
         "template_structure": rendered.get("template_structure", []),
+        "seed": seed,
+        "coverage": rendered.get("coverage"),
     }
 
 
+# /render/stream이 한 번에 내보내는 항목 줄 수 (청크마다 스레드풀 왕복이 생기므로 묶어서 보낸다)
+RENDER_STREAM_BATCH = 64
+
+
+def _ndjson_line(record: Dict[str, JSONValue]) -> bytes:
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def _render_ndjson(
+    header: RenderStreamHeader,
+    items: Iterator[Dict[str, JSONValue]],
+    offset: int,
+) -> Iterator[bytes]:
+    """헤더 레코드, 항목 레코드들, 끝 레코드 순으로 NDJSON 청크를 만든다.
+
+    동기 제너레이터라 Starlette가 스레드풀에서 한 청크씩 당겨 가며,
+    클라이언트가 읽지 않으면 다음 청크를 만들지 않는다 (백프레셔).
+    """
+    first = next(items, None)
+    chunk = [_ndjson_line(header.model_dump())]
+    emitted = 0
+    if first is not None:
+        chunk.append(_ndjson_line({"type": "item", "index": offset, "item": first}))
+        emitted = 1
+    # 첫 항목은 헤더와 함께 바로 내보낸다
+    yield b"".join(chunk)
+    chunk = []
+    for index, item in enumerate(items, offset + emitted):
+        chunk.append(_ndjson_line({"type": "item", "index": index, "item": item}))
+        emitted += 1
+        if len(chunk) >= RENDER_STREAM_BATCH:
+            yield b"".join(chunk)
+            chunk = []
+    chunk.append(_ndjson_line({"type": "end", "emitted": emitted}))
+    yield b"".join(chunk)
+
+
+@app.post("/render/stream")
+def render_stream_endpoint(req: RenderRequest) -> StreamingResponse:
+    """POST /render와 같은 요청을 NDJSON(application/x-ndjson)으로 스트리밍한다.
+    첫 줄은 축/세트/제외 규칙/구조/seed/커버리지 보고서를 담은 헤더 레코드({"type": "header", "count", ...}),
+    이어서 항목마다 {"type": "item", "index", "item"} 한 줄, 마지막은 {"type": "end", "emitted"}.
+    항목은 렌더러가 만드는 대로 내보내므로 첫 항목까지의 시간이 조합 수와 무관하다.
+
+    Stream the same render as POST /render as NDJSON. The first line is a
+    header record (count, axes, sets, excludes, template_structure, seed,
+    coverage), followed
+    by one `item` record per rendered prompt and a final `end` record.
+    Items are produced lazily, so time-to-first-item does not depend on the
+    number of combinations.
+    """
+    prog = parse(req.template)
+    meta = render_header(
+        prog,
+        only=req.only,
+        fix=req.fix,
+        skip_excludes=req.skip_excludes,
+        extra_excludes=req.extra_excludes,
+    )
+    seed = _sample_seed(req)
+    report: Optional[Dict[str, JSONValue]] = None
+    if req.coverage:
+        # 보고서가 헤더에 들어가야 하므로 커버링 배열은 응답 전에 만든다
+        items, report = render_covering(
+            prog,
+            req.coverage,
+            only=req.only,
+            fix=req.fix,
+            skip_excludes=req.skip_excludes,
+            extra_excludes=req.extra_excludes,
+            limit=req.limit,
+            offset=req.offset,
+        )
+    else:
+        items = render_iter(
+            prog,
+            only=req.only,
+            fix=req.fix,
+            skip_excludes=req.skip_excludes,
+            extra_excludes=req.extra_excludes,
+            limit=req.limit,
+            offset=req.offset,
+            sample=req.sample,
+            seed=seed,
+        )
+    header = RenderStreamHeader.model_validate(
+        {"count": meta.pop("total"), **meta, "seed": seed, "coverage": report}
+    )
+    # 조합식 오류가 응답 시작 전에 400으로 드러나도록 첫 항목을 미리 만든다
+    first = next(items, None)
+    items = itertools.chain([] if first is None else [first], items)
+    return StreamingResponse(
+        _render_ndjson(header, items, req.offset),
+        media_type="application/x-ndjson",
+    )
+
+
+@app.post("/render/count", response_model=RenderCountResponse)
+def render_count_endpoint(req: RenderCountRequest) -> RenderCountResponse:
+    """필터(only/fix/exclude)를 적용한 뒤 남는 조합 수를 반환한다.
+    조합을 전개하지 않고 축 크기와 조합식 구조로 계산하므로 조합 수와 무관하게 빠르다.
+
+    Count the combinations that survive the filters without expanding them.
+    Computed from axis sizes and the combine expression structure, so the
+    cost does not grow with the number of combinations.
+    """
+    prog = parse(req.template)
+    count = count_combinations(
+        prog,
+        only=req.only,
+        fix=req.fix,
+        skip_excludes=req.skip_excludes,
+        extra_excludes=req.extra_excludes,
+    )
+    return RenderCountResponse(count=count)
+
+
+def _parse_axis_pairs(pairs: Optional[List[str]], param: str) -> List[tuple[str, str]]:
+    """`axis:key` 형식의 쿼리 파라미터 목록을 (axis, key) 쌍으로 분해한다."""
+    result: List[tuple[str, str]] = []
+    for pair in pairs or []:
+        axis, sep, key = pair.partition(":")
+        if not sep or not axis or not key:
+            raise HTTPException(status_code=400, detail=f"{param}는 axis:key 형식이어야 합니다: {pair}")
+        result.append((axis, key))
+    return result
+
+
+@app.get("/render/item/{index}", response_model=RenderItemResponse)
+def render_item_endpoint(
+    index: int,
+    template: str,
+    only: List[str] = Query(None),
+    fix: List[str] = Query(None),
+    skip_excludes: bool = False,
+) -> RenderItemResponse:
+    """필터 적용 후 index번째 렌더링 항목을 반환한다.
+    앞쪽 조합을 전개하지 않고 바로 찾아가므로 깊은 index도 첫 항목과 비슷한 비용이다.
+    only/fix는 `axis:key` 형식으로 반복 지정한다 (예: ?fix=emotion:happy&only=outfit:bikini).
+
+    Return the rendered item at `index` after filtering. The combination is
+    located directly from the product structure, so deep indices cost about
+    the same as the first one. `only`/`fix` are repeated `axis:key` params.
+    """
+    only_map: Dict[str, List[str]] = {}
+    for axis, key in _parse_axis_pairs(only, "only"):
+        only_map.setdefault(axis, []).append(key)
+    fix_map = dict(_parse_axis_pairs(fix, "fix"))
+
+    prog = parse(template)
+    count = count_combinations(
+        prog, only=only_map or None, fix=fix_map or None, skip_excludes=skip_excludes,
+    )
+    item = render_at(
+        prog, index, only=only_map or None, fix=fix_map or None, skip_excludes=skip_excludes,
+    )
+    if item is None:
+        raise HTTPException(status_code=404, detail=f"index out of range (count={count})")
+    return RenderItemResponse(index=index, count=count, item=RenderItem.model_validate(item))
+
+
 @app.post("/workflow/inject", response_model=InjectResponse)
 def inject_endpoint(req: InjectRequest) -> InjectResponse:
     """ComfyUI 워크플로우 JSON에 프롬프트를 주입한다.
@@ -914,6 +1246,21 @@ def inject_endpoint(req: InjectRequest) -> InjectResponse:
     return InjectResponse(workflow=injected_dict)
 
 
+@app.post("/workflow/inject/batch", response_model=InjectBatchResponse)
+def inject_batch_endpoint(req: InjectBatchRequest) -> Response:
+    """ComfyUI 워크플로우 하나에 프롬프트 여러 개를 각각 주입한다.
+    워크플로우는 한 번만 훑고, 프롬프트마다 플레이스홀더 자리만 채운다.
+    결과가 하위 트리를 공유하므로 모델 검증 없이 바로 JSON으로 직렬화한다.
+
+    Inject each prompt into its own copy of a ComfyUI workflow. The workflow
+    is scanned once and only placeholder slots are filled per prompt.
+    Response body matches InjectBatchResponse.
+    """
+    workflows = inject_many(req.workflow, req.prompts, req.placeholder)
+    body = json.dumps({"workflows": workflows}, ensure_ascii=False, separators=(",", ":"))
+    return Response(content=body, media_type="application/json")
+
+
 # ====== 잡 ======
 
 
@@ -930,6 +1277,74 @@ async def jobs_create(req: JobsCreateRequest) -> dict[str, list[str]]:
     return {"jobIds": [j.id for j in jobs]}
 
 
+@app.post("/jobs/from-template", response_model=TemplateBatchResponse)
+async def jobs_from_template(req: JobsFromTemplateRequest) -> TemplateBatchResponse:
+    """CEG 템플릿을 서버에서 전개해 잡을 등록한다. 배치 ID를 바로 반환하고,
+    잡은 백그라운드에서 chunk_size개씩 렌더링·주입·등록된다. 첫 청크가 등록되면
+    나머지를 렌더링하는 동안에도 디스패처가 잡을 실행한다.
+    진행 상황은 GET /jobs/from-template/{batch_id}로 확인한다.
+
+    Expand a CEG template server-side and enqueue one job per rendered item.
+    Returns a batch id immediately; jobs are rendered, injected and registered
+    in chunks of `chunk_size` in the background, and dispatch starts as soon as
+    the first chunk is registered.
+    """
+    prog = parse(req.template)
+    seed = _sample_seed(req)
+    total: Optional[int] = None
+    if not req.coverage:
+        total = count_combinations(
+            prog,
+            only=req.only,
+            fix=req.fix,
+            skip_excludes=req.skip_excludes,
+            extra_excludes=req.extra_excludes,
+        )
+        if req.sample:
+            total = min(total, req.sample)
+        total = max(total - req.offset, 0)
+        if req.limit:
+            total = min(total, req.limit)
+    items = render_iter(
+        prog,
+        only=req.only,
+        fix=req.fix,
+        skip_excludes=req.skip_excludes,
+        extra_excludes=req.extra_excludes,
+        limit=req.limit,
+        offset=req.offset,
+        sample=req.sample,
+        seed=seed,
+        coverage=req.coverage,
+    )
+    chunks = iter_job_chunks(
+        items,
+        WorkflowMapper(req.workflow, req.node_mappings),
+        template=req.template,
+        worker_type=req.workerType,
+        worker_id=req.workerId,
+        chunk_size=req.chunk_size,
+    )
+    # 조합식 오류가 배치 시작 전에 400으로 드러나도록 첫 청크는 미리 만든다
+    first = await asyncio.to_thread(next, chunks, None)
+    batch = job_manager.submit_stream(
+        itertools.chain([] if first is None else [first], chunks), total
+    )
+    return batch.to_response()
+
+
+@app.get("/jobs/from-template/{batch_id}", response_model=TemplateBatchResponse)
+async def jobs_from_template_status(batch_id: str) -> TemplateBatchResponse:
+    """템플릿 배치의 진행 상황(생성된 잡 수, 상태)을 반환한다.
+
+    Return the progress of a template batch started by POST /jobs/from-template.
+    """
+    batch = job_manager.get_batch(batch_id)
+    if batch is None:
+        raise HTTPException(status_code=404, detail="batch not found")
+    return batch.to_response()
+
+
 @app.get("/jobs")
 async def jobs_list(
     limit: int = 100,
@@ -940,22 +1355,33 @@ async def jobs_list(
     created_at_to: Optional[float] = None,
     sort_by: str = "created_at",
     sort_order: str = "desc",
+    cursor: str | None = None,
+    with_total: bool = True,
 ) -> JobQueryResponse:
     """잡 목록을 조회한다. 상태, 검색 태그, 생성일 범위, 정렬 등으로 필터링 가능.
+    cursor(이전 응답의 nextCursor)를 주면 OFFSET 없이 그 다음 페이지를 찾는다.
+    with_total=false면 전체 개수를 세지 않는다 (total=null).
 
     Query job list with optional filters: status, search tags,
     creation date range, sort order, and pagination.
+    Pass the previous response's nextCursor as cursor for keyset paging;
+    with_total=false skips the total count. Invalid cursors return 400.
     """
-    return await job_manager.query_jobs(
-        limit=limit,
-        offset=offset,
-        statuses=status,
-        search_tags=search,
-        created_at_from=created_at_from,
-        created_at_to=created_at_to,
-        sort_by=sort_by,
-        sort_order=sort_order,
-    )
+    try:
+        return await job_manager.query_jobs(
+            limit=limit,
+            offset=offset,
+            statuses=status,
+            search_tags=search,
+            created_at_from=created_at_from,
+            created_at_to=created_at_to,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            cursor=cursor,
+            with_total=with_total,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
 
 
 @app.post("/jobs/session-stats", response_model=SessionStatsResponse)
@@ -967,19 +1393,22 @@ async def jobs_session_stats(req: SessionStatsRequest) -> SessionStatsResponse:
     Matches each job to a session using session markers, and returns
     job counts per session and status breakdown for the selected session.
     """
-    # 1. DB에서 minimal job list 로드
-    jobs_minimal = await job_manager._store.get_all_jobs_minimal()
-
-    # 2. 인메모리(활성 잡) 상태 병합
-    async with job_manager._lock:
-        for job_dict in jobs_minimal:
-            jid = job_dict["id"]
-            if isinstance(jid, str) and jid in job_manager._jobs:
-                job_dict["status"] = job_manager._jobs[jid].status
-
-    # 3. 세션 매칭 및 카운팅
+    # 1. 세션별 생성 시각 구간 [from, before) (초). 활성 세션은 activatedAt 이후 전부,
+    #    나머지는 startAt이 가장 가까운 이전 마커, 모든 마커보다 이른 잡은 가장 오래된 마커.
+    intervals: list[tuple[str, Optional[float], Optional[float]]] = []
+    cap: Optional[float] = None
+    if req.activeState:
+        cap = req.activeState.activatedAt / 1000
+        intervals.append((req.activeState.activeSessionId, cap, None))
     sorted_markers = sorted(req.markers, key=lambda x: x.startAt, reverse=True)
-
+    before = cap
+    for i, m in enumerate(sorted_markers):
+        start = m.startAt / 1000 if i < len(sorted_markers) - 1 else None
+        if start is None or before is None or start < before:
+            intervals.append((m.id, start, before))
+            before = start
+
+    # 2. 구간별 상태 카운트 (DB 상태 카운터, 하루 단위 버킷 + 구간 양 끝만 인덱스로 센다)
     session_job_counts: dict[str, int] = {}
     selected_session_counts: dict[str, int] = {
         "pending": 0,
@@ -990,32 +1419,20 @@ async def jobs_session_stats(req: SessionStatsRequest) -> SessionStatsResponse:
         "cancelled": 0,
         "active": 0,
     }
-
-    for job in jobs_minimal:
-        created_at_val = job["createdAt"]
-        created_at = float(created_at_val) if isinstance(created_at_val, (int, float)) else 0.0
-        t = created_at * 1000  # seconds to ms
-
-        sid = ""
-        if req.activeState and t >= req.activeState.activatedAt:
-            sid = req.activeState.activeSessionId
-        else:
-            for m in sorted_markers:
-                if t >= m.startAt:
-                    sid = m.id
-                    break
-            if not sid and sorted_markers:
-                sid = sorted_markers[-1].id
-
-        if sid:
-            session_job_counts[sid] = session_job_counts.get(sid, 0) + 1
-            if sid == req.selectedSessionId:
-                status_val = job.get("status")
-                status = str(status_val) if status_val is not None else ""
+    for sid, created_from, created_before in intervals:
+        by_status = await job_manager._store.count_jobs_by_status(
+            created_at_from=created_from, created_before=created_before
+        )
+        total = sum(by_status.values())
+        if not total:
+            continue
+        session_job_counts[sid] = session_job_counts.get(sid, 0) + total
+        if sid == req.selectedSessionId:
+            for status, count in by_status.items():
                 if status in selected_session_counts:
-                    selected_session_counts[status] += 1
+                    selected_session_counts[status] += count
                 if status in ("pending", "queued", "running"):
-                    selected_session_counts["active"] += 1
+                    selected_session_counts["active"] += count
 
     return SessionStatsResponse(
         sessionJobCounts=session_job_counts,
@@ -1144,20 +1561,29 @@ async def logs_all(
     offset: int = 0,
     status: str | None = None,
     worker_id: str | None = None,
+    cursor: str | None = None,
 ) -> LogsResponse:
     """필터링된 전체 잡 이벤트 로그를 페이지네이션과 함께 반환한다.
-    상태, 워커 ID로 필터링 가능.
+    상태, 워커 ID로 필터링 가능. cursor(이전 응답의 nextCursor)로 다음 페이지를 찾는다.
 
     Returns filtered job event logs with pagination.
-    Can filter by status and worker ID.
+    Can filter by status and worker ID. Pass nextCursor as cursor for keyset paging.
     """
-    events = await job_manager._store.get_all_events(
-        limit=limit,
-        offset=offset,
-        status=status,
-        worker_id=worker_id,
-    )
-    return LogsResponse(events=events, limit=limit, offset=offset)
+    try:
+        events = await job_manager._store.get_all_events(
+            limit=limit + 1,
+            offset=offset,
+            status=status,
+            worker_id=worker_id,
+            cursor=cursor,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    next_cursor = None
+    if len(events) > limit:
+        events = events[:limit]
+        next_cursor = event_cursor(events[-1]) if events else None
+    return LogsResponse(events=events, limit=limit, offset=offset, nextCursor=next_cursor)
 
 
 # ====== 이미지 프록시 ======
@@ -1238,26 +1664,46 @@ async def saved_images_list(
     status: str | None = None,
     filename: str | None = None,
     tag: str | None = None,
+    template_hash: str | None = None,
+    cursor: str | None = None,
+    with_total: bool = True,
 ) -> SavedImagesListResponse:
     """디스크에 영속화된 이미지 목록을 반환한다.
-    job_id, status, filename, tag로 필터링 가능. 페이지네이션 지원.
+    job_id, status, filename, tag, template_hash(같은 템플릿 원문)로 필터링 가능. 페이지네이션 지원.
+    cursor(이전 응답의 nextCursor)로 다음 페이지를, with_total=false면 개수 없이(total=null) 반환.
 
     List persisted (saved) images on disk.
-    Supports filtering by job_id, status, filename, and tag with pagination.
+    Supports filtering by job_id, status, filename, tag, and template_hash
+    (images generated from the same template source) with pagination.
+    Pass nextCursor as cursor for keyset paging; with_total=false skips the count.
     """
-    items_raw = await job_manager._store.list_saved_images(
-        limit=limit,
-        offset=offset,
-        job_id=job_id,
-        status=status,
-        filename=filename,
-        tag=tag,
-    )
-    total = await job_manager._store.count_saved_images(
-        job_id=job_id, status=status, filename=filename, tag=tag
-    )
+    try:
+        items_raw = await job_manager._store.list_saved_images(
+            limit=limit + 1,
+            offset=offset,
+            job_id=job_id,
+            status=status,
+            filename=filename,
+            tag=tag,
+            template_hash=template_hash,
+            cursor=cursor,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    next_cursor = None
+    if len(items_raw) > limit:
+        items_raw = items_raw[:limit]
+        next_cursor = saved_image_cursor(items_raw[-1]) if items_raw else None
+    total = None
+    if with_total:
+        total = await job_manager._store.count_saved_images(
+            job_id=job_id, status=status, filename=filename, tag=tag,
+            template_hash=template_hash,
+        )
     items = [SavedImageResponse.model_validate(it) for it in items_raw]
-    return SavedImagesListResponse(items=items, limit=limit, offset=offset, total=total)
+    return SavedImagesListResponse(
+        items=items, limit=limit, offset=offset, total=total, nextCursor=next_cursor
+    )
 
 
 @app.get("/jobs/{job_id}/saved-images", response_model=JobSavedImagesResponse)
@@ -1654,6 +2100,8 @@ async def db_export() -> FileResponse:
 
     Export the SQLite jobs.db database file directly (for backup).
     """
+    # 쓰기 큐와 WAL을 본 파일에 반영한 뒤 내보낸다
+    await job_manager._store.checkpoint()
     db_path = job_manager._store._db_path
     if not db_path.exists():
         raise HTTPException(status_code=404, detail="Database file not found")
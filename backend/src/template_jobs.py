@@ -0,0 +1,145 @@
+"""
+템플릿 → 잡 파이프라인 (POST /jobs/from-template).
+
+프론트엔드는 /render 결과를 받아 항목마다 워크플로우를 완성해 POST /jobs로 되돌려 보낸다.
+2만 장 배치면 요청 본문이 수백 MB가 되고 JobItem 검증도 2만 번 일어난다.
+여기서는 템플릿·렌더 옵션·기본 워크플로우·노드 매핑만 받아 서버에서 전개한다.
+
+    render_iter ──▶ WorkflowMapper.build ──▶ JobItem 청크(chunk_size개씩)
+
+- 기본 워크플로우는 한 번만 검증하고, 항목마다 바뀌지 않는 매핑(SEED 고정값/FIXED/IMAGE)은
+  미리 적용해 둔다. 항목마다는 PROMPT/FILENAME/랜덤 SEED가 걸린 노드만 새로 만든다.
+  나머지 노드 객체는 잡끼리 공유한다 (디스패치 시 _resolve_image_markers가 깊은 복사).
+- iter_job_chunks는 제너레이터라 청크 하나를 만들 만큼만 전개한다.
+  JobManager.submit_stream이 청크를 받는 대로 등록하므로 마지막 청크를 렌더링하기 전에
+  디스패처가 첫 청크를 처리하기 시작한다.
+"""
+from __future__ import annotations
+
+import random
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from backend.src.models import JobItem, JSONValue, WorkerType
+from backend.src.workflow_models import (
+    ComfyNode,
+    ComfyWorkflow,
+    MappingSourceType,
+    NodeInputValue,
+    NodeMapping,
+)
+
+# 프론트엔드 buildWorkflowForItem과 같은 랜덤 시드 범위
+MAX_RANDOM_SEED = 1_000_000_000
+
+# 한 번에 등록하는 잡 수 기본값
+DEFAULT_CHUNK_SIZE = 200
+
+# 업로드 이미지 마커 (__upload__{sha256}.{ext}) — 프론트엔드와 같은 규칙
+_UPLOAD_MARKER_RE = re.compile(r"^__upload__([a-f0-9]{64})\.\w+$")
+
+
+def _text(item: Dict[str, JSONValue], key: str) -> str:
+    """렌더링 항목의 문자열 필드 (prompt / filename)."""
+    value = item.get(key)
+    if not isinstance(value, str):
+        raise ValueError(f"render item {key!r} must be a string, got {type(value).__name__}")
+    return value
+
+
+class WorkflowMapper:
+    """기본 워크플로우 + 노드 매핑 → 렌더링 항목별 워크플로우.
+
+    프론트엔드 buildWorkflowForItem과 같은 규칙으로 값을 넣는다.
+    워크플로우에 없는 노드를 가리키는 매핑은 무시하고, 같은 입력을 여러 매핑이
+    가리키면 나중 매핑이 이긴다.
+    """
+
+    def __init__(self, workflow: ComfyWorkflow, mappings: Iterable[NodeMapping], *,
+                 rng: Optional[random.Random] = None) -> None:
+        nodes: Dict[str, ComfyNode] = dict(workflow.root)
+        static: Dict[str, Dict[str, NodeInputValue]] = {}
+        dynamic: Dict[str, Dict[str, MappingSourceType]] = {}
+        self.image_uploads: Dict[str, Dict[str, str]] = {}
+
+        for m in mappings:
+            if m.source_type == MappingSourceType.IMAGE and m.image_value:
+                match = _UPLOAD_MARKER_RE.match(m.image_value)
+                if match:
+                    self.image_uploads[match.group(1)] = {"name": m.image_value}
+            if m.node_id not in nodes:
+                continue
+            key = m.target_input
+            # 같은 입력에 대한 이전 매핑은 덮어쓴다
+            static.get(m.node_id, {}).pop(key, None)
+            dynamic.get(m.node_id, {}).pop(key, None)
+            match m.source_type:
+                case MappingSourceType.PROMPT | MappingSourceType.FILENAME:
+                    dynamic.setdefault(m.node_id, {})[key] = m.source_type
+                case MappingSourceType.SEED if m.seed_random:
+                    dynamic.setdefault(m.node_id, {})[key] = m.source_type
+                case MappingSourceType.SEED:
+                    static.setdefault(m.node_id, {})[key] = m.seed_value or 0
+                case MappingSourceType.IMAGE:
+                    if m.image_value:
+                        static.setdefault(m.node_id, {})[key] = m.image_value
+                case MappingSourceType.FIXED:
+                    static.setdefault(m.node_id, {})[key] = m.fixed_value or ""
+
+        for node_id, values in static.items():
+            if values:
+                node = nodes[node_id]
+                nodes[node_id] = node.model_copy(update={"inputs": {**node.inputs, **values}})
+        self._nodes = nodes
+        self._dynamic: List[Tuple[str, List[Tuple[str, MappingSourceType]]]] = [
+            (node_id, list(slots.items())) for node_id, slots in dynamic.items() if slots
+        ]
+        self._rng = rng or random.Random()
+
+    def build(self, item: Dict[str, JSONValue]) -> ComfyWorkflow:
+        """렌더링 항목 하나의 워크플로우. 동적 매핑이 걸린 노드만 새로 만든다."""
+        nodes = dict(self._nodes)
+        for node_id, slots in self._dynamic:
+            node = nodes[node_id]
+            inputs = dict(node.inputs)
+            for key, source in slots:
+                if source == MappingSourceType.PROMPT:
+                    inputs[key] = _text(item, "prompt")
+                elif source == MappingSourceType.FILENAME:
+                    inputs[key] = _text(item, "filename")
+                else:
+                    inputs[key] = self._rng.randrange(MAX_RANDOM_SEED)
+            nodes[node_id] = node.model_copy(update={"inputs": inputs})
+        # 노드는 이미 검증된 ComfyNode라 다시 검증하지 않는다
+        return ComfyWorkflow.model_construct(root=nodes)
+
+
+def iter_job_chunks(items: Iterable[Dict[str, JSONValue]], mapper: WorkflowMapper, *,
+                    template: str,
+                    worker_type: WorkerType = WorkerType.COMFYUI,
+                    worker_id: Optional[str] = None,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[List[JobItem]]:
+    """렌더링 항목을 JobItem 청크로 묶어 지연 생성한다.
+
+    items는 보통 render_iter 결과. 청크 하나를 채울 만큼만 소비하므로
+    메모리 사용량은 조합 총수가 아니라 chunk_size에 비례한다.
+    """
+    chunk: List[JobItem] = []
+    for item in items:
+        # 워크플로우는 이미 검증된 ComfyWorkflow 인스턴스라 다시 검증되지 않고,
+        # 나머지 필드(filename/prompt/meta …)만 검증된다
+        chunk.append(JobItem.model_validate({
+            "filename": item["filename"],
+            "prompt": item["prompt"],
+            "workflow": mapper.build(item),
+            "workerType": worker_type,
+            "meta": item.get("meta") or {},
+            "cegTemplate": template,
+            "imageUploads": mapper.image_uploads,
+            "workerId": worker_id,
+        }))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
@@ -0,0 +1,161 @@
+"""
+워크플로우 블롭 — 잡/저장 이미지 행의 workflow_json 중복 제거.
+
+한 배치의 잡들은 같은 워크플로우에서 프롬프트·파일명·시드 같은 입력 몇 개만 다르다.
+행마다 전체 JSON을 두는 대신 workflow_blobs 테이블에 정규화된 워크플로우를 한 번만 두고,
+행에는 블롭 해시와 (필요하면) 입력 패치만 기록한다.
+
+    workflow_blobs(hash, workflow_json)      ← 정규 JSON(sort_keys)의 sha256
+    jobs.workflow_hash + jobs.workflow_patch ← {node_id: {input_key: value}}
+
+- 노드 구성(노드 ID, class_type, 입력 키, 그 밖의 노드 필드)이 같은 워크플로우를 "모양"이 같다고 본다.
+  모양별로 처음 본 워크플로우가 기준 블롭이 되고, 이후 워크플로우는 달라진 입력만 패치로 남는다.
+- 모양이 다르거나 패치가 기준의 절반을 넘으면 그 워크플로우 자체를 블롭으로 저장한다
+  (같은 워크플로우라면 해시가 같아 한 번만 저장됨).
+- 블롭은 내용 주소라 바뀌지 않으므로 읽기 쪽에서 해시 → JSON을 마음 놓고 캐시한다.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+from collections import OrderedDict
+from typing import cast, Hashable, Optional
+
+from backend.src.models import JSONValue
+
+# 모양별로 기억하는 기준 블롭 수
+MAX_BASES = 64
+
+# 이미 기록했다고 기억하는 블롭 해시 수 (넘으면 잊고 INSERT OR IGNORE에 맡긴다)
+MAX_KNOWN_BLOBS = 10_000
+
+# 패치 크기가 기준 블롭의 이 비율을 넘으면 패치 대신 새 블롭
+MAX_PATCH_RATIO = 0.5
+
+WorkflowPatch = dict[str, dict[str, JSONValue]]
+
+
+def canonical_json(workflow: dict[str, JSONValue]) -> str:
+    """키 정렬 + 공백 없는 정규 JSON. 같은 워크플로우는 항상 같은 문자열이 된다."""
+    return json.dumps(workflow, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def blob_hash(canonical: str) -> str:
+    """정규 JSON의 sha256 (workflow_blobs 키)."""
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def workflow_shape(workflow: dict[str, JSONValue]) -> Optional[Hashable]:
+    """패치 가능 여부를 가르는 모양 서명. ComfyUI 노드 형태가 아니면 None."""
+    shape: list[tuple[str, JSONValue, tuple[str, ...]]] = []
+    for node_id, node in workflow.items():
+        if not isinstance(node, dict):
+            return None
+        inputs = node.get("inputs")
+        if not isinstance(inputs, dict):
+            return None
+        shape.append((node_id, node.get("class_type"), tuple(inputs)))
+    return tuple(shape)
+
+
+def _same(a: JSONValue, b: JSONValue) -> bool:
+    """JSON 기준 동등 비교. model_dump()의 노드 링크 튜플과 JSON 리스트를 같게 본다."""
+    if a == b:
+        return True
+    if isinstance(a, (list, tuple)) and isinstance(b, (list, tuple)):
+        return len(a) == len(b) and all(_same(x, y) for x, y in zip(a, b))
+    return False
+
+
+def diff_inputs(base: dict[str, JSONValue], workflow: dict[str, JSONValue]) -> Optional[WorkflowPatch]:
+    """base와 달라진 입력 값만 모은 패치. 입력 밖의 차이가 있으면 None.
+
+    두 워크플로우의 workflow_shape()가 같다고 가정한다.
+    """
+    patch: WorkflowPatch = {}
+    for node_id, node in workflow.items():
+        base_node = base[node_id]
+        if not isinstance(node, dict) or not isinstance(base_node, dict) or len(node) != len(base_node):
+            return None
+        for key, value in node.items():
+            if key == "inputs":
+                continue
+            if key not in base_node or not _same(base_node[key], value):
+                return None
+        inputs, base_inputs = node["inputs"], base_node["inputs"]
+        if not isinstance(inputs, dict) or not isinstance(base_inputs, dict):
+            return None
+        changed = {k: v for k, v in inputs.items() if not _same(base_inputs[k], v)}
+        if changed:
+            patch[node_id] = changed
+    return patch
+
+
+def apply_patch(workflow: dict[str, JSONValue], patch: WorkflowPatch) -> dict[str, JSONValue]:
+    """패치의 입력 값을 workflow에 덮어쓴다 (제자리 수정 후 반환)."""
+    for node_id, inputs in patch.items():
+        node = workflow.get(node_id)
+        node_inputs = node.get("inputs") if isinstance(node, dict) else None
+        if isinstance(node_inputs, dict):
+            node_inputs.update(inputs)
+    return workflow
+
+
+def decode_workflow(blob_json: str, patch_json: Optional[str]) -> dict[str, JSONValue]:
+    """블롭 JSON + 패치 JSON → 워크플로우 (호출마다 새 객체)."""
+    workflow = cast(dict[str, JSONValue], json.loads(blob_json))
+    if patch_json:
+        apply_patch(workflow, cast(WorkflowPatch, json.loads(patch_json)))
+    return workflow
+
+
+class WorkflowEncoder:
+    """워크플로우 → (workflow_json, workflow_hash, workflow_patch) 행 값.
+
+    새로 기록해야 할 블롭은 encode()의 new_blobs에 모은다. 호출자는 그 행을 커밋하는
+    트랜잭션(또는 그 전)에 블롭을 workflow_blobs에 넣어야 하고, 실패하면 다시 대기시켜야 한다.
+    """
+
+    def __init__(self, max_bases: int = MAX_BASES) -> None:
+        self._max_bases = max_bases
+        # 모양 → (기준 해시, 기준 워크플로우, 기준 정규 JSON 길이)
+        self._bases: OrderedDict[Hashable, tuple[str, dict[str, JSONValue], int]] = OrderedDict()
+        self._known: set[str] = set()
+
+    def reset(self) -> None:
+        """DB가 바뀌었을 때(재오픈/가져오기) 기억한 블롭을 잊는다."""
+        self._bases.clear()
+        self._known.clear()
+
+    def encode(
+        self, workflow: Optional[dict[str, JSONValue]], new_blobs: dict[str, str]
+    ) -> tuple[str, Optional[str], Optional[str]]:
+        if not workflow:
+            return "{}", None, None
+        shape = workflow_shape(workflow)
+        if shape is not None:
+            base = self._bases.get(shape)
+            if base is not None:
+                base_hash, base_workflow, base_len = base
+                self._bases.move_to_end(shape)
+                patch = diff_inputs(base_workflow, workflow)
+                if patch is not None:
+                    if not patch:
+                        return "", base_hash, None
+                    patch_json = json.dumps(patch, separators=(",", ":"), ensure_ascii=False)
+                    if len(patch_json) <= base_len * MAX_PATCH_RATIO:
+                        return "", base_hash, patch_json
+
+        canonical = canonical_json(workflow)
+        digest = blob_hash(canonical)
+        if digest not in self._known:
+            if len(self._known) >= MAX_KNOWN_BLOBS:
+                self._known.clear()
+            new_blobs[digest] = canonical
+            self._known.add(digest)
+        if shape is not None and shape not in self._bases:
+            # 호출자의 객체와 공유하지 않도록 정규 JSON에서 다시 만든다
+            self._bases[shape] = (digest, json.loads(canonical), len(canonical))
+            if len(self._bases) > self._max_bases:
+                self._bases.popitem(last=False)
+        return "", digest, None
@@ -26,6 +26,15 @@ class MappingSourceType(StrEnum):
     FIXED = auto()
 
 
+# input_key를 생략한 매핑이 채울 입력 (프론트엔드 자동 매핑과 같은 기본값)
+DEFAULT_INPUT_KEYS: dict[MappingSourceType, str] = {
+    MappingSourceType.PROMPT: "text",
+    MappingSourceType.FILENAME: "filename_prefix",
+    MappingSourceType.SEED: "seed",
+    MappingSourceType.IMAGE: "image",
+}
+
+
 class NodeMapping(BaseModel):
     """
     노드매핑 데이터 클래스
@@ -37,3 +46,9 @@ class NodeMapping(BaseModel):
     seed_random: Optional[bool] = None
     fixed_value: Optional[str] = None
     image_value: Optional[str] = None
+    input_key: Optional[str] = None
+
+    @property
+    def target_input(self) -> str:
+        """값을 넣을 노드 입력 이름. input_key가 없으면 소스 종류별 기본값."""
+        return self.input_key or DEFAULT_INPUT_KEYS.get(self.source_type, "text")
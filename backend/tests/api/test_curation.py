@@ -90,6 +90,32 @@ class TestSavedImagesList:
         for item in items:
             assert item["status"] == "approved"
 
+    async def test_list_with_template_hash_filter(self, client):
+        template = '{{axis mood}}\n  happy : "smiling"\n{{/axis}}\n{{template}}{{mood}}{{/template}}\n'
+        await _seed_image(self.store, hash_suffix="T1", filename="tpl_1.png", ceg_template=template)
+        await _seed_image(self.store, hash_suffix="T2", filename="tpl_2.png", ceg_template=template)
+        detail = await self.store.get_saved_image("abc123T1")
+
+        resp = client.get("/saved-images", params={"template_hash": detail["templateHash"]})
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["total"] == 2
+        assert {it["originalFilename"] for it in body["items"]} == {"tpl_1.png", "tpl_2.png"}
+        assert all(it["templateHash"] == detail["templateHash"] for it in body["items"])
+
+    def test_list_cursor_paging(self, client):
+        first = client.get("/saved-images", params={"limit": 2}).json()
+        assert first["total"] == 3 and first["nextCursor"]
+        rest = client.get(
+            "/saved-images", params={"limit": 2, "cursor": first["nextCursor"], "with_total": False}
+        ).json()
+        assert rest["total"] is None and rest["nextCursor"] is None
+        hashes = [it["hash"] for it in first["items"] + rest["items"]]
+        assert sorted(hashes) == ["abc12301", "abc12302", "abc12303"]
+
+    def test_list_bad_cursor_returns_400(self, client):
+        assert client.get("/saved-images", params={"cursor": "%%%"}).status_code == 400
+
     def test_list_with_filename_filter(self, client):
         resp = client.get("/saved-images", params={"filename": "img_01.png"})
         assert resp.status_code == 200
@@ -2,12 +2,19 @@
 Tests for:
   GET  /health
   GET  /version
+  GET  /debug/memory
   POST /render
+  POST /render/stream
+  POST /render/count
+  GET  /render/item/{index}
   POST /workflow/inject
+  POST /workflow/inject/batch
   GET  /templates
 """
 from __future__ import annotations
 
+import json
+
 
 # ──────────────────────────────────────────────────────────────────
 #  DSL templates — correct CEG grammar
@@ -61,6 +68,23 @@ def test_version_returns_fields(client):
     assert "commit" in data
 
 
+# ── debug/memory ───────────────────────────────────────────────────
+
+def test_debug_memory_reports_parse_cache(client):
+    before = client.get("/debug/memory").json()["parseCache"]
+    client.post("/render", json={"template": SIMPLE_TEMPLATE})
+    client.post("/render", json={"template": SIMPLE_TEMPLATE})
+    after = client.get("/debug/memory").json()["parseCache"]
+    assert after["hits"] >= before["hits"] + 1
+    assert after["size"] <= after["maxSize"]
+
+
+def test_debug_memory_reports_write_behind(client):
+    stats = client.get("/debug/memory").json()["writeBehind"]
+    assert stats["queueDepth"] >= 0
+    assert "lastFlushMs" in stats
+
+
 # ── render ─────────────────────────────────────────────────────────
 
 def test_render_simple(client):
@@ -128,6 +152,33 @@ def test_render_limit(client):
     assert len(data["items"]) == 2  # but only 2 items returned
 
 
+def test_render_sample_echoes_seed(client):
+    body = {"template": COMBINED_TEMPLATE, "sample": 2}
+    first = client.post("/render", json=body).json()
+    assert first["count"] == 4
+    assert len(first["items"]) == 2
+    assert isinstance(first["seed"], int)
+    again = client.post("/render", json={**body, "seed": first["seed"]}).json()
+    assert again["items"] == first["items"]
+    assert again["seed"] == first["seed"]
+    assert client.post("/render", json={"template": COMBINED_TEMPLATE}).json()["seed"] is None
+
+
+def test_render_coverage_reports(client):
+    resp = client.post("/render", json={"template": COMBINED_TEMPLATE, "coverage": 2})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["count"] == 4
+    assert data["coverage"]["strength"] == 2
+    assert data["coverage"]["ratio"] == 1.0
+    assert len(data["items"]) == data["coverage"]["rows"] == 4
+
+
+def test_render_sample_and_coverage_conflict(client):
+    resp = client.post("/render", json={"template": COMBINED_TEMPLATE, "coverage": 2, "sample": 2})
+    assert resp.status_code == 400
+
+
 def test_render_syntax_error_returns_400(client):
     resp = client.post("/render", json={"template": "{{axis}}"})
     assert resp.status_code == 400
@@ -145,6 +196,151 @@ def test_render_template_without_combine(client):
     assert len(data["items"]) == 1
 
 
+# ── render/stream ──────────────────────────────────────────────────
+
+def _ndjson(resp):
+    return [json.loads(line) for line in resp.text.splitlines()]
+
+
+def test_render_stream_matches_render(client):
+    body = {"template": COMBINED_TEMPLATE, "offset": 1, "limit": 2}
+    resp = client.post("/render/stream", json=body)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    records = _ndjson(resp)
+    full = client.post("/render", json=body).json()
+
+    header, *items, end = records
+    assert header["type"] == "header"
+    assert header["count"] == full["count"]
+    for key in ("axes", "sets", "excludes", "template_structure"):
+        assert header[key] == full[key]
+    assert [r["type"] for r in items] == ["item"] * 2
+    assert [r["index"] for r in items] == [1, 2]
+    assert [r["item"] for r in items] == full["items"]
+    assert end == {"type": "end", "emitted": 2}
+
+
+def test_render_stream_header_carries_coverage(client):
+    body = {"template": COMBINED_TEMPLATE, "coverage": 2, "limit": 3}
+    header, *items, end = _ndjson(client.post("/render/stream", json=body))
+    full = client.post("/render", json=body).json()
+    assert header["coverage"] == full["coverage"]
+    assert header["coverage"]["rows"] == 3
+    assert [r["item"] for r in items] == full["items"]
+    assert end == {"type": "end", "emitted": 3}
+    plain = _ndjson(client.post("/render/stream", json={"template": COMBINED_TEMPLATE}))
+    assert plain[0]["coverage"] is None
+
+
+def test_render_stream_batches_many_items(client):
+    axes = "".join(
+        f"{{{{axis a{a}}}}}\n" + "".join(f'  v{v} : "{v}"\n' for v in range(10)) + "{{/axis}}\n"
+        for a in range(3)
+    )
+    template = axes + "{{combine a0 * a1 * a2}}\n{{template}}x{{/template}}\n"
+    records = _ndjson(client.post("/render/stream", json={"template": template}))
+    assert records[0]["count"] == 1000
+    assert [r["index"] for r in records[1:-1]] == list(range(1000))
+    assert records[-1] == {"type": "end", "emitted": 1000}
+
+
+def test_render_stream_first_chunk_is_lazy(client):
+    """The first chunk (header + first item) is produced without expanding the product."""
+    from backend.src.prompt_dsl import parse, render_header, render_iter
+    from backend.src.server import RenderStreamHeader, _render_ndjson
+
+    axes = "".join(
+        f"{{{{axis a{a}}}}}\n" + "".join(f'  v{v} : "{v}"\n' for v in range(10)) + "{{/axis}}\n"
+        for a in range(9)
+    )
+    prog = parse(axes + "{{combine " + " * ".join(f"a{a}" for a in range(9)) + "}}\n{{template}}x{{/template}}\n")
+    meta = render_header(prog)
+    header = RenderStreamHeader.model_validate({"count": meta.pop("total"), **meta})
+    chunks = _render_ndjson(header, render_iter(prog), 0)
+    header_line, first = (json.loads(line) for line in next(chunks).splitlines())
+    assert header_line["count"] == 10**9
+    assert first == {"type": "item", "index": 0, "item": first["item"]}
+
+
+def test_render_stream_syntax_error_returns_400(client):
+    resp = client.post("/render/stream", json={"template": "{{axis}}"})
+    assert resp.status_code == 400
+    assert resp.json()["error"] == "DSLSyntaxError"
+
+
+# ── render/count ───────────────────────────────────────────────────
+
+def test_render_count_matches_render(client):
+    for body in (
+        {"template": COMBINED_TEMPLATE},
+        {"template": COMBINED_TEMPLATE, "only": {"mood": ["happy"]}},
+        {"template": COMBINED_TEMPLATE, "extra_excludes": [
+            {"conditions": [{"axis": "mood", "op": "eq", "values": ["sad"]},
+                            {"axis": "style", "op": "eq", "values": ["photo"]}]},
+        ]},
+        {"template": "{{template}}hello world{{/template}}"},
+    ):
+        count = client.post("/render/count", json=body)
+        assert count.status_code == 200
+        assert count.json()["count"] == client.post("/render", json=body).json()["count"]
+
+
+def test_render_count_large_product(client):
+    axes = "".join(
+        f"{{{{axis a{a}}}}}\n" + "".join(f'  v{v} : "{v}"\n' for v in range(10)) + "{{/axis}}\n"
+        for a in range(7)
+    )
+    template = (
+        axes
+        + "{{combine " + " * ".join(f"a{a}" for a in range(7)) + "}}\n"
+        + "{{exclude a0 = v0 AND a1 = v0}}\n"
+        + "{{template}}x{{/template}}\n"
+    )
+    resp = client.post("/render/count", json={"template": template})
+    assert resp.status_code == 200
+    assert resp.json()["count"] == 10**7 - 10**5
+
+
+def test_render_count_syntax_error_returns_400(client):
+    resp = client.post("/render/count", json={"template": "{{axis}}"})
+    assert resp.status_code == 400
+
+
+# ── render/item ────────────────────────────────────────────────────
+
+def test_render_item_matches_render_page(client):
+    full = client.post("/render", json={"template": COMBINED_TEMPLATE}).json()
+    for i, expected in enumerate(full["items"]):
+        resp = client.get(f"/render/item/{i}", params={"template": COMBINED_TEMPLATE})
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["index"] == i
+        assert data["count"] == 4
+        assert data["item"] == expected
+
+
+def test_render_item_with_filters(client):
+    resp = client.get(
+        "/render/item/1",
+        params={"template": COMBINED_TEMPLATE, "fix": "mood:sad", "only": ["style:photo", "style:painting"]},
+    )
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["count"] == 2
+    assert data["item"]["meta"] == {"mood": "sad", "style": "painting"}
+
+
+def test_render_item_out_of_range_returns_404(client):
+    resp = client.get("/render/item/4", params={"template": COMBINED_TEMPLATE})
+    assert resp.status_code == 404
+
+
+def test_render_item_bad_filter_returns_400(client):
+    resp = client.get("/render/item/0", params={"template": COMBINED_TEMPLATE, "fix": "mood"})
+    assert resp.status_code == 400
+
+
 # ── workflow/inject ────────────────────────────────────────────────
 
 def test_inject_string_prompt(client):
@@ -239,6 +435,18 @@ def test_inject_no_placeholder_match_returns_original(client):
     assert data["workflow"]["3"]["inputs"]["prompt"] == "static text"
 
 
+def test_inject_batch_matches_single(client):
+    workflow = {"1": {"inputs": {"text": "{{input}}", "seed": 1}}, "2": {"inputs": {"text": "static"}}}
+    prompts = ["cat", {"{{input}}": "dog"}, "bird"]
+    resp = client.post("/workflow/inject/batch", json={"workflow": workflow, "prompts": prompts})
+    assert resp.status_code == 200
+    workflows = resp.json()["workflows"]
+    assert len(workflows) == 3
+    for prompt, injected in zip(prompts, workflows):
+        single = client.post("/workflow/inject", json={"workflow": workflow, "prompt": prompt})
+        assert injected == single.json()["workflow"]
+
+
 # ── templates ──────────────────────────────────────────────────────
 
 def test_list_templates_returns_list(client):
@@ -0,0 +1,107 @@
+"""
+Tests for the server-side template-to-jobs pipeline:
+
+  POST /jobs/from-template             — expand template, inject, enqueue in chunks
+  GET  /jobs/from-template/{batch_id}  — batch progress
+  GET  /jobs, GET /logs                — cursor paging over the created jobs
+"""
+from __future__ import annotations
+
+import time
+
+TEMPLATE = (
+    '{{axis emotion}}\n'
+    '  happy : "smiling"\n'
+    '  sad : "crying"\n'
+    '  angry : "frowning"\n'
+    '{{/axis}}\n'
+    '{{combine emotion}}\n'
+    '{{template}}1girl, {{emotion}}{{/template}}\n'
+    '{{filename}}{{emotion}}{{/filename}}\n'
+)
+
+WORKFLOW = {
+    "3": {"class_type": "KSampler", "inputs": {"seed": 1}},
+    "6": {"class_type": "CLIPTextEncode", "inputs": {"text": ""}},
+    "9": {"class_type": "SaveImage", "inputs": {"filename_prefix": "out"}},
+}
+
+MAPPINGS = [
+    {"id": "p", "node_id": "6", "source_type": "prompt"},
+    {"id": "f", "node_id": "9", "source_type": "filename"},
+    {"id": "s", "node_id": "3", "source_type": "seed", "seed_value": 42},
+]
+
+
+def _wait_batch(client, batch_id: str) -> dict:
+    for _ in range(200):
+        body = client.get(f"/jobs/from-template/{batch_id}").json()
+        if body["status"] != "running":
+            return body
+        time.sleep(0.01)
+    raise AssertionError("batch did not finish")
+
+
+def test_from_template_creates_jobs(client):
+    resp = client.post("/jobs/from-template", json={
+        "template": TEMPLATE,
+        "workflow": WORKFLOW,
+        "node_mappings": MAPPINGS,
+        "chunk_size": 2,
+    })
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["total"] == 3
+
+    done = _wait_batch(client, body["batchId"])
+    assert done["status"] == "done"
+    assert done["created"] == 3
+
+    items = client.get("/jobs", params={"limit": 10}).json()["items"]
+    by_name = {j["filename"]: j for j in items}
+    assert set(by_name) == {"smiling", "crying", "frowning"}
+    wf = by_name["crying"]["workflow"]
+    assert wf["6"]["inputs"]["text"] == "1girl, crying"
+    assert wf["9"]["inputs"]["filename_prefix"] == "crying"
+    assert wf["3"]["inputs"]["seed"] == 42
+    assert by_name["crying"]["meta"] == {"emotion": "sad"}
+    assert by_name["crying"]["cegTemplate"] == TEMPLATE
+
+
+def test_from_template_limit_total(client):
+    resp = client.post("/jobs/from-template", json={
+        "template": TEMPLATE, "workflow": WORKFLOW, "node_mappings": MAPPINGS, "offset": 1, "limit": 5,
+    })
+    assert resp.json()["total"] == 2
+    assert _wait_batch(client, resp.json()["batchId"])["created"] == 2
+
+
+def test_from_template_bad_template(client):
+    resp = client.post("/jobs/from-template", json={"template": "{{combine nope}}", "workflow": WORKFLOW})
+    assert resp.status_code == 400
+
+
+def test_from_template_unknown_batch(client):
+    assert client.get("/jobs/from-template/missing").status_code == 404
+
+
+def test_jobs_and_logs_cursor_paging(client):
+    resp = client.post("/jobs/from-template", json={
+        "template": TEMPLATE, "workflow": WORKFLOW, "node_mappings": MAPPINGS,
+    })
+    _wait_batch(client, resp.json()["batchId"])
+
+    first = client.get("/jobs", params={"limit": 2}).json()
+    assert first["total"] == 3 and first["nextCursor"]
+    rest = client.get("/jobs", params={"limit": 2, "cursor": first["nextCursor"], "with_total": False}).json()
+    assert rest["total"] is None and rest["nextCursor"] is None
+    assert len({j["id"] for j in first["items"] + rest["items"]}) == 3
+
+    logs = client.get("/logs", params={"limit": 1}).json()
+    assert len(logs["events"]) == 1 and logs["nextCursor"]
+    more = client.get("/logs", params={"limit": 100, "cursor": logs["nextCursor"]}).json()
+    assert logs["events"][0]["id"] not in {e["id"] for e in more["events"]}
+
+    assert client.get("/jobs", params={"cursor": "garbage"}).status_code == 400
+    assert client.get("/jobs", params={"cursor": first["nextCursor"], "sort_by": "filename"}).status_code == 400
+    assert client.get("/logs", params={"cursor": first["nextCursor"]}).status_code == 400
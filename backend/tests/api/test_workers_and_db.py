@@ -9,6 +9,10 @@ Workers:
 DB:
   GET    /db/export              — export database file
   POST   /db/import              — import database from file upload
+  GET    /debug/counters         — status counter consistency check
+
+Jobs:
+  POST   /jobs/session-stats     — per-session job counts
 """
 from __future__ import annotations
 
@@ -389,4 +393,92 @@ class TestDbImport:
         # After import, export should still work
         export_resp2 = client.get("/db/export")
         assert export_resp2.status_code == 200
-        assert len(export_resp2.content) > 0
\ No newline at end of file
+        assert len(export_resp2.content) > 0
+
+# ═══════════════════════════════════════════════════════════════
+#  DB — GET /debug/counters
+# ═══════════════════════════════════════════════════════════════
+
+
+class TestDebugCounters:
+    """GET /debug/counters — recompute the status counters and report drift."""
+
+    @pytest_asyncio.fixture(autouse=True)
+    async def _setup(self, client):
+        self.store = _get_store()
+        await self.store.save({"id": "j1", "filename": "a", "prompt": "p", "status": "done", "createdAt": 100.0})
+        await self.store.flush()
+
+    def test_no_drift(self, client):
+        assert client.get("/debug/counters").json() == {"drift": [], "repaired": False}
+
+    async def test_reports_and_repairs_drift(self, client):
+        await self.store._conn.execute("UPDATE job_counts SET count = 5")
+        await self.store._conn.commit()
+        body = client.get("/debug/counters", params={"repair": True}).json()
+        assert body["repaired"] is True
+        assert body["drift"] == [{"table": "job_counts", "key": {"status": "done", "day": 0}, "column": "count", "stored": 5, "actual": 1}]
+        assert client.get("/debug/counters").json()["drift"] == []
+
+
+# ═══════════════════════════════════════════════════════════════
+#  Jobs — POST /jobs/session-stats
+# ═══════════════════════════════════════════════════════════════
+
+DAY_MS = 86_400_000
+STATUSES = ("pending", "queued", "running", "done", "error", "cancelled")
+
+
+def _expected_session_stats(jobs, markers, active, selected):
+    """잡마다 세션을 찾아 세는 원래 방식 (카운터 구현과 비교용)."""
+    ordered = sorted(markers, key=lambda m: m["startAt"], reverse=True)
+    sessions: dict[str, int] = {}
+    selected_counts = dict.fromkeys([*STATUSES, "active"], 0)
+    for created_at, status in jobs:
+        t = created_at * 1000
+        if active and t >= active["activatedAt"]:
+            sid = active["activeSessionId"]
+        else:
+            sid = next((m["id"] for m in ordered if t >= m["startAt"]), ordered[-1]["id"] if ordered else "")
+        if not sid:
+            continue
+        sessions[sid] = sessions.get(sid, 0) + 1
+        if sid == selected:
+            selected_counts[status] += 1
+            if status in ("pending", "queued", "running"):
+                selected_counts["active"] += 1
+    return {"sessionJobCounts": sessions, "selectedSessionCounts": selected_counts}
+
+
+class TestSessionStats:
+    """POST /jobs/session-stats — counts come from the DB status counters."""
+
+    JOBS = [(i * 21_600.0 + 1.5, STATUSES[i % 6]) for i in range(24)]  # 6일, 6시간 간격
+
+    @pytest_asyncio.fixture(autouse=True)
+    async def _setup(self, client):
+        store = _get_store()
+        for i, (created_at, status) in enumerate(self.JOBS):
+            await store.save({"id": f"j{i}", "filename": "a", "prompt": "p", "status": status, "createdAt": created_at})
+        await store.flush()
+
+    def test_matches_per_job_matching(self, client):
+        markers = [
+            {"id": "s1", "startAt": DAY_MS + 5, "label": "1"},
+            {"id": "s2", "startAt": 3 * DAY_MS, "label": "2"},
+            {"id": "s0", "startAt": DAY_MS // 2, "label": "0"},
+            {"id": "dup", "startAt": 3 * DAY_MS, "label": "same start"},
+        ]
+        cases = [
+            (markers, None, "s1"),
+            (markers, {"activeSessionId": "live", "activatedAt": 4 * DAY_MS + 7}, "live"),
+            (markers, {"activeSessionId": "s2", "activatedAt": 2 * DAY_MS}, "s2"),
+            ([], {"activeSessionId": "live", "activatedAt": DAY_MS}, "live"),
+            (markers[:1], None, "s1"),
+        ]
+        for case_markers, active, selected in cases:
+            resp = client.post("/jobs/session-stats", json={
+                "markers": case_markers, "activeState": active, "selectedSessionId": selected,
+            })
+            assert resp.status_code == 200
+            assert resp.json() == _expected_session_stats(self.JOBS, case_markers, active, selected)
@@ -6,7 +6,8 @@ from unittest.mock import AsyncMock, MagicMock
 import pytest
 
 from backend.src.job_store import JobStore
-from backend.src.jobs import JobManager, Job
+from backend.src.jobs import BULK_CREATED_EVENT_MIN, JobManager, Job
+from backend.src.models import JobItem, JobStatus, WorkerType
 from backend.src.worker_pool import WorkerPool
 from backend.src.worker import BaseWorker
 
@@ -188,3 +189,93 @@ class TestBatchCancel:
         loaded = await tmp_store.load_all()
         assert len(loaded) == 0
 
+
+
+class TestBulkSubmit:
+    @staticmethod
+    def _manager(tmp_store: JobStore, tmp_path) -> tuple[JobManager, list]:
+        manager = JobManager(pool=MagicMock(spec=WorkerPool), store=tmp_store, images_dir=tmp_path / "images")
+        events: list = []
+
+        async def listener(event) -> None:
+            events.append(event)
+
+        manager.subscribe(listener)
+        return manager, events
+
+    @staticmethod
+    def _items(n: int) -> list[JobItem]:
+        return [
+            JobItem(filename=f"bulk-{i}", prompt=f"p{i}", workerType=WorkerType.COMFYUI,
+                    workflow={"1": {"class_type": "KSampler", "inputs": {}}})
+            for i in range(n)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_small_submit_emits_per_job_events(self, tmp_store: JobStore, tmp_path) -> None:
+        manager, events = self._manager(tmp_store, tmp_path)
+        jobs = await manager.submit(self._items(3))
+        assert [e.type for e in events] == ["job.created"] * 3
+        assert [e.job.id for e in events] == [j.id for j in jobs]
+
+    @pytest.mark.asyncio
+    async def test_bulk_submit_emits_single_compact_event(self, tmp_store: JobStore, tmp_path) -> None:
+        manager, events = self._manager(tmp_store, tmp_path)
+        jobs = await manager.submit(self._items(BULK_CREATED_EVENT_MIN))
+
+        assert len(events) == 1
+        event = events[0]
+        assert event.type == "jobs.created"
+        assert [s.id for s in event.jobs] == [j.id for j in jobs]
+        assert event.jobs[0].filename == "bulk-0"
+        assert "workflow" not in event.model_dump()["jobs"][0]
+
+        assert len(manager._jobs) == BULK_CREATED_EVENT_MIN
+        assert len(await tmp_store.load_all()) == BULK_CREATED_EVENT_MIN
+        created = await tmp_store.get_job_events(jobs[-1].id)
+        assert [e["eventType"] for e in created] == ["created"]
+
+    @pytest.mark.asyncio
+    async def test_retry_uses_bulk_path(self, tmp_store: JobStore, tmp_path) -> None:
+        manager, events = self._manager(tmp_store, tmp_path)
+        originals = [Job.from_dict(_make_job_dict(id=f"orig-{i}", status="error")) for i in range(BULK_CREATED_EVENT_MIN)]
+        retried = await manager.retry(originals)
+
+        assert [e.type for e in events] == ["jobs.created"]
+        assert {j.id for j in retried}.isdisjoint(j.id for j in originals)
+        assert all(j.status == "pending" for j in retried)
+        assert len(await tmp_store.load_all()) == BULK_CREATED_EVENT_MIN
+
+
+class TestPartialUpdates:
+    @pytest.mark.asyncio
+    async def test_lifecycle_never_rewrites_full_row(self, tmp_store: JobStore, tmp_path) -> None:
+        manager = JobManager(pool=MagicMock(spec=WorkerPool), store=tmp_store, images_dir=tmp_path / "images")
+        job = await manager.submit(JobItem(filename="p", prompt="p", workerType=WorkerType.COMFYUI))
+        tmp_store.save = AsyncMock(side_effect=AssertionError("full-row save"))
+
+        await manager._update(job.id, status=JobStatus.RUNNING, started_at=1.0, progress_percent=50.0,
+                              image_urls_append=["u1"])
+        await manager._finish(job.id)
+
+        stored = await tmp_store.get_job(job.id)
+        assert stored["status"] == "done"
+        assert stored["progressPercent"] == 50.0
+        assert stored["imageUrls"] == ["u1"]
+        assert stored["startedAt"] == 1.0
+        assert stored["finishedAt"] is not None
+        assert stored["executionDurationMs"] is not None
+
+    @pytest.mark.asyncio
+    async def test_reload_persists_requeued_jobs(self, tmp_store: JobStore, tmp_path) -> None:
+        manager = JobManager(pool=MagicMock(spec=WorkerPool), store=tmp_store, images_dir=tmp_path / "images")
+        await tmp_store.save(_make_job_dict(id="job-running", status="running", worker_id="w-1"))
+        await tmp_store.save(_make_job_dict(id="job-done", status="done"))
+
+        await manager.reload_jobs()
+
+        stored = await tmp_store.get_job("job-running")
+        assert manager._jobs["job-running"].status == JobStatus.PENDING
+        assert stored["status"] == "pending"
+        assert stored["workerId"] is None
+        assert await tmp_store.count_jobs_by_status() == {"pending": 1, "done": 1}
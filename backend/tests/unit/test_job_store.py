@@ -2,12 +2,22 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
+import random
+import sqlite3
 import time
 from typing import Any
 
+import pytest
 
-from backend.src.job_store import JobStore, _saved_image_row_to_dict
+from backend.src.job_store import (
+    JobStore,
+    _saved_image_row_to_dict,
+    event_cursor,
+    job_cursor,
+    saved_image_cursor,
+)
 
 
 # ---------------------------------------------------------------------------
@@ -122,6 +132,16 @@ class TestJobs:
         assert loaded[0]["_workflow"] == {"5": {"class_type": "CLIPTextEncode"}}
         assert loaded[0]["meta"] == {"seed": 42}
 
+    async def test_load_active_streams_only_active_jobs(self, tmp_store: JobStore) -> None:
+        statuses = ["done", "pending", "running", "error", "queued", "cancelled", "pending"]
+        for i, status in enumerate(statuses):
+            await tmp_store.save(_make_job(id=f"j{i}", status=status, created_at=100.0 + i // 3,
+                                           _workflow={"3": {"inputs": {"seed": i}}}))
+        chunks = [chunk async for chunk in tmp_store.load_active(chunk_size=2)]
+        assert [[j["id"] for j in chunk] for chunk in chunks] == [["j1", "j2"], ["j4", "j6"]]
+        assert chunks[1][1]["_workflow"] == {"3": {"inputs": {"seed": 6}}}
+        assert [chunk async for chunk in tmp_store.load_active(chunk_size=10)] == [chunks[0] + chunks[1]]
+
     async def test_delete(self, tmp_store: JobStore) -> None:
         await tmp_store.save(_make_job(id="j1"))
         await tmp_store.save(_make_job(id="j2"))
@@ -134,6 +154,23 @@ class TestJobs:
         """Deleting a missing id should not raise."""
         await tmp_store.delete("ghost")
 
+    async def test_save_created_writes_jobs_and_events(self, tmp_store: JobStore) -> None:
+        await tmp_store.save_created([_make_job(id=f"j{i}", filename=f"f{i}.png") for i in range(3)])
+        loaded = await tmp_store.load_all()
+        assert sorted(j["id"] for j in loaded) == ["j0", "j1", "j2"]
+        events = await tmp_store.get_job_events("j1")
+        assert len(events) == 1
+        assert events[0]["eventType"] == "created"
+        assert events[0]["details"] == {"filename": "f1.png", "prompt": "a happy cat"}
+
+    async def test_save_created_rolls_back_on_error(self, tmp_store: JobStore) -> None:
+        # 두 번째 행이 NOT NULL 제약에 걸리면 첫 행도 남지 않는다
+        bad = _make_job(id="j2", filename=None)
+        with pytest.raises(sqlite3.IntegrityError):
+            await tmp_store.save_created([_make_job(id="j1"), bad])
+        assert await tmp_store.load_all() == []
+        assert await tmp_store.get_job_events("j1") == []
+
     async def test_count_jobs_no_filter(self, tmp_store: JobStore) -> None:
         await tmp_store.save(_make_job(id="j1"))
         await tmp_store.save(_make_job(id="j2"))
@@ -183,6 +220,25 @@ class TestJobs:
         assert len(result) == 1
         assert result[0]["id"] == "j2"
 
+    async def test_query_jobs_active_statuses(self, tmp_store: JobStore) -> None:
+        for i, status in enumerate(["running", "done", "pending", "queued", "error"]):
+            await tmp_store.save(_make_job(id=f"j{i}", status=status, created_at=100.0 + i))
+        active = ["queued", "running", "pending"]
+        result = await tmp_store.query_jobs(statuses=active)
+        assert [r["id"] for r in result] == ["j3", "j2", "j0"]
+        assert await tmp_store.count_jobs(statuses=active) == 3
+        result = await tmp_store.query_jobs(statuses=active, sort_by="filename", sort_order="asc")
+        assert {r["id"] for r in result} == {"j0", "j2", "j3"}
+
+    async def test_query_jobs_sort_by_status_newest_first(self, tmp_store: JobStore) -> None:
+        await tmp_store.save(_make_job(id="b", status="done", created_at=100.0))
+        await tmp_store.save(_make_job(id="a", status="done", created_at=200.0))
+        await tmp_store.save(_make_job(id="c", status="error", created_at=150.0))
+        result = await tmp_store.query_jobs(sort_by="status", sort_order="asc")
+        assert [r["id"] for r in result] == ["b", "a", "c"]
+        result = await tmp_store.query_jobs(sort_by="status", sort_order="desc")
+        assert [r["id"] for r in result] == ["c", "a", "b"]
+
     async def test_query_jobs_filename_filter(self, tmp_store: JobStore) -> None:
         await tmp_store.save(_make_job(id="j1", filename="cat.png"))
         await tmp_store.save(_make_job(id="j2", filename="dog.png"))
@@ -196,6 +252,86 @@ class TestJobs:
         assert len(result) == 1 and result[0]["id"] == "j1"
 
 
+class TestJobSearchIndex:
+    """Tests for the jobs_fts search index behind count_jobs / query_jobs search_tags."""
+
+    async def _ids(self, store: JobStore, *tags: str) -> list[str]:
+        rows = await store.query_jobs(search_tags=list(tags), sort_by="filename", sort_order="asc")
+        assert await store.count_jobs(search_tags=list(tags)) == len(rows)
+        return [r["id"] for r in rows]
+
+    async def _integrity_check(self, store: JobStore) -> None:
+        await store._conn.execute("INSERT INTO jobs_fts (jobs_fts, rank) VALUES ('integrity-check', 1)")
+
+    async def test_prefixes_and_plain_terms(self, tmp_store: JobStore) -> None:
+        await tmp_store.save(_make_job(id="a", filename="smile_cat.png", prompt="Happy Cat"))
+        await tmp_store.save(_make_job(id="b", filename="dog.png", prompt="sad dog", error="CUDA out of memory"))
+        await tmp_store.save(_make_job(id="c", filename="bird.png", prompt="bird", meta={"mood": "smile"}))
+        assert tmp_store._fts
+        assert await self._ids(tmp_store, "@smile") == ["a"]
+        assert await self._ids(tmp_store, "#happy cat") == ["a"]
+        assert await self._ids(tmp_store, "$memory") == ["b"]
+        assert await self._ids(tmp_store, "smile") == ["c", "a"]
+        assert await self._ids(tmp_store, "@bird", "$cuda") == ["c", "b"]
+
+    async def test_short_terms_fall_back_to_like(self, tmp_store: JobStore) -> None:
+        await tmp_store.save(_make_job(id="a", filename="a_1.png", prompt="ox"))
+        await tmp_store.save(_make_job(id="b", filename="ab1.png", prompt="cow"))
+        assert await self._ids(tmp_store, "#ox") == ["a"]
+        assert await self._ids(tmp_store, "#ox", "@ab1") == ["a", "b"]
+        assert await self._ids(tmp_store, '"') == []
+
+    async def test_wildcards_are_literal_in_fts(self, tmp_store: JobStore) -> None:
+        await tmp_store.save(_make_job(id="a", filename="a_1.png"))
+        await tmp_store.save(_make_job(id="b", filename="ab1.png"))
+        assert await self._ids(tmp_store, "@a_1") == ["a"]
+        assert await self._ids(tmp_store, "@a%1") == []
+
+    async def test_dense_matches_page_in_created_at_order(
+        self, tmp_store: JobStore, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        from backend.src import job_store
+
+        monkeypatch.setattr(job_store, "FTS_DENSE_MATCHES", 2)
+        for i in range(4):
+            await tmp_store.save(_make_job(id=f"j{i}", prompt="smile", created_at=1000.0 + i))
+        await tmp_store.save(_make_job(id="other", prompt="frown", created_at=2000.0))
+        rows = await tmp_store.query_jobs(search_tags=["#smile"], limit=2, offset=1)
+        assert [r["id"] for r in rows] == ["j2", "j1"]
+        rows = await tmp_store.query_jobs(search_tags=["#smile"], sort_order="asc", limit=2)
+        assert [r["id"] for r in rows] == ["j0", "j1"]
+
+    async def test_index_follows_replace_update_and_delete(self, tmp_store: JobStore) -> None:
+        await tmp_store.save(_make_job(id="a", prompt="first prompt"))
+        await tmp_store.flush()
+        await tmp_store.save(_make_job(id="a", prompt="second prompt"))
+        assert await self._ids(tmp_store, "#first") == []
+        assert await self._ids(tmp_store, "#second") == ["a"]
+
+        await tmp_store.update_fields("a", error="worker timeout")
+        assert await self._ids(tmp_store, "$timeout") == ["a"]
+
+        await tmp_store.delete("a")
+        assert await self._ids(tmp_store, "#second") == []
+        await self._integrity_check(tmp_store)
+
+    async def test_index_built_for_existing_jobs(self, tmp_path) -> None:
+        store = JobStore(db_path=tmp_path / "legacy.db", flush_interval=0)
+        await store.open()
+        await store.save(_make_job(id="a", prompt="legacy prompt"))
+        await store.flush()
+        await store._conn.execute("DROP TABLE jobs_fts")
+        await store._conn.commit()
+        await store.close()
+
+        await store.open()
+        try:
+            assert await self._ids(store, "#legacy") == ["a"]
+            await self._integrity_check(store)
+        finally:
+            await store.close()
+
+
 # ===================================================================
 # Job events
 # ===================================================================
@@ -260,6 +396,486 @@ class TestExecutionEvents:
         assert len(events) == 3
 
 
+# ===================================================================
+# Write-behind
+# ===================================================================
+
+
+async def _raw_count(store: JobStore, table: str) -> int:
+    """flush 없이 DB에 실제로 기록된 행 수."""
+    cursor = await store._conn.execute(f"SELECT COUNT(*) FROM {table}")
+    return (await cursor.fetchone())[0]
+
+
+class TestWriteBehind:
+    """Tests for the write-behind queue (save / save_event → flush)."""
+
+    @pytest.fixture
+    async def store(self, tmp_path):
+        # 주기 flush를 끄고 임계값으로만 동작을 확인
+        store = JobStore(db_path=tmp_path / "wb.db", flush_interval=0, max_pending=10)
+        await store.open()
+        try:
+            yield store
+        finally:
+            await store.close()
+
+    async def test_writes_are_queued_until_flush(self, store: JobStore) -> None:
+        await store.save(_make_job(id="j1"))
+        await store.save_event("j1", "started")
+        await store.save_execution_event("j1", "w1", "progress", {"value": 1})
+        assert store.pending_writes == 3
+        assert await _raw_count(store, "jobs") == 0
+
+        await store.flush()
+        assert store.pending_writes == 0
+        assert await _raw_count(store, "jobs") == 1
+        assert await _raw_count(store, "job_events") == 1
+        assert await _raw_count(store, "execution_events") == 1
+
+    async def test_job_rows_coalesce_last_write_wins(self, store: JobStore) -> None:
+        for pct in (10.0, 50.0, 90.0):
+            await store.save(_make_job(id="j1", status="running", progressPercent=pct))
+        assert store.pending_writes == 1
+        loaded = await store.get_job("j1")
+        assert loaded["progressPercent"] == 90.0
+
+    async def test_reads_see_pending_writes(self, store: JobStore) -> None:
+        await store.save(_make_job(id="j1"))
+        await store.save_event("j1", "created")
+        assert [j["id"] for j in await store.load_all()] == ["j1"]
+        assert await store.count_jobs() == 1
+        assert len(await store.get_job_events("j1")) == 1
+
+    async def test_size_threshold_flushes(self, store: JobStore) -> None:
+        for i in range(10):
+            await store.save_event("j1", f"e{i}")
+        assert store.pending_writes == 0
+        assert await _raw_count(store, "job_events") == 10
+
+    async def test_delete_is_not_undone_by_pending_write(self, store: JobStore) -> None:
+        await store.save(_make_job(id="j1"))
+        await store.delete("j1")
+        await store.flush()
+        assert await _raw_count(store, "jobs") == 0
+
+    async def test_close_flushes(self, tmp_path) -> None:
+        store = JobStore(db_path=tmp_path / "wb.db", flush_interval=0)
+        await store.open()
+        await store.save(_make_job(id="j1"))
+        await store.close()
+
+        reopened = JobStore(db_path=tmp_path / "wb.db", flush_interval=0)
+        await reopened.open()
+        try:
+            assert [j["id"] for j in await reopened.load_all()] == ["j1"]
+        finally:
+            await reopened.close()
+
+    async def test_interval_flush(self, tmp_path) -> None:
+        store = JobStore(db_path=tmp_path / "wb.db", flush_interval=0.01)
+        await store.open()
+        try:
+            await store.save(_make_job(id="j1"))
+            for _ in range(100):
+                if not store.pending_writes:
+                    break
+                await asyncio.sleep(0.01)
+            assert await _raw_count(store, "jobs") == 1
+        finally:
+            await store.close()
+
+    async def test_failed_flush_requeues(self, store: JobStore) -> None:
+        await store.save(_make_job(id="j1", filename=None))
+        await store.save_event("j1", "created")
+        with pytest.raises(sqlite3.IntegrityError):
+            await store.flush()
+        assert store.pending_writes == 2
+        assert await _raw_count(store, "job_events") == 0
+
+        # 더 새 값이 들어오면 그것이 기록된다
+        await store.save(_make_job(id="j1"))
+        await store.flush()
+        assert await _raw_count(store, "jobs") == 1
+        assert await _raw_count(store, "job_events") == 1
+
+    async def test_failing_writer_does_not_roll_back_running_flush(self, tmp_path) -> None:
+        store = JobStore(db_path=tmp_path / "wb.db", flush_interval=0)
+        await store.open()
+        try:
+            for i in range(50):
+                await store.save(_make_job(id=f"j{i}"))
+                await store.save_event(f"j{i}", "created")
+            flushing = asyncio.create_task(store.flush())
+            await asyncio.sleep(0)  # flush가 트랜잭션을 연 상태에서
+            with pytest.raises(sqlite3.IntegrityError):
+                await store.save_created([_make_job(id="bad", filename=None)])
+            await flushing
+            assert store.pending_writes == 0
+            assert await _raw_count(store, "jobs") == 50
+            assert await _raw_count(store, "job_events") == 50
+        finally:
+            await store.close()
+
+    async def test_concurrent_commit_does_not_commit_half_a_flush(self, tmp_path) -> None:
+        store = JobStore(db_path=tmp_path / "wb.db", flush_interval=0)
+        await store.open()
+        try:
+            await store.save_created([_make_job(id="j0")])
+            for i in range(1, 50):
+                await store.save(_make_job(id=f"j{i}"))
+            await store.update_fields("j0", status=None)  # type: ignore[typeddict-item]
+            flushing = asyncio.create_task(store.flush())
+            await asyncio.sleep(0)
+            await store.save_setting("k", "v")
+            with pytest.raises(sqlite3.IntegrityError):
+                await flushing
+            # 실패한 flush의 행은 하나도 커밋되지 않고 모두 큐로 돌아간다
+            assert await _raw_count(store, "jobs") == 1
+            assert store.pending_writes == 50
+            assert await store.get_setting("k") == "v"
+        finally:
+            store._pending_updates.clear()
+            await store.close()
+
+    @staticmethod
+    def _slow_executemany(store: JobStore, monkeypatch: pytest.MonkeyPatch) -> None:
+        executemany = store._conn.executemany
+
+        async def slow(sql: str, params: Any) -> Any:
+            await asyncio.sleep(0.5)
+            return await executemany(sql, params)
+
+        monkeypatch.setattr(store._conn, "executemany", slow)
+
+    async def _reopened_job(self, tmp_path, job_id: str) -> dict[str, Any]:
+        reopened = JobStore(db_path=tmp_path / "wb.db", flush_interval=0)
+        await reopened.open()
+        try:
+            return await reopened.get_job(job_id)
+        finally:
+            await reopened.close()
+
+    async def test_cancelled_flush_requeues(self, tmp_path, monkeypatch) -> None:
+        store = JobStore(db_path=tmp_path / "wb.db", flush_interval=0)
+        await store.open()
+        await store.save_created([_make_job(id="a")])
+        await store.update_fields("a", status="done", finished_at=1.0)
+        await store.save_event("a", "done")
+        self._slow_executemany(store, monkeypatch)
+        # 요청 쪽 flush가 트랜잭션 도중에 취소돼도 (클라이언트 연결 끊김) 쓰기는 큐로 돌아간다
+        flushing = asyncio.create_task(store.flush())
+        await asyncio.sleep(0.1)
+        flushing.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await flushing
+        assert store.pending_writes == 2
+        monkeypatch.undo()
+        await store.close()
+
+        loaded = await self._reopened_job(tmp_path, "a")
+        assert loaded["status"] == "done"
+        assert loaded["finishedAt"] == 1.0
+
+    async def test_close_waits_for_running_flush(self, tmp_path, monkeypatch) -> None:
+        store = JobStore(db_path=tmp_path / "wb.db", flush_interval=0.01)
+        await store.open()
+        await store.save_created([_make_job(id="a")])
+        self._slow_executemany(store, monkeypatch)
+        await store.update_fields("a", status="done", finished_at=1.0)
+        while store.pending_writes:  # 주기 flush가 큐를 꺼내 트랜잭션을 연 상태에서 닫는다
+            await asyncio.sleep(0.01)
+        await store.close()
+
+        loaded = await self._reopened_job(tmp_path, "a")
+        assert loaded["status"] == "done"
+        assert loaded["finishedAt"] == 1.0
+
+    async def test_update_fields_only_touches_given_columns(self, store: JobStore) -> None:
+        await store.save_created([_make_job(id="j1", prompt="keep me")])
+        await store.update_fields("j1", status="running", progress_percent=42.0, image_urls=["u1"])
+        await store.update_fields("j1", progress_percent=64.0)
+        assert store.pending_writes == 1
+        loaded = await store.get_job("j1")
+        assert loaded["status"] == "running"
+        assert loaded["progressPercent"] == 64.0
+        assert loaded["imageUrls"] == ["u1"]
+        assert loaded["prompt"] == "keep me"
+        assert loaded["_workflow"] == {"3": {"class_type": "KSampler"}}
+
+    async def test_update_fields_rejects_immutable(self, store: JobStore) -> None:
+        with pytest.raises(ValueError):
+            await store.update_fields("j1", prompt="nope")  # type: ignore[call-arg]
+
+    async def test_update_after_pending_row_applies_on_top(self, store: JobStore) -> None:
+        await store.save(_make_job(id="j1", status="pending"))
+        await store.update_fields("j1", status="queued", worker_id="w1")
+        loaded = await store.get_job("j1")
+        assert loaded["status"] == "queued"
+        assert loaded["workerId"] == "w1"
+
+    async def test_full_row_supersedes_pending_update(self, store: JobStore) -> None:
+        await store.save_created([_make_job(id="j1")])
+        await store.update_fields("j1", status="queued")
+        await store.save(_make_job(id="j1", status="done"))
+        assert (await store.get_job("j1"))["status"] == "done"
+
+    async def test_stats(self, store: JobStore) -> None:
+        await store.save(_make_job(id="j1"))
+        await store.save_event("j1", "created")
+        stats = store.write_behind_stats()
+        assert stats["queueDepth"] == 2
+        assert stats["pendingJobs"] == 1
+        assert stats["flushes"] == 0
+        assert stats["lastFlushMs"] is None
+
+        await store.flush()
+        stats = store.write_behind_stats()
+        assert stats["queueDepth"] == 0
+        assert stats["flushes"] == 1
+        assert stats["flushedRows"] == 2
+        assert stats["lastFlushMs"] >= 0
+
+
+def _workflow(text: str, seed: int = 1) -> dict[str, Any]:
+    return {
+        "3": {"class_type": "KSampler", "inputs": {"seed": seed, "steps": 20, "model": ["4", 0]}},
+        "4": {"class_type": "CheckpointLoaderSimple", "inputs": {"ckpt_name": "model.safetensors"}},
+        "6": {"class_type": "CLIPTextEncode", "inputs": {"text": text, "clip": ["4", 1]},
+              "_meta": {"title": "Positive"}},
+    }
+
+
+class TestWorkflowBlobs:
+    """Tests for workflow_blobs dedup (blob + input patch per row)."""
+
+    async def test_jobs_share_one_blob(self, tmp_store: JobStore) -> None:
+        for i in range(5):
+            await tmp_store.save(_make_job(id=f"j{i}", _workflow=_workflow(f"prompt {i}", seed=i)))
+        loaded = {j["id"]: j["_workflow"] for j in await tmp_store.load_all()}
+        assert loaded == {f"j{i}": _workflow(f"prompt {i}", seed=i) for i in range(5)}
+        assert await _raw_count(tmp_store, "workflow_blobs") == 1
+
+        cursor = await tmp_store._conn.execute(
+            "SELECT workflow_json, workflow_patch FROM jobs WHERE id = 'j3'"
+        )
+        row = await cursor.fetchone()
+        assert row["workflow_json"] == ""
+        assert json.loads(row["workflow_patch"]) == {"3": {"seed": 3}, "6": {"text": "prompt 3"}}
+
+    async def test_save_created_and_get_job(self, tmp_store: JobStore) -> None:
+        await tmp_store.save_created(
+            [_make_job(id=f"j{i}", _workflow=_workflow(f"p{i}")) for i in range(3)]
+        )
+        assert (await tmp_store.get_job("j2"))["_workflow"] == _workflow("p2")
+        assert await _raw_count(tmp_store, "workflow_blobs") == 1
+
+    async def test_different_shape_gets_own_blob(self, tmp_store: JobStore) -> None:
+        other = _workflow("x")
+        other["9"] = {"class_type": "SaveImage", "inputs": {"filename_prefix": "out"}}
+        await tmp_store.save(_make_job(id="a", _workflow=_workflow("x")))
+        await tmp_store.save(_make_job(id="b", _workflow=other))
+        await tmp_store.save(_make_job(id="c", _workflow={}))
+        jobs = {j["id"]: j["_workflow"] for j in await tmp_store.load_all()}
+        assert jobs == {"a": _workflow("x"), "b": other, "c": {}}
+        assert await _raw_count(tmp_store, "workflow_blobs") == 2
+
+    async def test_saved_image_reuses_job_blob(self, tmp_store: JobStore) -> None:
+        await tmp_store.save(_make_job(id="j1", _workflow=_workflow("base")))
+        await tmp_store.flush()
+        # model_dump()는 노드 링크를 튜플로 준다
+        dumped = _workflow("image prompt")
+        dumped["3"]["inputs"]["model"] = ("4", 0)
+        await tmp_store.save_image_record(**_make_image(hash="h1", workflow=dumped))
+        assert await _raw_count(tmp_store, "workflow_blobs") == 1
+
+        expected = _workflow("image prompt")
+        assert (await tmp_store.get_saved_image("h1"))["workflow"] == expected
+        assert (await tmp_store.list_saved_images())[0]["workflow"] == expected
+
+    async def test_failed_transaction_keeps_blob_pending(self, tmp_store: JobStore) -> None:
+        with pytest.raises(sqlite3.IntegrityError):
+            await tmp_store.save_created([_make_job(id="bad", filename=None, _workflow=_workflow("x"))])
+        assert await _raw_count(tmp_store, "workflow_blobs") == 0
+        # 인코더는 블롭을 이미 기억하므로 다음 기록에서 대기 중인 블롭이 함께 들어가야 한다
+        await tmp_store.save_created([_make_job(id="ok", _workflow=_workflow("y"))])
+        assert await _raw_count(tmp_store, "workflow_blobs") == 1
+        assert (await tmp_store.get_job("ok"))["_workflow"] == _workflow("y")
+
+    async def test_migrates_inline_workflows_on_open(self, tmp_path) -> None:
+        db_path = tmp_path / "legacy.db"
+        store = JobStore(db_path=db_path, flush_interval=0)
+        await store.open()
+        for i in range(3):
+            await store._conn.execute(
+                "INSERT INTO jobs (id, filename, prompt, workflow_json, status, created_at) "
+                "VALUES (?, 'f.png', 'p', ?, 'done', ?)",
+                (f"j{i}", json.dumps(_workflow(f"p{i}")), float(i)),
+            )
+        await store._conn.execute(
+            "INSERT INTO jobs (id, filename, prompt, workflow_json, status, created_at) "
+            "VALUES ('broken', 'f.png', 'p', 'not-json', 'done', 9)"
+        )
+        await store._conn.execute(
+            "INSERT INTO saved_images (hash, job_id, created_at, workflow_json) VALUES ('h1', 'j0', 0, ?)",
+            (json.dumps(_workflow("p0")),),
+        )
+        await store._conn.commit()
+        await store.close()
+
+        await store.open()
+        try:
+            cursor = await store._conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE workflow_hash IS NULL AND workflow_json NOT IN ('', '{}')"
+            )
+            assert (await cursor.fetchone())[0] == 0
+            jobs = {j["id"]: j["_workflow"] for j in await store.load_all()}
+            assert jobs == {**{f"j{i}": _workflow(f"p{i}") for i in range(3)}, "broken": {}}
+            assert (await store.get_saved_image("h1"))["workflow"] == _workflow("p0")
+            assert await _raw_count(store, "workflow_blobs") == 1
+        finally:
+            await store.close()
+
+    async def test_reopen_on_other_db_rewrites_blob(self, tmp_path) -> None:
+        store = JobStore(db_path=tmp_path / "a.db", flush_interval=0)
+        await store.open()
+        await store.save(_make_job(id="j1", _workflow=_workflow("x")))
+        await store.close()
+
+        # /db/import처럼 같은 인스턴스가 다른 DB 파일을 연다
+        store._db_path = tmp_path / "b.db"
+        await store.open()
+        try:
+            await store.save(_make_job(id="j2", _workflow=_workflow("y")))
+            assert (await store.get_job("j2"))["_workflow"] == _workflow("y")
+        finally:
+            await store.close()
+
+
+TEMPLATE = '{{axis mood}}\n  happy : "smiling"\n  sad : "crying"\n{{/axis}}\n{{template}}{{mood}}{{/template}}\n'
+
+
+class TestTemplateInterning:
+    """Tests for the templates table (ceg_template interned by content hash)."""
+
+    async def test_jobs_share_one_template_row(self, tmp_store: JobStore) -> None:
+        await tmp_store.save_created([_make_job(id=f"j{i}", cegTemplate=TEMPLATE) for i in range(3)])
+        await tmp_store.save(_make_job(id="plain"))
+        jobs = {j["id"]: j["cegTemplate"] for j in await tmp_store.load_all()}
+        assert jobs == {"j0": TEMPLATE, "j1": TEMPLATE, "j2": TEMPLATE, "plain": ""}
+        assert await _raw_count(tmp_store, "templates") == 1
+
+        cursor = await tmp_store._conn.execute("SELECT ceg_template, template_hash FROM jobs WHERE id = 'j0'")
+        row = await cursor.fetchone()
+        assert row["ceg_template"] == ""
+        assert row["template_hash"]
+
+    async def test_saved_images_filter_by_template(self, tmp_store: JobStore) -> None:
+        await tmp_store.save(_make_job(id="j1", cegTemplate=TEMPLATE))
+        await tmp_store.flush()
+        await tmp_store.save_image_record(**_make_image(hash="h1", ceg_template=TEMPLATE, meta={"mood": "happy"}))
+        await tmp_store.save_image_record(**_make_image(hash="h2", ceg_template=TEMPLATE, meta={"mood": "sad"}))
+        await tmp_store.save_image_record(**_make_image(hash="h3"))
+        assert await _raw_count(tmp_store, "templates") == 1
+
+        image = await tmp_store.get_saved_image("h1")
+        assert image["cegTemplate"] == TEMPLATE
+        assert image["tags"] == ["happy"]
+        listed = await tmp_store.list_saved_images(template_hash=image["templateHash"])
+        assert sorted(i["hash"] for i in listed) == ["h1", "h2"]
+        assert await tmp_store.count_saved_images(template_hash=image["templateHash"]) == 2
+
+    async def test_template_parsed_once_for_auto_tags(self, tmp_store: JobStore, monkeypatch) -> None:
+        import backend.src.prompt_dsl as prompt_dsl
+
+        calls: list[str] = []
+        real_parse = prompt_dsl.parse
+        monkeypatch.setattr(prompt_dsl, "parse", lambda src: calls.append(src) or real_parse(src))
+        for i, mood in enumerate(["happy", "sad", "happy"]):
+            await tmp_store.save_image_record(
+                **_make_image(hash=f"h{i}", ceg_template=TEMPLATE, meta={"mood": mood})
+            )
+        assert await tmp_store.auto_generate_tags("h1") == ["sad"]
+        assert len(calls) == 1
+
+    async def test_migrates_inline_templates_on_open(self, tmp_path) -> None:
+        store = JobStore(db_path=tmp_path / "legacy.db", flush_interval=0)
+        await store.open()
+        await store._conn.execute(
+            "INSERT INTO jobs (id, filename, prompt, workflow_json, status, created_at, ceg_template) "
+            "VALUES ('j1', 'f.png', 'p', '{}', 'done', 0, ?)",
+            (TEMPLATE,),
+        )
+        await store._conn.execute(
+            "INSERT INTO saved_images (hash, job_id, created_at, ceg_template) VALUES ('h1', 'j1', 0, ?)",
+            (TEMPLATE,),
+        )
+        await store._conn.commit()
+        await store.close()
+
+        await store.open()
+        try:
+            assert (await store.get_job("j1"))["cegTemplate"] == TEMPLATE
+            image = await store.get_saved_image("h1")
+            assert image["cegTemplate"] == TEMPLATE
+            assert image["templateHash"]
+            assert await _raw_count(store, "templates") == 1
+            cursor = await store._conn.execute(
+                "SELECT COUNT(*) FROM saved_images WHERE ceg_template != ''"
+            )
+            assert (await cursor.fetchone())[0] == 0
+        finally:
+            await store.close()
+
+
+class TestReadPool:
+    """Tests for the read-only connection pool."""
+
+    async def test_reads_use_read_only_connections(self, tmp_store: JobStore) -> None:
+        await tmp_store.save(_make_job(id="j1"))
+        assert (await tmp_store.get_job("j1"))["id"] == "j1"
+        assert len(tmp_store._readers) == tmp_store._read_pool_size
+        with pytest.raises(sqlite3.OperationalError):
+            await tmp_store._readers[0].execute("DELETE FROM jobs")
+
+    async def test_reader_sees_committed_writes(self, tmp_store: JobStore) -> None:
+        await tmp_store.save_image_record(**_make_image(hash="h1"))
+        await tmp_store.add_tags("h1", ["cat"])
+        assert (await tmp_store.get_saved_image("h1"))["tags"] == ["cat"]
+        assert await tmp_store.update_curation("h1", status="approved") is not None
+        assert (await tmp_store.list_saved_images(status="approved"))[0]["hash"] == "h1"
+
+    async def test_concurrent_reads_share_pool(self, tmp_path) -> None:
+        store = JobStore(db_path=tmp_path / "pool.db", read_pool_size=1)
+        await store.open()
+        try:
+            for i in range(5):
+                await store.save_image_record(**_make_image(hash=f"h{i}"))
+            results = await asyncio.gather(*(store.count_saved_images() for _ in range(10)))
+            assert results == [5] * 10
+            assert store._idle_readers.qsize() == 1
+        finally:
+            await store.close()
+
+    async def test_without_pool_reads_use_writer(self, tmp_path) -> None:
+        store = JobStore(db_path=tmp_path / "nopool.db", read_pool_size=0)
+        await store.open()
+        try:
+            await store.save(_make_job(id="j1"))
+            assert [j["id"] for j in await store.load_all()] == ["j1"]
+            assert store._readers == []
+        finally:
+            await store.close()
+
+    async def test_close_and_reopen(self, tmp_store: JobStore) -> None:
+        await tmp_store.save_setting("k", "v")
+        await tmp_store.close()
+        assert tmp_store._readers == []
+        await tmp_store.open()
+        assert await tmp_store.get_setting("k") == "v"
+        assert len(tmp_store._readers) == tmp_store._read_pool_size
+
+
 # ===================================================================
 # Settings
 # ===================================================================
@@ -641,6 +1257,86 @@ class TestAssetGroups:
     async def test_list_asset_groups_empty(self, tmp_store: JobStore) -> None:
         assert await tmp_store.list_asset_groups() == []
 
+    async def _grouped(self, store: JobStore) -> dict[str, tuple[Any, ...]]:
+        """asset_groups 없이 saved_images를 직접 묶은 결과."""
+        rows = await store._conn.execute_fetchall(
+            """
+            SELECT original_filename, COUNT(*),
+              SUM(status = 'pending'), SUM(status = 'approved'), SUM(status = 'rejected'), SUM(status = 'trashed'),
+              MAX(created_at),
+              (SELECT hash FROM saved_images s2 WHERE s2.original_filename = s.original_filename
+               ORDER BY created_at DESC, hash DESC LIMIT 1)
+            FROM saved_images s GROUP BY original_filename
+            """
+        )
+        return {r[0]: tuple(r[1:]) for r in rows}
+
+    async def test_summary_follows_image_writes(self, tmp_store: JobStore) -> None:
+        for i in range(12):
+            await tmp_store.save_image_record(**_make_image(hash=f"h{i:02d}", original_filename=f"f{i % 3}.png"))
+        await tmp_store._conn.execute("UPDATE saved_images SET created_at = 100.0 + CAST(substr(hash, 2) AS INTEGER) % 5")
+        await tmp_store._conn.commit()
+        await tmp_store.update_curation("h01", status="approved")
+        await tmp_store.update_curation("h04", status="trashed")
+        for hash in ("h09", "h10", "h02", "h05", "h08", "h11"):  # f2.png 전부 + 대표 이미지들
+            await tmp_store.delete_saved_image(hash)
+
+        groups = await tmp_store.list_asset_groups(sort="name")
+        assert {
+            g["filename"]: (g["total"], g["pendingCount"], g["approvedCount"], g["rejectedCount"],
+                            g["trashedCount"], g["latestCreatedAt"], g["sampleHash"])
+            for g in groups
+        } == await self._grouped(tmp_store)
+        assert [g["filename"] for g in groups] == ["f0.png", "f1.png"]
+        assert await tmp_store.check_counters() == []
+
+    async def test_sorts_break_ties_and_page(self, tmp_store: JobStore) -> None:
+        for i, name in enumerate(["b.png", "a.png", "c.png", "a.png"]):
+            await tmp_store.save_image_record(**_make_image(hash=f"h{i}", original_filename=name))
+        await tmp_store._conn.execute("UPDATE saved_images SET created_at = 100.0")
+        await tmp_store._conn.commit()
+        latest = [g["filename"] for g in await tmp_store.list_asset_groups()]
+        assert latest == ["c.png", "b.png", "a.png"]
+        assert [g["filename"] for g in await tmp_store.list_asset_groups(sort="count")] == ["a.png", "b.png", "c.png"]
+        assert [g["filename"] for g in await tmp_store.list_asset_groups(limit=2, offset=1)] == latest[1:]
+        assert (await tmp_store.list_asset_groups(sort="name"))[0]["sampleHash"] == "h3"
+
+    async def test_rebuild_counters(self, tmp_store: JobStore) -> None:
+        await self._seed_images(tmp_store)
+        await tmp_store.save(_make_job(id="j1", status="done"))
+        expected = await tmp_store.list_asset_groups()
+        for table in ("asset_groups", "saved_image_counts", "job_counts"):
+            await tmp_store._conn.execute(f"DELETE FROM {table}")
+        await tmp_store._conn.commit()
+        assert await tmp_store.list_asset_groups() == []
+
+        assert await tmp_store.rebuild_counters() == {"job_counts": 1, "saved_image_counts": 2, "asset_groups": 2}
+        assert await tmp_store.list_asset_groups() == expected
+        assert await tmp_store.check_counters() == []
+
+    async def test_check_counters_reports_group_sample_drift(self, tmp_store: JobStore) -> None:
+        await tmp_store.save_image_record(**_make_image(hash="h1", original_filename="a.png"))
+        await tmp_store.save_image_record(**_make_image(hash="h2", original_filename="a.png"))
+        await tmp_store._conn.execute("UPDATE saved_images SET created_at = 100.0 WHERE hash = 'h1'")
+        await tmp_store._conn.execute("UPDATE saved_images SET created_at = 200.0 WHERE hash = 'h2'")
+        await tmp_store.rebuild_counters()
+        # 수는 맞지만 최신 시각 / 대표 이미지가 어긋난 그룹
+        await tmp_store._conn.execute(
+            "UPDATE asset_groups SET latest_created_at = 100.0, sample_hash = 'h1' WHERE filename = 'a.png'"
+        )
+        await tmp_store._conn.commit()
+
+        drift = await tmp_store.check_counters()
+        assert drift == [
+            {"table": "asset_groups", "key": {"filename": "a.png"}, "column": "latest_created_at",
+             "stored": 100.0, "actual": 200.0},
+            {"table": "asset_groups", "key": {"filename": "a.png"}, "column": "sample_hash",
+             "stored": "h1", "actual": "h2"},
+        ]
+        assert await tmp_store.check_counters(repair=True) == drift
+        assert await tmp_store.check_counters() == []
+        assert (await tmp_store.list_asset_groups())[0]["sampleHash"] == "h2"
+
 
 # ===================================================================
 # All events (combined log)
@@ -756,6 +1452,16 @@ class TestSavedImageRowToDict:
         result = _saved_image_row_to_dict(row)
         assert result["workflow"] == wf
 
+    def test_row_with_workflow_blob(self) -> None:
+        blob = json.dumps({"6": {"class_type": "CLIPTextEncode", "inputs": {"text": "base"}}})
+        row = self._make_row(workflow_json="", workflow_hash="b1", workflow_patch='{"6": {"text": "cat"}}')
+        result = _saved_image_row_to_dict(row, blobs={"b1": blob})
+        assert result["workflow"] == {"6": {"class_type": "CLIPTextEncode", "inputs": {"text": "cat"}}}
+
+    def test_row_with_missing_workflow_blob(self) -> None:
+        row = self._make_row(workflow_json="", workflow_hash="b1", workflow_patch=None)
+        assert _saved_image_row_to_dict(row, blobs={})["workflow"] == {}
+
     def test_row_with_invalid_workflow_json(self) -> None:
         row = self._make_row(workflow_json="bad-json")
         result = _saved_image_row_to_dict(row)
@@ -794,4 +1500,245 @@ class TestSavedImageRowToDict:
     def test_row_null_workflow_json(self) -> None:
         row = self._make_row(workflow_json=None)
         result = _saved_image_row_to_dict(row)
-        assert result["workflow"] == {}
\ No newline at end of file
+        assert result["workflow"] == {}
+
+# ===================================================================
+# Cursor pagination
+# ===================================================================
+
+
+class TestCursorPagination:
+    """Tests for keyset paging via job_cursor / saved_image_cursor / event_cursor."""
+
+    async def _job_pages(self, store: JobStore, limit: int, **kwargs: Any) -> list[str]:
+        ids: list[str] = []
+        cursor = None
+        while True:
+            page = await store.query_jobs(limit=limit, cursor=cursor, **kwargs)
+            ids += [j["id"] for j in page]
+            if len(page) < limit:
+                return ids
+            cursor = job_cursor(page[-1], kwargs.get("sort_by", "created_at"), kwargs.get("sort_order", "desc"))
+
+    async def test_jobs_pages_match_offset_order_with_ties(self, tmp_store: JobStore) -> None:
+        for i in range(7):
+            await tmp_store.save(_make_job(id=f"j{i}", created_at=100.0 + i // 3))
+        expected = [j["id"] for j in await tmp_store.query_jobs(limit=100)]
+        assert expected == ["j6", "j5", "j4", "j3", "j2", "j1", "j0"]
+        assert await self._job_pages(tmp_store, 2) == expected
+        assert await self._job_pages(tmp_store, 3, sort_order="asc") == expected[::-1]
+
+    async def test_jobs_nullable_sort_column(self, tmp_store: JobStore) -> None:
+        for i, duration in enumerate([None, 5.0, None, 1.0, 5.0]):
+            await tmp_store.save(_make_job(id=f"j{i}", executionDurationMs=duration))
+        for order in ("asc", "desc"):
+            expected = [j["id"] for j in await tmp_store.query_jobs(sort_by="duration", sort_order=order)]
+            assert expected[0 if order == "asc" else -1] in ("j0", "j2")
+            assert await self._job_pages(tmp_store, 2, sort_by="duration", sort_order=order) == expected
+
+    async def test_jobs_status_sort_pages(self, tmp_store: JobStore) -> None:
+        for i in range(7):
+            await tmp_store.save(_make_job(id=f"j{i}", status=("done", "error")[i % 2], created_at=100.0 + i // 2))
+        for order in ("asc", "desc"):
+            expected = [j["id"] for j in await tmp_store.query_jobs(sort_by="status", sort_order=order)]
+            assert await self._job_pages(tmp_store, 2, sort_by="status", sort_order=order) == expected
+
+    async def test_jobs_cursor_with_filters(self, tmp_store: JobStore) -> None:
+        for i in range(6):
+            await tmp_store.save(_make_job(id=f"j{i}", status="done" if i % 2 else "error", created_at=100.0 + i))
+        assert await self._job_pages(tmp_store, 1, statuses=["done"]) == ["j5", "j3", "j1"]
+
+    async def test_cursor_must_match_sort(self, tmp_store: JobStore) -> None:
+        await tmp_store.save(_make_job(id="j1"))
+        cursor = job_cursor((await tmp_store.query_jobs())[0])
+        with pytest.raises(ValueError):
+            await tmp_store.query_jobs(cursor=cursor, sort_order="asc")
+        with pytest.raises(ValueError):
+            await tmp_store.list_saved_images(cursor=cursor)
+        with pytest.raises(ValueError):
+            await tmp_store.query_jobs(cursor="not a cursor!")
+
+    async def test_saved_images_pages(self, tmp_store: JobStore) -> None:
+        for i in range(5):
+            await tmp_store.save_image_record(**_make_image(hash=f"h{i}"))
+        await tmp_store._conn.execute("UPDATE saved_images SET created_at = 100.0")
+        await tmp_store._conn.commit()
+        first = await tmp_store.list_saved_images(limit=3)
+        rest = await tmp_store.list_saved_images(limit=3, cursor=saved_image_cursor(first[-1]))
+        assert [i["hash"] for i in first + rest] == ["h4", "h3", "h2", "h1", "h0"]
+
+    async def test_events_pages(self, tmp_store: JobStore) -> None:
+        for i in range(5):
+            await tmp_store.save_event(f"j{i}", "created", worker_id="w1" if i % 2 else None)
+        await tmp_store.flush()
+        await tmp_store._conn.execute("UPDATE job_events SET timestamp = 100.0")
+        await tmp_store._conn.commit()
+        first = await tmp_store.get_all_events(limit=2)
+        rest = await tmp_store.get_all_events(limit=10, cursor=event_cursor(first[-1]))
+        assert [e["jobId"] for e in first + rest] == ["j4", "j3", "j2", "j1", "j0"]
+        page = await tmp_store.get_all_events(limit=1, worker_id="w1")
+        rest = await tmp_store.get_all_events(worker_id="w1", cursor=event_cursor(page[0]))
+        assert [e["jobId"] for e in page + rest] == ["j3", "j1"]
+
+# ===================================================================
+# Status counters
+# ===================================================================
+
+DAY = 86400.0
+
+
+class TestStatusCounters:
+    """Tests for the job_counts / saved_image_counts tables and check_counters."""
+
+    async def _scan_counts(self, store: JobStore, where: str = "", params: tuple[Any, ...] = ()) -> dict[str, int]:
+        rows = await store._conn.execute_fetchall(
+            f"SELECT status, COUNT(*) FROM jobs{where} GROUP BY status", params
+        )
+        return {status: count for status, count in rows}
+
+    async def test_counters_follow_job_writes(self, tmp_store: JobStore) -> None:
+        for i in range(6):
+            await tmp_store.save(_make_job(id=f"j{i}", status="pending", created_at=DAY * i + 10))
+        await tmp_store.save(_make_job(id="j0", status="done", created_at=10.0))  # INSERT OR REPLACE
+        await tmp_store.update_fields("j1", status="running")
+        await tmp_store.update_fields("j1", status="error", progress_percent=100.0)
+        await tmp_store.cancel_batch([{"id": "j2", "finished_at": 1.0}])
+        await tmp_store.delete("j3")
+        await tmp_store.delete_batch(["j4"])
+
+        expected = {"done": 1, "error": 1, "cancelled": 1, "pending": 1}
+        assert await tmp_store.count_jobs_by_status() == expected
+        assert await tmp_store.count_jobs() == 4
+        assert await tmp_store.count_jobs(statuses=["pending", "done"]) == 2
+        assert await tmp_store.check_counters() == []
+
+    async def test_count_by_status_matches_scan_across_day_edges(self, tmp_store: JobStore) -> None:
+        for i in range(40):
+            await tmp_store.save(_make_job(
+                id=f"j{i}", status=("done", "error", "pending")[i % 3], created_at=DAY * (i // 4) + 3600.0 * (i % 4) * 6,
+            ))
+        bounds = [None, 0.0, 10.0, DAY, DAY * 2 - 1, DAY * 3 + 7200, DAY * 7, DAY * 20]
+        for lo in bounds:
+            for hi in bounds:
+                conds = [c for c, v in (("created_at >= ?", lo), ("created_at < ?", hi)) if v is not None]
+                where = f" WHERE {' AND '.join(conds)}" if conds else ""
+                params = tuple(v for v in (lo, hi) if v is not None)
+                assert await tmp_store.count_jobs_by_status(created_at_from=lo, created_before=hi) == \
+                    await self._scan_counts(tmp_store, where, params), (lo, hi)
+                inclusive = where.replace("created_at <", "created_at <=")
+                assert await tmp_store.count_jobs(created_at_from=lo, created_at_to=hi) == \
+                    sum((await self._scan_counts(tmp_store, inclusive, params)).values()), (lo, hi)
+
+    async def test_count_by_status_matches_scan_around_day_zero(self, tmp_store: JobStore) -> None:
+        # 음수 시각은 0 쪽으로 잘려 day 0 / 음수 날에 들어간다
+        rng = random.Random(4222)
+        edges = [k * DAY + d for k in range(-3, 4) for d in (-1.0, -0.5, 0.0, 0.5, 1.0)]
+        times = edges + [rng.uniform(-4 * DAY, 4 * DAY) for _ in range(60)]
+        await tmp_store.save_created([
+            _make_job(id=f"j{i}", status=("done", "error")[i % 2], createdAt=t) for i, t in enumerate(times)
+        ])
+        bounds = [None, 4222.0, -4222.0, *rng.sample(edges, 12), *(rng.uniform(-4 * DAY, 4 * DAY) for _ in range(6))]
+        for lo in bounds:
+            for hi in bounds:
+                conds = [c for c, v in (("created_at >= ?", lo), ("created_at < ?", hi)) if v is not None]
+                where = f" WHERE {' AND '.join(conds)}" if conds else ""
+                params = tuple(v for v in (lo, hi) if v is not None)
+                assert await tmp_store.count_jobs_by_status(created_at_from=lo, created_before=hi) == \
+                    await self._scan_counts(tmp_store, where, params), (lo, hi)
+                inclusive = where.replace("created_at <", "created_at <=")
+                assert await tmp_store.count_jobs(created_at_from=lo, created_at_to=hi) == \
+                    sum((await self._scan_counts(tmp_store, inclusive, params)).values()), (lo, hi)
+
+    async def test_saved_image_counts(self, tmp_store: JobStore) -> None:
+        for i in range(5):
+            await tmp_store.save_image_record(**_make_image(hash=f"h{i}", original_filename=f"f{i % 2}.png"))
+        await tmp_store.save_image_record(**_make_image(hash="h0"))  # 이미 있으면 무시
+        await tmp_store.update_curation("h0", status="approved")
+        await tmp_store.update_curation("h1", status="approved")
+        await tmp_store.update_curation("h1", note="same status")
+        await tmp_store.delete_saved_image("h2")
+
+        assert await tmp_store.count_saved_images() == 4
+        assert await tmp_store.count_saved_images(status="approved") == 2
+        assert await tmp_store.count_saved_images(filename="f0.png") == 2
+        assert await tmp_store.count_saved_images(status="pending", filename="f1.png") == 1
+        assert await tmp_store.count_saved_images(status="rejected") == 0
+        assert await tmp_store.count_saved_images(job_id="job-1", status="approved") == 2
+        assert await tmp_store.check_counters() == []
+
+    async def test_check_counters_reports_and_repairs_drift(self, tmp_store: JobStore) -> None:
+        await tmp_store.save(_make_job(id="j1", status="done", created_at=DAY + 5))
+        await tmp_store.save_image_record(**_make_image(hash="h1"))
+        await tmp_store.flush()
+        await tmp_store._conn.execute("UPDATE job_counts SET count = 3")
+        await tmp_store._conn.execute("DELETE FROM saved_image_counts")
+        await tmp_store._conn.commit()
+
+        drift = await tmp_store.check_counters()
+        assert drift == [
+            {"table": "job_counts", "key": {"status": "done", "day": 1}, "column": "count", "stored": 3, "actual": 1},
+            {"table": "saved_image_counts", "key": {"original_filename": "photo.png", "status": "pending"},
+             "column": "count", "stored": 0, "actual": 1},
+        ]
+        assert await tmp_store.check_counters(repair=True) == drift
+        assert await tmp_store.check_counters() == []
+        assert await tmp_store.count_jobs() == 1
+        assert await tmp_store.count_saved_images() == 1
+
+    async def test_counters_built_for_existing_database(self, tmp_path: Any) -> None:
+        path = tmp_path / "old.db"
+        store = JobStore(db_path=path, flush_interval=0)
+        await store.open()
+        await store.save(_make_job(id="j1", status="done"))
+        await store.save_image_record(**_make_image(hash="h1"))
+        await store.close()
+        conn = sqlite3.connect(path)
+        for table in ("job_counts", "saved_image_counts", "asset_groups"):
+            conn.execute(f"DROP TABLE {table}")  # 카운터가 없던 버전의 DB
+        conn.commit()
+        conn.close()
+
+        store = JobStore(db_path=path, flush_interval=0)
+        await store.open()
+        try:
+            assert await store.count_jobs_by_status() == {"done": 1}
+            assert await store.count_saved_images(status="pending") == 1
+            assert [g["sampleHash"] for g in await store.list_asset_groups()] == ["h1"]
+            assert await store.check_counters() == []
+        finally:
+            await store.close()
+
+# ===================================================================
+# Auto tags
+# ===================================================================
+
+
+class TestAutoTags:
+    """Tests for auto tag extraction from ceg_template + meta."""
+
+    async def test_bulk_auto_tags_parse_template_once(
+        self, tmp_store: JobStore, monkeypatch: Any
+    ) -> None:
+        from backend.src import prompt_dsl
+
+        template = '{{axis mood}}\n  happy : "smile"\n  sad : "tears"\n{{/axis}}\n{{combine mood}}\n'
+        calls = []
+        real = prompt_dsl._parse_uncached
+
+        def counting(src: str) -> prompt_dsl.Program:
+            calls.append(src)
+            return real(src)
+
+        monkeypatch.setattr(prompt_dsl, "_parse_uncached", counting)
+        monkeypatch.setattr(prompt_dsl, "_parse_cache", prompt_dsl._ParseCache(8))
+        hashes = []
+        for i in range(50):
+            h = f"img{i}"
+            mood = "happy" if i % 2 else "sad"
+            await tmp_store.save_image_record(**_make_image(hash=h, ceg_template=template, meta={"mood": mood}))
+            hashes.append(h)
+
+        result = await tmp_store.bulk_auto_generate_tags(hashes)
+        assert result["img1"] == ["happy"]
+        assert result["img2"] == ["sad"]
+        assert calls == [template]
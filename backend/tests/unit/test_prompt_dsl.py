@@ -9,11 +9,23 @@ from backend.src.prompt_dsl import (
     AxisValue,
     DSLSyntaxError,
     Program,
+    _ParseCache,
     _clean_prompt,
+    _compile_render_plan,
+    _load_parser,
+    _row_tuples,
+    _render_item,
+    count_combinations,
+    covering_array,
     eval_expr,
+    compile_injection,
     inject_into_workflow,
+    inject_many,
+    iter_expr,
     parse,
     render,
+    render_at,
+    render_iter,
 )
 
 
@@ -35,6 +47,24 @@ def _simple_program():
     )
 
 
+def _wide_program(n_axes, n_values, extra=""):
+    """n_axes개 축 x n_values개 값의 곱. 조합 수가 n_values ** n_axes."""
+    parts = []
+    for a in range(n_axes):
+        parts.append(f"{{{{axis a{a}}}}}\n")
+        for v in range(n_values):
+            parts.append(f'  v{v} : "a{a} value {v}"\n')
+        parts.append("{{/axis}}\n")
+    names = " * ".join(f"a{a}" for a in range(n_axes))
+    parts.append(f"{{{{combine {names}}}}}\n")
+    parts.append(extra)
+    body = ", ".join(f"{{{{a{a}}}}}" for a in range(n_axes))
+    keys = "_".join(f"{{{{a{a}.key}}}}" for a in range(n_axes))
+    parts.append(f"{{{{template}}}}{body}{{{{/template}}}}\n")
+    parts.append(f"{{{{filename}}}}{keys}{{{{/filename}}}}\n")
+    return parse("".join(parts))
+
+
 # ══════════════════════════════════════════════
 #  Parser Tests
 # ══════════════════════════════════════════════
@@ -966,6 +996,48 @@ class TestInjectIntoWorkflow:
         assert result["node1"]["other"] == "hello"
 
 
+class TestInjectionPlan:
+    """compile_injection / inject_many match inject_into_workflow and share untouched subtrees."""
+
+    WORKFLOW = {
+        "1": {"inputs": {"text": "{{input}}, best", "seed": 3}, "_meta": {"title": "pos"}},
+        "2": {"inputs": {"text": "bad, {{negative}}", "list": ["{{input}}", 1, None, ["x{{input}}y"]]}},
+        "3": {"inputs": {"model": ["1", 0], "name": "static"}},
+    }
+
+    @pytest.mark.parametrize("prompt", [
+        "cat",
+        "",
+        "{{negative}}",
+        {"{{input}}": "cat", "{{negative}}": "ugly"},
+        {"{{input}}": "has {{negative}}", "{{negative}}": "N"},
+        {"{{negative}}": "N", "{{input}}": "{{negative}}"},
+        {"": "-"},
+        {},
+    ])
+    def test_matches_inject_into_workflow(self, prompt):
+        (result,) = inject_many(self.WORKFLOW, [prompt])
+        assert result == inject_into_workflow(self.WORKFLOW, prompt)
+
+    def test_mixed_batch(self):
+        prompts = ["a", {"{{input}}": "b", "{{negative}}": "c"}, "d", {"{{input}}": "e"}]
+        assert inject_many(self.WORKFLOW, prompts) == [inject_into_workflow(self.WORKFLOW, p) for p in prompts]
+
+    def test_shares_untouched_subtrees(self):
+        first, second = inject_many(self.WORKFLOW, ["a", "b"])
+        assert first["3"] is self.WORKFLOW["3"] is second["3"]
+        assert first["1"]["_meta"] is self.WORKFLOW["1"]["_meta"]
+        assert first["1"]["inputs"] is not self.WORKFLOW["1"]["inputs"]
+        assert self.WORKFLOW["1"]["inputs"]["text"] == "{{input}}, best"
+        assert first["2"]["inputs"]["list"][3] == ["xay"]
+
+    def test_plan_rejects_other_placeholders(self):
+        plan = compile_injection(self.WORKFLOW, ["{{input}}", "{{negative}}"])
+        assert plan.inject({"{{input}}": "a", "{{negative}}": "b"})["2"]["inputs"]["text"] == "bad, b"
+        with pytest.raises(ValueError):
+            plan.inject({"{{negative}}": "b", "{{input}}": "a"})
+
+
 # ══════════════════════════════════════════════
 #  Clean Prompt Tests
 # ══════════════════════════════════════════════
@@ -1071,4 +1143,538 @@ class TestRenderOutputStructure:
         )
         result = render(prog)
         item = result["items"][0]
-        assert "mood" in item["meta"]
\ No newline at end of file
+        assert "mood" in item["meta"]
+
+# ══════════════════════════════════════════════
+#  Lazy Rendering Tests
+# ══════════════════════════════════════════════
+
+class TestRenderIter:
+    """Tests for iter_expr() / render_iter() lazy evaluation."""
+
+    def test_iter_expr_matches_eval_expr_order(self):
+        prog = parse(
+            '{{axis a}}\n  x : "x"\n  y : "y"\n{{/axis}}\n'
+            '{{axis b?}}\n  p : "p"\n{{/axis}}\n'
+            '{{axis c}}\n  q : "q"\n  r : "r"\n{{/axis}}\n'
+            '{{combine (a * b) + ~c * a}}\n'
+        )
+        lazy = list(iter_expr(prog.combine_expr, prog.axes, prog.vars))
+        eager = eval_expr(prog.combine_expr, prog.axes, prog.vars)
+        assert [{k: (v.key, v.hide_key) for k, v in c.items()} for c in lazy] == \
+            [{k: (v.key, v.hide_key) for k, v in c.items()} for c in eager]
+
+    def test_undefined_name_raises_before_iteration(self):
+        axis = Axis(name="empty", values=[])
+        with pytest.raises(DSLSyntaxError, match="정의되지 않은 축"):
+            iter_expr(("mul", [("var", "empty"), ("var", "nope")]), {"empty": axis}, {})
+
+    def test_render_iter_matches_render_items(self):
+        prog = _wide_program(3, 3, '{{exclude a0 = v1 AND a2 in [v0, v2]}}\n')
+        full = render(prog)
+        assert list(render_iter(prog)) == full["items"]
+        assert list(render_iter(prog, offset=4, limit=5)) == full["items"][4:9]
+
+    def test_render_iter_stops_after_page(self):
+        # 10^8 조합 — 전체 전개하면 끝나지 않는다
+        prog = _wide_program(8, 10)
+        items = list(render_iter(prog, limit=3))
+        assert [i["filename"] for i in items] == [
+            "v0_v0_v0_v0_v0_v0_v0_v0",
+            "v0_v0_v0_v0_v0_v0_v0_v1",
+            "v0_v0_v0_v0_v0_v0_v0_v2",
+        ]
+
+    def test_render_iter_applies_filters_lazily(self):
+        prog = _wide_program(8, 10)
+        items = list(render_iter(prog, fix={"a7": "v9"}, only={"a6": ["v3", "v4"]}, limit=2))
+        assert [i["meta"]["a6"] for i in items] == ["v3", "v4"]
+        assert all(i["meta"]["a7"] == "v9" for i in items)
+
+    def test_render_iter_no_combine(self):
+        prog = parse('{{set x = "hi"}}\n{{template}}{{x}}{{/template}}\n{{filename}}f{{/filename}}\n')
+        assert list(render_iter(prog)) == [{"filename": "f", "prompt": "hi", "meta": {}}]
+
+
+# ══════════════════════════════════════════════
+#  Counting Tests
+# ══════════════════════════════════════════════
+
+def _brute_count(prog, **kw):
+    return len(render(prog, **kw)["items"])
+
+
+class TestCountCombinations:
+    """count_combinations() must agree exactly with render()'s total."""
+
+    EXPR_TEMPLATE = (
+        '{{axis a}}\n  x : "x"\n  y : "y"\n  z : "z"\n{{/axis}}\n'
+        '{{axis b?}}\n  p : "p"\n  q : "q"\n{{/axis}}\n'
+        '{{axis c}}\n  r : "r"\n  s : "s"\n{{/axis}}\n'
+        '{{set lit = "L"}}\n'
+        '{{combine (a * b * c) + (~c * a) + b * lit}}\n'
+    )
+
+    @pytest.mark.parametrize("extra", [
+        "",
+        "{{exclude a = x AND c = r}}\n",
+        "{{exclude a = x AND b = p}}\n",
+        "{{exclude a in [x, y] AND b not in [p] AND c = s}}\n",
+        "{{exclude a = z OR b = q}}\n",
+        "{{exclude a = x AND nope = r}}\n",
+        "{{exclude b = p AND c = r}}\n{{exclude a = y AND b = q}}\n{{exclude a = x AND c = s}}\n",
+    ])
+    def test_agrees_with_enumeration(self, extra):
+        prog = parse(self.EXPR_TEMPLATE + extra)
+        for kw in ({}, {"fix": {"a": "x"}}, {"only": {"b": ["p"]}}, {"skip_excludes": True},
+                   {"only": {"lit": ["lit"]}}):
+            assert count_combinations(prog, **kw) == _brute_count(prog, **kw) == render(prog, **kw)["total"]
+
+    def test_extra_excludes_agree(self):
+        prog = parse(self.EXPR_TEMPLATE)
+        extra = [
+            {"conditions": [{"axis": "a", "op": "eq", "values": ["x"]},
+                            {"axis": "b", "op": "bogus", "values": []}]},
+            {"conditions": [{"axis": "c", "op": "in", "values": ["r"]}], "connective": "OR"},
+        ]
+        assert count_combinations(prog, extra_excludes=extra) == _brute_count(prog, extra_excludes=extra)
+
+    def test_duplicate_axis_in_product_falls_back(self):
+        prog = parse(
+            '{{axis a}}\n  x : "x"\n  y : "y"\n{{/axis}}\n'
+            '{{combine a * a}}\n{{exclude a = x}}\n'
+        )
+        assert count_combinations(prog) == _brute_count(prog) == 2
+
+    def test_no_combine_counts_one(self):
+        assert count_combinations(parse("{{template}}x{{/template}}")) == 1
+
+    def test_large_product_without_enumeration(self):
+        prog = _wide_program(
+            8, 10,
+            "{{exclude a0 = v0 AND a7 in [v0, v1]}}\n"
+            "{{exclude a3 = v3 OR a4 = v4}}\n",
+        )
+        expected = 10**8 - 2 * 10**6          # a0=v0 ∧ a7∈{v0,v1}
+        expected = expected * 9 * 9 // 100     # a3≠v3, a4≠v4
+        assert count_combinations(prog) == expected
+
+
+# ══════════════════════════════════════════════
+#  Random Access Tests
+# ══════════════════════════════════════════════
+
+class TestRandomAccess:
+    """render(offset=k) / render_at() jump to the k-th surviving combination."""
+
+    TEMPLATE = TestCountCombinations.EXPR_TEMPLATE + (
+        "{{exclude a = x AND c = r}}\n{{exclude b = q AND c = s}}\n{{exclude a = z OR b = p AND c = r}}\n"
+        "{{template}}{{a}} {{b}} {{c}}{{/template}}\n{{filename}}{{a.key}}_{{b.key}}_{{c.key}}{{/filename}}\n"
+    )
+
+    def test_every_offset_matches_full_render(self):
+        prog = parse(self.TEMPLATE)
+        full = render(prog)["items"]
+        for k in range(len(full) + 1):
+            assert render(prog, offset=k, limit=3)["items"] == full[k:k + 3]
+            assert render_at(prog, k) == (full[k] if k < len(full) else None)
+
+    def test_filters_apply_before_indexing(self):
+        prog = parse(self.TEMPLATE)
+        full = render(prog, only={"c": ["s"]})["items"]
+        assert [render_at(prog, k, only={"c": ["s"]}) for k in range(len(full))] == full
+
+    def test_deep_offset_in_large_product(self):
+        prog = _wide_program(8, 10, "{{exclude a0 = v0 AND a1 = v0}}\n")
+        # a0=v0, a1=v0 블록(10^6개)이 빠지므로 뒤쪽 인덱스가 10^6만큼 당겨진다
+        item = render_at(prog, 50_000_000)
+        assert item["filename"] == "v5_v1_v0_v0_v0_v0_v0_v0"
+        page = render(prog, offset=99_000_000 - 1, limit=5)
+        assert page["total"] == 99_000_000
+        assert [i["filename"] for i in page["items"]] == ["v9_v9_v9_v9_v9_v9_v9_v9"]
+
+    def test_negative_and_out_of_range(self):
+        prog = parse(self.TEMPLATE)
+        assert render_at(prog, -1) is None
+        assert render_at(parse("{{template}}x{{/template}}"), 1) is None
+
+
+# ══════════════════════════════════════════════
+#  Sampling Tests
+# ══════════════════════════════════════════════
+
+class TestSampling:
+    """render(sample=N, seed=S) draws N surviving combinations uniformly, reproducibly."""
+
+    def test_sample_is_subset_in_order_and_reproducible(self):
+        prog = parse(TestRandomAccess.TEMPLATE)
+        full = render(prog)["items"]
+        picked = render(prog, sample=5, seed=7)
+        assert picked["total"] == len(full)
+        assert len(picked["items"]) == 5
+        positions = [full.index(item) for item in picked["items"]]
+        assert positions == sorted(set(positions))
+        assert render(prog, sample=5, seed=7)["items"] == picked["items"]
+
+    def test_sample_larger_than_space_returns_everything(self):
+        prog = parse(TestRandomAccess.TEMPLATE)
+        full = render(prog, only={"c": ["s"]})["items"]
+        assert render(prog, only={"c": ["s"]}, sample=1000, seed=1)["items"] == full
+
+    def test_total_is_filtered_count_not_returned_rows(self):
+        prog = _wide_program(3, 10, "{{exclude a0 = v0 AND a1 = v0}}\n")
+        filtered = count_combinations(prog)
+        assert filtered == 990
+        sampled = render(prog, sample=20, seed=3, limit=5)
+        assert (sampled["total"], len(sampled["items"])) == (filtered, 5)
+        covered = render(prog, coverage=2)
+        assert covered["total"] == filtered
+        assert len(covered["items"]) == covered["coverage"]["rows"] < filtered
+
+    def test_offset_and_limit_page_within_sample(self):
+        prog = _wide_program(3, 10)
+        picked = render(prog, sample=20, seed=3)["items"]
+        assert render(prog, sample=20, seed=3, offset=5, limit=4)["items"] == picked[5:9]
+
+    def test_large_space_respects_excludes(self):
+        prog = _wide_program(8, 10, "{{exclude a0 = v0 AND a1 = v0}}\n")
+        items = render(prog, sample=200, seed=11)["items"]
+        assert len({i["filename"] for i in items}) == 200
+        assert not any(i["filename"].startswith("v0_v0_") for i in items)
+        assert render(prog, sample=200, seed=12)["items"] != items
+
+    def test_uniform_over_small_space(self):
+        prog = _wide_program(1, 4)
+        counts: dict[str, int] = {}
+        for seed in range(2000):
+            (item,) = render(prog, sample=1, seed=seed)["items"]
+            counts[item["filename"]] = counts.get(item["filename"], 0) + 1
+        assert sorted(counts) == ["v0", "v1", "v2", "v3"]
+        assert all(400 <= c <= 600 for c in counts.values())
+
+    def test_non_normalizable_expression_uses_reservoir(self):
+        prog = parse(
+            '{{axis a}}\n  x : "x"\n  y : "y"\n  z : "z"\n{{/axis}}\n'
+            '{{axis b}}\n  p : "p"\n  q : "q"\n{{/axis}}\n'
+            '{{combine a * (a + b)}}\n{{template}}{{a}} {{b}}{{/template}}\n'
+        )
+        full = render(prog)["items"]
+        picked = render(prog, sample=3, seed=5)["items"]
+        assert len(picked) == 3
+        assert [full.index(i) for i in picked] == sorted(full.index(i) for i in picked)
+        assert render(prog, sample=3, seed=5)["items"] == picked
+
+
+# ══════════════════════════════════════════════
+#  Covering Array Tests
+# ══════════════════════════════════════════════
+
+def _tuples(prog, combos, t):
+    out = set()
+    for combo in combos:
+        out |= _row_tuples(combo, list(prog.axes), t)
+    return out
+
+
+class TestCoveringArray:
+    """covering_array / render(coverage=t) hit every feasible t-way key interaction."""
+
+    @pytest.mark.parametrize("t, extra", [
+        (2, ""),
+        (2, "{{exclude a0 = v0 AND a1 = v1}}\n{{exclude a1 = v2 AND a2 = v0 AND a3 = v1}}\n"),
+        (2, "{{exclude a0 = v1 OR a3 = v2}}\n"),
+        (3, "{{exclude a0 = v0 AND a1 = v0}}\n"),
+    ])
+    def test_covers_every_feasible_tuple(self, t, extra):
+        prog = _wide_program(4, 4, extra)
+        everything = list(iter_expr(prog.combine_expr, prog.axes, prog.vars, prog.excludes))
+        rows, report = covering_array(prog, t)
+        assert all(row in everything for row in rows)
+        assert _tuples(prog, rows, t) == _tuples(prog, everything, t)
+        assert report["covered"] == report["tuples"] - report["infeasible"]
+        assert report["ratio"] == 1.0
+        assert report["rows"] == len(rows) < len(everything)
+
+    def test_infeasible_tuples_are_reported(self):
+        # a0=v0이면 a1의 모든 값이 빠지므로 a0=v0이 들어간 튜플은 어디에도 나올 수 없다
+        prog = _wide_program(3, 2, "{{exclude a0 = v0 AND a1 in [v0, v1]}}\n")
+        rows, report = covering_array(prog, 2)
+        assert report["tuples"] == 12
+        assert report["infeasible"] == 4
+        assert all(row["a0"].key == "v1" for row in rows)
+
+    def test_sum_and_optional_axes(self):
+        prog = parse(
+            '{{axis a}}\n  x : "x"\n  y : "y"\n{{/axis}}\n'
+            '{{axis b?}}\n  p : "p"\n  q : "q"\n{{/axis}}\n'
+            '{{axis c}}\n  r : "r"\n  s : "s"\n{{/axis}}\n'
+            '{{axis d}}\n  u : "u"\n  w : "w"\n{{/axis}}\n'
+            '{{combine (a * b * c) + (c * d)}}\n{{exclude a = x AND b = p}}\n'
+            '{{template}}x{{/template}}\n'
+        )
+        everything = list(iter_expr(prog.combine_expr, prog.axes, prog.vars, prog.excludes))
+        rows, report = covering_array(prog, 2)
+        assert all(row in everything for row in rows)
+        assert _tuples(prog, rows, 2) == _tuples(prog, everything, 2)
+        # a-b, a-c, b-c, c-d 네 쌍 x 4. a-d, b-d는 같은 조합에 나올 수 없으므로 세지 않는다
+        assert report["tuples"] == 4 * 4
+
+    def test_non_normalizable_expression(self):
+        prog = parse(
+            '{{axis a}}\n  x : "x"\n  y : "y"\n{{/axis}}\n'
+            '{{axis b}}\n  p : "p"\n  q : "q"\n{{/axis}}\n'
+            '{{combine a * (a + b)}}\n{{template}}x{{/template}}\n'
+        )
+        everything = list(iter_expr(prog.combine_expr, prog.axes, prog.vars))
+        rows, report = covering_array(prog, 2)
+        assert _tuples(prog, rows, 2) == _tuples(prog, everything, 2)
+        assert report["ratio"] == 1.0
+
+    def test_max_rows_is_a_prefix(self):
+        prog = _wide_program(5, 6)
+        rows, report = covering_array(prog, 2)
+        head, partial = covering_array(prog, 2, max_rows=10)
+        assert head == rows[:10]
+        assert partial["rows"] == 10
+        assert partial["covered"] < report["covered"]
+
+    def test_render_coverage_pages_and_reports(self):
+        prog = _wide_program(6, 10)
+        full = render(prog, coverage=2)
+        assert full["total"] == 10**6
+        assert full["coverage"]["strength"] == 2
+        assert full["coverage"]["ratio"] == 1.0
+        assert 100 <= len(full["items"]) < 200
+        page = render(prog, coverage=2, offset=5, limit=5)
+        assert page["items"] == full["items"][5:10]
+        assert page["coverage"]["rows"] == 10
+        assert "coverage" not in render(prog, limit=1)
+
+    def test_strength_above_axis_count_is_full_product(self):
+        prog = _wide_program(2, 3)
+        rows, report = covering_array(prog, 5)
+        assert report["strength"] == 2
+        assert len(rows) == 9
+
+
+# ══════════════════════════════════════════════
+#  Exclude Pruning Tests
+# ══════════════════════════════════════════════
+
+class TestExcludePruning:
+    """eval_expr(excludes=...) prunes during expansion but keeps render()'s semantics."""
+
+    def _filtered(self, prog, rules):
+        full = eval_expr(prog.combine_expr, prog.axes, prog.vars)
+        keep = [c for c in full if not any(self._hit(r, c) for r in rules)]
+        return [{k: v.key for k, v in c.items()} for c in keep]
+
+    @staticmethod
+    def _hit(rule, combo):
+        results = []
+        for cond in rule.conditions:
+            v = combo.get(cond.axis)
+            if v is None:
+                results.append(False)
+            elif cond.op == "eq":
+                results.append(v.key == cond.values[0])
+            elif cond.op == "in":
+                results.append(v.key in cond.values)
+            elif cond.op == "not_in":
+                results.append(v.key not in cond.values)
+        return all(results) if rule.connective == "AND" else any(results)
+
+    @pytest.mark.parametrize("extra", [
+        "{{exclude a = x AND c = r}}\n",
+        "{{exclude a in [x, y] AND b not in [p] AND c = s}}\n",
+        "{{exclude a = z OR b = q}}\n",
+        "{{exclude b = p AND c = r}}\n{{exclude a = y AND b = q}}\n{{exclude a = x AND nope = s}}\n",
+    ])
+    def test_matches_filtered_expansion(self, extra):
+        prog = parse(TestCountCombinations.EXPR_TEMPLATE + extra)
+        pruned = eval_expr(prog.combine_expr, prog.axes, prog.vars, prog.excludes)
+        assert [{k: v.key for k, v in c.items()} for c in pruned] == self._filtered(prog, prog.excludes)
+
+    def test_later_factor_may_overwrite(self):
+        # 앞의 a = x는 뒤의 a가 덮어쓰므로 그 시점에 버리면 안 된다
+        prog = parse(
+            '{{axis a}}\n  x : "x"\n  y : "y"\n{{/axis}}\n'
+            '{{axis b}}\n  p : "p"\n{{/axis}}\n'
+            '{{combine a * b * a}}\n{{exclude a = x AND b = p}}\n'
+        )
+        pruned = eval_expr(prog.combine_expr, prog.axes, prog.vars, prog.excludes)
+        assert [c["a"].key for c in pruned] == ["y", "y"]
+        assert pruned == [c for c in eval_expr(prog.combine_expr, prog.axes, prog.vars) if c["a"].key != "x"]
+
+    def test_fallback_render_prunes_large_product(self):
+        # a0 * a0 때문에 조합 공간 정규화가 불가 → 전개 경로. 10^9 조합 중 1000개만 남는다
+        prog = _wide_program(
+            8, 10,
+            "".join(f"{{{{exclude a{a} not in [v9]}}}}\n" for a in range(1, 7)),
+        )
+        prog.combine_expr = ("mul", [("var", "a0")] + list(prog.combine_expr[1]))
+        result = render(prog, limit=2)
+        assert result["total"] == 10 * 10 * 10
+        assert [i["filename"] for i in result["items"]] == [
+            "v0_v9_v9_v9_v9_v9_v9_v0",
+            "v0_v9_v9_v9_v9_v9_v9_v1",
+        ]
+
+
+# ══════════════════════════════════════════════
+#  Substitution Plan Tests
+# ══════════════════════════════════════════════
+
+class TestSubstitutionPlan:
+    """Precompiled template plans must render exactly like the _substitute() path."""
+
+    def _assert_same(self, src):
+        prog = parse(src)
+        plan = _compile_render_plan(prog)
+        assert plan is not None
+        combos = eval_expr(prog.combine_expr, prog.axes, prog.vars)
+        assert combos
+        for combo in combos:
+            assert _render_item(prog, combo, plan) == _render_item(prog, combo)
+        return prog
+
+    def test_nested_sets_and_props(self):
+        self._assert_same(
+            '{{set character = "1girl, {{hair}}"}}\n'
+            '{{set hair = "red hair"}}\n'
+            '{{axis outfit}}\n  a : { clothes: "dress", bg: "{{character}} park" }\n  b : { clothes: "suit" }\n{{/axis}}\n'
+            '{{axis mood?}}\n  happy : "smile, {{outfit.key}}"\n{{/axis}}\n'
+            '{{combine outfit * mood}}\n'
+            '{{template}}{{character}}, {{outfit}}, {{outfit.bg}}, {{mood}}, {{nope}}{{/template}}\n'
+            '{{filename}}{{outfit.key}}__{{mood.key}}..{{outfit.bg}}{{/filename}}\n'
+        )
+
+    def test_alias_hidden_keys_and_set_in_combine(self):
+        self._assert_same(
+            '{{set lit = "L {{a}}"}}\n'
+            '{{axis a}}\n  x : "x"\n  y : "y"\n{{/axis}}\n'
+            '{{axis b}}\n  p : "p"\n{{/axis}}\n'
+            '{{combine all = a * ~b * lit}}\n'
+            '{{template}}{{all}} | {{lit.key}} | {{b.key}}{{/template}}\n'
+            '{{filename}}{{all.key}}_{{lit.key}}_{{missing.key}}{{/filename}}\n'
+        )
+
+    def test_cyclic_sets_stop_after_five_rounds(self):
+        prog = self._assert_same(
+            '{{set a = "<{{b}}"}}\n{{set b = "{{a}}"}}\n'
+            '{{axis x}}\n  k : "v"\n{{/axis}}\n{{combine x}}\n'
+            '{{template}}{{a}}{{/template}}\n{{filename}}f{{/filename}}\n'
+        )
+        assert render(prog)["items"][0]["prompt"] == "<<<{{b}}"
+
+    def test_stray_braces_fall_back(self):
+        prog = parse(
+            '{{set open = "{"}}\n'
+            '{{axis x}}\n  k : "v"\n{{/axis}}\n{{combine x}}\n'
+            '{{template}}{{open}}{x}}{{/template}}\n{{filename}}f{{/filename}}\n'
+        )
+        assert _compile_render_plan(prog) is None
+        # "{" + "{x}}" → 다음 라운드에 {{x}} 토큰이 생긴다
+        assert render(prog)["items"][0]["prompt"] == "v"
+
+
+# ══════════════════════════════════════════════
+#  Parse Cache Tests
+# ══════════════════════════════════════════════
+
+class TestParseCache:
+    """The content-hash LRU cache behind parse()."""
+
+    SRC = '{{axis a}}\n  x : "x"\n{{/axis}}\n{{combine a}}\n{{template}}{{a}}{{/template}}\n'
+
+    def test_hit_and_miss_counters(self):
+        cache = _ParseCache(4)
+        cache.get(self.SRC)
+        cache.get(self.SRC)
+        cache.get(self.SRC + "\n")
+        assert cache.stats() == {"size": 2, "maxSize": 4, "hits": 1, "misses": 2}
+
+    def test_copy_on_read(self):
+        cache = _ParseCache(4)
+        prog = cache.get(self.SRC)
+        prog.axes["a"].values.append(AxisValue(key="y", value="y"))
+        prog.vars["injected"] = "1"
+        prog.combine_expr = None
+        again = cache.get(self.SRC)
+        assert [v.key for v in again.axes["a"].values] == ["x"]
+        assert "injected" not in again.vars
+        assert again == parse(self.SRC)
+
+    def test_evicts_least_recently_used(self):
+        cache = _ParseCache(2)
+        srcs = [self.SRC.replace('"x"', f'"x{i}"') for i in range(3)]
+        cache.get(srcs[0])
+        cache.get(srcs[1])
+        cache.get(srcs[0])          # srcs[0]이 가장 최근
+        cache.get(srcs[2])          # srcs[1] 축출
+        cache.get(srcs[0])
+        cache.get(srcs[1])
+        assert cache.stats()["hits"] == 2
+        assert cache.stats()["misses"] == 4
+        assert cache.stats()["size"] == 2
+
+    def test_syntax_errors_are_cached(self):
+        cache = _ParseCache(4)
+        for _ in range(2):
+            with pytest.raises(DSLSyntaxError, match="문법 에러"):
+                cache.get("{{axis broken")
+        assert cache.stats()["misses"] == 1
+        assert cache.stats()["hits"] == 1
+
+
+# ══════════════════════════════════════════════
+#  Template Structure Tests
+# ══════════════════════════════════════════════
+
+class TestTemplateStructure:
+    """template_structure is extracted lazily from the single parse tree."""
+
+    SRC = (
+        '{{set who = "teto"}}\n'
+        '{{axis mood}}\n  happy : "smile"\n{{/axis}}\n'
+        '{{combine mood}}\n'
+        '{{template}}\n{{who}}, {{mood}}\n{{/template}}\n'
+    )
+
+    def test_structure_computed_on_first_access(self):
+        prog = parse(self.SRC)
+        assert prog._structure is None
+        lines = prog.template_structure
+        assert prog._structure is lines
+        assert [ln.type.value for ln in lines][:3] == ["set-header", "axis-header", "axis-body"]
+        assert lines[6].keys == ["who", "mood"]
+
+    def test_structure_copies_are_independent(self):
+        first = parse(self.SRC)
+        first.template_structure[0].keys.append("junk")
+        first.template_structure = []
+        assert parse(self.SRC).template_structure[0].keys == ["who"]
+
+
+class TestGrammarCache:
+    """The serialized parser is reused, and a bad cache file never breaks loading."""
+
+    SRC = '{{axis a}}\n  x : "1"\n{{/axis}}\n{{template}}\n{{a}}\n{{/template}}\n'
+
+    def test_cache_written_and_reused(self, tmp_path, monkeypatch):
+        cache = tmp_path / "grammar.cache"
+        monkeypatch.setenv("CEG_GRAMMAR_CACHE", str(cache))
+        _load_parser()
+        assert cache.exists()
+        tree = _load_parser().parse(self.SRC)
+        assert tree.data == "start"
+
+    def test_corrupt_cache_falls_back(self, tmp_path, monkeypatch):
+        cache = tmp_path / "grammar.cache"
+        cache.write_bytes(b"not a lark cache")
+        monkeypatch.setenv("CEG_GRAMMAR_CACHE", str(cache))
+        assert _load_parser().parse(self.SRC).data == "start"
+
+    def test_cache_disabled(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("CEG_GRAMMAR_CACHE", "")
+        assert _load_parser().parse(self.SRC).data == "start"
@@ -0,0 +1,242 @@
+"""EXPLAIN QUERY PLAN regression tests for every query JobStore issues.
+
+Each case calls a JobStore method with SQLite tracing on, then runs
+``EXPLAIN QUERY PLAN`` for every captured statement and fails when a large
+table is read in full: a plain ``SCAN`` (no index), or an index ``SCAN`` in a
+statement that cannot stop early (no LIMIT, or GROUP BY). Intentional
+whole-table reads are listed in ``ALLOWED_FULL_SCANS`` with the reason.
+"""
+
+from __future__ import annotations
+
+import inspect
+import re
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+import pytest
+
+from backend.src.job_store import JobStore, job_cursor, saved_image_cursor
+
+# 잡 / 이미지 수에 비례해 커지는 테이블
+LARGE_TABLES = {"jobs", "saved_images", "job_events", "execution_events", "image_tags", "asset_groups"}
+
+# 메서드가 일부러 테이블 전체를 읽는 경우 (case id → 이유)
+ALLOWED_FULL_SCANS = {
+    "load_all": "restores every job at startup",
+    "get_all_jobs_minimal": "session stats walk every job",
+    "check_counters": "recounts every job and image to compare with the counters",
+    "rebuild_counters": "rebuilds every counter from scratch",
+    "list_tag_counts": "aggregates every tag",
+    "auto_generate_all_empty_tags": "one-off backfill over every untagged image",
+}
+
+# 목록 / 정렬 조회가 타야 하는 인덱스 (인덱스를 바꾸면 여기도 바꾼다)
+EXPECTED_INDEXES = {
+    "query_jobs": "idx_jobs_created_at_id",
+    "query_jobs_cursor": "idx_jobs_created_at_id",
+    "query_jobs_status": "idx_jobs_status_created_at",
+    "query_jobs_active": "idx_jobs_active",
+    "load_active": "idx_jobs_active",
+    "query_jobs_sort_status": "idx_jobs_status_created_at",
+    "query_jobs_sort_filename": "idx_jobs_filename_id",
+    "query_jobs_sort_duration": "idx_jobs_duration_id",
+    "count_jobs_by_status": "idx_jobs_status_created_at",
+    "list_saved_images": "idx_saved_images_created_at_hash",
+    "list_saved_images_status": "idx_saved_images_status_created_at",
+    "list_saved_images_cursor": "idx_saved_images_status_created_at",
+    "list_saved_images_filename": "idx_saved_images_filename_created_at",
+    "list_asset_groups": "idx_asset_groups_latest",
+    "list_asset_groups_count": "idx_asset_groups_count",
+    "get_all_events": "idx_job_events_timestamp",
+}
+
+# 커버하지 않아도 되는 공개 메서드 (쿼리 없음 / 연결 관리)
+NOT_QUERIES = {"open", "close", "flush", "checkpoint"}
+
+Call = Callable[[JobStore], Awaitable[Any]]
+
+
+async def _seed(store: JobStore) -> None:
+    for i in range(6):
+        await store.save({
+            "id": f"job-{i}",
+            "filename": f"char_{i % 2}",
+            "prompt": f"1girl, smile {i}",
+            "_workflow": {"3": {"class_type": "KSampler", "inputs": {"seed": i}}},
+            "status": ("pending", "running", "done", "error", "done", "cancelled")[i],
+            "createdAt": 100.0 + i,
+            "executionDurationMs": 10.0 * i if i % 2 else None,
+            "meta": {"emotion": "happy"},
+        })
+        await store.save_event(f"job-{i}", "created", worker_id="w1")
+        await store.save_execution_event(f"job-{i}", "w1", "executing", {"node": "3"})
+        await store.save_image_record(
+            hash=f"h{i}", job_id=f"job-{i}", original_filename=f"char_{i % 2}.png",
+            comfy_filename="x.png", subfolder="", type_="output", worker_id="w1",
+            extension=".png", size_bytes=1, prompt="p", meta={"emotion": "happy"},
+        )
+    await store.add_tags("h0", ["portrait"])
+    await store.flush()
+
+
+async def _collect(chunks: AsyncIterator[list[dict[str, Any]]]) -> list[dict[str, Any]]:
+    return [row async for chunk in chunks for row in chunk]
+
+
+CASES: dict[str, Call] = {
+    "save": lambda s: s.save({"id": "job-0", "filename": "x", "prompt": "p", "status": "done"}),
+    "update_fields": lambda s: s.update_fields("job-1", status="done", progress_percent=50.0),
+    "save_created": lambda s: s.save_created([{"id": "new", "filename": "x", "prompt": "p", "status": "pending"}]),
+    "delete": lambda s: s.delete("job-5"),
+    "delete_batch": lambda s: s.delete_batch(["job-4", "job-5"]),
+    "cancel_batch": lambda s: s.cancel_batch([{"id": "job-0", "finished_at": 1.0}]),
+    "load_all": lambda s: s.load_all(),
+    "load_active": lambda s: _collect(s.load_active(chunk_size=1)),
+    "get_job": lambda s: s.get_job("job-1"),
+    "get_all_jobs_minimal": lambda s: s.get_all_jobs_minimal(),
+    "count_jobs_all": lambda s: s.count_jobs(),
+    "count_jobs_filtered": lambda s: s.count_jobs(
+        statuses=["done"], search_tags=["#smile"], created_at_from=100.0, created_at_to=200.0
+    ),
+    "count_jobs_search": lambda s: s.count_jobs(search_tags=["@char"]),
+    "count_jobs_status_range": lambda s: s.count_jobs(
+        statuses=["done"], created_at_from=100.0, created_at_to=86400.0 * 3 + 5
+    ),
+    "count_jobs_by_status": lambda s: s.count_jobs_by_status(created_at_from=101.0, created_before=86400.0 * 2),
+    "check_counters": lambda s: s.check_counters(),
+    "query_jobs": lambda s: s.query_jobs(limit=2),
+    "query_jobs_status": lambda s: s.query_jobs(statuses=["error"], limit=2),
+    "query_jobs_active": lambda s: s.query_jobs(statuses=["pending", "queued", "running"], limit=2),
+    "query_jobs_date_range": lambda s: s.query_jobs(created_at_from=101.0, created_at_to=104.0),
+    "query_jobs_search": lambda s: s.query_jobs(search_tags=["#smile", "$timeout"], limit=2),
+    "query_jobs_short_search": lambda s: s.query_jobs(search_tags=["@ch"], limit=2),
+    "query_jobs_sort_filename": lambda s: s.query_jobs(sort_by="filename", sort_order="asc", limit=2),
+    "query_jobs_sort_duration": lambda s: s.query_jobs(sort_by="duration", limit=2),
+    "query_jobs_sort_status": lambda s: s.query_jobs(sort_by="status", limit=2),
+    "query_jobs_cursor": lambda s: s.query_jobs(
+        limit=2, cursor=job_cursor({"id": "job-3", "createdAt": 103.0})
+    ),
+    "save_event": lambda s: s.save_event("job-1", "done"),
+    "get_job_events": lambda s: s.get_job_events("job-1"),
+    "save_execution_event": lambda s: s.save_execution_event("job-1", "w1", "done", {}),
+    "get_execution_events": lambda s: s.get_execution_events("job-1"),
+    "save_setting": lambda s: s.save_setting("k", "v"),
+    "get_setting": lambda s: s.get_setting("k"),
+    "delete_setting": lambda s: s.delete_setting("k"),
+    "list_settings": lambda s: s.list_settings(),
+    "list_worker_urls": lambda s: s.list_worker_urls(),
+    "add_worker_url": lambda s: s.add_worker_url("http://w"),
+    "remove_worker_url": lambda s: s.remove_worker_url("http://w"),
+    "save_image_record": lambda s: s.save_image_record(
+        hash="h9", job_id="job-1", original_filename="char_0.png", comfy_filename="x.png",
+        subfolder="", type_="output", worker_id="w1", extension=".png", size_bytes=1, prompt="p",
+    ),
+    "auto_generate_tags": lambda s: s.auto_generate_tags("h1"),
+    "bulk_auto_generate_tags": lambda s: s.bulk_auto_generate_tags(["h1", "h2"]),
+    "auto_generate_all_empty_tags": lambda s: s.auto_generate_all_empty_tags(),
+    "get_saved_image": lambda s: s.get_saved_image("h1"),
+    "count_saved_images_all": lambda s: s.count_saved_images(),
+    "count_saved_images": lambda s: s.count_saved_images(status="approved"),
+    "count_saved_images_filtered": lambda s: s.count_saved_images(
+        job_id="job-1", filename="char_1.png", tag="portrait", template_hash="t"
+    ),
+    "list_saved_images": lambda s: s.list_saved_images(limit=2),
+    "list_saved_images_status": lambda s: s.list_saved_images(status="pending", limit=2),
+    "list_saved_images_filename": lambda s: s.list_saved_images(filename="char_0.png", limit=2),
+    "list_saved_images_tag": lambda s: s.list_saved_images(tag="portrait", limit=2),
+    "list_saved_images_cursor": lambda s: s.list_saved_images(
+        limit=2, status="pending", cursor=saved_image_cursor({"hash": "h3", "createdAt": 1e12})
+    ),
+    "update_curation": lambda s: s.update_curation("h1", status="trashed", note="n"),
+    "delete_saved_image": lambda s: s.delete_saved_image("h1"),
+    "list_trashed_for_purge": lambda s: s.list_trashed_for_purge(),
+    "add_tags": lambda s: s.add_tags("h1", ["a", "b"]),
+    "remove_tag": lambda s: s.remove_tag("h0", "portrait"),
+    "get_tags": lambda s: s.get_tags("h0"),
+    "list_tag_counts": lambda s: s.list_tag_counts(),
+    "list_asset_groups": lambda s: s.list_asset_groups(),
+    "list_asset_groups_name": lambda s: s.list_asset_groups(sort="name", limit=1),
+    "list_asset_groups_count": lambda s: s.list_asset_groups(sort="count", limit=1),
+    "rebuild_counters": lambda s: s.rebuild_counters(),
+    "get_all_events": lambda s: s.get_all_events(limit=2),
+    "get_all_events_filtered": lambda s: s.get_all_events(status="done", worker_id="w1", limit=2),
+}
+
+_SCAN = re.compile(r"^SCAN (\w+)( USING .*)?$")
+_ALIAS = re.compile(r"\b(?:FROM|JOIN|UPDATE|INTO)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?", re.IGNORECASE)
+_DML = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "REPLACE")
+
+
+@pytest.fixture
+async def seeded_store(tmp_path: Path) -> JobStore:
+    store = JobStore(db_path=tmp_path / "plans.db", flush_interval=0, read_pool_size=0)
+    await store.open()
+    await _seed(store)
+    yield store
+    await store.close()
+
+
+def _aliases(sql: str) -> dict[str, str]:
+    names: dict[str, str] = {}
+    for table, alias in _ALIAS.findall(sql):
+        names[table] = table
+        if alias and alias.upper() not in {"WHERE", "ON", "SET", "ORDER", "GROUP", "LIMIT", "VALUES"}:
+            names[alias] = table
+    return names
+
+
+async def _plans(store: JobStore, call: Call) -> list[tuple[str, str]]:
+    """call이 실행한 DML 문장마다 (SQL, 계획 한 줄) 목록."""
+    statements: list[str] = []
+    await store._conn.set_trace_callback(statements.append)
+    try:
+        await call(store)
+        await store.flush()
+    finally:
+        await store._conn.set_trace_callback(None)
+    plans: list[tuple[str, str]] = []
+    for sql in dict.fromkeys(statements):
+        if not sql.lstrip().upper().startswith(_DML):
+            continue  # PRAGMA / BEGIN / COMMIT, 트리거 안의 문장은 주석으로 온다
+        for row in await store._conn.execute_fetchall(f"EXPLAIN QUERY PLAN {sql}"):
+            plans.append((sql, row[3]))
+    return plans
+
+
+def _full_scans(plans: list[tuple[str, str]]) -> list[str]:
+    offenders: list[str] = []
+    for sql, detail in plans:
+        match = _SCAN.match(detail)
+        if not match or _aliases(sql).get(match.group(1), match.group(1)) not in LARGE_TABLES:
+            continue
+        upper = sql.upper()
+        stops_early = " LIMIT " in upper and " GROUP BY " not in upper
+        if match.group(2) is None or not stops_early:
+            offenders.append(f"{detail}: {' '.join(sql.split())}")
+    return offenders
+
+
+@pytest.mark.parametrize("case", sorted(CASES))
+async def test_no_full_scans(seeded_store: JobStore, case: str) -> None:
+    offenders = _full_scans(await _plans(seeded_store, CASES[case]))
+    if case in ALLOWED_FULL_SCANS:
+        assert offenders, f"{case} no longer scans a whole table; drop it from ALLOWED_FULL_SCANS"
+    else:
+        assert offenders == []
+
+
+@pytest.mark.parametrize("case", sorted(EXPECTED_INDEXES))
+async def test_list_queries_use_their_index(seeded_store: JobStore, case: str) -> None:
+    details = [detail for _, detail in await _plans(seeded_store, CASES[case])]
+    assert any(f"INDEX {EXPECTED_INDEXES[case]} " in f"{d} " for d in details), details
+
+
+def test_every_public_method_is_covered() -> None:
+    public = {
+        name for name, member in inspect.getmembers(JobStore)
+        if (inspect.iscoroutinefunction(member) or inspect.isasyncgenfunction(member)) and not name.startswith("_")
+    }
+    covered = set(CASES) | NOT_QUERIES
+    missing = {name for name in public if not any(c == name or c.startswith(f"{name}_") for c in covered)}
+    assert missing == set()
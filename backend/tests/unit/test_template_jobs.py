@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+from pydantic import ValidationError
+
+from backend.src.jobs import JobManager
+from backend.src.job_store import JobStore
+from backend.src.models import JobItem, WorkerType
+from backend.src.prompt_dsl import parse, render_iter
+from backend.src.template_jobs import MAX_RANDOM_SEED, WorkflowMapper, iter_job_chunks
+from backend.src.worker_pool import WorkerPool
+from backend.src.workflow_models import ComfyWorkflow, MappingSourceType, NodeMapping
+
+
+UPLOAD = "__upload__" + "a" * 64 + ".png"
+
+TEMPLATE = (
+    '{{axis emotion}}\n'
+    '  happy : "smiling"\n'
+    '  sad : "crying"\n'
+    '{{/axis}}\n'
+    '{{axis pose}}\n'
+    '  stand : "standing"\n'
+    '  sit : "sitting"\n'
+    '  run : "running"\n'
+    '{{/axis}}\n'
+    '{{combine emotion * pose}}\n'
+    '{{template}}1girl, {{emotion}}, {{pose}}{{/template}}\n'
+    '{{filename}}{{emotion}}_{{pose}}{{/filename}}\n'
+)
+
+
+def _workflow() -> ComfyWorkflow:
+    return ComfyWorkflow.model_validate({
+        "3": {"class_type": "KSampler", "inputs": {"seed": 1, "steps": 20, "model": ["4", 0]}},
+        "6": {"class_type": "CLIPTextEncode", "inputs": {"text": "", "clip": ["4", 1]}},
+        "9": {"class_type": "SaveImage", "inputs": {"filename_prefix": "out"}},
+        "10": {"class_type": "LoadImage", "inputs": {"image": "default.png"}},
+        "11": {"class_type": "Note", "inputs": {"text": ""}},
+    })
+
+
+def _mapping(node_id: str, source: MappingSourceType, **kwargs) -> NodeMapping:
+    return NodeMapping(id=f"m{node_id}{source}", node_id=node_id, source_type=source, **kwargs)
+
+
+ITEM = {"filename": "happy_stand", "prompt": "1girl, smiling, standing", "meta": {"emotion": "happy"}}
+
+
+class TestWorkflowMapper:
+    def test_prompt_and_filename(self):
+        mapper = WorkflowMapper(_workflow(), [
+            _mapping("6", MappingSourceType.PROMPT),
+            _mapping("9", MappingSourceType.FILENAME),
+        ])
+        wf = mapper.build(ITEM).model_dump()
+        assert wf["6"]["inputs"] == {"text": "1girl, smiling, standing", "clip": ["4", 1]}
+        assert wf["9"]["inputs"]["filename_prefix"] == "happy_stand"
+        assert wf["3"]["inputs"]["seed"] == 1
+
+    def test_static_mappings(self):
+        mapper = WorkflowMapper(_workflow(), [
+            _mapping("3", MappingSourceType.SEED, seed_value=42),
+            _mapping("11", MappingSourceType.FIXED, fixed_value="note"),
+            _mapping("10", MappingSourceType.IMAGE, image_value=UPLOAD),
+        ])
+        wf = mapper.build(ITEM).model_dump()
+        assert wf["3"]["inputs"]["seed"] == 42
+        assert wf["11"]["inputs"]["text"] == "note"
+        assert wf["10"]["inputs"]["image"] == UPLOAD
+        assert mapper.image_uploads == {"a" * 64: {"name": UPLOAD}}
+
+    def test_random_seed_per_item(self):
+        mapper = WorkflowMapper(_workflow(), [
+            _mapping("3", MappingSourceType.SEED, seed_random=True, seed_value=7),
+        ], rng=random.Random(0))
+        seeds = {mapper.build(ITEM).root["3"].inputs["seed"] for _ in range(20)}
+        assert len(seeds) > 1
+        assert all(0 <= s < MAX_RANDOM_SEED for s in seeds)
+
+    def test_explicit_input_key(self):
+        mapper = WorkflowMapper(_workflow(), [
+            _mapping("3", MappingSourceType.FIXED, fixed_value="30", input_key="steps"),
+        ])
+        assert mapper.build(ITEM).root["3"].inputs["steps"] == "30"
+
+    def test_missing_node_is_skipped(self):
+        mapper = WorkflowMapper(_workflow(), [_mapping("99", MappingSourceType.PROMPT)])
+        assert "99" not in mapper.build(ITEM).root
+
+    def test_later_mapping_wins(self):
+        mapper = WorkflowMapper(_workflow(), [
+            _mapping("6", MappingSourceType.PROMPT),
+            _mapping("6", MappingSourceType.FIXED, fixed_value="fixed"),
+        ])
+        assert mapper.build(ITEM).root["6"].inputs["text"] == "fixed"
+
+    def test_base_workflow_is_not_mutated(self):
+        base = _workflow()
+        mapper = WorkflowMapper(base, [
+            _mapping("6", MappingSourceType.PROMPT),
+            _mapping("3", MappingSourceType.SEED, seed_value=42),
+        ])
+        first = mapper.build(ITEM)
+        second = mapper.build({**ITEM, "prompt": "other"})
+        assert base.root["6"].inputs["text"] == ""
+        assert base.root["3"].inputs["seed"] == 1
+        assert first.root["6"].inputs["text"] == "1girl, smiling, standing"
+        assert second.root["6"].inputs["text"] == "other"
+        # 매핑이 없는 노드는 잡끼리 공유
+        assert first.root["9"] is second.root["9"]
+
+
+class TestIterJobChunks:
+    def test_chunks_cover_all_items(self):
+        items = list(render_iter(parse(TEMPLATE)))
+        mapper = WorkflowMapper(_workflow(), [_mapping("6", MappingSourceType.PROMPT)])
+        chunks = list(iter_job_chunks(items, mapper, template=TEMPLATE, worker_id="w1", chunk_size=4))
+        assert [len(c) for c in chunks] == [4, 2]
+        jobs = [job for chunk in chunks for job in chunk]
+        assert [j.filename for j in jobs] == [it["filename"] for it in items]
+        assert [j.workflow.root["6"].inputs["text"] for j in jobs] == [it["prompt"] for it in items]
+        assert jobs[0].meta == {"emotion": "happy", "pose": "stand"}
+        assert jobs[0].cegTemplate == TEMPLATE
+        assert jobs[0].workerType is WorkerType.COMFYUI
+        assert jobs[0].workerId == "w1"
+
+    def test_lazy(self):
+        consumed = []
+
+        def items():
+            for i in range(10):
+                consumed.append(i)
+                yield {"filename": f"f{i}", "prompt": f"p{i}", "meta": {}}
+
+        mapper = WorkflowMapper(_workflow(), [])
+        chunks = iter_job_chunks(items(), mapper, template="", chunk_size=3)
+        next(chunks)
+        assert consumed == [0, 1, 2]
+
+    def test_items_are_validated(self):
+        mapper = WorkflowMapper(_workflow(), [_mapping("6", MappingSourceType.PROMPT)])
+        with pytest.raises(ValidationError):
+            next(iter_job_chunks([{**ITEM, "meta": {"emotion": 1}}], mapper, template=""))
+        with pytest.raises(ValueError, match="prompt"):
+            next(iter_job_chunks([{**ITEM, "prompt": None}], mapper, template=""))
+        # 매퍼가 만든 워크플로우는 다시 검증·복사하지 않고 그대로 쓴다
+        (job,) = next(iter_job_chunks([ITEM], mapper, template=""))
+        assert job.workflow is not None
+        assert job.workflow.root["9"] is mapper.build(ITEM).root["9"]
+
+
+class TestSubmitStream:
+    @pytest.mark.asyncio
+    async def test_registers_chunks_and_finishes(self, tmp_store: JobStore, tmp_path):
+        manager = JobManager(pool=MagicMock(spec=WorkerPool), store=tmp_store, images_dir=tmp_path / "images")
+        mapper = WorkflowMapper(_workflow(), [_mapping("6", MappingSourceType.PROMPT)])
+        chunks = iter_job_chunks(render_iter(parse(TEMPLATE)), mapper, template=TEMPLATE, chunk_size=4)
+
+        batch = manager.submit_stream(chunks, total=6)
+        assert batch.status == "running"
+        assert manager.get_batch(batch.id) is batch
+        await asyncio.gather(*manager._batch_tasks)
+
+        assert batch.status == "done"
+        assert batch.created == 6
+        assert len(manager._jobs) == 6
+        assert len(await tmp_store.load_all()) == 6
+
+    @pytest.mark.asyncio
+    async def test_error_keeps_registered_jobs(self, tmp_store: JobStore, tmp_path):
+        manager = JobManager(pool=MagicMock(spec=WorkerPool), store=tmp_store, images_dir=tmp_path / "images")
+
+        def chunks():
+            yield [JobItem(filename="a", prompt="a", workerType=WorkerType.COMFYUI)]
+            raise RuntimeError("boom")
+
+        batch = manager.submit_stream(chunks())
+        await asyncio.gather(*manager._batch_tasks)
+
+        assert batch.status == "error"
+        assert batch.error == "boom"
+        assert batch.created == 1
+        assert len(manager._jobs) == 1
+
+    @pytest.mark.asyncio
+    async def test_finished_batches_are_evicted(self, tmp_store: JobStore, tmp_path, monkeypatch):
+        monkeypatch.setattr("backend.src.jobs.FINISHED_BATCH_LIMIT", 2)
+        manager = JobManager(pool=MagicMock(spec=WorkerPool), store=tmp_store, images_dir=tmp_path / "images")
+        release = threading.Event()
+
+        def blocked():
+            release.wait()  # 워커 스레드에서 막혀 배치가 끝나지 않는다
+            yield from ()
+
+        long_batch = manager.submit_stream(blocked())
+        finished = []
+        for _ in range(4):
+            finished.append(manager.submit_stream(iter([[]])))
+            await asyncio.gather(*(t for t in manager._batch_tasks if t.get_name() != f"batch-{long_batch.id}"))
+
+        assert [manager.get_batch(b.id) for b in finished] == [None, None, *finished[2:]]
+        assert manager.get_batch(long_batch.id) is long_batch  # 실행 중인 배치는 버리지 않는다
+        release.set()
+        await asyncio.gather(*manager._batch_tasks)
+        assert long_batch.status == "done"
+        assert manager.get_batch(finished[2].id) is None
+        assert set(manager._batches) == {finished[3].id, long_batch.id}
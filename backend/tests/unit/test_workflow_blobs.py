@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import json
+
+from backend.src.workflow_blobs import (
+    WorkflowEncoder,
+    apply_patch,
+    blob_hash,
+    canonical_json,
+    decode_workflow,
+    diff_inputs,
+    workflow_shape,
+)
+
+
+def _workflow(text: str = "base", seed: int = 1) -> dict:
+    return {
+        "3": {"class_type": "KSampler", "inputs": {"seed": seed, "model": ["4", 0]}},
+        "6": {"class_type": "CLIPTextEncode", "inputs": {"text": text, "clip": ["4", 1]}},
+    }
+
+
+class TestCanonical:
+    def test_key_order_does_not_change_hash(self):
+        a = {"1": {"inputs": {"a": 1, "b": 2}, "class_type": "X"}}
+        b = {"1": {"class_type": "X", "inputs": {"b": 2, "a": 1}}}
+        assert canonical_json(a) == canonical_json(b)
+        assert blob_hash(canonical_json(a)) == blob_hash(canonical_json(b))
+
+    def test_shape(self):
+        assert workflow_shape(_workflow("a")) == workflow_shape(_workflow("b", seed=9))
+        assert workflow_shape({"1": "not a node"}) is None
+
+
+class TestDiffAndApply:
+    def test_round_trip(self):
+        base, wf = _workflow(), _workflow("cat", seed=5)
+        patch = diff_inputs(base, wf)
+        assert patch == {"3": {"seed": 5}, "6": {"text": "cat"}}
+        assert apply_patch(_workflow(), patch) == wf
+
+    def test_tuple_links_equal_lists(self):
+        wf = _workflow()
+        wf["3"]["inputs"]["model"] = ("4", 0)
+        assert diff_inputs(_workflow(), wf) == {}
+
+    def test_non_input_change_is_not_patchable(self):
+        wf = _workflow()
+        wf["6"]["_meta"] = {"title": "Positive"}
+        assert diff_inputs(_workflow(), wf) is None
+
+    def test_decode_returns_new_objects(self):
+        blob = canonical_json(_workflow())
+        first = decode_workflow(blob, '{"6": {"text": "x"}}')
+        first["3"]["inputs"]["seed"] = 99
+        assert decode_workflow(blob, None) == _workflow()
+
+
+class TestWorkflowEncoder:
+    def test_patch_against_first_blob(self):
+        encoder = WorkflowEncoder()
+        blobs: dict[str, str] = {}
+        first = encoder.encode(_workflow(), blobs)
+        second = encoder.encode(_workflow("cat"), blobs)
+        assert len(blobs) == 1
+        assert first == ("", blob_hash(canonical_json(_workflow())), None)
+        assert second[1] == first[1]
+        assert json.loads(second[2]) == {"6": {"text": "cat"}}
+
+    def test_large_patch_falls_back_to_blob(self):
+        encoder = WorkflowEncoder()
+        blobs: dict[str, str] = {}
+        encoder.encode(_workflow(), blobs)
+        _, digest, patch = encoder.encode(_workflow("x" * 1000), blobs)
+        assert patch is None
+        assert len(blobs) == 2
+        assert json.loads(blobs[digest]) == _workflow("x" * 1000)
+
+    def test_empty_workflow_stays_inline(self):
+        assert WorkflowEncoder().encode({}, {}) == ("{}", None, None)
+
+    def test_reset_forgets_written_blobs(self):
+        encoder = WorkflowEncoder()
+        encoder.encode(_workflow(), {})
+        encoder.reset()
+        blobs: dict[str, str] = {}
+        encoder.encode(_workflow(), blobs)
+        assert len(blobs) == 1
@@ -185,6 +185,14 @@ class TestNodeMapping:
         nm2 = NodeMapping.model_validate_json(json_str)
         assert nm2 == nm
 
+    def test_target_input_defaults(self):
+        assert NodeMapping(id="a", node_id="1", source_type=MappingSourceType.PROMPT).target_input == "text"
+        assert NodeMapping(id="b", node_id="1", source_type=MappingSourceType.FILENAME).target_input == "filename_prefix"
+        assert NodeMapping(id="c", node_id="1", source_type=MappingSourceType.SEED).target_input == "seed"
+        assert NodeMapping(
+            id="d", node_id="1", source_type=MappingSourceType.SEED, input_key="noise_seed"
+        ).target_input == "noise_seed"
+
     def test_missing_required_fields_raises_validation_error(self):
         with pytest.raises(ValidationError):
             NodeMapping(id="m7")  # missing node_id and source_type
\ No newline at end of file
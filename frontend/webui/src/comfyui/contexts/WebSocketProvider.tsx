@@ -81,6 +81,25 @@ export const WebSocketProvider = ({ children, backendUrl }: ProviderProps) => {
         setJobs((prev) => [...prev, newJob])
         break
       }
+      case "jobs.created": {
+        const newJobs: JobView[] = event.jobs.map((j) => ({
+          workerId: null,
+          error: null,
+          imageUrls: [],
+          savedImageHashes: [],
+          progressPercent: 0,
+          currentNodeName: "",
+          totalNodeCount: 0,
+          completedNodeCount: 0,
+          startedAt: null,
+          finishedAt: null,
+          retryCount: 0,
+          executionDurationMs: null,
+          ...j,
+        }))
+        setJobs((prev) => [...prev, ...newJobs])
+        break
+      }
       case "job.updated":
         setJobs((prev) => {
           if (["done", "error", "cancelled"].includes(event.job.status)) {
@@ -35,6 +35,11 @@ export interface JobView {
   targetWorkerId?: string | null
 }
 
+export type JobSummary = Pick<
+  JobView,
+  "id" | "filename" | "prompt" | "status" | "createdAt" | "meta" | "targetWorkerId"
+>
+
 export interface WorkerView {
   id: string
   url: string
@@ -78,6 +83,7 @@ export interface SavedImage {
   trashedAt: number | null
   tags: string[]
   cegTemplate?: string
+  templateHash?: string | null
   workflow?: Record<string, unknown>
 }
 
@@ -108,6 +114,7 @@ export type BackendEvent =
       paused: boolean
     }
   | { type: "job.created"; job: JobView }
+  | { type: "jobs.created"; jobs: JobSummary[] }
   | { type: "job.updated"; job: JobView }
   | { type: "worker.updated"; worker: WorkerView }
   | { type: "worker.added"; worker: WorkerView }
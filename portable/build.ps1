@@ -65,6 +65,12 @@ if ($LASTEXITCODE -ne 0) {
     }
 }
 
+# Precompile the DSL grammar (prompt_dsl.lark.cache) so it ships in the bundle
+Write-Host "Precompiling DSL grammar..." -ForegroundColor Gray
+Push-Location $ProjectRoot
+& $VenvPython -c "import backend.src.prompt_dsl"
+Pop-Location
+
 # Build the executable
 Write-Host "Running PyInstaller compilation..." -ForegroundColor Gray
 & $VenvPython -m PyInstaller --name "ComfyEmotionGen" `
@@ -48,6 +48,10 @@ if ! "$VENV_PY" -m PyInstaller --version >/dev/null 2>&1; then
   "$VENV_PY" -m pip install pyinstaller
 fi
 
+# Precompile the DSL grammar (prompt_dsl.lark.cache) so it ships in the bundle
+echo "Precompiling DSL grammar..."
+(cd "$PROJECT_ROOT" && "$VENV_PY" -c "import backend.src.prompt_dsl")
+
 cd "$SCRIPT_DIR"
 "$VENV_PY" -m PyInstaller \
   --name "ComfyEmotionGen" \
@@ -21,6 +21,12 @@ if ($LASTEXITCODE -ne 0) {
     }
 }
 
+# Precompile the DSL grammar (prompt_dsl.lark.cache) so it ships in the bundle
+Write-Host "Precompiling DSL grammar..." -ForegroundColor Gray
+Push-Location $ProjectRoot
+python -c "import backend.src.prompt_dsl"
+Pop-Location
+
 Write-Host "Running PyInstaller compilation..." -ForegroundColor Gray
 python -m PyInstaller --name "ComfyEmotionGen-backend" `
             --noconfirm `
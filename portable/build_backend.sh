@@ -26,6 +26,10 @@ if ! "$PY" -c "import PyInstaller" 2>/dev/null; then
   }
 fi
 
+# Precompile the DSL grammar (prompt_dsl.lark.cache) so it ships in the bundle
+echo "Precompiling DSL grammar..."
+(cd "$PROJECT_ROOT" && "$PY" -c "import backend.src.prompt_dsl")
+
 cd "$SCRIPT_DIR"
 "$PY" -m PyInstaller \
   --name "ComfyEmotionGen-backend" \